@@ -6,7 +6,7 @@ create structured reports.
 """
 from asgiref.sync import async_to_sync
 
-from apps.common.llm_providers import get_llm_provider
+from apps.common.llm_providers import Priority, get_llm_provider
 
 
 class ResearchAgent:
@@ -49,7 +49,7 @@ class ResearchAgent:
         prompt = self._build_research_prompt(topic, case_context, inquiry_context, sources, graph_context)
 
         try:
-            provider = get_llm_provider('chat')
+            provider = get_llm_provider('chat', priority=Priority.BACKGROUND)
 
             async def _call():
                 return await provider.generate(
@@ -69,6 +69,7 @@ async def generate_research_document(
     from apps.agents.research_loop import ResearchLoop, ResearchContext
     from apps.agents.research_tools import resolve_tools_for_config
     from apps.common.llm_providers.factory import get_llm_provider
+    from apps.common.llm_providers.rate_limiter import Priority
     from django.contrib.auth.models import User
     import uuid as uuid_module
 
@@ -113,7 +114,7 @@ async def generate_research_document(
     research_config = skill_context.get('research_config') or ResearchConfig.default()
 
     # ── Set up provider and tools ────────────────────────────────────────
-    provider = get_llm_provider('chat')
+    provider = get_llm_provider('chat', priority=Priority.BACKGROUND)
     tools = resolve_tools_for_config(research_config.sources, case_id=str(case.id), user_id=user.id)
 
     # ── Build progress callback ──────────────────────────────────────────
@@ -0,0 +1,241 @@
+"""
+Case Aggregates Service
+
+Counts behind the case workspace — evidence and its direction, assumption
+validation, inquiry progress, untested assumptions / unvalidated claims
+and recent provenance events — computed together and cached.
+
+Served by:
+    - CaseViewSet.home (aggregates + recent activity)
+    - CaseViewSet.evidence_landscape
+    - ContextAssemblyService._resolve_case_mode() (workspace state in the
+      case-mode prompt)
+
+A miss costs one conditional aggregate over the project's nodes and their
+outgoing edges, one over the case's inquiries, and one query each for
+the top-N lists and recent events. Results are cached under the
+project's graph revision, the plan version, the inquiries' state and
+the latest provenance event. One probe query reads all of these, so a
+hit is a single query, and any change to the inputs moves the key.
+"""
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, Left, RowNumber
+
+logger = logging.getLogger(__name__)
+
+# Assumption statuses counted as validated by the evidence landscape
+VALIDATED_ASSUMPTION_STATUSES = ['confirmed', 'refuted']
+
+UNTESTED_LIST_LIMIT = 10
+UNLINKED_CLAIMS_LIMIT = 5
+RECENT_EVENTS_LIMIT = 5
+
+
+def empty_aggregates() -> Dict[str, Any]:
+    return {
+        'evidence': {'total': 0, 'supporting': 0, 'contradicting': 0, 'neutral': 0},
+        'assumptions': {'total': 0, 'validated': 0, 'untested': 0, 'untested_list': []},
+        'inquiries': {'total': 0, 'open': 0, 'investigating': 0, 'resolved': 0},
+        'unlinked_claims': [],
+        'recent_events': [],
+    }
+
+
+class CaseAggregatesService:
+    """Workspace counts for a case, cached per graph revision and plan version."""
+
+    @staticmethod
+    def _version_probe(case_id: uuid.UUID) -> Optional[tuple]:
+        """(project_id, graph revision, plan version, inquiry count, inquiries
+        last changed, latest provenance event id) in one query."""
+        from apps.cases.models import Case, InvestigationPlan
+        from apps.events.models import Event, EventCategory
+        from apps.graph.models import ProjectGraphRevision
+        from apps.inquiries.models import Inquiry
+
+        inquiries = Inquiry.objects.filter(case_id=OuterRef('id')).values('case_id')
+        return (
+            Case.objects
+            .filter(id=case_id)
+            .annotate(
+                graph_revision=Coalesce(
+                    Subquery(
+                        ProjectGraphRevision.objects
+                        .filter(project_id=OuterRef('project_id'))
+                        .values('revision')[:1]
+                    ),
+                    Value(0),
+                ),
+                plan_version=Coalesce(
+                    Subquery(
+                        InvestigationPlan.objects
+                        .filter(case_id=OuterRef('id'))
+                        .values('current_version')[:1]
+                    ),
+                    Value(0),
+                ),
+                inquiry_count=Coalesce(
+                    Subquery(inquiries.annotate(n=Count('id')).values('n'), output_field=IntegerField()),
+                    Value(0),
+                ),
+                inquiries_changed=Subquery(inquiries.annotate(latest=Max('updated_at')).values('latest')),
+                latest_event=Subquery(
+                    Event.objects
+                    .filter(case_id=OuterRef('id'), category=EventCategory.PROVENANCE)
+                    .order_by('-timestamp')
+                    .values('id')[:1]
+                ),
+            )
+            .values_list(
+                'project_id', 'graph_revision', 'plan_version',
+                'inquiry_count', 'inquiries_changed', 'latest_event',
+            )
+            .first()
+        )
+
+    @staticmethod
+    def get_case_aggregates(case_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """
+        Workspace aggregates for a case (None if the case doesn't exist).
+
+        Returns: {
+            evidence: {total, supporting, contradicting, neutral},
+            assumptions: {total, validated, untested, untested_list},
+            inquiries: {total, open, investigating, resolved},
+            unlinked_claims: [{text, location}],
+            recent_events: [{id, type, payload, timestamp, actor_type}],
+        }
+        """
+        from apps.graph.revision import GRAPH_CACHE_TIMEOUT, graph_cache_key
+
+        probe = CaseAggregatesService._version_probe(case_id)
+        if probe is None:
+            return None
+        project_id, revision, plan_version, inquiry_count, inquiries_changed, latest_event = probe
+
+        inquiry_state = f'{inquiry_count}-{inquiries_changed.timestamp() if inquiries_changed else 0}'
+        key = graph_cache_key(
+            'case_aggregates', project_id, revision,
+            f'case-{case_id}', f'plan-{plan_version}', inquiry_state, latest_event or 'none',
+        )
+        aggregates = cache.get(key)
+        if aggregates is not None:
+            return aggregates
+
+        try:
+            aggregates = CaseAggregatesService.compute_case_aggregates(case_id, project_id)
+        except Exception:
+            logger.warning("case_aggregates_failed", extra={'case_id': str(case_id)}, exc_info=True)
+            return empty_aggregates()
+        cache.set(key, aggregates, GRAPH_CACHE_TIMEOUT)
+        return aggregates
+
+    @staticmethod
+    def compute_case_aggregates(case_id: uuid.UUID, project_id: uuid.UUID) -> Dict[str, Any]:
+        """Uncached aggregates (see get_case_aggregates)."""
+        from apps.events.models import Event, EventCategory
+        from apps.graph.models import EdgeType, Node
+        from apps.inquiries.models import Inquiry, InquiryStatus
+
+        aggregates = empty_aggregates()
+
+        # Nodes joined to their outgoing edges: node counts are distinct,
+        # edge counts are per joined row
+        is_evidence = Q(node_type='evidence')
+        is_assumption = Q(node_type='assumption')
+        counts = Node.objects.filter(project_id=project_id).aggregate(
+            evidence=Count('id', filter=is_evidence, distinct=True),
+            supporting=Count(
+                'outgoing_edges',
+                filter=is_evidence & Q(outgoing_edges__edge_type=EdgeType.SUPPORTS),
+            ),
+            contradicting=Count(
+                'outgoing_edges',
+                filter=is_evidence & Q(outgoing_edges__edge_type=EdgeType.CONTRADICTS),
+            ),
+            assumptions=Count('id', filter=is_assumption, distinct=True),
+            validated=Count(
+                'id',
+                filter=is_assumption & Q(status__in=VALIDATED_ASSUMPTION_STATUSES),
+                distinct=True,
+            ),
+        )
+        aggregates['evidence'] = {
+            'total': counts['evidence'],
+            'supporting': counts['supporting'],
+            'contradicting': counts['contradicting'],
+            'neutral': max(0, counts['evidence'] - counts['supporting'] - counts['contradicting']),
+        }
+        aggregates['assumptions'].update({
+            'total': counts['assumptions'],
+            'validated': counts['validated'],
+            'untested': counts['assumptions'] - counts['validated'],
+        })
+
+        # Inquiries by status
+        aggregates['inquiries'] = (
+            Inquiry.objects
+            .filter(case_id=case_id)
+            .exclude(status=InquiryStatus.ARCHIVED)
+            .aggregate(
+                total=Count('id'),
+                open=Count('id', filter=Q(status=InquiryStatus.OPEN)),
+                investigating=Count('id', filter=Q(status=InquiryStatus.INVESTIGATING)),
+                resolved=Count('id', filter=Q(status=InquiryStatus.RESOLVED)),
+            )
+        )
+
+        # Newest untested assumptions and unvalidated claims, ranked per type
+        listed = (
+            Node.objects
+            .filter(project_id=project_id)
+            .filter(
+                (is_assumption & ~Q(status__in=VALIDATED_ASSUMPTION_STATUSES))
+                | Q(node_type='claim', status='unvalidated')
+            )
+            .annotate(
+                rank=Window(
+                    RowNumber(),
+                    partition_by=[F('node_type')],
+                    order_by=[F('created_at').desc(), F('id')],
+                ),
+                excerpt=Left('content', 200),
+            )
+            .filter(rank__lte=max(UNTESTED_LIST_LIMIT, UNLINKED_CLAIMS_LIMIT))
+            .order_by('node_type', 'rank')
+            .values_list('id', 'node_type', 'excerpt', 'status', 'rank')
+        )
+        for node_id, node_type, excerpt, node_status, rank in listed:
+            if node_type == 'assumption' and rank <= UNTESTED_LIST_LIMIT:
+                aggregates['assumptions']['untested_list'].append({
+                    'id': str(node_id),
+                    'text': excerpt or '',
+                    'status': node_status,
+                })
+            elif node_type == 'claim' and rank <= UNLINKED_CLAIMS_LIMIT:
+                aggregates['unlinked_claims'].append({
+                    'text': (excerpt or '')[:150],
+                    'location': 'graph',
+                })
+
+        aggregates['recent_events'] = [
+            {
+                'id': str(event['id']),
+                'type': event['type'],
+                'payload': event['payload'],
+                'timestamp': event['timestamp'].isoformat(),
+                'actor_type': event['actor_type'],
+            }
+            for event in Event.objects.filter(
+                case_id=case_id,
+                category=EventCategory.PROVENANCE,
+            ).order_by('-timestamp').values(
+                'id', 'type', 'payload', 'timestamp', 'actor_type',
+            )[:RECENT_EVENTS_LIMIT]
+        ]
+        return aggregates
@@ -18,7 +18,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from django.core.cache import cache
 
-from apps.common.llm_providers import get_llm_provider
+from apps.common.llm_providers import Priority, get_llm_provider
 
 
 # Cache keys
@@ -87,7 +87,7 @@ def run_background_analysis(
         }
     }
     """
-    provider = get_llm_provider('fast')
+    provider = get_llm_provider('fast', priority=Priority.BACKGROUND)
 
     prompt = _build_analysis_prompt(content, case_context)
 
@@ -4,9 +4,15 @@ Brief grounding engine.
 Computes grounding status and annotations for brief sections by following
 the section → inquiry → signals → evidence chain. Uses GraphAnalyzer
 for pattern detection.
+
+Graph counts and patterns depend only on the case, so evolve_brief()
+computes them once for all sections and writes sections and annotations
+in bulk. Each section remembers a fingerprint of its inputs; incremental
+evolves (plan changes) skip sections whose fingerprint is unchanged.
 """
 import logging
-from typing import Dict, List, Any
+import hashlib
+from typing import Any, Dict, List, Optional
 
 from django.db import transaction
 from django.utils import timezone
@@ -34,7 +40,11 @@ class BriefGroundingEngine:
     """
 
     @staticmethod
-    def compute_section_grounding(section: BriefSection, evidence_threshold: str = 'medium') -> Dict[str, Any]:
+    def compute_section_grounding(
+        section: BriefSection,
+        evidence_threshold: str = 'medium',
+        counts: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Compute grounding status for a single section.
 
@@ -44,6 +54,8 @@ class BriefGroundingEngine:
         Args:
             section: The BriefSection to compute grounding for.
             evidence_threshold: 'low', 'medium', or 'high' — controls STRONG/MODERATE thresholds.
+            counts: compute_case_grounding_counts() of the section's case,
+                when the caller grounds several sections at once.
 
         Returns:
             {
@@ -69,7 +81,9 @@ class BriefGroundingEngine:
         }
 
         if section.inquiry:
-            return BriefGroundingEngine._compute_from_inquiry(section.inquiry, result, evidence_threshold)
+            return BriefGroundingEngine._compute_from_inquiry(
+                section.inquiry, result, evidence_threshold, counts,
+            )
         else:
             # Decision frame sections get "set" status if decision_question exists
             if section.section_type == 'decision_frame':
@@ -81,77 +95,79 @@ class BriefGroundingEngine:
             return result
 
     @staticmethod
-    def _compute_from_inquiry(inquiry, result: Dict, evidence_threshold: str = 'medium') -> Dict:
-        """Compute grounding from graph evidence nodes and signals."""
-        # Count evidence by direction from graph Node(type=EVIDENCE) + Edges
-        try:
-            from apps.graph.models import Node, Edge, EdgeType
-            from apps.graph.services import GraphService
-            case = inquiry.case
-            if case and case.project:
-                visible_ids = GraphService._get_case_visible_nodes(case.id)
-                evidence_nodes = Node.objects.filter(
-                    id__in=visible_ids,
-                    node_type='evidence',
-                )
-                result['evidence_count'] = evidence_nodes.count()
-                result['supporting'] = Edge.objects.filter(
-                    source_node__in=evidence_nodes,
-                    edge_type=EdgeType.SUPPORTS,
-                ).count()
-                result['contradicting'] = Edge.objects.filter(
-                    source_node__in=evidence_nodes,
-                    edge_type=EdgeType.CONTRADICTS,
-                ).count()
-                result['neutral'] = max(
-                    0,
-                    result['evidence_count'] - result['supporting'] - result['contradicting'],
-                )
-
-                # Average confidence from evidence nodes
-                if result['evidence_count'] > 0:
-                    confidences = list(
-                        evidence_nodes.filter(confidence__isnull=False)
-                        .values_list('confidence', flat=True)
-                    )
-                    if confidences:
-                        result['confidence_avg'] = round(
-                            sum(confidences) / len(confidences), 2
-                        )
-        except Exception as e:
-            logger.debug("Grounding confidence lookup failed: %s", e)
+    def compute_case_grounding_counts(case) -> Dict[str, Any]:
+        """
+        Graph counts behind inquiry-section grounding, over the case-visible
+        nodes (case-owned + referenced project nodes).
 
-        # Count unvalidated assumptions from the graph layer
-        # Scoped to case-visible nodes (case-owned + referenced project nodes)
-        try:
-            from apps.graph.models import Node
-            from apps.graph.services import GraphService
-            case = inquiry.case
-            if case and case.project:
-                visible_ids = GraphService._get_case_visible_nodes(case.id)
-                assumption_nodes = Node.objects.filter(
-                    id__in=visible_ids,
-                    node_type='assumption',
-                ).exclude(status__in=['confirmed', 'refuted'])
-                result['unvalidated_assumptions'] = assumption_nodes.count()
-        except Exception as e:
-            logger.debug("Assumption count lookup failed: %s", e)
+        They depend only on the case, not on the section's inquiry, so every
+        linked section of a brief shares them. Two queries: one conditional
+        aggregate over the nodes, one over the evidence nodes' edges.
+        """
+        from django.db.models import Avg, Count, Q
+        from apps.graph.models import CaseNodeReference, Edge, EdgeType, Node
 
-        # Count tensions from the graph layer
-        # Scoped to case-visible nodes
+        counts = {
+            'evidence_count': 0,
+            'supporting': 0,
+            'contradicting': 0,
+            'neutral': 0,
+            'unvalidated_assumptions': 0,
+            'tensions_count': 0,
+            'confidence_avg': None,
+        }
+        if not (case and case.project_id):
+            return counts
+
+        visible = Node.objects.filter(
+            Q(case_id=case.id, scope='case')
+            | Q(id__in=CaseNodeReference.objects.filter(
+                case_id=case.id, excluded=False,
+            ).values('node_id'))
+        )
         try:
-            from apps.graph.models import Node
-            from apps.graph.services import GraphService
-            case = inquiry.case
-            if case and case.project:
-                visible_ids = GraphService._get_case_visible_nodes(case.id)
-                tension_nodes = Node.objects.filter(
-                    id__in=visible_ids,
-                    node_type='tension',
+            node_counts = visible.aggregate(
+                evidence_count=Count('id', filter=Q(node_type='evidence')),
+                confidence_avg=Avg('confidence', filter=Q(node_type='evidence')),
+                unvalidated_assumptions=Count(
+                    'id',
+                    filter=Q(node_type='assumption') & ~Q(status__in=['confirmed', 'refuted']),
+                ),
+                tensions_count=Count('id', filter=Q(node_type='tension')),
+            )
+            counts['evidence_count'] = node_counts['evidence_count']
+            counts['unvalidated_assumptions'] = node_counts['unvalidated_assumptions']
+            counts['tensions_count'] = node_counts['tensions_count']
+            if node_counts['confidence_avg'] is not None:
+                counts['confidence_avg'] = round(node_counts['confidence_avg'], 2)
+
+            if counts['evidence_count']:
+                edge_counts = Edge.objects.filter(
+                    source_node__in=visible.filter(node_type='evidence'),
+                ).aggregate(
+                    supporting=Count('id', filter=Q(edge_type=EdgeType.SUPPORTS)),
+                    contradicting=Count('id', filter=Q(edge_type=EdgeType.CONTRADICTS)),
                 )
-                result['tensions_count'] = tension_nodes.count()
+                counts['supporting'] = edge_counts['supporting']
+                counts['contradicting'] = edge_counts['contradicting']
+            counts['neutral'] = max(
+                0, counts['evidence_count'] - counts['supporting'] - counts['contradicting'],
+            )
         except Exception as e:
-            logger.debug("Tension count lookup failed: %s", e)
+            logger.debug("Grounding count lookup failed: %s", e)
+        return counts
+
+    @staticmethod
+    def _compute_from_inquiry(
+        inquiry,
+        result: Dict,
+        evidence_threshold: str = 'medium',
+        counts: Optional[Dict[str, Any]] = None,
+    ) -> Dict:
+        """Compute grounding from graph evidence nodes and signals."""
+        if counts is None:
+            counts = BriefGroundingEngine.compute_case_grounding_counts(inquiry.case)
+        result.update(counts)
 
         # Determine status
         result['status'] = BriefGroundingEngine._determine_status(result, evidence_threshold)
@@ -204,12 +220,17 @@ class BriefGroundingEngine:
         return GroundingStatus.WEAK
 
     @staticmethod
-    def compute_section_annotations(section: BriefSection) -> List[Dict[str, Any]]:
+    def compute_section_annotations(
+        section: BriefSection,
+        patterns: Optional[Dict] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Generate annotations for a section based on graph analysis.
 
         Uses GraphAnalyzer's inquiry-scoped methods for richer pattern
         detection when available, falling back to inline analysis.
+        ``patterns`` (GraphAnalyzer.find_patterns_for_case of the section's
+        case) skips the analysis when the caller already ran it.
 
         Returns a list of annotation data dicts, not yet persisted.
         Each dict: {type, description, priority, signal_ids, inquiry_id}
@@ -224,9 +245,10 @@ class BriefGroundingEngine:
         if inquiry:
             # Use inquiry-scoped graph analysis for richer pattern detection
             try:
-                from apps.graph.analyzer import GraphAnalyzer
-                analyzer = GraphAnalyzer()
-                patterns = analyzer.find_patterns_for_inquiry(inquiry.id)
+                if patterns is None:
+                    from apps.graph.analyzer import GraphAnalyzer
+                    analyzer = GraphAnalyzer()
+                    patterns = analyzer.find_patterns_for_inquiry(inquiry.id)
                 annotations = BriefGroundingEngine._annotations_from_patterns(
                     patterns, inquiry
                 )
@@ -343,7 +365,7 @@ class BriefGroundingEngine:
 
     @staticmethod
     def _annotations_inline(
-        section: BriefSection, inquiry
+        section: BriefSection, inquiry, evidence_count: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Fallback inline annotation computation (no GraphAnalyzer dependency).
@@ -354,17 +376,10 @@ class BriefGroundingEngine:
         annotations = []
 
         # Evidence desert — count from graph evidence nodes
-        try:
-            from apps.graph.models import Node
-            from apps.graph.services import GraphService
-            case = inquiry.case
-            visible_ids = GraphService._get_case_visible_nodes(case.id) if case else []
-            evidence_count = Node.objects.filter(
-                id__in=visible_ids,
-                node_type='evidence',
-            ).count() if visible_ids else 0
-        except Exception:
-            evidence_count = 0
+        if evidence_count is None:
+            evidence_count = BriefGroundingEngine.compute_case_grounding_counts(
+                inquiry.case
+            )['evidence_count']
         if evidence_count < 2 and inquiry.status in ['open', 'investigating']:
             annotations.append({
                 'type': AnnotationType.EVIDENCE_DESERT,
@@ -379,8 +394,31 @@ class BriefGroundingEngine:
 
         return annotations
 
+    @staticmethod
+    def _graph_version(case) -> str:
+        """Graph state the case's grounding depends on: the project graph
+        revision and the case's node references."""
+        from apps.graph.revision import get_case_references_version, get_graph_revision
+
+        return f'r{get_graph_revision(case.project_id)}:{get_case_references_version(case.id)}'
+
+    @staticmethod
+    def _section_fingerprint(section: BriefSection, case, graph_version: str, evidence_threshold: str) -> str:
+        """Hash of everything a section's grounding and annotations are computed from."""
+        if section.inquiry:
+            inquiry = section.inquiry
+            parts = [
+                graph_version, evidence_threshold, str(inquiry.id),
+                inquiry.status, inquiry.updated_at.isoformat(),
+            ]
+        elif section.section_type == 'decision_frame':
+            parts = ['decision_frame', bool(case.decision_question)]
+        else:
+            parts = ['unlinked']
+        return hashlib.md5('|'.join(map(str, parts)).encode('utf-8')).hexdigest()
+
     @classmethod
-    def evolve_brief(cls, case_id) -> Dict[str, Any]:
+    def evolve_brief(cls, case_id, incremental: bool = False) -> Dict[str, Any]:
         """
         Recompute grounding for all BriefSections in a case.
 
@@ -392,6 +430,9 @@ class BriefGroundingEngine:
 
         Args:
             case_id: UUID of the case
+            incremental: Only reground sections whose inputs (linked
+                inquiry, case graph, evidence threshold) changed since
+                they were last grounded.
 
         Returns:
             Dict with: updated_sections, new_annotations, resolved_annotations
@@ -411,33 +452,68 @@ class BriefGroundingEngine:
         # Wrap entire evolution in a transaction so partial failures don't
         # leave grounding_status / annotations in an inconsistent state.
         with transaction.atomic():
-            return cls._evolve_brief_inner(case)
+            return cls._evolve_brief_inner(case, incremental=incremental)
 
     @classmethod
-    def _evolve_brief_inner(cls, case) -> Dict[str, Any]:
-        """Inner evolution logic, runs within a transaction."""
+    def _evolve_brief_inner(cls, case, incremental: bool = False) -> Dict[str, Any]:
+        """Inner evolution logic, runs within a transaction.
+
+        Graph counts and patterns depend only on the case, so they're
+        computed once (and only if some linked section needs regrounding);
+        section and annotation writes are batched.
+        """
+        from django.db.models import Prefetch
+
         brief = case.main_brief
-        sections = BriefSection.objects.filter(brief=brief).select_related('inquiry').prefetch_related(
-            'annotations',
+        sections = list(
+            BriefSection.objects.filter(brief=brief)
+            .select_related('inquiry', 'brief__case')
+            .prefetch_related(Prefetch(
+                'annotations',
+                queryset=BriefAnnotation.objects.filter(
+                    dismissed_at__isnull=True,
+                    resolved_at__isnull=True,
+                ),
+                to_attr='active_annotations',
+            ))
         )
 
         # Read per-case investigation preferences
         prefs = getattr(case, 'investigation_preferences', None) or {}
         evidence_threshold = prefs.get('evidence_threshold', 'medium')
 
+        graph_version = (
+            cls._graph_version(case) if any(s.inquiry_id for s in sections) else ''
+        )
+        now = timezone.now()
+        counts = None
+        patterns = None
+        patterns_failed = False
+
         updated_sections = []
         new_annotations = []
         resolved_annotations = []
+        regrounded = []
+        to_create = []
+        to_resolve = []
 
         for section in sections:
+            fingerprint = cls._section_fingerprint(section, case, graph_version, evidence_threshold)
+            if incremental and fingerprint == section.grounding_fingerprint:
+                continue
+
             # 1. Recompute grounding
-            grounding = cls.compute_section_grounding(section, evidence_threshold)
+            if section.inquiry and counts is None:
+                counts = cls.compute_case_grounding_counts(case)
+            grounding = cls.compute_section_grounding(section, evidence_threshold, counts=counts)
             old_status = section.grounding_status
             new_status = grounding.pop('status')
 
             section.grounding_status = new_status
             section.grounding_data = grounding
-            section.save(update_fields=['grounding_status', 'grounding_data', 'updated_at'])
+            section.grounding_fingerprint = fingerprint
+            section.updated_at = now
+            regrounded.append(section)
 
             if old_status != new_status:
                 updated_sections.append({
@@ -448,60 +524,77 @@ class BriefGroundingEngine:
                 })
 
             # 2. Compute new annotations
-            computed_annotations = cls.compute_section_annotations(section)
-
-            # 3. Reconcile with existing annotations
-            existing_active = section.annotations.filter(
-                dismissed_at__isnull=True,
-                resolved_at__isnull=True,
-            )
-
-            # Build a set of existing annotation "signatures" for dedup
-            existing_signatures = set()
-            for ann in existing_active:
-                sig = (ann.annotation_type, ann.description[:80])
-                existing_signatures.add(sig)
+            if section.inquiry and patterns is None and not patterns_failed:
+                try:
+                    from apps.graph.analyzer import GraphAnalyzer
+                    patterns = GraphAnalyzer().find_patterns_for_case(case.id, case.project_id)
+                except Exception as e:
+                    logger.warning(
+                        f"Case-scoped analysis failed for {case.id}, "
+                        f"falling back to inline: {e}"
+                    )
+                    patterns_failed = True
+            if patterns_failed and section.inquiry:
+                computed_annotations = cls._annotations_inline(
+                    section, section.inquiry, evidence_count=counts['evidence_count'],
+                )
+            else:
+                computed_annotations = cls.compute_section_annotations(section, patterns)
 
-            # Create new annotations that don't already exist
+            # 3. Reconcile with existing annotations by "signature"
+            existing_active = section.active_annotations
+            existing_signatures = {
+                (ann.annotation_type, ann.description[:80]) for ann in existing_active
+            }
+            computed_signatures = set()
             for ann_data in computed_annotations:
                 sig = (ann_data['type'], ann_data['description'][:80])
+                computed_signatures.add(sig)
                 if sig not in existing_signatures:
-                    annotation = BriefAnnotation.objects.create(
+                    existing_signatures.add(sig)
+                    to_create.append((section, BriefAnnotation(
                         section=section,
                         annotation_type=ann_data['type'],
                         description=ann_data['description'],
                         priority=ann_data['priority'],
                         source_inquiry_id=ann_data.get('inquiry_id'),
-                    )
-                    new_annotations.append({
-                        'id': str(annotation.id),
-                        'type': annotation.annotation_type,
-                        'section_heading': section.heading,
-                    })
+                    )))
 
             # 4. Resolve stale annotations (no longer computed)
-            computed_signatures = set()
-            for ann_data in computed_annotations:
-                sig = (ann_data['type'], ann_data['description'][:80])
-                computed_signatures.add(sig)
-
             for existing_ann in existing_active:
                 sig = (existing_ann.annotation_type, existing_ann.description[:80])
                 if sig not in computed_signatures:
-                    existing_ann.resolved_at = timezone.now()
-                    existing_ann.resolved_by = 'system'
-                    existing_ann.save(update_fields=['resolved_at', 'resolved_by', 'updated_at'])
+                    to_resolve.append(existing_ann.id)
                     resolved_annotations.append({
                         'id': str(existing_ann.id),
                         'type': existing_ann.annotation_type,
                         'section_heading': section.heading,
                     })
 
+        if regrounded:
+            BriefSection.objects.bulk_update(
+                regrounded,
+                ['grounding_status', 'grounding_data', 'grounding_fingerprint', 'updated_at'],
+            )
+        if to_create:
+            BriefAnnotation.objects.bulk_create([annotation for _, annotation in to_create])
+            for section, annotation in to_create:
+                new_annotations.append({
+                    'id': str(annotation.id),
+                    'type': annotation.annotation_type,
+                    'section_heading': section.heading,
+                })
+        if to_resolve:
+            BriefAnnotation.objects.filter(id__in=to_resolve).update(
+                resolved_at=now, resolved_by='system', updated_at=now,
+            )
+
         # 5. Update locked state for synthesis/recommendation sections
         _update_locked_sections(brief, sections)
 
         logger.info(
             f"Brief evolved for case {case.id}: "
+            f"{len(regrounded)}/{len(sections)} sections regrounded, "
             f"{len(updated_sections)} sections updated, "
             f"{len(new_annotations)} new annotations, "
             f"{len(resolved_annotations)} resolved"
@@ -512,6 +605,7 @@ class BriefGroundingEngine:
             'new_annotations': new_annotations,
             'resolved_annotations': resolved_annotations,
             'sections_updated': len(updated_sections),
+            'sections_regrounded': len(regrounded),
             'annotations_created': len(new_annotations),
             'annotations_resolved': len(resolved_annotations),
         }
@@ -526,7 +620,18 @@ def _update_locked_sections(brief, sections):
 
     If the case's investigation_preferences has disable_locks=True, all
     synthesis/recommendation sections are immediately unlocked.
+
+    Only sections whose lock state changes are written (one bulk update).
     """
+    changed = []
+
+    def set_lock(section, is_locked: bool, lock_reason: str = ''):
+        if section.is_locked != is_locked or section.lock_reason != lock_reason:
+            section.is_locked = is_locked
+            section.lock_reason = lock_reason
+            section.updated_at = timezone.now()
+            changed.append(section)
+
     # Check for per-case lock override
     case = brief.case
     prefs = getattr(case, 'investigation_preferences', None) or {}
@@ -534,60 +639,50 @@ def _update_locked_sections(brief, sections):
         for section in sections:
             if section.section_type in ('recommendation', 'synthesis', 'trade_offs'):
                 if section.is_locked:
-                    section.is_locked = False
-                    section.lock_reason = ''
-                    section.save(update_fields=['is_locked', 'lock_reason', 'updated_at'])
-        return
-
-    inquiry_sections = [s for s in sections if s.section_type == 'inquiry_brief']
-
-    # Count inquiry grounding states
-    all_moderate_or_better = all(
-        s.grounding_status in (GroundingStatus.MODERATE, GroundingStatus.STRONG)
-        for s in inquiry_sections
-    ) if inquiry_sections else False
-
-    any_has_evidence = any(
-        s.grounding_data.get('evidence_count', 0) > 0
-        for s in inquiry_sections
-    )
-
-    has_unresolved_tensions = any(
-        s.grounding_status == GroundingStatus.CONFLICTED
-        for s in inquiry_sections
-    )
-
-    for section in sections:
-        if section.section_type == 'recommendation':
-            if not inquiry_sections:
-                section.is_locked = True
-                section.lock_reason = 'Create inquiries to begin building toward a recommendation'
-            elif has_unresolved_tensions:
-                tension_count = sum(
-                    1 for s in inquiry_sections
-                    if s.grounding_status == GroundingStatus.CONFLICTED
-                )
-                section.is_locked = True
-                section.lock_reason = f'Resolve {tension_count} tension(s) to unlock'
-            elif not all_moderate_or_better:
-                weak_count = sum(
-                    1 for s in inquiry_sections
-                    if s.grounding_status in (GroundingStatus.EMPTY, GroundingStatus.WEAK)
-                )
-                section.is_locked = True
-                section.lock_reason = f'Strengthen {weak_count} inquiry section(s) to unlock'
-            else:
-                section.is_locked = False
-                section.lock_reason = ''
-            section.save(update_fields=['is_locked', 'lock_reason', 'updated_at'])
-
-        elif section.section_type in ('synthesis', 'trade_offs'):
-            if not any_has_evidence:
-                section.is_locked = True
-                section.lock_reason = 'Gather evidence in at least one inquiry to unlock'
-            else:
-                section.is_locked = False
-                section.lock_reason = ''
-            section.save(update_fields=['is_locked', 'lock_reason', 'updated_at'])
+                    set_lock(section, False)
+    else:
+        inquiry_sections = [s for s in sections if s.section_type == 'inquiry_brief']
+
+        # Count inquiry grounding states
+        all_moderate_or_better = all(
+            s.grounding_status in (GroundingStatus.MODERATE, GroundingStatus.STRONG)
+            for s in inquiry_sections
+        ) if inquiry_sections else False
+
+        any_has_evidence = any(
+            s.grounding_data.get('evidence_count', 0) > 0
+            for s in inquiry_sections
+        )
+
+        has_unresolved_tensions = any(
+            s.grounding_status == GroundingStatus.CONFLICTED
+            for s in inquiry_sections
+        )
+
+        for section in sections:
+            if section.section_type == 'recommendation':
+                if not inquiry_sections:
+                    set_lock(section, True, 'Create inquiries to begin building toward a recommendation')
+                elif has_unresolved_tensions:
+                    tension_count = sum(
+                        1 for s in inquiry_sections
+                        if s.grounding_status == GroundingStatus.CONFLICTED
+                    )
+                    set_lock(section, True, f'Resolve {tension_count} tension(s) to unlock')
+                elif not all_moderate_or_better:
+                    weak_count = sum(
+                        1 for s in inquiry_sections
+                        if s.grounding_status in (GroundingStatus.EMPTY, GroundingStatus.WEAK)
+                    )
+                    set_lock(section, True, f'Strengthen {weak_count} inquiry section(s) to unlock')
+                else:
+                    set_lock(section, False)
 
+            elif section.section_type in ('synthesis', 'trade_offs'):
+                if not any_has_evidence:
+                    set_lock(section, True, 'Gather evidence in at least one inquiry to unlock')
+                else:
+                    set_lock(section, False)
 
+    if changed:
+        BriefSection.objects.bulk_update(changed, ['is_locked', 'lock_reason', 'updated_at'])
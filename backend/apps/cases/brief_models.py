@@ -140,6 +140,11 @@ class BriefSection(UUIDModel, TimestampedModel):
         blank=True,
         help_text='Cached grounding metrics: evidence_count, tensions_count, etc.'
     )
+    grounding_fingerprint = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text='Hash of the inputs grounding was last computed from (incremental evolve)'
+    )
 
     # Section state
     is_locked = models.BooleanField(
@@ -7,9 +7,10 @@ chunks that will be fed into the case-level extraction pipeline.
 
 Two retrieval strategies:
 1. Direct embedding similarity — pgvector cosine distance on chunk embeddings
-2. Hierarchy-aware retrieval — walk the ClusterHierarchy tree, find relevant
-   theme/topic clusters, pull all their chunks (catches chunks that individually
-   don't match the query but belong to a relevant cluster)
+2. Hierarchy-aware retrieval — rank the ClusterHierarchy's theme/topic
+   centroids (apps.graph.centroid_index), pull all chunks of relevant clusters
+   (catches chunks that individually don't match the query but belong to a
+   relevant cluster)
 """
 import logging
 import uuid
@@ -17,10 +18,7 @@ from typing import List
 
 from pgvector.django import CosineDistance
 
-from apps.common.vector_utils import (
-    generate_embedding,
-    cosine_similarity,
-)
+from apps.common.vector_utils import generate_embedding
 from apps.projects.models import DocumentChunk
 
 logger = logging.getLogger(__name__)
@@ -162,7 +160,9 @@ class CaseChunkRetriever:
         """Find relevant theme/topic clusters, then pull all their chunks.
 
         Catches chunks that might not individually match the query
-        but belong to a relevant topic cluster.
+        but belong to a relevant topic cluster. Themes and topics are
+        ranked in one pass over the hierarchy's cached centroid index;
+        chunks of the most similar clusters come first.
 
         Gracefully returns empty if no hierarchy exists (Plan 1 not built yet).
         """
@@ -173,59 +173,25 @@ class CaseChunkRetriever:
         topic_threshold = extraction_settings.get('hierarchy_topic_threshold', 0.55)
 
         try:
-            from apps.graph.models import ClusterHierarchy
-            hierarchy = ClusterHierarchy.objects.filter(
-                project_id=project_id,
-                is_current=True,
-            ).first()
+            from apps.graph.centroid_index import get_current_centroid_index
+            index = get_current_centroid_index(project_id)
         except Exception as e:
             logger.warning("Could not load hierarchy for chunk retrieval: %s", e)
             return []
 
-        if not hierarchy:
+        if index is None:
             return []
 
-        tree = hierarchy.tree or {}
-        relevant_chunk_ids = []
-
-        # Walk the tree: Level 2 (themes) → Level 1 (topics) → chunks
-        for theme in tree.get('children', []):
-            theme_embedding = theme.get('embedding')
-            if not theme_embedding:
-                continue
-
-            theme_sim = cosine_similarity(focus_embedding, theme_embedding)
-            if theme_sim > theme_threshold:
-                # Entire theme is relevant — pull all its chunks
-                relevant_chunk_ids.extend(self._collect_chunk_ids(theme))
-            else:
-                # Check individual topics within this theme
-                for topic in theme.get('children', []):
-                    topic_embedding = topic.get('embedding')
-                    if not topic_embedding:
-                        continue
-
-                    topic_sim = cosine_similarity(focus_embedding, topic_embedding)
-                    if topic_sim > topic_threshold:
-                        relevant_chunk_ids.extend(topic.get('chunk_ids', []))
-
-        if not relevant_chunk_ids:
+        rows = index.match(focus_embedding, theme_threshold, topic_threshold)
+        chunk_ids = index.chunks_for(rows, limit=max_chunks)
+        if not chunk_ids:
             return []
 
-        # Deduplicate and fetch
-        unique_ids = list(set(relevant_chunk_ids))[:max_chunks]
-        return list(
-            DocumentChunk.objects
-            .filter(id__in=unique_ids)
-            .select_related('document')
-        )
-
-    def _collect_chunk_ids(self, node: dict) -> List[str]:
-        """Recursively collect all chunk IDs from a hierarchy node's subtree."""
-        ids = list(node.get('chunk_ids', []))
-        for child in node.get('children', []):
-            ids.extend(self._collect_chunk_ids(child))
-        return ids
+        by_id = {
+            str(chunk.id): chunk
+            for chunk in DocumentChunk.objects.filter(id__in=chunk_ids).select_related('document')
+        }
+        return [by_id[cid] for cid in chunk_ids if cid in by_id]
 
     def _merge_and_rank(
         self,
@@ -24,6 +24,7 @@ from apps.graph.extraction import (
     _normalize_extraction_result,
 )
 from apps.graph.models import Node, Edge, GraphDelta
+from apps.graph.revision import bump_graph_revision
 from apps.graph.services import GraphService
 from apps.projects.models import DocumentChunk
 
@@ -318,6 +319,7 @@ class CaseExtractionService:
                         )
 
                 Node.objects.bulk_update(created_nodes, ['embedding', 'properties'])
+                bump_graph_revision(case.project_id)
             except Exception:
                 logger.warning(
                     "Batch embedding generation failed for case extraction nodes",
@@ -0,0 +1,24 @@
+"""
+Remember what each brief section's grounding was computed from, so
+incremental evolve can skip sections whose inputs haven't changed.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0032_resolution_type_to_binary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='briefsection',
+            name='grounding_fingerprint',
+            field=models.CharField(
+                blank=True,
+                help_text='Hash of the inputs grounding was last computed from (incremental evolve)',
+                max_length=32,
+            ),
+        ),
+    ]
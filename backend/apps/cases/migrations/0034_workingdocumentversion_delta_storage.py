@@ -0,0 +1,159 @@
+"""
+Delta-encode WorkingDocumentVersion content.
+
+Adds storage / forward_delta / reverse_delta and compacts existing rows:
+per document, every 20th version keeps its full content,
+the others are rewritten as diffs against the previous version. The
+reverse migration expands every row back to a full snapshot.
+"""
+import difflib
+
+from django.db import migrations, models
+
+# Frozen copy of the storage format at the time of this migration, so
+# later changes to apps.cases.version_store don't change what it writes.
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+SNAPSHOT_INTERVAL = 20
+
+FIELDS = ['storage', 'content_markdown', 'forward_delta', 'reverse_delta']
+
+
+def make_delta(old, new):
+    """Line diff ops: n copies, -n skips, [lines] inserts."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+
+    def push(op):
+        if ops and type(ops[-1]) is type(op) and (
+            isinstance(op, list) or (ops[-1] > 0) == (op > 0)
+        ):
+            ops[-1] = ops[-1] + op
+        else:
+            ops.append(op)
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            push(i2 - i1)
+            continue
+        if i2 > i1:
+            push(-(i2 - i1))
+        if j2 > j1:
+            push(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(base, delta):
+    lines = base.splitlines(keepends=True)
+    out = []
+    pos = 0
+    for op in delta:
+        if isinstance(op, list):
+            out.extend(op)
+        elif op > 0:
+            out.extend(lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return ''.join(out)
+
+
+def _rows_by_document(WorkingDocumentVersion):
+    """Yield (document_id, [rows ascending by version]) one document at a time."""
+    document_ids = (
+        WorkingDocumentVersion.objects
+        .order_by('document_id')
+        .values_list('document_id', flat=True)
+        .distinct()
+    )
+    for document_id in document_ids.iterator():
+        yield document_id, list(
+            WorkingDocumentVersion.objects
+            .filter(document_id=document_id)
+            .order_by('version')
+        )
+
+
+def compact_versions(apps, schema_editor):
+    WorkingDocumentVersion = apps.get_model('cases', 'WorkingDocumentVersion')
+
+    for _, rows in _rows_by_document(WorkingDocumentVersion):
+        previous = None
+        rows_since_snapshot = 0
+        for row in rows:
+            content = row.content_markdown
+            if previous is None:
+                row.storage, row.forward_delta, row.reverse_delta = SNAPSHOT, None, None
+            elif rows_since_snapshot >= SNAPSHOT_INTERVAL:
+                row.storage, row.forward_delta = SNAPSHOT, None
+                row.reverse_delta = make_delta(content, previous)
+            else:
+                row.storage, row.content_markdown = DELTA, ''
+                row.forward_delta = make_delta(previous, content)
+                row.reverse_delta = make_delta(content, previous)
+            rows_since_snapshot = 1 if row.storage == SNAPSHOT else rows_since_snapshot + 1
+            previous = content
+        WorkingDocumentVersion.objects.bulk_update(rows, FIELDS, batch_size=200)
+
+
+def expand_versions(apps, schema_editor):
+    WorkingDocumentVersion = apps.get_model('cases', 'WorkingDocumentVersion')
+
+    for _, rows in _rows_by_document(WorkingDocumentVersion):
+        content = ''
+        for row in rows:
+            if row.storage != SNAPSHOT:
+                content = apply_delta(content, row.forward_delta)
+                row.content_markdown = content
+            content = row.content_markdown
+            row.storage = SNAPSHOT
+            row.forward_delta = None
+            row.reverse_delta = None
+        WorkingDocumentVersion.objects.bulk_update(rows, FIELDS, batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0033_briefsection_grounding_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workingdocumentversion',
+            name='storage',
+            field=models.CharField(
+                choices=[('snapshot', 'Full snapshot'), ('delta', 'Diff from previous version')],
+                default='snapshot',
+                help_text='Whether content_markdown or forward_delta holds this version',
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name='workingdocumentversion',
+            name='forward_delta',
+            field=models.JSONField(
+                blank=True, null=True,
+                help_text='Line diff from the previous version (delta rows only)',
+            ),
+        ),
+        migrations.AddField(
+            model_name='workingdocumentversion',
+            name='reverse_delta',
+            field=models.JSONField(
+                blank=True, null=True,
+                help_text='Line diff back to the previous version',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='workingdocumentversion',
+            name='content_markdown',
+            field=models.TextField(
+                blank=True,
+                help_text='Full document content (snapshot rows only)',
+            ),
+        ),
+        migrations.RunPython(compact_versions, expand_versions),
+    ]
@@ -343,6 +343,10 @@ class WorkingDocumentVersion(UUIDModel):
 
     Created automatically before AI overwrites (suggestions, agentic tasks)
     and optionally on manual saves. Enables rollback and AI attribution.
+
+    Content is delta-encoded (see apps.cases.version_store): periodic rows
+    hold the full text, the rest line diffs against the previous version.
+    Use content() to read a version's text.
     """
     document = models.ForeignKey(
         WorkingDocument,
@@ -354,8 +358,29 @@ class WorkingDocumentVersion(UUIDModel):
         help_text="Sequential version number"
     )
 
+    storage = models.CharField(
+        max_length=10,
+        choices=[
+            ('snapshot', 'Full snapshot'),
+            ('delta', 'Diff from previous version'),
+        ],
+        default='snapshot',
+        help_text="Whether content_markdown or forward_delta holds this version"
+    )
+
     content_markdown = models.TextField(
-        help_text="Full document content at this version"
+        blank=True,
+        help_text="Full document content (snapshot rows only)"
+    )
+
+    forward_delta = models.JSONField(
+        null=True, blank=True,
+        help_text="Line diff from the previous version (delta rows only)"
+    )
+
+    reverse_delta = models.JSONField(
+        null=True, blank=True,
+        help_text="Line diff back to the previous version"
     )
 
     diff_summary = models.TextField(
@@ -393,27 +418,35 @@ class WorkingDocumentVersion(UUIDModel):
     def __str__(self):
         return f"v{self.version} of {self.document.title} ({self.created_by})"
 
+    def content(self):
+        """Full document content at this version."""
+        from apps.cases.version_store import get_version_content
+
+        return get_version_content(self)
+
     @classmethod
     def create_snapshot(cls, document, created_by, diff_summary='', task_description=''):
         """Create a version snapshot of the current document content."""
         from django.db import transaction
+        from apps.cases.version_store import chain_tail, encode_next
 
         with transaction.atomic():
-            latest = (
+            # Lock the newest row so concurrent snapshots serialize
+            list(
                 cls.objects.select_for_update()
                 .filter(document=document)
                 .order_by('-version')
-                .first()
+                .values_list('id', flat=True)[:1]
             )
-            next_version = (latest.version + 1) if latest else 1
+            latest_version, latest_content, rows_since_snapshot = chain_tail(cls, document.id)
 
             return cls.objects.create(
                 document=document,
-                version=next_version,
-                content_markdown=document.content_markdown,
+                version=latest_version + 1,
                 diff_summary=diff_summary,
                 created_by=created_by,
                 task_description=task_description,
+                **encode_next(latest_content, document.content_markdown or '', rows_since_snapshot),
             )
 
 
@@ -33,7 +33,7 @@ class PlanService:
         """Trigger brief re-grounding after plan changes. Non-fatal on failure."""
         try:
             from apps.cases.brief_grounding import BriefGroundingEngine
-            BriefGroundingEngine.evolve_brief(case_id)
+            BriefGroundingEngine.evolve_brief(case_id, incremental=True)
         except Exception:
             logger.exception(
                 "brief_regrounding_failed",
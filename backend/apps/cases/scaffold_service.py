@@ -21,7 +21,8 @@ from apps.cases.scaffold_schemas import ScaffoldExtraction
 from apps.common.llm_providers import get_llm_provider
 from apps.events.services import EventService
 from apps.events.models import EventType, ActorType
-from apps.graph.models import ClusterHierarchy, ProjectInsight
+from apps.graph.centroid_index import get_current_centroid_index
+from apps.graph.models import ProjectInsight
 
 logger = logging.getLogger(__name__)
 
@@ -79,15 +80,8 @@ class CaseScaffoldService:
     def _build_hierarchy_context(cls, project_id: uuid.UUID) -> Optional[str]:
         """Build a brief project context string from hierarchy and insights."""
         try:
-            hierarchy = ClusterHierarchy.objects.filter(
-                project_id=project_id, is_current=True, status='ready'
-            ).first()
-
-            themes = []
-            if hierarchy and isinstance(hierarchy.tree, dict):
-                for child in (hierarchy.tree.get('children') or []):
-                    if child.get('level') == 2 and child.get('label'):
-                        themes.append(child['label'])
+            index = get_current_centroid_index(project_id)
+            themes = index.theme_labels() if index is not None else []
 
             insights = list(
                 ProjectInsight.objects.filter(
@@ -426,14 +420,19 @@ class CaseScaffoldService:
         signals = []  # kept for backward compat with return value
         if extraction.assumptions:
             try:
-                from apps.graph.models import Node
-                for assumption_text in extraction.assumptions:
-                    Node.objects.create(
-                        project=case.project,
-                        node_type='assumption',
-                        content=assumption_text,
-                        status='untested',
-                    )
+                from apps.graph.models import NodeSourceType
+                from apps.graph.services import GraphService
+                # GraphService bumps the graph revision and stamps each node
+                # with it, so caches and delta sync pick the assumptions up
+                with transaction.atomic():
+                    for assumption_text in extraction.assumptions:
+                        GraphService.create_node(
+                            project=case.project,
+                            node_type='assumption',
+                            content=assumption_text,
+                            source_type=NodeSourceType.AGENT_ANALYSIS,
+                            status='untested',
+                        )
             except Exception as e:
                 logger.warning(f"Could not create assumption graph nodes: {e}")
 
@@ -4,9 +4,12 @@ Tests for cases app
 from django.test import TestCase
 from django.contrib.auth.models import User
 
-from .models import Case, CaseStatus, StakesLevel
+from .models import (
+    Case, CaseStatus, DocumentType, StakesLevel, WorkingDocument, WorkingDocumentVersion,
+)
 from .services import CaseService
 from apps.events.models import Event, EventType
+from apps.graph.testing import GraphTestMixin
 
 
 class CaseServiceTest(TestCase):
@@ -63,3 +66,148 @@ class CaseServiceTest(TestCase):
         self.assertIsNotNone(patch_event)
         self.assertIn('position', patch_event.payload['changes'])
     
+
+
+class CaseAggregatesServiceTest(GraphTestMixin, TestCase):
+    """Workspace aggregates come from a few grouped queries and are cached."""
+
+    with_case = True
+
+    def test_counts_and_cache(self):
+        from apps.graph.models import EdgeType
+        from apps.graph.services import GraphService
+        from apps.inquiries.models import Inquiry
+        from .aggregates_service import CaseAggregatesService
+
+        claim = self._node('Claim', 'claim')
+        for content, edge_type in (('For', EdgeType.SUPPORTS), ('Against', EdgeType.CONTRADICTS)):
+            evidence = self._node(content, 'evidence')
+            GraphService.create_edge(evidence, claim, edge_type, 'user_edit')
+        self._node('Loose', 'evidence')
+        self._node('Untested', 'assumption')
+        inquiry = Inquiry.objects.create(case=self.case, title='Why?', sequence_index=0)
+
+        # Probe, nodes/edges, inquiries, lists, events
+        with self.assertNumQueries(5):
+            aggregates = CaseAggregatesService.get_case_aggregates(self.case.id)
+        self.assertEqual(
+            aggregates['evidence'],
+            {'total': 3, 'supporting': 1, 'contradicting': 1, 'neutral': 1},
+        )
+        self.assertEqual(aggregates['assumptions']['total'], 1)
+        self.assertEqual(aggregates['assumptions']['untested'], 1)
+        self.assertEqual(aggregates['assumptions']['untested_list'][0]['text'], 'Untested')
+        self.assertEqual(aggregates['inquiries']['open'], 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(CaseAggregatesService.get_case_aggregates(self.case.id), aggregates)
+
+        # Inquiry and graph changes move the cache key
+        inquiry.status = 'resolved'
+        inquiry.save()
+        self.assertEqual(
+            CaseAggregatesService.get_case_aggregates(self.case.id)['inquiries']['resolved'], 1,
+        )
+        self._node('Another', 'assumption')
+        self.assertEqual(
+            CaseAggregatesService.get_case_aggregates(self.case.id)['assumptions']['total'], 2,
+        )
+        self.assertIsNone(CaseAggregatesService.get_case_aggregates(self.project.id))
+
+
+class WorkingDocumentVersionStoreTest(TestCase):
+    """Versions keep periodic snapshots plus diffs and rebuild on demand."""
+
+    def setUp(self):
+        from apps.events.models import ActorType
+        from apps.projects.models import Project
+
+        self.user = User.objects.create_user(username='versions', password='testpass123')
+        project = Project.objects.create(title='Versions Project', user=self.user)
+        event = Event.objects.create(
+            actor_type=ActorType.SYSTEM, type=EventType.CASE_CREATED, payload={},
+        )
+        case = Case.objects.create(
+            title='Versions Case', user=self.user, project=project,
+            position='Position', created_from_event_id=event.id,
+        )
+        self.document = WorkingDocument.objects.create(
+            case=case, title='Brief', document_type=DocumentType.CASE_BRIEF,
+            content_markdown='', created_by=self.user,
+        )
+
+    def _write_versions(self, count):
+        contents = []
+        for i in range(count):
+            self.document.content_markdown = '\n'.join(
+                f'Line {j} of revision {i if j == i % 7 else 0}' for j in range(40)
+            )
+            contents.append(self.document.content_markdown)
+            WorkingDocumentVersion.create_snapshot(self.document, created_by='user')
+        return contents
+
+    def test_snapshots_and_reconstruction(self):
+        from django.test import override_settings
+        from .version_store import get_versions_content
+
+        with override_settings(SUMMARY_SETTINGS={'document_versions': {'snapshot_interval': 5}}):
+            contents = self._write_versions(12)
+
+        versions = list(WorkingDocumentVersion.objects.filter(document=self.document).order_by('version'))
+        self.assertEqual(
+            [v.version for v in versions if v.storage == 'snapshot'], [1, 6, 11],
+        )
+        self.assertTrue(all(v.content_markdown == '' for v in versions if v.storage == 'delta'))
+
+        for version in versions:
+            with self.assertNumQueries(0 if version.storage == 'snapshot' else 2):
+                self.assertEqual(version.content(), contents[version.version - 1])
+
+        with self.assertNumQueries(1):
+            rebuilt = get_versions_content(WorkingDocumentVersion, self.document.id, [3, 9, 12])
+        self.assertEqual(rebuilt, {n: contents[n - 1] for n in (3, 9, 12)})
+
+    def test_compaction_migration(self):
+        from importlib import import_module
+        from django.apps import apps as global_apps
+
+        migration = import_module('apps.cases.migrations.0034_workingdocumentversion_delta_storage')
+        contents = self._write_versions(25)
+        migration.expand_versions(global_apps, None)
+        self.assertFalse(WorkingDocumentVersion.objects.exclude(storage='snapshot').exists())
+
+        migration.compact_versions(global_apps, None)
+        versions = WorkingDocumentVersion.objects.filter(document=self.document).order_by('version')
+        self.assertEqual(
+            list(versions.filter(storage='snapshot').values_list('version', flat=True)), [1, 21],
+        )
+        self.assertEqual([v.content() for v in versions], contents)
+
+
+class ScaffoldGraphRevisionTest(GraphTestMixin, TestCase):
+    """Scaffolded assumption nodes go through GraphService."""
+
+    def test_scaffolding_bumps_graph_revision(self):
+        from unittest.mock import patch
+        from apps.graph.models import Node, ProjectGraphRevision
+        from apps.graph.revision import get_graph_revision
+        from apps.graph.testing import TEST_EMBEDDING
+        from .scaffold_schemas import ScaffoldExtraction
+        from .scaffold_service import CaseScaffoldService
+
+        user, project = self.user, self.project
+        before = get_graph_revision(project.id)
+
+        extraction = ScaffoldExtraction(
+            decision_question='Should we expand to Berlin?',
+            assumptions=['Demand exists', 'Hiring is feasible'],
+        )
+        with patch('apps.graph.services.generate_embedding', return_value=TEST_EMBEDDING):
+            CaseScaffoldService._create_scaffolded_case(extraction, user, project.id)
+
+        revision = ProjectGraphRevision.objects.get(project=project).revision
+        self.assertGreater(revision, before)
+        nodes = Node.objects.filter(project=project, node_type='assumption')
+        self.assertEqual(nodes.count(), 2)
+        # Stamped, so delta sync from the earlier revision includes them
+        self.assertEqual(nodes.filter(graph_revision__gt=before).count(), 2)
@@ -396,6 +396,78 @@ class TestEvolveBrief(BriefTestMixin, TransactionTestCase):
         self.assertEqual(result['updated_sections'], [])
 
 
+class TestBatchedEvolveBrief(BriefTestMixin, TestCase):
+    """evolve_brief() grounds all sections from shared case-level queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser_batch', password='testpass123')
+        self.case, self.brief = self._create_case_with_brief()
+
+    def _graph_node(self, node_type='evidence', content='Graph evidence'):
+        from unittest.mock import patch
+        from apps.graph.services import GraphService
+
+        with patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384):
+            return GraphService.create_node(
+                project=self.case.project, node_type=node_type, content=content,
+                source_type='user_edit', case=self.case,
+            )
+
+    def _evolve_queries(self, **kwargs):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.graph import analytics
+
+        analytics._csr_cache.clear()  # count graph loads on every run
+        with CaptureQueriesContext(connection) as ctx:
+            result = BriefGroundingEngine.evolve_brief(self.case.id, **kwargs)
+        return result, len(ctx.captured_queries)
+
+    def test_query_count_independent_of_section_count(self):
+        inquiry = self._create_inquiry(self.case)
+        self._create_section(self.brief, section_type=SectionType.INQUIRY_BRIEF, inquiry=inquiry)
+        self._graph_node()
+        _, one_section = self._evolve_queries()
+
+        for order in range(1, 4):
+            other = self._create_inquiry(self.case, title=f'Inquiry {order}')
+            self._create_section(
+                self.brief, heading=f'Section {order}', order=order,
+                section_type=SectionType.INQUIRY_BRIEF, inquiry=other,
+            )
+        result, four_sections = self._evolve_queries()
+
+        self.assertEqual(four_sections, one_section)
+        self.assertEqual(result['sections_regrounded'], 4)
+        for section in BriefSection.objects.filter(brief=self.brief):
+            self.assertEqual(section.grounding_data['evidence_count'], 1)
+            self.assertEqual(section.grounding_status, GroundingStatus.MODERATE)
+
+    def test_incremental_skips_unchanged_sections(self):
+        inquiry = self._create_inquiry(self.case)
+        linked = self._create_section(
+            self.brief, heading='Linked', section_type=SectionType.INQUIRY_BRIEF, inquiry=inquiry,
+        )
+        self._create_section(self.brief, heading='Custom', order=1)
+        BriefGroundingEngine.evolve_brief(self.case.id)
+
+        result = BriefGroundingEngine.evolve_brief(self.case.id, incremental=True)
+        self.assertEqual(result['sections_regrounded'], 0)
+
+        # A graph write only regrounds the linked section
+        self._graph_node()
+        result = BriefGroundingEngine.evolve_brief(self.case.id, incremental=True)
+        self.assertEqual(result['sections_regrounded'], 1)
+        linked.refresh_from_db()
+        self.assertEqual(linked.grounding_data['evidence_count'], 1)
+
+        # So does a change to the linked inquiry
+        inquiry.status = 'resolved'
+        inquiry.save()
+        result = BriefGroundingEngine.evolve_brief(self.case.id, incremental=True)
+        self.assertEqual(result['sections_regrounded'], 1)
+
+
 class TestBriefSectionCRUD(BriefTestMixin, TestCase):
     """Test BriefSection model operations."""
 
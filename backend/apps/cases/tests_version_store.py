@@ -0,0 +1,45 @@
+"""
+Tests for the line diffs behind delta-encoded document versions
+(apps.cases.version_store).
+
+Run locally (no DB required):
+    DJANGO_SETTINGS_MODULE=config.settings.test pytest apps/cases/tests_version_store.py -v --no-cov
+"""
+
+import random
+import unittest
+
+# ── Django setup for imports ──────────────────────────────────────
+import django
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from apps.cases.version_store import apply_delta, make_delta  # noqa: E402
+
+
+class LineDeltaTests(unittest.TestCase):
+
+    def test_round_trip(self):
+        old = '# Brief\n\nIntro\n\n## Risks\nNone yet\n'
+        new = '# Brief\n\nIntro, revised\n\n## Risks\nNone yet\n## Next\n- call vendor'
+        forward = make_delta(old, new)
+        self.assertEqual(apply_delta(old, forward), new)
+        self.assertEqual(apply_delta(new, make_delta(new, old)), old)
+        # Unchanged lines are referenced, not copied
+        self.assertEqual(forward[0], 2)
+        self.assertEqual(make_delta(old, old), [6])
+        self.assertEqual(apply_delta('', make_delta('', new)), new)
+        self.assertEqual(apply_delta(new, make_delta(new, '')), '')
+
+    def test_random_edits(self):
+        rng = random.Random(11)
+        vocab = ['alpha\n', 'beta\n', 'gamma\n', 'delta\n', '\n', 'no newline']
+        for _ in range(200):
+            old = ''.join(rng.choice(vocab) for _ in range(rng.randint(0, 15)))
+            new = ''.join(rng.choice(vocab) for _ in range(rng.randint(0, 15)))
+            self.assertEqual(apply_delta(old, make_delta(old, new)), new)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Delta-encoded storage for WorkingDocumentVersion content.
+
+Versions of a document form a chain ordered by version number. Every
+snapshot_interval-th row (and the first) is a full snapshot; the others
+keep only a forward diff from the previous row. Every row after the
+first also keeps a reverse diff back to the previous row, so a version
+can be rebuilt from the nearest snapshot on either side:
+
+    v1 [S] ── v2 [Δ] ── v3 [Δ] ── ... ── v21 [S] ── v22 [Δ] ...
+         forward ──▶                 ◀── reverse
+
+Rebuilding walks at most half an interval between two snapshots, and at
+most one interval past the newest snapshot.
+
+Diffs are line based and stored as JSON lists of ops:
+
+    n          copy n lines from the base
+    -n         skip n lines of the base
+    [lines]    insert these lines
+
+Writes only append rows — nothing already stored is rewritten.
+"""
+import difflib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db.models import Max, Min, Q
+
+logger = logging.getLogger(__name__)
+
+# Default for SUMMARY_SETTINGS['document_versions']['snapshot_interval']
+DEFAULT_SNAPSHOT_INTERVAL = 20
+
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+
+_CHAIN_FIELDS = ('version', 'storage', 'content_markdown', 'forward_delta', 'reverse_delta')
+
+
+def snapshot_interval() -> int:
+    from django.conf import settings as django_settings
+
+    configured = (
+        getattr(django_settings, 'SUMMARY_SETTINGS', {})
+        .get('document_versions', {})
+        .get('snapshot_interval', DEFAULT_SNAPSHOT_INTERVAL)
+    )
+    return max(1, int(configured))
+
+
+# ── Line diffs ───────────────────────────────────────────────────
+
+def make_delta(old: str, new: str) -> list:
+    """Ops that turn ``old`` into ``new`` (see module docstring)."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: list = []
+
+    def push(op):
+        # Merge runs of the same kind so the list stays short
+        if ops and type(ops[-1]) is type(op) and (
+            isinstance(op, list) or (ops[-1] > 0) == (op > 0)
+        ):
+            ops[-1] = ops[-1] + op
+        else:
+            ops.append(op)
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            push(i2 - i1)
+            continue
+        if i2 > i1:
+            push(-(i2 - i1))
+        if j2 > j1:
+            push(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(base: str, delta: Sequence) -> str:
+    """Apply ops from make_delta() to ``base``."""
+    lines = base.splitlines(keepends=True)
+    out: List[str] = []
+    pos = 0
+    for op in delta:
+        if isinstance(op, list):
+            out.extend(op)
+        elif op > 0:
+            out.extend(lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return ''.join(out)
+
+
+# ── Writes ───────────────────────────────────────────────────────
+
+def encode_next(previous_content: Optional[str], content: str, rows_since_snapshot: int) -> dict:
+    """
+    Storage fields for a new row appended after a row holding
+    ``previous_content`` (None when the chain is empty).
+
+    ``rows_since_snapshot`` counts rows from the newest snapshot, itself
+    included, to the end of the chain.
+    """
+    if previous_content is None:
+        return {'storage': SNAPSHOT, 'content_markdown': content,
+                'forward_delta': None, 'reverse_delta': None}
+    reverse = make_delta(content, previous_content)
+    if rows_since_snapshot >= snapshot_interval():
+        return {'storage': SNAPSHOT, 'content_markdown': content,
+                'forward_delta': None, 'reverse_delta': reverse}
+    return {'storage': DELTA, 'content_markdown': '',
+            'forward_delta': make_delta(previous_content, content), 'reverse_delta': reverse}
+
+
+def chain_tail(version_model, document_id) -> tuple:
+    """
+    (latest version number, its content, rows since the newest snapshot)
+    for a document, or (0, None, 0) if it has no versions. One query for
+    the newest snapshot and everything after it.
+    """
+    newest_snapshot = (
+        version_model.objects
+        .filter(document_id=document_id, storage=SNAPSHOT)
+        .order_by('-version')
+        .values('version')[:1]
+    )
+    rows = list(
+        version_model.objects
+        .filter(document_id=document_id, version__gte=newest_snapshot)
+        .order_by('version')
+        .values_list(*_CHAIN_FIELDS)
+    )
+    if not rows:
+        return 0, None, 0
+    content = _walk_forward(rows)
+    return rows[-1][0], content, len(rows)
+
+
+# ── Reads ────────────────────────────────────────────────────────
+
+def _walk_forward(rows: Sequence[tuple]) -> str:
+    """Content of the last row; ``rows`` ascending, starting at a snapshot."""
+    content = rows[0][2]
+    for _, storage, full, forward, _ in rows[1:]:
+        content = full if storage == SNAPSHOT else apply_delta(content, forward)
+    return content
+
+
+def _walk_backward(rows: Sequence[tuple]) -> str:
+    """Content of the first row; ``rows`` ascending, ending at a snapshot."""
+    content = rows[-1][2]
+    for row in reversed(rows[1:]):
+        content = apply_delta(content, row[4])
+    return content
+
+
+def get_version_content(version) -> str:
+    """Full content of one WorkingDocumentVersion (at most two queries)."""
+    if version.storage == SNAPSHOT:
+        return version.content_markdown
+
+    model = type(version)
+    siblings = model.objects.filter(document_id=version.document_id)
+    bounds = siblings.aggregate(
+        below=Max('version', filter=Q(storage=SNAPSHOT, version__lt=version.version)),
+        above=Min('version', filter=Q(storage=SNAPSHOT, version__gt=version.version)),
+    )
+    below, above = bounds['below'], bounds['above']
+    if below is None and above is None:
+        raise model.DoesNotExist(
+            f"No snapshot to rebuild v{version.version} of document {version.document_id}"
+        )
+
+    backward = above is not None and (below is None or above - version.version < version.version - below)
+    if backward:
+        rows = list(
+            siblings.filter(version__gte=version.version, version__lte=above)
+            .order_by('version').values_list(*_CHAIN_FIELDS)
+        )
+        return _walk_backward(rows)
+    rows = list(
+        siblings.filter(version__gte=below, version__lte=version.version)
+        .order_by('version').values_list(*_CHAIN_FIELDS)
+    )
+    return _walk_forward(rows)
+
+
+def get_versions_content(version_model, document_id, versions: Iterable[int]) -> Dict[int, str]:
+    """
+    {version number: content} for several versions of one document, from
+    a single pass over the chain between the nearest snapshot below the
+    oldest requested version and the newest one.
+    """
+    wanted = set(versions)
+    if not wanted:
+        return {}
+    siblings = version_model.objects.filter(document_id=document_id)
+    start = (
+        siblings.filter(storage=SNAPSHOT, version__lte=min(wanted))
+        .order_by('-version').values('version')[:1]
+    )
+    rows = siblings.filter(version__gte=start, version__lte=max(wanted)).order_by('version')
+
+    contents: Dict[int, str] = {}
+    content = ''
+    for number, storage, full, forward, _ in rows.values_list(*_CHAIN_FIELDS).iterator():
+        content = full if storage == SNAPSHOT else apply_delta(content, forward)
+        if number in wanted:
+            contents[number] = content
+    return contents
@@ -418,106 +418,16 @@ class CaseViewSet(BriefActionsMixin, PlanActionsMixin, viewsets.ModelViewSet):
             unlinked_claims: [{text, location}]
         }
         """
-        from apps.inquiries.models import Inquiry, InquiryStatus
+        from .aggregates_service import CaseAggregatesService
 
         case = self.get_object()
-
-        # Evidence counts now come from graph Node(type=EVIDENCE) + Edge(type=SUPPORTS/CONTRADICTS)
-        try:
-            from apps.graph.models import Node, Edge, EdgeType
-            evidence_nodes = Node.objects.filter(
-                project=case.project,
-                node_type='evidence',
-            )
-            total_evidence = evidence_nodes.count()
-            total_supporting = Edge.objects.filter(
-                source_node__in=evidence_nodes,
-                edge_type=EdgeType.SUPPORTS,
-            ).count()
-            total_contradicting = Edge.objects.filter(
-                source_node__in=evidence_nodes,
-                edge_type=EdgeType.CONTRADICTS,
-            ).count()
-            total_neutral = total_evidence - total_supporting - total_contradicting
-        except Exception:
-            total_evidence = 0
-            total_supporting = 0
-            total_contradicting = 0
-            total_neutral = 0
-
-        evidence = {
-            'total': total_evidence,
-            'supporting': total_supporting,
-            'contradicting': total_contradicting,
-            'neutral': max(0, total_neutral),
-        }
-
-        # Count assumptions from the graph layer (Node model)
-        try:
-            from apps.graph.models import Node
-            assumption_nodes = Node.objects.filter(
-                project=case.project,
-                node_type='assumption',
-            )
-            total_assumptions = assumption_nodes.count()
-            validated_assumptions = assumption_nodes.filter(
-                status__in=['confirmed', 'refuted']
-            ).count()
-            untested_nodes = assumption_nodes.exclude(
-                status__in=['confirmed', 'refuted']
-            )[:10]
-            untested_list = [
-                {
-                    'id': str(node.id),
-                    'text': node.content[:200] if node.content else '',
-                    'status': node.status,
-                }
-                for node in untested_nodes
-            ]
-        except Exception:
-            total_assumptions = 0
-            validated_assumptions = 0
-            untested_list = []
-
-        assumptions = {
-            'total': total_assumptions,
-            'validated': validated_assumptions,
-            'untested': total_assumptions - validated_assumptions,
-            'untested_list': untested_list,
-        }
-
-        # Count inquiries by status — single aggregate query
-        from django.db.models import Count, Q
-        inquiries_qs = case.inquiries.exclude(status=InquiryStatus.ARCHIVED)
-        inquiry_counts = inquiries_qs.aggregate(
-            total=Count('id'),
-            open=Count('id', filter=Q(status=InquiryStatus.OPEN)),
-            investigating=Count('id', filter=Q(status=InquiryStatus.INVESTIGATING)),
-            resolved=Count('id', filter=Q(status=InquiryStatus.RESOLVED)),
-        )
-
-        # Find unvalidated claims from the graph layer
-        unlinked_claims = []
-        try:
-            from apps.graph.models import Node
-            claim_nodes = Node.objects.filter(
-                project=case.project,
-                node_type='claim',
-                status='unvalidated',
-            )[:5]
-            for node in claim_nodes:
-                unlinked_claims.append({
-                    'text': node.content[:150] if node.content else '',
-                    'location': 'graph',
-                })
-        except Exception as e:
-            logger.debug("Unlinked claims lookup failed: %s", e)
+        aggregates = CaseAggregatesService.get_case_aggregates(case.id)
 
         return Response({
-            'evidence': evidence,
-            'assumptions': assumptions,
-            'inquiries': inquiry_counts,
-            'unlinked_claims': unlinked_claims,
+            'evidence': aggregates['evidence'],
+            'assumptions': aggregates['assumptions'],
+            'inquiries': aggregates['inquiries'],
+            'unlinked_claims': aggregates['unlinked_claims'],
         })
 
     @action(detail=True, methods=['patch'], url_path='user-confidence')
@@ -1049,7 +959,8 @@ class CaseViewSet(BriefActionsMixin, PlanActionsMixin, viewsets.ModelViewSet):
         GET /api/cases/{id}/home/
 
         Returns everything needed to render the case home in one call:
-        plan, inquiries with evidence counts, recent signals, activity, health.
+        plan, inquiries, workspace aggregates (CaseAggregatesService) and
+        recent activity.
         """
         case = self.get_object()
 
@@ -1079,26 +990,24 @@ class CaseViewSet(BriefActionsMixin, PlanActionsMixin, viewsets.ModelViewSet):
                 'conclusion': inq.conclusion,
             })
 
-        # Recent provenance events (last 5)
-        from apps.events.models import Event, EventCategory
-        recent_events = Event.objects.filter(
-            case_id=case.id,
-            category=EventCategory.PROVENANCE,
-        ).order_by('-timestamp')[:5]
-        event_data = [{
-            'id': str(e.id),
-            'type': e.type,
-            'payload': e.payload,
-            'timestamp': e.timestamp.isoformat(),
-            'actor_type': e.actor_type,
-        } for e in recent_events]
+        # Workspace counts + recent provenance events (cached)
+        from .aggregates_service import CaseAggregatesService
+        aggregates = CaseAggregatesService.get_case_aggregates(case.id)
 
         return Response({
             'case': CaseSerializer(case).data,
             'plan': plan_data,
             'inquiries': inquiry_data,
+            'aggregates': {
+                'evidence': aggregates['evidence'],
+                'assumptions': {
+                    key: value for key, value in aggregates['assumptions'].items()
+                    if key != 'untested_list'
+                },
+                'inquiries': aggregates['inquiries'],
+            },
             'activity': {
-                'recent_events': event_data,
+                'recent_events': aggregates['recent_events'],
             },
         })
 
@@ -1914,24 +1823,34 @@ class WorkingDocumentViewSet(viewsets.ModelViewSet):
 
         GET /api/case-documents/{id}/version-history/
 
-        Returns list of version snapshots ordered by newest first.
+        Returns list of version snapshots ordered by newest first. Only
+        metadata is read unless ?include_content=true, in which case the
+        listed versions are rebuilt from their snapshots and diffs.
         """
+        from .version_store import get_versions_content
+
         document = self.get_object()
-        versions = WorkingDocumentVersion.objects.filter(
-            document=document
-        ).order_by('-version')[:50]
+        versions = list(
+            WorkingDocumentVersion.objects.filter(document=document)
+            .order_by('-version')
+            .values('id', 'version', 'diff_summary', 'created_by', 'task_description', 'created_at')[:50]
+        )
 
         include_content = request.query_params.get('include_content', 'false').lower() == 'true'
+        contents = (
+            get_versions_content(WorkingDocumentVersion, document.id, [v['version'] for v in versions])
+            if include_content else {}
+        )
         return Response([
             {
-                'id': str(v.id),
-                'version': v.version,
-                'diff_summary': v.diff_summary,
-                'created_by': v.created_by,
-                'task_description': v.task_description,
-                'created_at': v.created_at.isoformat(),
+                'id': str(v['id']),
+                'version': v['version'],
+                'diff_summary': v['diff_summary'],
+                'created_by': v['created_by'],
+                'task_description': v['task_description'],
+                'created_at': v['created_at'].isoformat(),
                 **(
-                    {'content_markdown': v.content_markdown}
+                    {'content_markdown': contents.get(v['version'], '')}
                     if include_content else {}
                 ),
             }
@@ -1977,7 +1896,7 @@ class WorkingDocumentViewSet(viewsets.ModelViewSet):
         )
 
         # Restore
-        document.content_markdown = target_version.content_markdown
+        document.content_markdown = target_version.content()
         document.save(update_fields=['content_markdown', 'updated_at'])
 
         return Response({
@@ -152,19 +152,44 @@ def _truncate_to_tokens(text: str, max_tokens: int) -> str:
 # Helper: resolve theme labels (moved from views.py line 45)
 # ---------------------------------------------------------------------------
 
-def _resolve_theme_labels(tree: dict, cluster_ids: list) -> list[str]:
-    """Walk a hierarchy tree to resolve cluster IDs to human-readable theme labels."""
-    labels = []
+def _resolve_theme_labels(project_id, cluster_ids: list) -> list[str]:
+    """Resolve cluster IDs to human-readable theme/topic labels.
+
+    Looks the ids up in the current hierarchy's chunk→cluster assignment
+    index and only walks the latest hierarchy tree for ids it doesn't
+    cover (e.g. hierarchies that predate the index).
+    """
+    from apps.graph.chunk_assignments import cluster_labels
+
+    ids = list(dict.fromkeys(str(cid) for cid in cluster_ids))
+    labels = cluster_labels(project_id, ids)
+
+    missing = [cid for cid in ids if cid not in labels]
+    if missing:
+        from apps.graph.models import ClusterHierarchy
+        hierarchy = (
+            ClusterHierarchy.objects.filter(project_id=project_id)
+            .order_by('-created_at').only('tree').first()
+        )
+        if hierarchy and hierarchy.tree:
+            labels.update(_tree_cluster_labels(hierarchy.tree, missing))
+
+    return [labels[cid] for cid in ids if cid in labels]
+
+
+def _tree_cluster_labels(tree: dict, cluster_ids: list) -> dict[str, str]:
+    """Walk a hierarchy tree's themes and topics for the labels of cluster IDs."""
+    labels = {}
     id_set = set(str(cid) for cid in cluster_ids)
 
     for child in (tree.get('children') or []):
         cid = str(child.get('id', ''))
         if cid in id_set and child.get('label'):
-            labels.append(child['label'])
+            labels[cid] = child['label']
         for grandchild in (child.get('children') or []):
             gcid = str(grandchild.get('id', ''))
             if gcid in id_set and grandchild.get('label'):
-                labels.append(grandchild['label'])
+                labels[gcid] = grandchild['label']
 
     return labels
 
@@ -1040,14 +1065,15 @@ class ContextAssemblyService:
             from apps.cases.models import Case, InvestigationPlan, PlanVersion
             from apps.intelligence.prompts import build_case_aware_system_prompt
 
-            # Parallel fetch: Case and InvestigationPlan are independent
-            case_obj, plan_obj = await asyncio.gather(
+            # Parallel fetch: Case, InvestigationPlan and workspace counts are independent
+            case_obj, plan_obj, aggregates = await asyncio.gather(
                 sync_to_async(
                     lambda: Case.objects.filter(id=case_id).first()
                 )(),
                 sync_to_async(
                     lambda: InvestigationPlan.objects.filter(case_id=case_id).first()
                 )(),
+                sync_to_async(self._load_case_aggregates)(case_id),
             )
 
             plan_content = None
@@ -1067,6 +1093,7 @@ class ContextAssemblyService:
                 constraints=case_obj.constraints if case_obj else None,
                 success_criteria=case_obj.success_criteria if case_obj else None,
                 available_tools=available_tools,
+                workspace_aggregates=aggregates,
             )
 
             # Check for pending outcome review on this case
@@ -1090,6 +1117,16 @@ class ContextAssemblyService:
             logger.warning(f"Could not build case-aware prompt: {e}")
             return None, None
 
+    @staticmethod
+    def _load_case_aggregates(case_id: str) -> Optional[Dict]:
+        """Cached workspace counts for the case prompt (None on failure)."""
+        try:
+            from apps.cases.aggregates_service import CaseAggregatesService
+            return CaseAggregatesService.get_case_aggregates(case_id)
+        except Exception as e:
+            logger.debug(f"Case aggregates skipped: {e}")
+            return None
+
     async def _resolve_graph_mode(self, thread) -> Optional[str]:
         """Graph mode: serializes graph + health. (views.py 747-773)"""
         try:
@@ -1147,7 +1184,7 @@ class ContextAssemblyService:
         """
         try:
             import uuid as uuid_module
-            from apps.graph.models import ProjectInsight, ClusterHierarchy
+            from apps.graph.models import ProjectInsight
             from apps.intelligence.graph_prompts import (
                 build_finding_focused_system_prompt,
                 _FINDING_TYPE_GUIDANCE,
@@ -1175,19 +1212,13 @@ class ContextAssemblyService:
 
             # Resolve source themes from hierarchy
             if insight.source_cluster_ids and insight.orientation:
-                hierarchy = await sync_to_async(
-                    lambda: ClusterHierarchy.objects.filter(
-                        project_id=project_id
-                    ).order_by('-created_at').first()
-                )()
-                if hierarchy and hierarchy.tree:
-                    theme_labels = _resolve_theme_labels(
-                        hierarchy.tree, insight.source_cluster_ids
+                theme_labels = await sync_to_async(_resolve_theme_labels)(
+                    project_id, insight.source_cluster_ids
+                )
+                if theme_labels:
+                    finding_lines.append(
+                        f"\n**Source themes:** {', '.join(theme_labels)}"
                     )
-                    if theme_labels:
-                        finding_lines.append(
-                            f"\n**Source themes:** {', '.join(theme_labels)}"
-                        )
 
             # Add orientation lens context
             if insight.orientation:
@@ -5,6 +5,7 @@ from .base import LLMProvider, StreamChunk
 from .factory import get_llm_provider
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
+from .rate_limiter import Priority, get_rate_limiter
 from .utils import stream_json, stream_and_collect, strip_markdown_fences
 
 __all__ = [
@@ -13,6 +14,8 @@ __all__ = [
     'get_llm_provider',
     'OpenAIProvider',
     'AnthropicProvider',
+    'Priority',
+    'get_rate_limiter',
     'stream_json',
     'stream_and_collect',
     'strip_markdown_fences',
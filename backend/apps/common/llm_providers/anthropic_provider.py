@@ -5,13 +5,16 @@ from typing import Any, AsyncIterator, Dict, List, Optional
 from anthropic import AsyncAnthropic
 
 from .base import LLMProvider, StreamChunk
+from .rate_limiter import Priority
 
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude implementation of LLM provider"""
-    
-    def __init__(self, api_key: str, model: str = "claude-haiku-4-5"):
-        super().__init__(api_key, model)
+
+    provider_name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = "claude-haiku-4-5", priority: Priority = Priority.DEFAULT):
+        super().__init__(api_key, model, priority)
         self.client = AsyncAnthropic(api_key=api_key)
     
     async def stream_chat(
@@ -34,6 +37,7 @@ class AnthropicProvider(LLMProvider):
         
         # Anthropic uses separate system parameter
         max_tokens = kwargs.pop('max_tokens', 4096)
+        priority = kwargs.pop('priority', None)
         
         # Enable prompt caching for system prompts (ephemeral cache, 5 min TTL)
         # Reduces TTFT by 75-85% for repeated contexts!
@@ -51,15 +55,19 @@ class AnthropicProvider(LLMProvider):
             system_param = system_prompt or ""
         
         # Stream from Anthropic
-        async with self.client.messages.stream(
-            model=self.model,
-            messages=messages,
-            system=system_param,
-            max_tokens=max_tokens,
-            **kwargs
-        ) as stream:
-            async for text in stream.text_stream:
-                yield StreamChunk(content=text)
+        async with self.rate_limit(messages, system_prompt, max_tokens, priority=priority) as lease:
+            output_chars = 0
+            async with self.client.messages.stream(
+                model=self.model,
+                messages=messages,
+                system=system_param,
+                max_tokens=max_tokens,
+                **kwargs
+            ) as stream:
+                async for text in stream.text_stream:
+                    output_chars += len(text)
+                    yield StreamChunk(content=text)
+            lease.record_usage(lease.extra.get('input_tokens', 0) + output_chars // 4)
 
     async def generate(
         self,
@@ -90,6 +98,7 @@ class AnthropicProvider(LLMProvider):
             raise ValueError("At least one message is required")
 
         use_model = model or self.model
+        priority = kwargs.pop('priority', None)
 
         # Enable prompt caching for system prompts (ephemeral cache, 5 min TTL)
         # Matches stream_chat() caching pattern — reduces cost by ~90% on cache hits.
@@ -104,14 +113,18 @@ class AnthropicProvider(LLMProvider):
         else:
             system_param = system_prompt or ""
 
-        response = await self.client.messages.create(
-            model=use_model,
-            messages=messages,
-            system=system_param,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            **kwargs
-        )
+        async with self.rate_limit(
+            messages, system_prompt, max_tokens, model=use_model, priority=priority,
+        ) as lease:
+            response = await self.client.messages.create(
+                model=use_model,
+                messages=messages,
+                system=system_param,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+            _record_usage(lease, response)
 
         # Extract text from response
         if response.content and len(response.content) > 0:
@@ -140,6 +153,8 @@ class AnthropicProvider(LLMProvider):
                 messages, tools, system_prompt, max_tokens, temperature, **kwargs
             )
 
+        priority = kwargs.pop('priority', None)
+
         # Build system param with prompt caching
         if system_prompt and len(system_prompt) > 100:
             system_param = [
@@ -152,16 +167,18 @@ class AnthropicProvider(LLMProvider):
         else:
             system_param = system_prompt or ""
 
-        response = await self.client.messages.create(
-            model=self.model,
-            messages=messages,
-            system=system_param,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            tools=tools,
-            tool_choice={"type": "tool", "name": tools[0]["name"]},
-            **kwargs,
-        )
+        async with self.rate_limit(messages, system_prompt, max_tokens, priority=priority) as lease:
+            response = await self.client.messages.create(
+                model=self.model,
+                messages=messages,
+                system=system_param,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                tools=tools,
+                tool_choice={"type": "tool", "name": tools[0]["name"]},
+                **kwargs,
+            )
+            _record_usage(lease, response)
 
         # Extract the tool_use input from response content blocks
         for block in response.content:
@@ -169,3 +186,13 @@ class AnthropicProvider(LLMProvider):
                 return block.input
 
         return {}
+
+
+def _record_usage(lease, response) -> None:
+    """Report actual token usage to the rate limiter so the estimate is refunded."""
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        lease.record_usage(
+            (getattr(usage, 'input_tokens', 0) or 0)
+            + (getattr(usage, 'output_tokens', 0) or 0)
+        )
@@ -2,9 +2,12 @@
 Base LLM Provider interface
 """
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+from .rate_limiter import Lease, Priority, estimate_tokens, get_rate_limiter
+
 
 @dataclass
 class StreamChunk:
@@ -27,15 +30,53 @@ class LLMProvider(ABC):
     }
     DEFAULT_CONTEXT_WINDOW = 128_000
 
-    def __init__(self, api_key: str, model: str):
+    # Key prefix for the shared rate limiter ("anthropic", "openai", ...)
+    provider_name: str = "llm"
+
+    def __init__(self, api_key: str, model: str, priority: Priority = Priority.DEFAULT):
         self.api_key = api_key
         self.model = model
+        self.priority = priority
 
     @property
     def context_window_tokens(self) -> int:
         """Return the context window size for this provider's model."""
         return self.MODEL_CONTEXT_WINDOWS.get(self.model, self.DEFAULT_CONTEXT_WINDOW)
 
+    @asynccontextmanager
+    async def rate_limit(
+        self,
+        messages: list[dict],
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        model: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> AsyncIterator[Lease]:
+        """
+        Hold a slot in the shared LLM rate limiter for the duration of a call.
+
+        Charges the estimated input tokens plus an output allowance (max_tokens,
+        capped by the limiter's reserve_output_tokens) up front; call
+        lease.record_output(text) when done so the charge is settled
+        against what the call actually used.
+        """
+        input_tokens = estimate_tokens(messages, system_prompt)
+        limiter = get_rate_limiter()
+        if limiter is None:
+            lease = Lease(f"{self.provider_name}:{model or self.model}", '', input_tokens + max_tokens)
+            lease.extra['input_tokens'] = input_tokens
+            yield lease
+            return
+
+        async with limiter.limit(
+            self.provider_name,
+            model or self.model,
+            tokens=limiter.reservation(input_tokens, max_tokens),
+            priority=self.priority if priority is None else priority,
+        ) as lease:
+            lease.extra['input_tokens'] = input_tokens
+            yield lease
+
     @abstractmethod
     async def stream_chat(
         self,
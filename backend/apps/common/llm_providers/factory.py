@@ -4,17 +4,29 @@ LLM Provider Factory
 from django.conf import settings
 
 from .base import LLMProvider
+from .rate_limiter import Priority
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
 
 
-def get_llm_provider(model_key: str = None) -> LLMProvider:
+# Rate-limiter priority when the caller doesn't pass one explicitly.
+# Background call sites (Celery extraction, clustering, research) pass
+# Priority.BACKGROUND themselves.
+MODEL_KEY_PRIORITIES = {
+    'chat': Priority.INTERACTIVE,
+    'extraction': Priority.BACKGROUND,
+}
+
+
+def get_llm_provider(model_key: str = None, priority: Priority = None) -> LLMProvider:
     """
     Get the appropriate LLM provider based on model key
     
     Args:
         model_key: Model key from settings.AI_MODELS (e.g., 'chat', 'fast')
                    If None, uses settings.AI_MODELS['chat']
+        priority: Scheduling class for the shared LLM rate limiter.
+                  Defaults per model key (see MODEL_KEY_PRIORITIES).
     
     Returns:
         Initialized LLM provider instance
@@ -29,6 +41,8 @@ def get_llm_provider(model_key: str = None) -> LLMProvider:
     """
     if model_key is None:
         model_key = 'chat'
+    if priority is None:
+        priority = MODEL_KEY_PRIORITIES.get(model_key, Priority.DEFAULT)
     
     # Get model identifier from settings (e.g., "anthropic:claude-haiku-4-5")
     model_identifier = settings.AI_MODELS.get(model_key, settings.AI_MODELS['fast'])
@@ -44,9 +58,9 @@ def get_llm_provider(model_key: str = None) -> LLMProvider:
     # Instantiate the appropriate provider
     if provider_name == 'anthropic':
         api_key = settings.ANTHROPIC_API_KEY
-        return AnthropicProvider(api_key=api_key, model=model_name)
+        return AnthropicProvider(api_key=api_key, model=model_name, priority=priority)
     elif provider_name == 'openai':
         api_key = settings.OPENAI_API_KEY
-        return OpenAIProvider(api_key=api_key, model=model_name)
+        return OpenAIProvider(api_key=api_key, model=model_name, priority=priority)
     else:
         raise ValueError(f"Unknown provider: {provider_name}")
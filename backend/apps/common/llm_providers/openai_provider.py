@@ -6,13 +6,16 @@ from typing import Any, AsyncIterator, Dict, List, Optional
 from openai import AsyncOpenAI
 
 from .base import LLMProvider, StreamChunk
+from .rate_limiter import Priority
 
 
 class OpenAIProvider(LLMProvider):
     """OpenAI implementation of LLM provider"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        super().__init__(api_key, model)
+    provider_name = "openai"
+
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", priority: Priority = Priority.DEFAULT):
+        super().__init__(api_key, model, priority)
         self.client = AsyncOpenAI(api_key=api_key)
 
     async def stream_chat(
@@ -28,21 +31,28 @@ class OpenAIProvider(LLMProvider):
         if system_prompt:
             openai_messages.append({"role": "system", "content": system_prompt})
         openai_messages.extend(messages)
+        priority = kwargs.pop('priority', None)
 
         # Stream from OpenAI
-        stream = await self.client.chat.completions.create(
-            model=self.model,
-            messages=openai_messages,
-            stream=True,
-            **kwargs
-        )
-
-        async for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield StreamChunk(
-                    content=chunk.choices[0].delta.content,
-                    finish_reason=chunk.choices[0].finish_reason
-                )
+        async with self.rate_limit(
+            messages, system_prompt, kwargs.get('max_tokens', 4096), priority=priority,
+        ) as lease:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=openai_messages,
+                stream=True,
+                **kwargs
+            )
+
+            output_chars = 0
+            async for chunk in stream:
+                if chunk.choices[0].delta.content:
+                    output_chars += len(chunk.choices[0].delta.content)
+                    yield StreamChunk(
+                        content=chunk.choices[0].delta.content,
+                        finish_reason=chunk.choices[0].finish_reason
+                    )
+            lease.record_usage(lease.extra.get('input_tokens', 0) + output_chars // 4)
 
     async def generate(
         self,
@@ -70,19 +80,24 @@ class OpenAIProvider(LLMProvider):
             raise ValueError("At least one message is required")
 
         use_model = model or self.model
+        priority = kwargs.pop('priority', None)
 
         openai_messages = []
         if system_prompt:
             openai_messages.append({"role": "system", "content": system_prompt})
         openai_messages.extend(messages)
 
-        response = await self.client.chat.completions.create(
-            model=use_model,
-            messages=openai_messages,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            **kwargs
-        )
+        async with self.rate_limit(
+            messages, system_prompt, max_tokens, model=use_model, priority=priority,
+        ) as lease:
+            response = await self.client.chat.completions.create(
+                model=use_model,
+                messages=openai_messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+            _record_usage(lease, response)
 
         if response.choices and response.choices[0].message.content:
             return response.choices[0].message.content
@@ -110,6 +125,8 @@ class OpenAIProvider(LLMProvider):
                 messages, tools, system_prompt, max_tokens, temperature, **kwargs
             )
 
+        priority = kwargs.pop('priority', None)
+
         openai_messages = []
         if system_prompt:
             openai_messages.append({"role": "system", "content": system_prompt})
@@ -128,15 +145,17 @@ class OpenAIProvider(LLMProvider):
             for t in tools
         ]
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=openai_messages,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            tools=openai_tools,
-            tool_choice={"type": "function", "function": {"name": tools[0]["name"]}},
-            **kwargs,
-        )
+        async with self.rate_limit(messages, system_prompt, max_tokens, priority=priority) as lease:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=openai_messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                tools=openai_tools,
+                tool_choice={"type": "function", "function": {"name": tools[0]["name"]}},
+                **kwargs,
+            )
+            _record_usage(lease, response)
 
         # Extract function call arguments
         choice = response.choices[0] if response.choices else None
@@ -148,3 +167,10 @@ class OpenAIProvider(LLMProvider):
                 pass
 
         return {}
+
+
+def _record_usage(lease, response) -> None:
+    """Report actual token usage to the rate limiter so the estimate is refunded."""
+    usage = getattr(response, 'usage', None)
+    if usage is not None and getattr(usage, 'total_tokens', None):
+        lease.record_usage(usage.total_tokens)
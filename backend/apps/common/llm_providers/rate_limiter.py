@@ -0,0 +1,557 @@
+"""
+Shared LLM rate limiter.
+
+Every LLMProvider call goes through a limiter keyed by (provider, model)
+that enforces three budgets at once:
+
+  - requests per minute  (token bucket)
+  - tokens per minute    (token bucket, charged with an estimate up front
+                          and settled against actual usage afterwards:
+                          unused tokens are refunded, overage is debited
+                          and may take the bucket below zero)
+  - calls in flight      (leases with a TTL so crashed workers can't leak slots)
+
+With the Redis backend the budgets are shared by every web and Celery
+process; the local backend is an in-process stand-in with identical
+semantics, used when Redis is disabled or unreachable.
+
+Priority classes reserve headroom: background work may only draw a bucket
+down to a reserve fraction of its capacity and only use part of the
+in-flight slots, so interactive chat is served first when budgets run low.
+
+Settings (all optional, see LLM_RATE_LIMITS in settings/base.py):
+    LLM_RATE_LIMITS = {
+        'enabled': False,              # off unless configured
+        'reserve_output_tokens': 1024, # output tokens charged up front
+        'backend': 'redis',            # or 'local'
+        'redis_url': 'redis://localhost:6379/2',
+        'max_wait_seconds': 120,
+        'default': {'requests_per_minute': 50, 'tokens_per_minute': 40000, 'max_in_flight': 8},
+        'models': {'anthropic:claude-haiku-4-5': {...}},
+    }
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call (lower value = served first)."""
+    INTERACTIVE = 0   # user is waiting on the response (chat, inline actions)
+    DEFAULT = 1       # request/response work triggered by the user
+    BACKGROUND = 2    # Celery extraction, clustering, summaries, research
+
+
+# Fraction of each bucket's capacity a priority class must leave untouched,
+# and the share of in-flight slots it may occupy.
+PRIORITY_RESERVE = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.DEFAULT: 0.1,
+    Priority.BACKGROUND: 0.25,
+}
+PRIORITY_INFLIGHT_SHARE = {
+    Priority.INTERACTIVE: 1.0,
+    Priority.DEFAULT: 0.9,
+    Priority.BACKGROUND: 0.75,
+}
+# Upper bound on a single poll sleep — interactive callers re-check sooner.
+PRIORITY_MAX_POLL_SECONDS = {
+    Priority.INTERACTIVE: 0.25,
+    Priority.DEFAULT: 0.5,
+    Priority.BACKGROUND: 1.0,
+}
+
+DEFAULT_LIMITS = {
+    'requests_per_minute': 50,
+    'tokens_per_minute': 40_000,
+    'max_in_flight': 8,
+}
+
+# Leases older than this are considered leaked (worker died mid-call).
+LEASE_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Budgets for one (provider, model) key."""
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_in_flight: int
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RateLimits':
+        merged = {**DEFAULT_LIMITS, **(data or {})}
+        return cls(
+            requests_per_minute=int(merged['requests_per_minute']),
+            tokens_per_minute=int(merged['tokens_per_minute']),
+            max_in_flight=int(merged['max_in_flight']),
+        )
+
+
+@dataclass
+class Lease:
+    """A granted slot. Call record_usage() so the charge is settled against actual usage."""
+    key: str
+    lease_id: str
+    reserved_tokens: int
+    used_tokens: Optional[int] = None
+    waited_seconds: float = 0.0
+    extra: dict = field(default_factory=dict)
+
+    def record_usage(self, tokens: int) -> None:
+        self.used_tokens = max(0, int(tokens))
+
+    def record_output(self, text: str, input_tokens: Optional[int] = None) -> None:
+        """Record usage from the generated text (~4 chars per token)."""
+        if input_tokens is None:
+            input_tokens = self.extra.get('input_tokens', 0)
+        self.record_usage(input_tokens + len(text or '') // 4)
+
+
+def estimate_tokens(messages: list, system_prompt: Optional[str] = None) -> int:
+    """Cheap input-token estimate (~4 chars per token) for budget charging."""
+    chars = len(system_prompt or '')
+    for message in messages or []:
+        content = message.get('content', '') if isinstance(message, dict) else message
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict):
+                    chars += len(str(block.get('text', '') or block.get('content', '')))
+    return chars // 4 + 1
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class LocalLimiterBackend:
+    """
+    In-process token buckets + in-flight leases.
+
+    Thread-safe because Celery tasks run asyncio.run() on worker threads,
+    so one process may host several event loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> {'req': float, 'tok': float, 'ts': float, 'leases': {id: expiry}}
+        self._state: Dict[str, dict] = {}
+
+    def try_acquire(
+        self,
+        key: str,
+        limits: RateLimits,
+        tokens: int,
+        priority: Priority,
+        lease_id: str,
+    ) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = {
+                    'req': float(limits.requests_per_minute),
+                    'tok': float(limits.tokens_per_minute),
+                    'ts': now,
+                    'leases': {},
+                }
+                self._state[key] = state
+
+            _refill(state, limits, now)
+            state['leases'] = {
+                lid: exp for lid, exp in state['leases'].items() if exp > now
+            }
+
+            ok, wait = _check_budgets(
+                req_level=state['req'],
+                tok_level=state['tok'],
+                in_flight=len(state['leases']),
+                limits=limits,
+                tokens=tokens,
+                priority=priority,
+            )
+            if not ok:
+                return False, wait
+
+            state['req'] -= 1
+            state['tok'] -= _token_cost(tokens, limits, priority)
+            state['leases'][lease_id] = now + LEASE_TTL_SECONDS
+            return True, 0.0
+
+    def release(self, key: str, limits: RateLimits, lease_id: str, refund_tokens: int) -> None:
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                return
+            state['leases'].pop(lease_id, None)
+            # Negative refunds debit usage beyond the reservation
+            state['tok'] = min(
+                float(limits.tokens_per_minute), state['tok'] + refund_tokens
+            )
+
+
+def _refill(state: dict, limits: RateLimits, now: float) -> None:
+    elapsed = max(0.0, now - state['ts'])
+    state['ts'] = now
+    state['req'] = min(
+        float(limits.requests_per_minute),
+        state['req'] + elapsed * limits.requests_per_minute / 60.0,
+    )
+    state['tok'] = min(
+        float(limits.tokens_per_minute),
+        state['tok'] + elapsed * limits.tokens_per_minute / 60.0,
+    )
+
+
+def _token_cost(tokens: int, limits: RateLimits, priority: Priority) -> float:
+    """
+    Tokens charged for a call. A call larger than the usable part of the
+    bucket is admitted once the bucket is full, otherwise it would never run.
+    """
+    usable = limits.tokens_per_minute * (1.0 - PRIORITY_RESERVE[priority])
+    return min(float(tokens), usable)
+
+
+def _check_budgets(
+    req_level: float,
+    tok_level: float,
+    in_flight: int,
+    limits: RateLimits,
+    tokens: int,
+    priority: Priority,
+) -> Tuple[bool, float]:
+    """
+    Decide whether a call may start now; mirrors _LUA_ACQUIRE below.
+
+    Returns (allowed, seconds_to_wait_before_retrying).
+    """
+    reserve = PRIORITY_RESERVE[priority]
+    slots = max(1, int(limits.max_in_flight * PRIORITY_INFLIGHT_SHARE[priority]))
+    if in_flight >= slots:
+        return False, 0.1
+
+    # Never reserve the last request of a tiny bucket, or it could never be used
+    req_floor = min(reserve * limits.requests_per_minute, limits.requests_per_minute - 1)
+    tok_cost = _token_cost(tokens, limits, priority)
+    tok_floor = reserve * limits.tokens_per_minute
+
+    wait = 0.0
+    if req_level - 1 < req_floor:
+        wait = max(wait, (req_floor + 1 - req_level) * 60.0 / limits.requests_per_minute)
+    if tok_level - tok_cost < tok_floor:
+        wait = max(wait, (tok_floor + tok_cost - tok_level) * 60.0 / limits.tokens_per_minute)
+    if wait > 0:
+        return False, wait
+    return True, 0.0
+
+
+# KEYS[1] = bucket hash, KEYS[2] = in-flight zset
+# ARGV = rpm, tpm, max_slots, tokens, reserve, lease_id, lease_ttl
+# Returns {1, 0} when granted, {0, wait_ms} otherwise.
+_LUA_ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local slots = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[5])
+local cost = math.min(tonumber(ARGV[4]), tpm * (1 - reserve))
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+if redis.call('ZCARD', KEYS[2]) >= slots then
+  return {0, 100}
+end
+
+local b = redis.call('HMGET', KEYS[1], 'req', 'tok', 'ts')
+local req = tonumber(b[1]) or rpm
+local tok = tonumber(b[2]) or tpm
+local ts = tonumber(b[3]) or now
+local elapsed = math.max(0, now - ts)
+req = math.min(rpm, req + elapsed * rpm / 60)
+tok = math.min(tpm, tok + elapsed * tpm / 60)
+
+local wait = 0
+local req_floor = math.min(reserve * rpm, rpm - 1)
+local tok_floor = reserve * tpm
+if req - 1 < req_floor then
+  wait = math.max(wait, (req_floor + 1 - req) * 60 / rpm)
+end
+if tok - cost < tok_floor then
+  wait = math.max(wait, (tok_floor + cost - tok) * 60 / tpm)
+end
+
+if wait > 0 then
+  redis.call('HSET', KEYS[1], 'req', req, 'tok', tok, 'ts', now)
+  redis.call('EXPIRE', KEYS[1], 120)
+  return {0, math.ceil(wait * 1000)}
+end
+
+redis.call('HSET', KEYS[1], 'req', req - 1, 'tok', tok - cost, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[7]), ARGV[6])
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[7]))
+return {1, 0}
+"""
+
+# KEYS[1] = bucket hash, KEYS[2] = in-flight zset
+# ARGV = lease_id, refund_tokens (negative = overage to debit), tpm
+_LUA_RELEASE = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+local refund = tonumber(ARGV[2])
+local tpm = tonumber(ARGV[3])
+if refund == 0 then
+  return 1
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  local tok = tonumber(redis.call('HGET', KEYS[1], 'tok')) or tpm
+  redis.call('HSET', KEYS[1], 'tok', math.min(tpm, tok + refund))
+elseif refund < 0 then
+  -- Expired bucket means it had refilled: debit from full
+  local t = redis.call('TIME')
+  local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+  redis.call('HSET', KEYS[1], 'tok', tpm + refund, 'ts', now)
+  redis.call('EXPIRE', KEYS[1], 120)
+end
+return 1
+"""
+
+
+class RedisLimiterBackend:
+    """Token buckets shared across processes via atomic Lua scripts."""
+
+    KEY_PREFIX = 'llm_rl'
+
+    def __init__(self, redis_url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(redis_url, socket_timeout=1.0)
+        self._acquire = self._client.register_script(_LUA_ACQUIRE)
+        self._release = self._client.register_script(_LUA_RELEASE)
+
+    def _keys(self, key: str) -> list:
+        return [f"{self.KEY_PREFIX}:{key}:bucket", f"{self.KEY_PREFIX}:{key}:inflight"]
+
+    def try_acquire(
+        self,
+        key: str,
+        limits: RateLimits,
+        tokens: int,
+        priority: Priority,
+        lease_id: str,
+    ) -> Tuple[bool, float]:
+        slots = max(1, int(limits.max_in_flight * PRIORITY_INFLIGHT_SHARE[priority]))
+        granted, wait_ms = self._acquire(
+            keys=self._keys(key),
+            args=[
+                limits.requests_per_minute,
+                limits.tokens_per_minute,
+                slots,
+                tokens,
+                PRIORITY_RESERVE[priority],
+                lease_id,
+                LEASE_TTL_SECONDS,
+            ],
+        )
+        return bool(int(granted)), int(wait_ms) / 1000.0
+
+    def release(self, key: str, limits: RateLimits, lease_id: str, refund_tokens: int) -> None:
+        self._release(
+            keys=self._keys(key),
+            args=[lease_id, refund_tokens, limits.tokens_per_minute],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+class LLMRateLimiter:
+    """
+    Acquire/release facade over a backend.
+
+    Usage:
+        async with limiter.limit('anthropic', 'claude-haiku-4-5', tokens=1200,
+                                 priority=Priority.BACKGROUND) as lease:
+            text = await client.call(...)
+            lease.record_output(text)
+
+    Fails open: if the backend errors, or a call has waited longer than
+    max_wait_seconds, the call proceeds (the provider SDK's own retry on
+    429 is the last line of defence) and a warning is logged.
+    """
+
+    def __init__(
+        self,
+        backend,
+        limits: Optional[Dict[str, dict]] = None,
+        default_limits: Optional[dict] = None,
+        max_wait_seconds: float = 120.0,
+        fallback_backend=None,
+        reserve_output_tokens: Optional[int] = None,
+    ):
+        self.backend = backend
+        self.fallback_backend = fallback_backend
+        self._limits = {k: RateLimits.from_dict(v) for k, v in (limits or {}).items()}
+        self._default = RateLimits.from_dict(default_limits or {})
+        self.max_wait_seconds = max_wait_seconds
+        self.reserve_output_tokens = reserve_output_tokens
+
+    def reservation(self, input_tokens: int, max_tokens: int) -> int:
+        """
+        Tokens to charge up front: the input estimate plus the output
+        allowance, capped at reserve_output_tokens. Calls that produce more
+        are debited the difference on release.
+        """
+        output = max_tokens
+        if self.reserve_output_tokens is not None:
+            output = min(output, self.reserve_output_tokens)
+        return input_tokens + max(0, output)
+
+    def limits_for(self, key: str) -> RateLimits:
+        return self._limits.get(key, self._default)
+
+    def _try_acquire(self, key, limits, tokens, priority, lease_id) -> Tuple[bool, float, object]:
+        try:
+            ok, wait = self.backend.try_acquire(key, limits, tokens, priority, lease_id)
+            return ok, wait, self.backend
+        except Exception as e:
+            if self.fallback_backend is None:
+                raise
+            logger.warning("LLM rate limiter backend unavailable, using local limiter: %s", e)
+            ok, wait = self.fallback_backend.try_acquire(key, limits, tokens, priority, lease_id)
+            return ok, wait, self.fallback_backend
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        priority: Priority = Priority.DEFAULT,
+    ) -> Tuple[Optional[Lease], object]:
+        """Wait until all budgets admit the call. Returns (lease, backend)."""
+        key = f"{provider}:{model}"
+        limits = self.limits_for(key)
+        lease_id = uuid.uuid4().hex
+        started = time.monotonic()
+        max_poll = PRIORITY_MAX_POLL_SECONDS[priority]
+
+        while True:
+            try:
+                ok, wait, backend = await asyncio.to_thread(
+                    self._try_acquire, key, limits, tokens, priority, lease_id,
+                )
+            except Exception as e:
+                logger.warning("LLM rate limiter error for %s, proceeding unthrottled: %s", key, e)
+                return None, None
+
+            waited = time.monotonic() - started
+            if ok:
+                return Lease(key, lease_id, tokens, waited_seconds=waited), backend
+            if waited >= self.max_wait_seconds:
+                logger.warning(
+                    "LLM rate limiter wait exceeded %.0fs for %s (priority=%s), proceeding",
+                    self.max_wait_seconds, key, priority.name,
+                )
+                return None, None
+
+            # Jitter keeps many waiting workers from re-polling in lockstep
+            await asyncio.sleep(min(wait, max_poll) * random.uniform(0.5, 1.0) + 0.01)
+
+    async def release(self, lease: Optional[Lease], backend) -> None:
+        if lease is None or backend is None:
+            return
+        refund = 0
+        if lease.used_tokens is not None:
+            refund = lease.reserved_tokens - lease.used_tokens
+        try:
+            await asyncio.to_thread(
+                backend.release, lease.key, self.limits_for(lease.key), lease.lease_id, refund,
+            )
+        except Exception as e:
+            # The lease TTL reclaims the slot eventually
+            logger.warning("LLM rate limiter release failed for %s: %s", lease.key, e)
+
+    @asynccontextmanager
+    async def limit(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        priority: Priority = Priority.DEFAULT,
+    ) -> AsyncIterator[Lease]:
+        lease, backend = await self.acquire(provider, model, tokens, priority)
+        if lease is not None and lease.waited_seconds > 1.0:
+            logger.info(
+                "llm_rate_limited",
+                extra={
+                    'limiter_key': lease.key,
+                    'priority': priority.name,
+                    'waited_seconds': round(lease.waited_seconds, 2),
+                },
+            )
+        try:
+            # Hand callers a throwaway lease when unthrottled so record_* still works
+            yield lease or Lease(f"{provider}:{model}", '', tokens)
+        finally:
+            await self.release(lease, backend)
+
+
+_limiter: Optional[LLMRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[LLMRateLimiter]:
+    """
+    Lazy singleton configured from settings.LLM_RATE_LIMITS.
+
+    Returns None when rate limiting is disabled (the default).
+    """
+    global _limiter
+    if _limiter is not None:
+        return _limiter
+
+    from django.conf import settings
+
+    config = getattr(settings, 'LLM_RATE_LIMITS', {}) or {}
+    if not config.get('enabled', False):
+        return None
+
+    with _limiter_lock:
+        if _limiter is None:
+            local = LocalLimiterBackend()
+            backend, fallback = local, None
+            if config.get('backend', 'local') == 'redis':
+                try:
+                    backend = RedisLimiterBackend(
+                        config.get('redis_url', 'redis://localhost:6379/2')
+                    )
+                    fallback = local
+                except Exception as e:
+                    logger.warning("Redis LLM rate limiter unavailable, using local: %s", e)
+            _limiter = LLMRateLimiter(
+                backend=backend,
+                limits=config.get('models'),
+                default_limits=config.get('default'),
+                max_wait_seconds=config.get('max_wait_seconds', 120),
+                fallback_backend=fallback,
+                reserve_output_tokens=config.get('reserve_output_tokens'),
+            )
+    return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Drop the singleton (tests / settings overrides)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
@@ -0,0 +1,219 @@
+"""
+Tests for the shared LLM rate limiter.
+
+Covers the in-process backend (same budget semantics as the Redis Lua
+script), priority headroom, token refunds and provider integration.
+
+Run locally (no DB or Redis required):
+    DJANGO_SETTINGS_MODULE=config.settings.test pytest apps/common/tests_rate_limiter.py -v --no-cov
+"""
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from apps.common.llm_providers.rate_limiter import (
+    LLMRateLimiter,
+    LocalLimiterBackend,
+    Priority,
+    RateLimits,
+    estimate_tokens,
+)
+
+
+def _limits(rpm=10, tpm=1000, in_flight=4):
+    return RateLimits(requests_per_minute=rpm, tokens_per_minute=tpm, max_in_flight=in_flight)
+
+
+class LocalBackendTest(unittest.TestCase):
+    """Token bucket + in-flight accounting of LocalLimiterBackend."""
+
+    def test_requests_per_minute_exhausted(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(rpm=3, in_flight=10)
+        for i in range(3):
+            ok, _ = backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, f'l{i}')
+            self.assertTrue(ok)
+        ok, wait = backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'l3')
+        self.assertFalse(ok)
+        self.assertGreater(wait, 0)
+
+    def test_tokens_per_minute_exhausted_and_refunded(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(tpm=1000)
+        ok, _ = backend.try_acquire('k', limits, 900, Priority.INTERACTIVE, 'a')
+        self.assertTrue(ok)
+        ok, _ = backend.try_acquire('k', limits, 500, Priority.INTERACTIVE, 'b')
+        self.assertFalse(ok)
+
+        # Call actually used 100 tokens → 800 refunded
+        backend.release('k', limits, 'a', refund_tokens=800)
+        ok, _ = backend.try_acquire('k', limits, 500, Priority.INTERACTIVE, 'b')
+        self.assertTrue(ok)
+
+    def test_overage_is_debited(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(tpm=1000)
+        self.assertTrue(backend.try_acquire('k', limits, 600, Priority.INTERACTIVE, 'a')[0])
+        # Call used 1300 tokens against a 600 reservation → bucket goes negative
+        backend.release('k', limits, 'a', refund_tokens=-700)
+        self.assertLess(backend._state['k']['tok'], 0)
+        ok, wait = backend.try_acquire('k', limits, 100, Priority.INTERACTIVE, 'b')
+        self.assertFalse(ok)
+        self.assertGreater(wait, 6.0)
+
+    def test_in_flight_cap_and_release(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(in_flight=2)
+        self.assertTrue(backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'a')[0])
+        self.assertTrue(backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'b')[0])
+        self.assertFalse(backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'c')[0])
+        backend.release('k', limits, 'a', refund_tokens=0)
+        self.assertTrue(backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'c')[0])
+
+    def test_keys_are_independent(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(rpm=1)
+        self.assertTrue(backend.try_acquire('anthropic:a', limits, 1, Priority.DEFAULT, 'x')[0])
+        self.assertTrue(backend.try_acquire('openai:b', limits, 1, Priority.DEFAULT, 'y')[0])
+
+    def test_background_leaves_headroom_for_interactive(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(rpm=100, tpm=1000, in_flight=100)
+        # Background may only draw the token bucket down to 25%
+        self.assertTrue(backend.try_acquire('k', limits, 700, Priority.BACKGROUND, 'a')[0])
+        self.assertFalse(backend.try_acquire('k', limits, 100, Priority.BACKGROUND, 'b')[0])
+        # Interactive can use the reserve
+        self.assertTrue(backend.try_acquire('k', limits, 250, Priority.INTERACTIVE, 'c')[0])
+
+    def test_background_in_flight_share(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(rpm=100, tpm=100_000, in_flight=4)
+        for i in range(3):
+            self.assertTrue(backend.try_acquire('k', limits, 1, Priority.BACKGROUND, f'b{i}')[0])
+        self.assertFalse(backend.try_acquire('k', limits, 1, Priority.BACKGROUND, 'b3')[0])
+        self.assertTrue(backend.try_acquire('k', limits, 1, Priority.INTERACTIVE, 'i0')[0])
+
+    def test_oversized_call_admitted_when_bucket_full(self):
+        backend = LocalLimiterBackend()
+        limits = _limits(tpm=1000)
+        ok, _ = backend.try_acquire('k', limits, 50_000, Priority.BACKGROUND, 'big')
+        self.assertTrue(ok)
+
+
+class LLMRateLimiterTest(unittest.TestCase):
+    """Acquire/release facade."""
+
+    def test_limit_context_manager_refunds_unused_tokens(self):
+        backend = LocalLimiterBackend()
+        limiter = LLMRateLimiter(backend, default_limits={
+            'requests_per_minute': 100, 'tokens_per_minute': 1000, 'max_in_flight': 4,
+        })
+
+        async def run():
+            async with limiter.limit('anthropic', 'm', tokens=900) as lease:
+                lease.record_usage(100)
+            async with limiter.limit('anthropic', 'm', tokens=800) as lease:
+                return lease
+
+        lease = asyncio.run(run())
+        self.assertTrue(lease.lease_id)
+        self.assertEqual(backend._state['anthropic:m']['leases'], {})
+
+    def test_reservation_caps_output_allowance(self):
+        limiter = LLMRateLimiter(LocalLimiterBackend(), reserve_output_tokens=1024)
+        self.assertEqual(limiter.reservation(200, 8192), 1224)
+        self.assertEqual(limiter.reservation(200, 500), 700)
+        self.assertEqual(LLMRateLimiter(LocalLimiterBackend()).reservation(200, 8192), 8392)
+
+    def test_usage_beyond_reservation_is_debited(self):
+        backend = LocalLimiterBackend()
+        limiter = LLMRateLimiter(backend, default_limits={
+            'requests_per_minute': 100, 'tokens_per_minute': 10000, 'max_in_flight': 4,
+        })
+
+        async def run():
+            async with limiter.limit('anthropic', 'm', tokens=1000) as lease:
+                lease.record_usage(3000)
+
+        asyncio.run(run())
+        self.assertLess(backend._state['anthropic:m']['tok'], 7100)
+
+    def test_per_model_limits_override_default(self):
+        limiter = LLMRateLimiter(
+            LocalLimiterBackend(),
+            limits={'openai:gpt-4o': {'requests_per_minute': 7}},
+            default_limits={'requests_per_minute': 3},
+        )
+        self.assertEqual(limiter.limits_for('openai:gpt-4o').requests_per_minute, 7)
+        self.assertEqual(limiter.limits_for('openai:other').requests_per_minute, 3)
+
+    def test_backend_error_falls_back_to_local(self):
+        class BrokenBackend:
+            def try_acquire(self, *args):
+                raise ConnectionError("redis down")
+
+        fallback = LocalLimiterBackend()
+        limiter = LLMRateLimiter(BrokenBackend(), fallback_backend=fallback)
+
+        async def run():
+            async with limiter.limit('anthropic', 'm', tokens=10) as lease:
+                return lease
+
+        lease = asyncio.run(run())
+        self.assertTrue(lease.lease_id)
+        self.assertIn('anthropic:m', fallback._state)
+
+    def test_wait_exceeded_proceeds_unthrottled(self):
+        limiter = LLMRateLimiter(
+            LocalLimiterBackend(),
+            default_limits={'requests_per_minute': 1, 'max_in_flight': 10},
+            max_wait_seconds=0,
+        )
+
+        async def run():
+            async with limiter.limit('anthropic', 'm', tokens=1):
+                pass
+            async with limiter.limit('anthropic', 'm', tokens=1) as lease:
+                return lease
+
+        lease = asyncio.run(run())
+        self.assertEqual(lease.lease_id, '')
+
+
+class ProviderIntegrationTest(unittest.TestCase):
+    """LLMProvider implementations go through the shared limiter."""
+
+    def test_generate_acquires_with_provider_priority(self):
+        from apps.common.llm_providers.base import LLMProvider, StreamChunk
+
+        class FakeProvider(LLMProvider):
+            provider_name = 'fake'
+
+            async def stream_chat(self, messages, system_prompt=None, **kwargs):
+                kwargs.pop('max_tokens', None)
+                priority = kwargs.pop('priority', None)
+                async with self.rate_limit(messages, system_prompt, priority=priority) as lease:
+                    yield StreamChunk(content='hello')
+                    lease.record_output('hello')
+
+        backend = LocalLimiterBackend()
+        limiter = LLMRateLimiter(backend)
+        provider = FakeProvider('key', 'model-x', priority=Priority.BACKGROUND)
+
+        calls = []
+        original = backend.try_acquire
+
+        def spy(key, limits, tokens, priority, lease_id):
+            calls.append((key, priority))
+            return original(key, limits, tokens, priority, lease_id)
+
+        backend.try_acquire = spy
+        with patch('apps.common.llm_providers.base.get_rate_limiter', return_value=limiter):
+            text = asyncio.run(provider.generate([{'role': 'user', 'content': 'hi'}]))
+
+        self.assertEqual(text, 'hello')
+        self.assertEqual(calls, [('fake:model-x', Priority.BACKGROUND)])
+
+    def test_estimate_tokens(self):
+        tokens = estimate_tokens([{'role': 'user', 'content': 'x' * 400}], 'y' * 400)
+        self.assertEqual(tokens, 201)
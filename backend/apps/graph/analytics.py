@@ -0,0 +1,338 @@
+"""
+In-memory graph analytics — a project's typed graph as CSR arrays.
+
+GraphAnalyzer's checks (circular reasoning, ungrounded assumptions,
+evidence deserts, confidence conflicts, strong claims) each used to run
+their own ORM sweeps. Here the project graph is loaded once — node ids,
+types, confidences and case membership, plus every edge as
+(source row, target row, type, strength) — in two values_list() queries,
+and cached per process by graph revision. The checks then run over numpy
+arrays:
+
+- cycles: Tarjan's strongly connected components over depends_on edges
+- grounding: supports in-degree, propagated backwards along depends_on
+  edges one vectorized hop at a time
+- degree checks: np.bincount over edge endpoints
+
+Content and other display fields aren't kept; callers batch-fetch them
+for the handful of nodes they report (node_details()).
+
+Edges are stored sorted by source row, so a node's outgoing edges are one
+[indptr[i], indptr[i + 1]) range. ``edge_rank`` keeps their load order
+(newest first) for callers that list edges.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .models import EdgeType, NodeType
+
+logger = logging.getLogger(__name__)
+
+NODE_TYPES = tuple(NodeType.values)
+EDGE_TYPES = tuple(EdgeType.values)
+
+_CSR_CACHE_MAX_SIZE = 16
+_csr_cache: 'OrderedDict[uuid.UUID, GraphCSR]' = OrderedDict()
+_csr_cache_lock = threading.Lock()
+
+
+def _codes(values: Sequence[str], vocabulary: Sequence[str]) -> np.ndarray:
+    """Integer code per value (-1 for values outside the vocabulary)."""
+    lookup = {name: code for code, name in enumerate(vocabulary)}
+    return np.array([lookup.get(value, -1) for value in values], dtype=np.int8)
+
+
+def _tarjan_scc(indptr: np.ndarray, indices: np.ndarray, n: int) -> np.ndarray:
+    """Strongly connected component label per row (iterative Tarjan)."""
+    indptr_list = indptr.tolist()
+    indices_list = indices.tolist()
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    labels = [-1] * n
+    stack: List[int] = []
+    counter = 0
+    component = 0
+
+    for root in range(n):
+        if order[root] != -1 or indptr_list[root] == indptr_list[root + 1]:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr_list[root])]
+        while work:
+            v, pos = work[-1]
+            if pos < indptr_list[v + 1]:
+                work[-1] = (v, pos + 1)
+                w = indices_list[pos]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr_list[w]))
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == order[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    labels[w] = component
+                    if w == v:
+                        break
+                component += 1
+
+    result = np.array(labels, dtype=np.int32)
+    # Rows never visited (no outgoing edges) are singleton components
+    unvisited = result < 0
+    result[unvisited] = component + np.arange(int(unvisited.sum()), dtype=np.int32)
+    return result
+
+
+@dataclass
+class GraphCSR:
+    """A project graph's structure as index arrays."""
+    node_ids: List[uuid.UUID]
+    node_types: np.ndarray      # (n,) int8 code into NODE_TYPES
+    confidence: np.ndarray      # (n,) float32
+    case_codes: np.ndarray      # (n,) int32 index into case_ids, -1 = no case
+    case_ids: List[uuid.UUID]
+    indptr: np.ndarray          # (n + 1,) outgoing edge range per source row
+    src: np.ndarray             # (m,) int32 source row, sorted
+    dst: np.ndarray             # (m,) int32 target row
+    edge_types: np.ndarray      # (m,) int8 code into EDGE_TYPES
+    strength: np.ndarray        # (m,) float32, NaN where unset
+    edge_rank: np.ndarray       # (m,) position in load order (newest first)
+    revision: int = 0
+    index: Dict[uuid.UUID, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    @classmethod
+    def from_rows(
+        cls,
+        node_rows: Sequence[tuple],
+        edge_rows: Iterable[tuple],
+        revision: int = 0,
+    ) -> 'GraphCSR':
+        """Build from (id, node_type, confidence, case_id) node rows and
+        (source_id, target_id, edge_type, strength) edge rows.
+
+        Edges with an endpoint outside ``node_rows`` are dropped.
+        """
+        node_ids = [row[0] for row in node_rows]
+        index = {nid: i for i, nid in enumerate(node_ids)}
+        case_ids: List[uuid.UUID] = []
+        case_index: Dict[uuid.UUID, int] = {}
+        case_codes = np.full(len(node_rows), -1, dtype=np.int32)
+        for i, row in enumerate(node_rows):
+            case_id = row[3]
+            if case_id is not None:
+                if case_id not in case_index:
+                    case_index[case_id] = len(case_ids)
+                    case_ids.append(case_id)
+                case_codes[i] = case_index[case_id]
+
+        src, dst, types, strength = [], [], [], []
+        for source_id, target_id, edge_type, edge_strength in edge_rows:
+            source = index.get(source_id)
+            target = index.get(target_id)
+            if source is None or target is None:
+                continue
+            src.append(source)
+            dst.append(target)
+            types.append(edge_type)
+            strength.append(np.nan if edge_strength is None else edge_strength)
+
+        src_arr = np.array(src, dtype=np.int32)
+        by_source = np.argsort(src_arr, kind='stable')
+        n = len(node_ids)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src_arr, minlength=n), out=indptr[1:])
+        return cls(
+            node_ids=node_ids,
+            node_types=_codes([row[1] for row in node_rows], NODE_TYPES),
+            confidence=np.array([row[2] for row in node_rows], dtype=np.float32),
+            case_codes=case_codes,
+            case_ids=case_ids,
+            indptr=indptr,
+            src=src_arr[by_source],
+            dst=np.array(dst, dtype=np.int32)[by_source],
+            edge_types=_codes(types, EDGE_TYPES)[by_source],
+            strength=np.array(strength, dtype=np.float32)[by_source],
+            edge_rank=by_source.astype(np.int32),
+            revision=revision,
+            index=index,
+        )
+
+    # ── Masks ────────────────────────────────────────────────────
+
+    def type_mask(self, node_type: str) -> np.ndarray:
+        return self.node_types == NODE_TYPES.index(node_type)
+
+    def case_mask(self, case_id: Optional[uuid.UUID]) -> np.ndarray:
+        if case_id not in self.case_ids:
+            return np.zeros(len(self), dtype=bool)
+        return self.case_codes == self.case_ids.index(case_id)
+
+    def edge_mask(self, edge_type: str, source_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        mask = self.edge_types == EDGE_TYPES.index(edge_type)
+        if source_mask is not None:
+            mask &= source_mask[self.src]
+        return mask
+
+    def edges_in_load_order(self, mask: np.ndarray) -> np.ndarray:
+        """Edge positions selected by ``mask``, newest edge first."""
+        selected = np.flatnonzero(mask)
+        return selected[np.argsort(self.edge_rank[selected], kind='stable')]
+
+    # ── Degree checks ────────────────────────────────────────────
+
+    def in_degree(self, edge_type: str) -> np.ndarray:
+        """Incoming ``edge_type`` edges per node."""
+        return np.bincount(self.dst[self.edge_mask(edge_type)], minlength=len(self))
+
+    def out_degree(self, edge_type: str, *, exclude_self: bool = False) -> np.ndarray:
+        """Outgoing ``edge_type`` edges per node."""
+        mask = self.edge_mask(edge_type)
+        if exclude_self:
+            mask &= self.src != self.dst
+        return np.bincount(self.src[mask], minlength=len(self))
+
+    def mean_in_strength(self, edge_type: str) -> np.ndarray:
+        """Mean strength of incoming ``edge_type`` edges per node (NaN if none set)."""
+        mask = self.edge_mask(edge_type) & ~np.isnan(self.strength)
+        n = len(self)
+        totals = np.bincount(self.dst[mask], weights=self.strength[mask], minlength=n)
+        counts = np.bincount(self.dst[mask], minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+    # ── Reachability and cycles ──────────────────────────────────
+
+    def grounded(self, max_depth: int) -> np.ndarray:
+        """Nodes with a supports edge on themselves or on something they
+        depend on within ``max_depth`` depends_on hops."""
+        grounded = self.in_degree(EdgeType.SUPPORTS) > 0
+        dependency = self.edge_mask(EdgeType.DEPENDS_ON)
+        src, dst = self.src[dependency], self.dst[dependency]
+        for _ in range(max_depth):
+            reached = np.zeros(len(self), dtype=bool)
+            reached[src[grounded[dst]]] = True
+            if not (reached & ~grounded).any():
+                break
+            grounded |= reached
+        return grounded
+
+    def strongly_connected_components(
+        self,
+        edge_type: str,
+        source_mask: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Component label per node over ``edge_type`` edges (whose source
+        is in ``source_mask``, when given)."""
+        mask = self.edge_mask(edge_type, source_mask)
+        src, dst = self.src[mask], self.dst[mask]
+        n = len(self)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return _tarjan_scc(indptr, dst, n)
+
+    def cycles(
+        self,
+        edge_type: str,
+        source_mask: Optional[np.ndarray] = None,
+    ) -> List[np.ndarray]:
+        """Node rows of every cycle-forming component (size > 1 or a self
+        loop), in node order."""
+        labels = self.strongly_connected_components(edge_type, source_mask)
+        if not len(labels):
+            return []
+        cyclic = np.bincount(labels) > 1
+        mask = self.edge_mask(edge_type, source_mask)
+        loops = self.src[mask][self.src[mask] == self.dst[mask]]
+        cyclic[labels[loops]] = True
+
+        rows = np.flatnonzero(cyclic[labels])
+        components: Dict[int, List[int]] = {}
+        for row in rows.tolist():
+            components.setdefault(int(labels[row]), []).append(row)
+        return [np.array(members, dtype=np.int32) for members in components.values()]
+
+
+def load_graph_csr(project_id: uuid.UUID, revision: int = 0) -> GraphCSR:
+    """Load a project graph's structure (two queries)."""
+    from .models import Edge, Node
+
+    node_rows = list(
+        Node.objects
+        .filter(project_id=project_id)
+        .order_by('-created_at', 'id')
+        .values_list('id', 'node_type', 'confidence', 'case_id')
+    )
+    edge_rows = (
+        Edge.objects
+        .filter(source_node__project_id=project_id)
+        .order_by('-created_at', 'id')
+        .values_list('source_node_id', 'target_node_id', 'edge_type', 'strength')
+    )
+    return GraphCSR.from_rows(node_rows, edge_rows.iterator(chunk_size=5000), revision=revision)
+
+
+def get_graph_csr(project_id: uuid.UUID) -> GraphCSR:
+    """Cached CSR for the project's current graph revision.
+
+    The revision is read before the graph, so a graph loaded while a write
+    commits is at worst newer than its revision and gets rebuilt next time.
+    """
+    from .revision import get_graph_revision
+
+    revision = get_graph_revision(project_id)
+    with _csr_cache_lock:
+        csr = _csr_cache.get(project_id)
+        if csr is not None and csr.revision == revision:
+            _csr_cache.move_to_end(project_id)
+            return csr
+
+    csr = load_graph_csr(project_id, revision)
+    with _csr_cache_lock:
+        _csr_cache[project_id] = csr
+        _csr_cache.move_to_end(project_id)
+        while len(_csr_cache) > _CSR_CACHE_MAX_SIZE:
+            _csr_cache.popitem(last=False)
+    return csr
+
+
+def node_details(
+    node_ids: Iterable[uuid.UUID],
+    fields: Sequence[str] = ('content', 'confidence'),
+) -> Dict[uuid.UUID, Dict[str, Any]]:
+    """Display fields for the given nodes in one query."""
+    from .models import Node
+
+    node_ids = list(node_ids)
+    if not node_ids:
+        return {}
+    return {
+        row['id']: row
+        for row in Node.objects.filter(id__in=node_ids).values('id', *fields)
+    }
@@ -1,19 +1,33 @@
 """
 Graph analyzer - Find patterns in the knowledge graph
+
+Checks run over the project graph's cached CSR arrays (apps.graph.analytics):
+loading a graph is two queries per graph revision, and the content of the
+nodes a check reports is fetched in one query afterwards.
 """
 import uuid
 import logging
-from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Iterable, List, Set, Tuple
 
-from django.db.models import Count, Q
+import numpy as np
+from asgiref.sync import sync_to_async
 
 from apps.chat.models import ChatThread
-from apps.graph.models import Node, Edge, EdgeType
+from apps.graph.analytics import GraphCSR, get_graph_csr, node_details
+from apps.graph.models import EdgeType, NodeType
 from apps.inquiries.models import Inquiry
 
 logger = logging.getLogger(__name__)
 
+# Hops of depends_on edges followed when looking for an assumption's support
+GROUNDING_MAX_DEPTH = 4
+
+# Both sides of a contradiction at or above this confidence make a conflict
+HIGH_CONFIDENCE = 0.75
+
+# Average support strength assumed when no supporting edge has one
+DEFAULT_SUPPORT_STRENGTH = 0.8
+
 
 class GraphAnalyzer:
     """
@@ -26,6 +40,65 @@ class GraphAnalyzer:
     - Recurring themes (semantically similar signals)
     """
 
+    # ── Shared checks over the CSR ───────────────────────────────
+
+    @staticmethod
+    def _unsupported_assumptions(csr: GraphCSR, in_case: np.ndarray) -> np.ndarray:
+        """Rows of the case's assumptions without an incoming supports edge."""
+        return np.flatnonzero(
+            in_case
+            & csr.type_mask(NodeType.ASSUMPTION)
+            & (csr.in_degree(EdgeType.SUPPORTS) == 0)
+        )
+
+    @staticmethod
+    def _strong_claims(
+        csr: GraphCSR,
+        in_case: np.ndarray,
+        min_confidence: float,
+    ) -> List[Tuple[int, int, float]]:
+        """(row, support count, average support strength) of the case's
+        claims with at least two supports edges averaging above ``min_confidence``."""
+        support_counts = csr.in_degree(EdgeType.SUPPORTS)
+        strengths = csr.mean_in_strength(EdgeType.SUPPORTS)
+        strengths = np.where(np.isnan(strengths), DEFAULT_SUPPORT_STRENGTH, strengths)
+        rows = np.flatnonzero(
+            in_case
+            & csr.type_mask(NodeType.CLAIM)
+            & (support_counts >= 2)
+            & (strengths > min_confidence)
+        )
+        return [(row, int(support_counts[row]), float(strengths[row])) for row in rows.tolist()]
+
+    @staticmethod
+    def _ungrounded_assumptions(
+        csr: GraphCSR,
+        assumption_ids: Iterable[uuid.UUID],
+    ) -> Tuple[Set[uuid.UUID], Dict[uuid.UUID, int]]:
+        """
+        Assumptions with no path to support: no incoming 'supports' edge on
+        the assumption nor on anything it depends on, following depends_on
+        edges up to GROUNDING_MAX_DEPTH hops.
+
+        Returns (ungrounded ids, direct dependency count per assumption).
+        """
+        rows = np.array(
+            [csr.index[aid] for aid in assumption_ids if aid in csr.index], dtype=np.int64,
+        )
+        if not len(rows):
+            return set(), {}
+        ungrounded = rows[~csr.grounded(GROUNDING_MAX_DEPTH)[rows]]
+        dependency_counts = csr.out_degree(EdgeType.DEPENDS_ON, exclude_self=True)
+        return (
+            {csr.node_ids[row] for row in ungrounded.tolist()},
+            {csr.node_ids[row]: int(dependency_counts[row]) for row in rows.tolist()},
+        )
+
+    @staticmethod
+    def _case_assumption_ids(csr: GraphCSR, in_case: np.ndarray) -> List[uuid.UUID]:
+        rows = np.flatnonzero(in_case & csr.type_mask(NodeType.ASSUMPTION))
+        return [csr.node_ids[row] for row in rows.tolist()]
+
     def find_patterns(self, thread_id: uuid.UUID) -> Dict:
         """
         Find interesting patterns in the graph for a thread.
@@ -40,8 +113,11 @@ class GraphAnalyzer:
             - strong_claims: Well-supported claims
             - recurring_themes: Similar signals mentioned multiple times
         """
-        thread = ChatThread.objects.get(id=thread_id)
-        case = thread.primary_case
+        case_id, project_id = (
+            ChatThread.objects
+            .values_list('primary_case_id', 'primary_case__project_id')
+            .get(id=thread_id)
+        )
 
         patterns = {
             'ungrounded_assumptions': [],
@@ -51,86 +127,59 @@ class GraphAnalyzer:
             'missing_considerations': []
         }
 
-        if not case:
+        if not case_id:
             # No case yet, limited analysis.
             # Assumptions are now graph nodes, not signals. Without a case we
             # cannot scope to a project, so return empty patterns.
             return patterns
 
-        # 1. Find ungrounded assumptions
-        # Assumptions are now graph Nodes, not Signals. Query the graph layer.
-        # Annotate with support count to avoid N+1 queries.
-        case_assumptions = Node.objects.filter(
-            case=case,
-            node_type='assumption',
-        ).annotate(
-            support_count=Count(
-                'incoming_edges',
-                filter=Q(incoming_edges__edge_type=EdgeType.SUPPORTS),
-            )
-        )
-        for assumption in case_assumptions:
-            if assumption.support_count == 0:
+        csr = get_graph_csr(project_id)
+        in_case = csr.case_mask(case_id)
+
+        ungrounded_rows = self._unsupported_assumptions(csr, in_case).tolist()
+        contradiction_edges = csr.edges_in_load_order(
+            csr.edge_mask(EdgeType.CONTRADICTS, in_case)
+        ).tolist()
+        strong_claims = self._strong_claims(csr, in_case, HIGH_CONFIDENCE)
+
+        rows = set(ungrounded_rows) | {row for row, _, _ in strong_claims}
+        for edge in contradiction_edges:
+            rows.update((int(csr.src[edge]), int(csr.dst[edge])))
+        details = node_details(csr.node_ids[row] for row in rows)
+
+        # 1. Ungrounded assumptions
+        for row in ungrounded_rows:
+            node = details.get(csr.node_ids[row])
+            if node:
                 patterns['ungrounded_assumptions'].append({
-                    'id': str(assumption.id),
-                    'text': assumption.content,
+                    'id': str(node['id']),
+                    'text': node['content'],
                     'mentioned_times': 1,
-                    'confidence': assumption.confidence,
+                    'confidence': node['confidence'],
                 })
 
-        # 2. Find contradictions
-        # Contradiction relationships are now graph Edges, not Signal M2Ms.
-        contradiction_edges = Edge.objects.filter(
-            edge_type=EdgeType.CONTRADICTS,
-            source_node__case=case,
-        ).select_related('source_node', 'target_node')
-
+        # 2. Contradictions
         for edge in contradiction_edges:
-            patterns['contradictions'].append({
-                'signal_id': str(edge.source_node.id),
-                'signal_text': edge.source_node.content,
-                'contradicts_id': str(edge.target_node.id),
-                'contradicts_text': edge.target_node.content,
-            })
-
-        # 3. Find strongly supported claims
-        # Claims are now graph Nodes. Check supporting edges + evidence links.
-        # Bulk-fetch all support edges for claims in this case, then group by target.
-        case_claims = Node.objects.filter(
-            case=case,
-            node_type='claim',
-        )
-        claim_ids = set(case_claims.values_list('id', flat=True))
-        all_support_edges = Edge.objects.filter(
-            target_node_id__in=claim_ids,
-            edge_type=EdgeType.SUPPORTS,
-        )
-        support_edges_by_target = defaultdict(list)
-        for edge in all_support_edges:
-            support_edges_by_target[edge.target_node_id].append(edge)
-
-        for claim_node in case_claims:
-            edges_for_claim = support_edges_by_target.get(claim_node.id, [])
-            support_count = len(edges_for_claim)
-
-            if support_count >= 2:
-                # Use average edge strength as confidence proxy
-                strengths = [
-                    e.strength for e in edges_for_claim
-                    if e.strength is not None
-                ]
-                avg_confidence = (
-                    sum(strengths) / len(strengths)
-                    if strengths else 0.8
-                )
-
-                if avg_confidence > 0.75:
-                    patterns['strong_claims'].append({
-                        'id': str(claim_node.id),
-                        'text': claim_node.content,
-                        'evidence_count': support_count,
-                        'avg_confidence': round(avg_confidence, 2),
-                    })
+            source = details.get(csr.node_ids[csr.src[edge]])
+            target = details.get(csr.node_ids[csr.dst[edge]])
+            if source and target:
+                patterns['contradictions'].append({
+                    'signal_id': str(source['id']),
+                    'signal_text': source['content'],
+                    'contradicts_id': str(target['id']),
+                    'contradicts_text': target['content'],
+                })
+
+        # 3. Strongly supported claims (average support strength as confidence proxy)
+        for row, support_count, avg_confidence in strong_claims:
+            node = details.get(csr.node_ids[row])
+            if node:
+                patterns['strong_claims'].append({
+                    'id': str(node['id']),
+                    'text': node['content'],
+                    'evidence_count': support_count,
+                    'avg_confidence': round(avg_confidence, 2),
+                })
 
         logger.info(
             f"Graph analysis complete for thread {thread_id}",
@@ -144,6 +193,39 @@ class GraphAnalyzer:
 
         return patterns
 
+    def _detect_circular_reasoning(self, thread_id: uuid.UUID) -> List[Dict]:
+        case_id, project_id = (
+            ChatThread.objects
+            .values_list('primary_case_id', 'primary_case__project_id')
+            .get(id=thread_id)
+        )
+        if not case_id:
+            return []
+
+        # depends_on edges out of the case's nodes; each strongly connected
+        # component with more than one node (or a self loop) is a cycle
+        csr = get_graph_csr(project_id)
+        cycles = csr.cycles(EdgeType.DEPENDS_ON, csr.case_mask(case_id))
+        if not cycles:
+            return []
+
+        # Report each cycle from its earliest created node
+        roots = [int(members.max()) for members in cycles]
+        details = node_details(csr.node_ids[row] for row in roots)
+
+        circular_chains = []
+        for root, members in zip(roots, cycles):
+            node = details.get(csr.node_ids[root])
+            if node:
+                circular_chains.append({
+                    'root_signal_id': str(node['id']),
+                    'root_signal_text': node['content'],
+                    'dependency_count': len(members),
+                    'cycle_node_ids': [str(csr.node_ids[row]) for row in members.tolist()],
+                    'circular': True,
+                })
+        return circular_chains
+
     async def detect_circular_reasoning(self, thread_id: uuid.UUID) -> List[Dict]:
         """
         Detect circular dependencies in the knowledge graph.
@@ -154,61 +236,33 @@ class GraphAnalyzer:
             thread_id: Thread to analyze
 
         Returns:
-            List of circular dependency chains
+            List of circular dependency chains, one per cycle
         """
-        thread = ChatThread.objects.get(id=thread_id)
+        return await sync_to_async(self._detect_circular_reasoning)(thread_id)
 
-        if not thread.primary_case:
+    def _find_orphaned_assumptions(self, thread_id: uuid.UUID) -> List[Dict]:
+        case_id, project_id = (
+            ChatThread.objects
+            .values_list('primary_case_id', 'primary_case__project_id')
+            .get(id=thread_id)
+        )
+        if not case_id:
             return []
 
-        circular_chains = []
+        csr = get_graph_csr(project_id)
+        assumption_ids = self._case_assumption_ids(csr, csr.case_mask(case_id))
+        ungrounded_ids, _ = self._ungrounded_assumptions(csr, assumption_ids)
+        details = node_details(ungrounded_ids)
 
-        # Dependencies are now graph Edges (edge_type='depends_on').
-        # Build an adjacency list from depends_on edges scoped to the case.
-        depends_edges = Edge.objects.filter(
-            edge_type=EdgeType.DEPENDS_ON,
-            source_node__case=thread.primary_case,
-        ).values_list('source_node_id', 'target_node_id')
-
-        adjacency: Dict[uuid.UUID, List[uuid.UUID]] = {}
-        for src, tgt in depends_edges:
-            adjacency.setdefault(src, []).append(tgt)
-
-        # Simple cycle detection via DFS
-        visited: set = set()
-        for start_id in adjacency:
-            if start_id in visited:
-                continue
-
-            path: set = set()
-            stack = [(start_id, False)]
-            while stack:
-                node_id, leaving = stack.pop()
-                if leaving:
-                    path.discard(node_id)
-                    continue
-                if node_id in path:
-                    # Cycle found — look up the node for reporting
-                    try:
-                        node = Node.objects.get(id=start_id)
-                        circular_chains.append({
-                            'root_signal_id': str(node.id),
-                            'root_signal_text': node.content,
-                            'dependency_count': len(path),
-                            'circular': True,
-                        })
-                    except Node.DoesNotExist:
-                        pass
-                    break
-                if node_id in visited:
-                    continue
-                visited.add(node_id)
-                path.add(node_id)
-                stack.append((node_id, True))
-                for neighbour in adjacency.get(node_id, []):
-                    stack.append((neighbour, False))
-
-        return circular_chains
+        return [
+            {
+                'id': str(aid),
+                'text': details[aid]['content'],
+                'mentioned_in_thread': False,  # Graph nodes are not thread-scoped
+            }
+            for aid in assumption_ids
+            if aid in ungrounded_ids and aid in details
+        ]
 
     async def find_orphaned_assumptions(self, thread_id: uuid.UUID) -> List[Dict]:
         """
@@ -216,7 +270,8 @@ class GraphAnalyzer:
 
         These are assumption *graph nodes* that:
         - Have no incoming 'supports' edge
-        - Don't depend on nodes that have support edges
+        - Don't depend (directly or through a depends_on chain) on nodes
+          that have support edges
         - Are "floating" without grounding
 
         Args:
@@ -225,67 +280,32 @@ class GraphAnalyzer:
         Returns:
             List of orphaned assumptions
         """
-        thread = ChatThread.objects.get(id=thread_id)
-
-        if not thread.primary_case:
-            return []
+        return await sync_to_async(self._find_orphaned_assumptions)(thread_id)
 
-        orphaned = []
-        assumptions = Node.objects.filter(
-            case=thread.primary_case,
-            node_type='assumption',
-        )
-        assumption_ids = set(assumptions.values_list('id', flat=True))
-        if not assumption_ids:
-            return orphaned
-
-        # Bulk: which assumptions have direct support edges?
-        directly_supported_ids = set(
-            Edge.objects.filter(
-                target_node_id__in=assumption_ids,
-                edge_type=EdgeType.SUPPORTS,
-            ).values_list('target_node_id', flat=True)
+    def _find_evidence_deserts(self, case_id: uuid.UUID) -> List[Dict]:
+        inquiries = list(
+            Inquiry.objects
+            .filter(case_id=case_id, status__in=['open', 'investigating'])
+            .values_list('id', 'title', 'status', 'case__project_id')
         )
+        if not inquiries:
+            return []
 
-        unsupported_ids = assumption_ids - directly_supported_ids
-        if not unsupported_ids:
-            return orphaned
-
-        # Bulk: depends_on edges from unsupported assumptions
-        dep_edges = Edge.objects.filter(
-            source_node_id__in=unsupported_ids,
-            edge_type=EdgeType.DEPENDS_ON,
-        ).values_list('source_node_id', 'target_node_id')
-
-        deps_by_assumption = defaultdict(set)
-        all_dep_target_ids = set()
-        for src_id, tgt_id in dep_edges:
-            deps_by_assumption[src_id].add(tgt_id)
-            all_dep_target_ids.add(tgt_id)
-
-        # Bulk: which dependency targets have support edges?
-        grounded_dep_ids = set()
-        if all_dep_target_ids:
-            grounded_dep_ids = set(
-                Edge.objects.filter(
-                    target_node_id__in=all_dep_target_ids,
-                    edge_type=EdgeType.SUPPORTS,
-                ).values_list('target_node_id', flat=True)
-            )
-
-        for assumption in assumptions:
-            if assumption.id in directly_supported_ids:
-                continue
-            dep_targets = deps_by_assumption.get(assumption.id, set())
-            has_grounded_dependency = bool(dep_targets & grounded_dep_ids)
-            if not has_grounded_dependency:
-                orphaned.append({
-                    'id': str(assumption.id),
-                    'text': assumption.content,
-                    'mentioned_in_thread': False,  # Graph nodes are not thread-scoped
-                })
+        # Every inquiry belongs to the same case, so to the same project graph
+        csr = get_graph_csr(inquiries[0][3])
+        total_evidence = int(csr.type_mask(NodeType.EVIDENCE).sum())
+        if total_evidence >= 2:
+            return []
 
-        return orphaned
+        return [
+            {
+                'id': str(inquiry_id),
+                'title': title,
+                'evidence_count': total_evidence,
+                'status': status,
+            }
+            for inquiry_id, title, status, _ in inquiries
+        ]
 
     async def find_evidence_deserts(self, case_id: uuid.UUID) -> List[Dict]:
         """
@@ -297,53 +317,41 @@ class GraphAnalyzer:
         Returns:
             List of inquiries needing more evidence
         """
-        deserts = []
-
-        inquiries = Inquiry.objects.filter(
-            case_id=case_id,
-            status__in=['open', 'investigating']
-        ).select_related('case__project')
-
-        # Bulk: collect distinct project IDs and count evidence nodes per project
-        project_ids = set()
-        for inquiry in inquiries:
-            if inquiry.case and inquiry.case.project_id:
-                project_ids.add(inquiry.case.project_id)
-
-        evidence_counts_by_project = {}
-        if project_ids:
-            evidence_qs = (
-                Node.objects.filter(
-                    project_id__in=project_ids,
-                    node_type='evidence',
-                )
-                .values('project_id')
-                .annotate(cnt=Count('id'))
-            )
-            evidence_counts_by_project = {
-                row['project_id']: row['cnt'] for row in evidence_qs
-            }
+        return await sync_to_async(self._find_evidence_deserts)(case_id)
 
-        for inquiry in inquiries:
-            try:
-                project_id = (
-                    inquiry.case.project_id
-                    if inquiry.case and inquiry.case.project_id
-                    else None
-                )
-                total_evidence = evidence_counts_by_project.get(project_id, 0)
-            except Exception:
-                total_evidence = 0
-
-            if total_evidence < 2:
-                deserts.append({
-                    'id': str(inquiry.id),
-                    'title': inquiry.title,
-                    'evidence_count': total_evidence,
-                    'status': inquiry.status
-                })
+    def _find_confidence_conflicts(self, case_id: uuid.UUID) -> List[Dict]:
+        from apps.cases.models import Case
+
+        project_id = Case.objects.filter(id=case_id).values_list('project_id', flat=True).first()
+        if project_id is None:
+            return []
+
+        csr = get_graph_csr(project_id)
+        confident = csr.confidence >= HIGH_CONFIDENCE
+        edges = csr.edges_in_load_order(
+            csr.edge_mask(EdgeType.CONTRADICTS, csr.case_mask(case_id) & confident)
+            & confident[csr.dst]
+        ).tolist()
+        details = node_details(
+            {csr.node_ids[csr.src[edge]] for edge in edges}
+            | {csr.node_ids[csr.dst[edge]] for edge in edges}
+        )
 
-        return deserts
+        conflicts = []
+        for edge in edges:
+            source = details.get(csr.node_ids[csr.src[edge]])
+            target = details.get(csr.node_ids[csr.dst[edge]])
+            if source and target:
+                conflicts.append({
+                    'type': 'signal_vs_signal',
+                    'signal1_id': str(source['id']),
+                    'signal1_text': source['content'],
+                    'signal1_confidence': source['confidence'],
+                    'signal2_id': str(target['id']),
+                    'signal2_text': target['content'],
+                    'signal2_confidence': target['confidence'],
+                })
+        return conflicts
 
     async def find_confidence_conflicts(self, case_id: uuid.UUID) -> List[Dict]:
         """
@@ -358,28 +366,7 @@ class GraphAnalyzer:
         Returns:
             List of high-confidence conflicts
         """
-        conflicts = []
-
-        # Node-vs-node contradictions via graph edges
-        contradiction_edges = Edge.objects.filter(
-            edge_type=EdgeType.CONTRADICTS,
-            source_node__case_id=case_id,
-            source_node__confidence__gte=0.75,
-            target_node__confidence__gte=0.75,
-        ).select_related('source_node', 'target_node')
-
-        for edge in contradiction_edges:
-            conflicts.append({
-                'type': 'signal_vs_signal',
-                'signal1_id': str(edge.source_node.id),
-                'signal1_text': edge.source_node.content,
-                'signal1_confidence': edge.source_node.confidence,
-                'signal2_id': str(edge.target_node.id),
-                'signal2_text': edge.target_node.content,
-                'signal2_confidence': edge.target_node.confidence,
-            })
-
-        return conflicts
+        return await sync_to_async(self._find_confidence_conflicts)(case_id)
 
     # ── Inquiry-Scoped Analysis Methods ──────────────────────────
 
@@ -402,8 +389,20 @@ class GraphAnalyzer:
             - recurring_themes: Similar signals mentioned multiple times
             - evidence_quality: Evidence strength breakdown
         """
-        inquiry = Inquiry.objects.get(id=inquiry_id)
+        case_id, project_id = (
+            Inquiry.objects
+            .values_list('case_id', 'case__project_id')
+            .get(id=inquiry_id)
+        )
+        return self.find_patterns_for_case(case_id, project_id)
+
+    def find_patterns_for_case(self, case_id: uuid.UUID, project_id: uuid.UUID) -> Dict:
+        """
+        find_patterns_for_inquiry() for every inquiry of a case.
 
+        The patterns only depend on the inquiry's case, so callers grounding
+        several sections of one brief compute them once.
+        """
         patterns = {
             'ungrounded_assumptions': [],
             'contradictions': [],
@@ -419,118 +418,78 @@ class GraphAnalyzer:
             },
         }
 
-        # Scope graph nodes to the inquiry's case for assumption/claim queries
-        case = inquiry.case if hasattr(inquiry, 'case') else None
-
-        # 1. Ungrounded assumptions (now graph Nodes, not Signals)
-        # Annotate with support count to avoid N+1 queries.
-        if case:
-            case_assumptions = Node.objects.filter(
-                case=case,
-                node_type='assumption',
-            ).annotate(
-                support_count=Count(
-                    'incoming_edges',
-                    filter=Q(incoming_edges__edge_type=EdgeType.SUPPORTS),
-                )
-            )
-            for assumption in case_assumptions:
-                if assumption.support_count == 0:
-                    patterns['ungrounded_assumptions'].append({
-                        'id': str(assumption.id),
-                        'text': assumption.content,
-                        'confidence': assumption.confidence,
-                    })
-
-        # 2. Contradictions (now graph Edges, deduplicated)
+        # Graph nodes are scoped to the case
+        csr = get_graph_csr(project_id)
+        in_case = csr.case_mask(case_id)
+
+        ungrounded_rows = self._unsupported_assumptions(csr, in_case).tolist()
+        strong_claims = self._strong_claims(csr, in_case, 0.7)
+
+        # Contradictions, deduplicated by node pair
         seen_pairs: set = set()
-        if case:
-            contradiction_edges = Edge.objects.filter(
-                edge_type=EdgeType.CONTRADICTS,
-                source_node__case=case,
-            ).select_related('source_node', 'target_node')
-
-            for edge in contradiction_edges:
-                pair = tuple(sorted([str(edge.source_node.id), str(edge.target_node.id)]))
-                if pair not in seen_pairs:
-                    seen_pairs.add(pair)
-                    patterns['contradictions'].append({
-                        'signal_id': str(edge.source_node.id),
-                        'signal_text': edge.source_node.content,
-                        'contradicts_id': str(edge.target_node.id),
-                        'contradicts_text': edge.target_node.content,
-                        'both_high_confidence': (
-                            edge.source_node.confidence >= 0.75
-                            and edge.target_node.confidence >= 0.75
-                        ),
-                    })
-
-        # 3. Strong claims (now graph Nodes)
-        # Bulk-fetch all support edges for claims in this case, then group by target.
-        if case:
-            case_claims = Node.objects.filter(
-                case=case,
-                node_type='claim',
-            )
-            claim_ids = set(case_claims.values_list('id', flat=True))
-            all_claim_support_edges = Edge.objects.filter(
-                target_node_id__in=claim_ids,
-                edge_type=EdgeType.SUPPORTS,
-            )
-            claim_support_by_target = defaultdict(list)
-            for edge in all_claim_support_edges:
-                claim_support_by_target[edge.target_node_id].append(edge)
-
-            for claim_node in case_claims:
-                edges_for_claim = claim_support_by_target.get(claim_node.id, [])
-                support_count = len(edges_for_claim)
-                if support_count >= 2:
-                    strengths = [
-                        e.strength for e in edges_for_claim
-                        if e.strength is not None
-                    ]
-                    avg_conf = (
-                        sum(strengths) / len(strengths)
-                        if strengths else 0.8
-                    )
-                    if avg_conf > 0.7:
-                        patterns['strong_claims'].append({
-                            'id': str(claim_node.id),
-                            'text': claim_node.content,
-                            'evidence_count': support_count,
-                            'avg_confidence': round(avg_conf, 2),
-                        })
-
-        # 4. Evidence quality breakdown — from graph evidence nodes
-        evidence_nodes = Node.objects.filter(
-            project=inquiry.case.project,
-            node_type='evidence',
-        ) if inquiry.case and inquiry.case.project else Node.objects.none()
-        for ev_node in evidence_nodes:
-            patterns['evidence_quality']['total'] += 1
-            conf = ev_node.confidence or 0
-            if conf >= 0.75:
-                patterns['evidence_quality']['high_confidence'] += 1
-            elif conf < 0.5:
-                patterns['evidence_quality']['low_confidence'] += 1
-        # Count supporting/contradicting from edges
-        patterns['evidence_quality']['supporting'] = Edge.objects.filter(
-            source_node__in=evidence_nodes,
-            edge_type=EdgeType.SUPPORTS,
-        ).count()
-        patterns['evidence_quality']['contradicting'] = Edge.objects.filter(
-            source_node__in=evidence_nodes,
-            edge_type=EdgeType.CONTRADICTS,
-        ).count()
-        patterns['evidence_quality']['neutral'] = max(
-            0,
-            patterns['evidence_quality']['total']
-            - patterns['evidence_quality']['supporting']
-            - patterns['evidence_quality']['contradicting'],
+        contradiction_edges = []
+        for edge in csr.edges_in_load_order(csr.edge_mask(EdgeType.CONTRADICTS, in_case)).tolist():
+            pair = frozenset((int(csr.src[edge]), int(csr.dst[edge])))
+            if pair not in seen_pairs:
+                seen_pairs.add(pair)
+                contradiction_edges.append(edge)
+
+        rows = set(ungrounded_rows) | {row for row, _, _ in strong_claims}
+        for edge in contradiction_edges:
+            rows.update((int(csr.src[edge]), int(csr.dst[edge])))
+        details = node_details(csr.node_ids[row] for row in rows)
+
+        # 1. Ungrounded assumptions
+        for row in ungrounded_rows:
+            node = details.get(csr.node_ids[row])
+            if node:
+                patterns['ungrounded_assumptions'].append({
+                    'id': str(node['id']),
+                    'text': node['content'],
+                    'confidence': node['confidence'],
+                })
+
+        # 2. Contradictions
+        for edge in contradiction_edges:
+            source = details.get(csr.node_ids[csr.src[edge]])
+            target = details.get(csr.node_ids[csr.dst[edge]])
+            if source and target:
+                patterns['contradictions'].append({
+                    'signal_id': str(source['id']),
+                    'signal_text': source['content'],
+                    'contradicts_id': str(target['id']),
+                    'contradicts_text': target['content'],
+                    'both_high_confidence': (
+                        source['confidence'] >= HIGH_CONFIDENCE
+                        and target['confidence'] >= HIGH_CONFIDENCE
+                    ),
+                })
+
+        # 3. Strong claims
+        for row, support_count, avg_conf in strong_claims:
+            node = details.get(csr.node_ids[row])
+            if node:
+                patterns['strong_claims'].append({
+                    'id': str(node['id']),
+                    'text': node['content'],
+                    'evidence_count': support_count,
+                    'avg_confidence': round(avg_conf, 2),
+                })
+
+        # 4. Evidence quality breakdown — from the project's evidence nodes
+        evidence = csr.type_mask(NodeType.EVIDENCE)
+        quality = patterns['evidence_quality']
+        quality['total'] = int(evidence.sum())
+        quality['high_confidence'] = int((evidence & (csr.confidence >= HIGH_CONFIDENCE)).sum())
+        quality['low_confidence'] = int((evidence & (csr.confidence < 0.5)).sum())
+        quality['supporting'] = int(csr.edge_mask(EdgeType.SUPPORTS, evidence).sum())
+        quality['contradicting'] = int(csr.edge_mask(EdgeType.CONTRADICTS, evidence).sum())
+        quality['neutral'] = max(
+            0, quality['total'] - quality['supporting'] - quality['contradicting'],
         )
 
         logger.info(
-            f"Inquiry pattern analysis complete for {inquiry_id}: "
+            f"Case pattern analysis complete for {case_id}: "
             f"{len(patterns['ungrounded_assumptions'])} ungrounded, "
             f"{len(patterns['contradictions'])} contradictions, "
             f"{len(patterns['strong_claims'])} strong claims"
@@ -542,9 +501,9 @@ class GraphAnalyzer:
         """
         Find assumptions within an inquiry's case that have no path to evidence.
 
-        Unlike the thread-scoped version, this checks both:
-        - Direct support edges on the assumption node
-        - Support edges on nodes the assumption depends on
+        Same check as the thread-scoped version (direct support edges, or
+        support on anything the assumption transitively depends on), and
+        also reports how many direct dependencies each assumption has.
 
         Args:
             inquiry_id: Inquiry to analyze
@@ -552,69 +511,24 @@ class GraphAnalyzer:
         Returns:
             List of orphaned assumption dicts
         """
-        inquiry = Inquiry.objects.get(id=inquiry_id)
-        case = inquiry.case if hasattr(inquiry, 'case') else None
-
-        if not case:
-            return []
-
-        orphaned = []
-        # Assumptions are now graph Nodes, scoped to the inquiry's case.
-        assumptions = Node.objects.filter(
-            case=case,
-            node_type='assumption',
+        case_id, project_id = (
+            Inquiry.objects
+            .values_list('case_id', 'case__project_id')
+            .get(id=inquiry_id)
         )
-        assumption_ids = set(assumptions.values_list('id', flat=True))
-        if not assumption_ids:
-            return orphaned
-
-        # Bulk: which assumptions have direct support edges?
-        directly_supported_ids = set(
-            Edge.objects.filter(
-                target_node_id__in=assumption_ids,
-                edge_type=EdgeType.SUPPORTS,
-            ).values_list('target_node_id', flat=True)
-        )
-
-        unsupported_ids = assumption_ids - directly_supported_ids
-        if not unsupported_ids:
-            return orphaned
-
-        # Bulk: depends_on edges from unsupported assumptions
-        dep_edges = Edge.objects.filter(
-            source_node_id__in=unsupported_ids,
-            edge_type=EdgeType.DEPENDS_ON,
-        ).values_list('source_node_id', 'target_node_id')
-
-        deps_by_assumption = defaultdict(set)
-        all_dep_target_ids = set()
-        for src_id, tgt_id in dep_edges:
-            deps_by_assumption[src_id].add(tgt_id)
-            all_dep_target_ids.add(tgt_id)
-
-        # Bulk: which dependency targets have support edges?
-        grounded_dep_ids = set()
-        if all_dep_target_ids:
-            grounded_dep_ids = set(
-                Edge.objects.filter(
-                    target_node_id__in=all_dep_target_ids,
-                    edge_type=EdgeType.SUPPORTS,
-                ).values_list('target_node_id', flat=True)
-            )
-
-        for assumption in assumptions:
-            if assumption.id in directly_supported_ids:
-                continue
-            dep_targets = deps_by_assumption.get(assumption.id, set())
-            has_grounded_dep = bool(dep_targets & grounded_dep_ids)
-            dep_count = len(dep_targets)
-            if not has_grounded_dep:
-                orphaned.append({
-                    'id': str(assumption.id),
-                    'text': assumption.content,
-                    'confidence': assumption.confidence,
-                    'dependency_count': dep_count,
-                })
-
-        return orphaned
 
+        csr = get_graph_csr(project_id)
+        assumption_ids = self._case_assumption_ids(csr, csr.case_mask(case_id))
+        ungrounded_ids, dependency_counts = self._ungrounded_assumptions(csr, assumption_ids)
+        details = node_details(ungrounded_ids)
+
+        return [
+            {
+                'id': str(aid),
+                'text': details[aid]['content'],
+                'confidence': details[aid]['confidence'],
+                'dependency_count': dependency_counts.get(aid, 0),
+            }
+            for aid in assumption_ids
+            if aid in ungrounded_ids and aid in details
+        ]
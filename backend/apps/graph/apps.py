@@ -5,3 +5,7 @@ class GraphConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.graph'
     verbose_name = 'Knowledge Graph'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.graph.signals  # noqa
@@ -0,0 +1,254 @@
+"""
+In-memory centroid index over a hierarchy's themes and topics.
+
+Built once per hierarchy (hierarchies are immutable once READY) and cached
+per process, so readers don't re-walk the tree JSON on every call:
+
+- CaseChunkRetriever ranks every theme/topic against a query with one
+  matrix-vector product and slices chunk ids out of contiguous ranges.
+- Scaffold context and orientation read theme labels/summaries from it.
+
+Layout: nodes are the root's children ("themes", depth 1) and their
+children ("topics", depth 2) — the two levels hierarchy-aware retrieval
+has always matched against. Leaf chunk ids are stored flattened in
+depth-first order, so every node's chunks are one [start, end) range.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INDEX_CACHE_MAX_SIZE = 32
+_index_cache: 'OrderedDict[uuid.UUID, HierarchyCentroidIndex]' = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+@dataclass
+class HierarchyCentroidIndex:
+    """Normalized theme/topic centroids with their chunk-id ranges."""
+    hierarchy_id: Optional[uuid.UUID]
+    node_ids: List[str]
+    depths: np.ndarray          # (n,) 1=theme (root child), 2=topic
+    levels: np.ndarray          # (n,) tree level of the node
+    parents: np.ndarray         # (n,) row of the parent theme, -1 for themes
+    centroids: np.ndarray       # (n, dim) float32, L2-normalized; zero rows = no vector
+    has_vector: np.ndarray      # (n,) bool
+    starts: np.ndarray          # (n,) chunk range start into chunk_ids
+    ends: np.ndarray            # (n,) chunk range end (exclusive)
+    chunk_ids: List[str] = field(default_factory=list)
+    nodes: List[Dict[str, Any]] = field(default_factory=list)  # label, summary, coverage_pct, document_ids
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @classmethod
+    def from_tree(
+        cls,
+        tree: Optional[dict],
+        vectors: Dict[str, np.ndarray],
+        hierarchy_id: Optional[uuid.UUID] = None,
+    ) -> 'HierarchyCentroidIndex':
+        node_ids: List[str] = []
+        depths: List[int] = []
+        levels: List[int] = []
+        parents: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        nodes: List[Dict[str, Any]] = []
+        chunk_ids: List[str] = []
+
+        def collect_leaves(node: dict):
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                children = current.get('children') or []
+                if children:
+                    stack.extend(reversed(children))
+                else:
+                    chunk_ids.extend(current.get('chunk_ids', []))
+
+        def add(node: dict, depth: int, parent: int) -> int:
+            row = len(node_ids)
+            node_ids.append(node.get('id', ''))
+            depths.append(depth)
+            levels.append(node.get('level', 0))
+            parents.append(parent)
+            starts.append(len(chunk_ids))
+            ends.append(len(chunk_ids))
+            nodes.append({
+                'id': node.get('id', ''),
+                'label': node.get('label'),
+                'summary': node.get('summary', ''),
+                'coverage_pct': node.get('coverage_pct', 0),
+                'document_ids': node.get('document_ids', []),
+            })
+            return row
+
+        for theme in (tree or {}).get('children') or []:
+            theme_row = add(theme, 1, -1)
+            children = theme.get('children') or []
+            if not children:
+                collect_leaves(theme)
+            for topic in children:
+                topic_row = add(topic, 2, theme_row)
+                collect_leaves(topic)
+                ends[topic_row] = len(chunk_ids)
+            ends[theme_row] = len(chunk_ids)
+
+        dim = next((len(v) for v in vectors.values()), 0)
+        centroids = np.zeros((len(node_ids), dim), dtype=np.float32)
+        has_vector = np.zeros(len(node_ids), dtype=bool)
+        for row, node_id in enumerate(node_ids):
+            vec = vectors.get(node_id)
+            if vec is not None and len(vec) == dim:
+                centroids[row] = vec
+                has_vector[row] = True
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids /= np.where(norms == 0, 1, norms)
+        has_vector &= norms[:, 0] > 0
+
+        return cls(
+            hierarchy_id=hierarchy_id,
+            node_ids=node_ids,
+            depths=np.asarray(depths, dtype=np.int8),
+            levels=np.asarray(levels, dtype=np.int8),
+            parents=np.asarray(parents, dtype=np.int32),
+            centroids=centroids,
+            has_vector=has_vector,
+            starts=np.asarray(starts, dtype=np.int64),
+            ends=np.asarray(ends, dtype=np.int64),
+            chunk_ids=chunk_ids,
+            nodes=nodes,
+        )
+
+    def similarities(self, query) -> np.ndarray:
+        """Cosine similarity of every node to ``query`` (0 for nodes without a vector)."""
+        if not len(self) or not self.centroids.shape[1]:
+            return np.zeros(len(self), dtype=np.float32)
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if q.shape[0] != self.centroids.shape[1] or norm == 0:
+            return np.zeros(len(self), dtype=np.float32)
+        return np.where(self.has_vector, self.centroids @ (q / norm), 0.0)
+
+    def match(self, query, theme_threshold: float, topic_threshold: float) -> List[int]:
+        """Rows of matching nodes, most similar first.
+
+        A theme matches above ``theme_threshold`` (and covers all its
+        chunks); topics of non-matching themes match above
+        ``topic_threshold``. Themes without a vector are skipped together
+        with their topics, as the tree walk this replaced did.
+        """
+        sims = self.similarities(query)
+        is_theme = self.depths == 1
+        theme_hit = is_theme & self.has_vector & (sims > theme_threshold)
+        parent_hit = np.zeros(len(self), dtype=bool)
+        parent_vector = np.zeros(len(self), dtype=bool)
+        topics = ~is_theme
+        parent_hit[topics] = theme_hit[self.parents[topics]]
+        parent_vector[topics] = self.has_vector[self.parents[topics]]
+        topic_hit = (
+            topics & self.has_vector & parent_vector
+            & (sims > topic_threshold) & ~parent_hit
+        )
+        rows = np.flatnonzero(theme_hit | topic_hit)
+        return rows[np.argsort(-sims[rows], kind='stable')].tolist()
+
+    def chunks_for(self, rows: List[int], limit: Optional[int] = None) -> List[str]:
+        """Chunk ids under the given node rows, in row order, de-duplicated."""
+        seen = set()
+        result: List[str] = []
+        for row in rows:
+            for cid in self.chunk_ids[self.starts[row]:self.ends[row]]:
+                if cid not in seen:
+                    seen.add(cid)
+                    result.append(cid)
+                    if limit is not None and len(result) >= limit:
+                        return result
+        return result
+
+    def theme_labels(self) -> List[str]:
+        """Labels of Level 2 themes directly under the root, in tree order."""
+        return [
+            self.nodes[row]['label']
+            for row in np.flatnonzero((self.depths == 1) & (self.levels == 2))
+            if self.nodes[row]['label']
+        ]
+
+    def theme_summaries(self) -> List[Dict[str, Any]]:
+        """Root children as orientation theme dicts.
+
+        Same selection as OrientationService._extract_theme_summaries:
+        Level 2+ children, or Level 1 children when the root has no
+        Level 2+ children (few clusters).
+        """
+        top = np.flatnonzero(self.depths == 1)
+        if not len(top):
+            return []
+        has_themes = bool((self.levels[top] >= 2).any())
+        themes = []
+        for row in top:
+            if self.levels[row] >= 2 or (self.levels[row] == 1 and not has_themes):
+                theme = dict(self.nodes[row])
+                if theme['label'] is None:
+                    theme['label'] = 'Unknown'
+                themes.append(theme)
+        return themes
+
+
+def build_centroid_index(hierarchy) -> HierarchyCentroidIndex:
+    """Build the index from a hierarchy's tree and stored node vectors."""
+    from .hierarchy_vectors import load_node_vectors
+
+    return HierarchyCentroidIndex.from_tree(
+        hierarchy.tree, load_node_vectors(hierarchy), hierarchy_id=hierarchy.pk,
+    )
+
+
+def get_centroid_index(hierarchy) -> HierarchyCentroidIndex:
+    """Cached centroid index for a hierarchy (built on first use per process).
+
+    Only READY hierarchies are cached; a hierarchy's tree and vectors don't
+    change after it is ready, so the id is a sufficient cache key.
+    """
+    from .models import HierarchyStatus
+
+    key = hierarchy.pk
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = build_centroid_index(hierarchy)
+    if hierarchy.status == HierarchyStatus.READY:
+        with _index_cache_lock:
+            _index_cache[key] = index
+            _index_cache.move_to_end(key)
+            while len(_index_cache) > _INDEX_CACHE_MAX_SIZE:
+                _index_cache.popitem(last=False)
+    return index
+
+
+def get_current_centroid_index(project_id: uuid.UUID) -> Optional[HierarchyCentroidIndex]:
+    """Centroid index of the project's current READY hierarchy, or None.
+
+    The tree is only loaded when the index isn't cached yet.
+    """
+    from .models import ClusterHierarchy, HierarchyStatus
+
+    hierarchy = (
+        ClusterHierarchy.objects
+        .filter(project_id=project_id, is_current=True, status=HierarchyStatus.READY)
+        .defer('tree', 'metadata')
+        .first()
+    )
+    if hierarchy is None:
+        return None
+    return get_centroid_index(hierarchy)
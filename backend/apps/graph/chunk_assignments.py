@@ -0,0 +1,138 @@
+"""
+Chunk → topic/theme assignments of a project's current hierarchy.
+
+ClusterChunkAssignment rows are derived from the hierarchy tree once, when
+the hierarchy becomes current, and replace the previous hierarchy's rows.
+Readers then label or filter chunks with an indexed lookup:
+
+- hierarchy chunk search joins them onto its result chunks
+- theme filtering (chunks_in_clusters) for retrieval
+- cluster id → label resolution (cluster_labels) for context assembly
+"""
+import logging
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 2000
+LABEL_MAX_LENGTH = 255
+
+
+class ChunkCluster(NamedTuple):
+    topic_id: str
+    topic_label: str
+    theme_id: str
+    theme_label: str
+
+
+def tree_chunk_assignments(tree: Optional[dict]) -> Dict[str, ChunkCluster]:
+    """Map every chunk id in a serialized tree to its topic and theme.
+
+    The topic is the chunk's Level 1 ancestor and the theme its nearest
+    ancestor at Level 2 or above (the root, for trees too small to
+    cluster). Chunk ids are taken from leaf nodes, as they are the only
+    ones listed once.
+    """
+    assignments: Dict[str, ChunkCluster] = {}
+    stack = [(tree or {}, '', '', '', '')]
+    while stack:
+        node, topic_id, topic_label, theme_id, theme_label = stack.pop()
+        level = node.get('level', 0)
+        if level >= 2:
+            theme_id, theme_label = node.get('id', ''), node.get('label', '')
+        elif level == 1:
+            topic_id, topic_label = node.get('id', ''), node.get('label', '')
+
+        children = node.get('children') or []
+        if not children:
+            cluster = ChunkCluster(topic_id, topic_label, theme_id, theme_label)
+            for cid in node.get('chunk_ids', []):
+                assignments[cid] = cluster
+        for child in children:
+            stack.append((child, topic_id, topic_label, theme_id, theme_label))
+    return assignments
+
+
+def write_chunk_assignments(hierarchy) -> int:
+    """Replace the project's assignments with those of ``hierarchy``.
+
+    Chunks deleted since the build are skipped. Call inside the transaction
+    that makes the hierarchy current. Returns the number of rows written.
+    """
+    from apps.projects.models import DocumentChunk
+    from .models import ClusterChunkAssignment
+
+    project_id = hierarchy.project_id
+    ClusterChunkAssignment.objects.filter(project_id=project_id).delete()
+
+    assignments = tree_chunk_assignments(hierarchy.tree)
+    if not assignments:
+        return 0
+    existing = {
+        str(cid) for cid in
+        DocumentChunk.objects.filter(document__project_id=project_id).values_list('id', flat=True)
+    }
+
+    rows = (
+        ClusterChunkAssignment(
+            project_id=project_id,
+            hierarchy_id=hierarchy.id,
+            chunk_id=chunk_id,
+            topic_id=cluster.topic_id,
+            topic_label=cluster.topic_label[:LABEL_MAX_LENGTH],
+            theme_id=cluster.theme_id,
+            theme_label=cluster.theme_label[:LABEL_MAX_LENGTH],
+        )
+        for chunk_id, cluster in assignments.items()
+        if chunk_id in existing
+    )
+    written = 0
+    batch: List = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            ClusterChunkAssignment.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        ClusterChunkAssignment.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def chunks_in_clusters(queryset, cluster_ids: Iterable[str]):
+    """Restrict a DocumentChunk queryset to chunks under the given topics/themes."""
+    from django.db.models import Q
+
+    ids = [str(cid) for cid in cluster_ids]
+    # At most one assignment per chunk (current hierarchy only), so the
+    # join doesn't duplicate rows.
+    return queryset.filter(
+        Q(cluster_assignments__theme_id__in=ids) | Q(cluster_assignments__topic_id__in=ids)
+    )
+
+
+def cluster_labels(project_id: uuid.UUID, cluster_ids: Iterable[str]) -> Dict[str, str]:
+    """Topic/theme id → label for the project's current hierarchy."""
+    from django.db.models import Q
+    from .models import ClusterChunkAssignment
+
+    ids = [str(cid) for cid in cluster_ids]
+    if not ids:
+        return {}
+    rows = (
+        ClusterChunkAssignment.objects
+        .filter(project_id=project_id)
+        .filter(Q(theme_id__in=ids) | Q(topic_id__in=ids))
+        .values_list('topic_id', 'topic_label', 'theme_id', 'theme_label')
+        .distinct()
+    )
+    wanted = set(ids)
+    labels: Dict[str, str] = {}
+    for topic_id, topic_label, theme_id, theme_label in rows:
+        if topic_id in wanted and topic_label:
+            labels[topic_id] = topic_label
+        if theme_id in wanted and theme_label:
+            labels[theme_id] = theme_label
+    return labels
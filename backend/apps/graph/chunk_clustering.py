@@ -8,10 +8,15 @@ The existing ClusteringService in clustering.py uses Leiden community detection
 on graph edges. This service uses agglomerative clustering on raw embeddings
 because at thematic-summary time, no graph edges exist yet.
 
-For large projects (>MAX_DIRECT_CLUSTER chunks), a two-phase approach is used:
-1. Sample a representative subset, cluster that directly
-2. Assign remaining chunks to nearest cluster centroid
-This keeps memory bounded at ~15MB regardless of project size.
+For large projects (>MAX_DIRECT_CLUSTER chunks) one of two backends is used,
+selected by SUMMARY_SETTINGS['chunk_clustering']['backend']:
+
+- 'sampled': sample a representative subset, cluster that directly, then
+  assign remaining chunks to the nearest cluster centroid.
+- 'minibatch': mini-batch spherical k-means over *all* chunks into small
+  micro-clusters, then average-linkage merging of the micro-clusters.
+  Every chunk contributes to the cluster structure; memory is
+  O(n·d + k²) with k ≤ max_micro_clusters.
 """
 import logging
 import uuid
@@ -26,8 +31,13 @@ logger = logging.getLogger(__name__)
 # Read from SUMMARY_SETTINGS at call-time; this constant is the fallback.
 _DEFAULT_MAX_DIRECT_CLUSTER = 5000
 
+# Backend for projects above max_direct_cluster ('sampled' or 'minibatch').
+_DEFAULT_BACKEND = 'minibatch'
+_DEFAULT_MICRO_CLUSTER_SIZE = 20
+_DEFAULT_MAX_MICRO_CLUSTERS = 5000
 
-def _get_chunk_clustering_config() -> dict:
+
+def get_chunk_clustering_config() -> dict:
     """Return chunk_clustering config from Django settings with safe fallbacks."""
     try:
         from django.conf import settings as django_settings
@@ -53,8 +63,8 @@ class ChunkClusteringService:
         The distance_threshold controls cluster granularity — lower values
         produce more, tighter clusters.
 
-        For projects with >5000 chunks, uses a two-phase approach:
-        cluster a sample, then assign remaining chunks to nearest centroid.
+        For projects with >5000 chunks, uses the configured scalable backend
+        (mini-batch micro-clusters + merging, or sample-and-assign).
 
         Args:
             project_id: Project to cluster.
@@ -83,48 +93,48 @@ class ChunkClusteringService:
                 'total_documents': int,
             }
         """
-        from apps.projects.models import DocumentChunk
+        from .chunk_loader import load_chunk_matrix
 
         # Resolve defaults from SUMMARY_SETTINGS if not explicitly provided
-        cfg = _get_chunk_clustering_config()
+        cfg = get_chunk_clustering_config()
         if distance_threshold is None:
             distance_threshold = cfg.get('distance_threshold', 0.65)
         max_direct = cfg.get('max_direct_cluster', _DEFAULT_MAX_DIRECT_CLUSTER)
 
-        # 1. Load chunks with embeddings
-        qs = DocumentChunk.objects.filter(
-            document__project_id=project_id,
-            embedding__isnull=False,
-        ).select_related('document')
-
-        if document_ids:
-            qs = qs.filter(document_id__in=document_ids)
-
-        chunks = list(qs.order_by('document', 'chunk_index'))
+        # 1. Stream chunks with embeddings into a float32 matrix
+        chunks = load_chunk_matrix(project_id, document_ids, text_limit=300)
 
         total_chunks = len(chunks)
-        total_documents = len(set(c.document_id for c in chunks))
+        total_documents = chunks.document_count
 
         if total_chunks < 3:
             # Too few chunks to cluster meaningfully
             return {
                 'clusters': [],
-                'orphan_chunk_ids': [str(c.id) for c in chunks],
+                'orphan_chunk_ids': list(chunks.ids),
                 'total_chunks': total_chunks,
                 'total_documents': total_documents,
             }
 
-        # 2. Build embedding matrix and normalize
-        embeddings = np.array([c.embedding for c in chunks])
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1, norms)
-        normalized = embeddings / norms
+        # 2. Normalize embeddings (in place)
+        normalized = chunks.normalized()
 
         # 3. Cluster — direct or sampled depending on size
         if total_chunks <= max_direct:
             labels = ChunkClusteringService._cluster_direct(
                 normalized, distance_threshold,
             )
+        elif cfg.get('backend', _DEFAULT_BACKEND) == 'minibatch':
+            labels = ChunkClusteringService._cluster_minibatch(
+                normalized, distance_threshold, cfg,
+            )
+            logger.info(
+                "chunk_clustering_used_minibatch",
+                extra={
+                    'project_id': str(project_id),
+                    'total_chunks': total_chunks,
+                },
+            )
         else:
             labels = ChunkClusteringService._cluster_sampled(
                 normalized, distance_threshold, sample_size=max_direct,
@@ -150,10 +160,9 @@ class ChunkClusteringService:
         for label, indices in sorted(cluster_map.items()):
             if len(indices) < min_cluster_size:
                 for idx in indices:
-                    orphan_ids.append(str(chunks[idx].id))
+                    orphan_ids.append(chunks.ids[idx])
                 continue
 
-            cluster_chunks = [chunks[i] for i in indices]
             cluster_embeddings = normalized[indices]
 
             # Pick up to 3 representatives: closest to centroid
@@ -167,26 +176,26 @@ class ChunkClusteringService:
 
             representatives = []
             for ki in top_k_indices:
-                c = cluster_chunks[ki]
+                row = indices[ki]
                 representatives.append({
-                    'chunk_id': str(c.id),
-                    'text': c.chunk_text[:300],
-                    'document_title': c.document.title,
+                    'chunk_id': chunks.ids[row],
+                    'text': chunks.texts[row],
+                    'document_title': chunks.document_title(row),
                 })
 
             # Document distribution
             doc_dist: Dict[str, int] = defaultdict(int)
-            for c in cluster_chunks:
-                doc_dist[c.document.title] += 1
+            for row in indices:
+                doc_dist[chunks.document_title(row)] += 1
 
             result_clusters.append({
                 'cluster_id': int(label),
-                'chunk_ids': [str(c.id) for c in cluster_chunks],
+                'chunk_ids': [chunks.ids[row] for row in indices],
                 'representative_chunks': representatives,
                 'document_distribution': dict(doc_dist),
-                'chunk_count': len(cluster_chunks),
+                'chunk_count': len(indices),
                 'coverage_pct': round(
-                    len(cluster_chunks) / total_chunks * 100, 1
+                    len(indices) / total_chunks * 100, 1
                 ),
             })
 
@@ -281,7 +290,7 @@ class ChunkClusteringService:
                 centroid = centroid / norm
             centroids[label] = centroid
 
-        centroid_labels = sorted(centroids.keys())
+        centroid_labels = np.array(sorted(centroids.keys()), dtype=int)
         centroid_matrix = np.array([centroids[l] for l in centroid_labels])
 
         # Phase 2: assign all chunks (including sampled) to nearest centroid
@@ -296,15 +305,36 @@ class ChunkClusteringService:
             best_centroid_idx = np.argmax(sims, axis=1)
             best_sims = sims[np.arange(len(batch)), best_centroid_idx]
 
-            for j in range(len(batch)):
-                # Only assign if close enough; otherwise leave as orphan (-1)
-                if (1 - best_sims[j]) < distance_threshold:
-                    labels[start + j] = centroid_labels[best_centroid_idx[j]]
-                else:
-                    labels[start + j] = -(start + j + 1)  # unique orphan label
+            # Only assign if close enough; otherwise a unique orphan label
+            labels[start:end] = np.where(
+                (1 - best_sims) < distance_threshold,
+                centroid_labels[best_centroid_idx],
+                -np.arange(start + 1, end + 1),
+            )
 
         return labels
 
+    @staticmethod
+    def _cluster_minibatch(
+        normalized: np.ndarray,
+        distance_threshold: float,
+        cfg: Optional[dict] = None,
+    ) -> np.ndarray:
+        """
+        Scalable clustering for large projects: every chunk is clustered.
+
+        See minibatch_agglomerative_cluster. Unlike _cluster_sampled there is
+        no O(sample²) distance matrix and no chunk is left out of the
+        cluster structure.
+        """
+        cfg = cfg if cfg is not None else get_chunk_clustering_config()
+        return minibatch_agglomerative_cluster(
+            normalized,
+            distance_threshold,
+            micro_cluster_size=cfg.get('micro_cluster_size', _DEFAULT_MICRO_CLUSTER_SIZE),
+            max_micro_clusters=cfg.get('max_micro_clusters', _DEFAULT_MAX_MICRO_CLUSTERS),
+        )
+
     @staticmethod
     def _fallback_cluster(
         normalized: np.ndarray,
@@ -316,38 +346,252 @@ class ChunkClusteringService:
         Assigns each embedding to the nearest existing cluster centroid
         if within threshold, otherwise creates a new cluster.
         """
-        n = len(normalized)
-        labels = np.full(n, -1, dtype=int)
-        centroids: List[np.ndarray] = []
-        cluster_counts: List[int] = []
-        next_label = 0
-
-        for i in range(n):
-            vec = normalized[i]
-
-            if centroids:
-                centroid_matrix = np.array(centroids)
-                sims = centroid_matrix @ vec
-                best_idx = int(np.argmax(sims))
-                best_sim = sims[best_idx]
-
-                if (1 - best_sim) < distance_threshold:
-                    labels[i] = best_idx
-                    # Update centroid incrementally
-                    count = cluster_counts[best_idx]
-                    centroids[best_idx] = (
-                        centroids[best_idx] * count + vec
-                    ) / (count + 1)
-                    norm = np.linalg.norm(centroids[best_idx])
-                    if norm > 0:
-                        centroids[best_idx] /= norm
-                    cluster_counts[best_idx] += 1
-                    continue
-
-            # Create new cluster
-            labels[i] = next_label
-            centroids.append(vec.copy())
-            cluster_counts.append(1)
-            next_label += 1
+        return greedy_threshold_cluster(normalized, distance_threshold)
+
+
+# ── Shared clustering primitives ──────────────────────────────────
+# Also used by HierarchicalClusteringService for Level 0→1 clustering.
+
+
+def greedy_threshold_cluster(
+    normalized: np.ndarray,
+    distance_threshold: float,
+) -> np.ndarray:
+    """
+    Single-pass greedy clustering: join the nearest running centroid if
+    within threshold, otherwise open a new cluster.
 
+    Centroids live in a preallocated matrix (grown by doubling) so each
+    step is one matrix-vector product instead of rebuilding the matrix.
+    """
+    n = len(normalized)
+    labels = np.full(n, -1, dtype=int)
+    if n == 0:
         return labels
+
+    centroids = np.empty((min(n, 64), normalized.shape[1]), dtype=float)
+    counts = np.zeros(len(centroids), dtype=int)
+    next_label = 0
+
+    for i in range(n):
+        vec = normalized[i]
+
+        if next_label:
+            sims = centroids[:next_label] @ vec
+            best_idx = int(np.argmax(sims))
+
+            if (1 - sims[best_idx]) < distance_threshold:
+                labels[i] = best_idx
+                # Update centroid incrementally
+                count = counts[best_idx]
+                centroid = (centroids[best_idx] * count + vec) / (count + 1)
+                norm = np.linalg.norm(centroid)
+                if norm > 0:
+                    centroid = centroid / norm
+                centroids[best_idx] = centroid
+                counts[best_idx] += 1
+                continue
+
+        # Create new cluster
+        if next_label == len(centroids):
+            centroids = np.vstack([centroids, np.empty_like(centroids)])
+            counts = np.concatenate([counts, np.zeros(len(counts), dtype=int)])
+        labels[i] = next_label
+        centroids[next_label] = vec
+        counts[next_label] = 1
+        next_label += 1
+
+    return labels
+
+
+def minibatch_agglomerative_cluster(
+    normalized: np.ndarray,
+    distance_threshold: float,
+    micro_cluster_size: int = _DEFAULT_MICRO_CLUSTER_SIZE,
+    max_micro_clusters: int = _DEFAULT_MAX_MICRO_CLUSTERS,
+    batch_size: int = 2048,
+    max_iter: int = 100,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    Average-linkage clustering over mini-batch k-means micro-clusters.
+
+    1. Spherical mini-batch k-means partitions all rows into
+       k = min(max_micro_clusters, n / micro_cluster_size) micro-clusters.
+    2. Micro-clusters are merged with average linkage until the closest
+       pair is ≥ distance_threshold apart.
+
+    For unit vectors the mean pairwise cosine distance between two groups
+    is exactly 1 - mean_a · mean_b, so step 2 is the same average-linkage
+    criterion sklearn applies to individual points — the only
+    approximation is that members of a micro-cluster always stay together.
+    Memory is O(n·d) for the input plus O(k²) for the merge (100MB at
+    the default k cap of 5000).
+    """
+    n = len(normalized)
+    if n < 2:
+        return np.zeros(n, dtype=int)
+
+    k = int(min(max_micro_clusters, max(2, -(-n // max(1, micro_cluster_size))), n))
+    rng = np.random.default_rng(seed)
+    assign = _spherical_kmeans(normalized, k, rng, batch_size, max_iter)
+
+    # Exact member means per micro-cluster, accumulated in blocks
+    k = int(assign.max()) + 1
+    counts = np.bincount(assign, minlength=k)
+    sums = np.zeros((k, normalized.shape[1]))
+    for start in range(0, n, batch_size):
+        block = assign[start:start + batch_size]
+        sums += _group_sums(
+            normalized[start:start + batch_size], block, np.bincount(block, minlength=k),
+        )
+
+    occupied = np.flatnonzero(counts)
+    micro_labels = _average_linkage_merge(
+        sums[occupied] / counts[occupied][:, None], counts[occupied], distance_threshold,
+    )
+
+    label_of_micro = np.full(k, -1, dtype=int)
+    label_of_micro[occupied] = micro_labels
+    return label_of_micro[assign]
+
+
+def _spherical_kmeans(
+    rows: np.ndarray,
+    k: int,
+    rng: np.random.Generator,
+    batch_size: int = 2048,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """
+    k-means on the unit sphere (cosine similarity); returns row → cluster.
+
+    Up to batch_size rows run full-batch Lloyd iterations; larger inputs
+    use mini-batch updates (running weighted means) for about three passes
+    over the data, then one full assignment pass in batch_size blocks.
+    """
+    n, dim = rows.shape
+    if k <= 1:
+        return np.zeros(n, dtype=int)
+
+    # Assignment only needs the argmax, so float32 products are plenty
+    rows = rows.astype(np.float32, copy=False)
+    centers = rows[rng.choice(n, size=k, replace=False)].copy()
+
+    if n <= batch_size:
+        assign = np.argmax(rows @ centers.T, axis=1)
+        for _ in range(min(max_iter, 20)):
+            counts = np.bincount(assign, minlength=k)
+            hit = counts > 0
+            centers[hit] = _normalize(_group_sums(rows, assign, counts)[hit])
+            new_assign = np.argmax(rows @ centers.T, axis=1)
+            if np.array_equal(new_assign, assign):
+                break
+            assign = new_assign
+        return assign
+
+    weights = np.ones(k, dtype=np.float32)
+    n_iter = min(max_iter, max(10, -(-3 * n // batch_size)))
+    for _ in range(n_iter):
+        batch = rows[rng.choice(n, size=batch_size, replace=False)]
+        nearest = np.argmax(batch @ centers.T, axis=1)
+        batch_counts = np.bincount(nearest, minlength=k)
+        batch_sums = _group_sums(batch, nearest, batch_counts)
+
+        hit = batch_counts > 0
+        new_weights = weights[hit] + batch_counts[hit]
+        centers[hit] = _normalize(
+            (centers[hit] * weights[hit][:, None] + batch_sums[hit]) / new_weights[:, None]
+        )
+        weights[hit] = new_weights
+
+    assign = np.empty(n, dtype=int)
+    for start in range(0, n, batch_size):
+        assign[start:start + batch_size] = np.argmax(
+            rows[start:start + batch_size] @ centers.T, axis=1,
+        )
+    return assign
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _group_sums(rows: np.ndarray, groups: np.ndarray, group_counts: np.ndarray) -> np.ndarray:
+    """Per-group row sums via one sort + reduceat (np.add.at is unbuffered and slow)."""
+    sums = np.zeros((len(group_counts), rows.shape[1]), dtype=rows.dtype)
+    non_empty = np.flatnonzero(group_counts)
+    if len(non_empty):
+        order = np.argsort(groups, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(group_counts[non_empty])[:-1]))
+        sums[non_empty] = np.add.reduceat(rows[order], starts, axis=0)
+    return sums
+
+
+def _average_linkage_merge(
+    means: np.ndarray,
+    counts: np.ndarray,
+    distance_threshold: float,
+) -> np.ndarray:
+    """
+    Average-linkage agglomeration of weighted groups (UPGMA).
+
+    ``means`` are unnormalized member means, so 1 - means @ means.T is the
+    mean pairwise cosine distance between groups. Merges proceed while the
+    closest pair is < distance_threshold, using the Lance–Williams update
+    and a nearest-neighbour cache. Returns a compact label per group.
+    """
+    m = len(means)
+    if m < 2:
+        return np.zeros(m, dtype=int)
+
+    # float32 keeps the k×k matrix at 100MB for k=5000
+    means = means.astype(np.float32)
+    dist = 1.0 - means @ means.T
+    np.fill_diagonal(dist, np.inf)
+    sizes = counts.astype(float)
+    active = np.ones(m, dtype=bool)
+    parent = np.arange(m)
+    nn = np.argmin(dist, axis=1)
+    nn_dist = dist[np.arange(m), nn]
+
+    while True:
+        a = int(np.argmin(nn_dist))
+        if nn_dist[a] >= distance_threshold:
+            break
+        b = int(nn[a])
+
+        # Merge b into a
+        merged = (sizes[a] * dist[a] + sizes[b] * dist[b]) / (sizes[a] + sizes[b])
+        merged[a] = np.inf
+        dist[a] = merged
+        dist[:, a] = merged
+        dist[b] = np.inf
+        dist[:, b] = np.inf
+        sizes[a] += sizes[b]
+        active[b] = False
+        parent[b] = a
+        nn_dist[b] = np.inf
+
+        # Refresh nearest neighbours that pointed at a or b
+        stale = np.flatnonzero(active & ((nn == a) | (nn == b)))
+        stale = np.union1d(stale, [a])
+        nn[stale] = np.argmin(dist[stale], axis=1)
+        nn_dist[stale] = dist[stale, nn[stale]]
+
+        # Others may now be closest to a (cannot happen for average
+        # linkage, but keeps the cache exact under float rounding)
+        closer = active & (merged < nn_dist)
+        nn[closer] = a
+        nn_dist[closer] = merged[closer]
+
+    # Resolve merge chains to roots and compact labels
+    roots = parent.copy()
+    while True:
+        next_roots = parent[roots]
+        if np.array_equal(next_roots, roots):
+            break
+        roots = next_roots
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels
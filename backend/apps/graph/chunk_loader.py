@@ -0,0 +1,152 @@
+"""
+Lean bulk loader for DocumentChunk embeddings.
+
+Clustering needs every chunk's embedding plus a little metadata (id,
+document, title, a text preview). Loading model instances with
+select_related('document') pulls the full Document row — including
+content_text — once per chunk, and list(c.embedding) turns each vector
+into 384 Python floats. For large projects that is gigabytes of
+transient memory.
+
+load_chunk_matrix() instead streams (id, document_id, title,
+text[:limit], embedding) tuples through a server-side cursor
+(QuerySet.iterator) into a preallocated float32 matrix and compact
+metadata columns. Text is truncated in SQL so full chunk text never
+leaves the database.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 384
+STREAM_CHUNK_SIZE = 2000
+
+
+@dataclass
+class ChunkMatrix:
+    """Chunk embeddings (one row per chunk) with column-oriented metadata."""
+    embeddings: np.ndarray                   # (n, dim) float32
+    ids: List[str] = field(default_factory=list)
+    doc_index: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    document_ids: List[str] = field(default_factory=list)     # per distinct document
+    document_titles: List[str] = field(default_factory=list)  # per distinct document
+    texts: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def document_count(self) -> int:
+        return len(self.document_ids)
+
+    def document_id(self, row: int) -> str:
+        return self.document_ids[self.doc_index[row]]
+
+    def document_title(self, row: int) -> str:
+        return self.document_titles[self.doc_index[row]]
+
+    def normalized(self) -> np.ndarray:
+        """L2-normalize the embedding rows in place (zero rows stay zero) and return them."""
+        norms = np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        np.divide(self.embeddings, np.where(norms == 0, 1, norms), out=self.embeddings)
+        return self.embeddings
+
+    def chunk_dicts(self) -> List[dict]:
+        """Per-chunk metadata dicts (no embeddings) for code that works row-wise."""
+        return [
+            {
+                'id': self.ids[i],
+                'document_id': self.document_id(i),
+                'document_title': self.document_title(i),
+                'text': self.texts[i],
+            }
+            for i in range(len(self.ids))
+        ]
+
+
+def load_chunk_matrix(
+    project_id: uuid.UUID,
+    document_ids: Optional[List[uuid.UUID]] = None,
+    text_limit: int = 500,
+) -> ChunkMatrix:
+    """
+    Stream a project's embedded chunks into a ChunkMatrix.
+
+    Ordered by (document, chunk_index), like the model-instance loaders it
+    replaces. Only the columns needed for clustering are selected.
+    """
+    from django.db.models.functions import Substr
+    from apps.projects.models import DocumentChunk
+
+    qs = DocumentChunk.objects.filter(
+        document__project_id=project_id,
+        embedding__isnull=False,
+    )
+    if document_ids:
+        qs = qs.filter(document_id__in=document_ids)
+
+    expected = qs.count()
+    rows = (
+        qs.order_by('document', 'chunk_index')
+        .annotate(text_preview=Substr('chunk_text', 1, text_limit))
+        .values_list('id', 'document_id', 'document__title', 'text_preview', 'embedding')
+        .iterator(chunk_size=STREAM_CHUNK_SIZE)
+    )
+    return fill_chunk_matrix(rows, expected)
+
+
+def fill_chunk_matrix(
+    rows: Iterable[tuple],
+    expected: int,
+    dim: int = EMBEDDING_DIM,
+) -> ChunkMatrix:
+    """
+    Copy (id, document_id, title, text, embedding) rows into a ChunkMatrix.
+
+    The matrix is preallocated for ``expected`` rows; it grows if more rows
+    arrive (chunks added while streaming) and is trimmed if fewer do.
+    """
+    embeddings = np.empty((max(expected, 0), dim), dtype=np.float32)
+    doc_index = np.empty(max(expected, 0), dtype=np.int32)
+    ids: List[str] = []
+    texts: List[str] = []
+    doc_positions: Dict[str, int] = {}
+    document_ids: List[str] = []
+    document_titles: List[str] = []
+
+    n = 0
+    for chunk_id, document_id, title, text, embedding in rows:
+        if n == len(embeddings):
+            grow = max(n, 1024)
+            embeddings = np.concatenate([embeddings, np.empty((grow, dim), dtype=np.float32)])
+            doc_index = np.concatenate([doc_index, np.empty(grow, dtype=np.int32)])
+
+        doc_key = str(document_id)
+        pos = doc_positions.get(doc_key)
+        if pos is None:
+            pos = doc_positions[doc_key] = len(document_ids)
+            document_ids.append(doc_key)
+            document_titles.append(title or '')
+
+        embeddings[n] = embedding
+        doc_index[n] = pos
+        ids.append(str(chunk_id))
+        texts.append(text or '')
+        n += 1
+
+    if n != expected:
+        logger.debug("chunk_loader_row_count_changed", extra={'expected': expected, 'loaded': n})
+
+    return ChunkMatrix(
+        embeddings=embeddings[:n],
+        ids=ids,
+        doc_index=doc_index[:n],
+        document_ids=document_ids,
+        document_titles=document_titles,
+        texts=texts,
+    )
@@ -8,7 +8,7 @@ Post-processing: semantic refinement using embedding similarity.
 import logging
 import uuid
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import numpy as np
 
@@ -18,6 +18,74 @@ from .services import GraphService
 logger = logging.getLogger(__name__)
 
 
+class NodeEmbeddingMatrix:
+    """
+    Embeddings of a node set stacked into one matrix.
+
+    Rows hold the raw vectors (centroids are means of raw embeddings) and
+    a row-normalized copy for cosine similarity. Nodes without an
+    embedding have no row.
+    """
+
+    def __init__(self, nodes: Iterable[Node]):
+        self.row_of: Dict[uuid.UUID, int] = {}
+        vectors = []
+        for node in nodes:
+            if node.embedding is not None and node.id not in self.row_of:
+                self.row_of[node.id] = len(vectors)
+                vectors.append(node.embedding)
+
+        if vectors:
+            self.vectors = np.asarray(vectors, dtype=np.float64)
+        else:
+            self.vectors = np.zeros((0, 0), dtype=np.float64)
+        self.normalized = _normalize_rows(self.vectors)
+
+    def __contains__(self, node_id: uuid.UUID) -> bool:
+        return node_id in self.row_of
+
+    def rows(self, node_ids: Iterable[uuid.UUID]) -> np.ndarray:
+        """Row indices for the given nodes (iteration order, skipping missing)."""
+        row_of = self.row_of
+        return np.fromiter(
+            (row_of[nid] for nid in node_ids if nid in row_of), dtype=np.intp,
+        )
+
+    def centroids(self, clusters: List[Set[uuid.UUID]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mean raw embedding per cluster via segment sums.
+
+        Returns (centroids (k, d), counts (k,)); clusters without any
+        embedded node get a zero row and count 0.
+        """
+        k = len(clusters)
+        dim = self.vectors.shape[1] if self.vectors.size else 0
+        sums = np.zeros((k, dim), dtype=np.float64)
+        counts = np.zeros(k, dtype=np.int64)
+
+        row_chunks = [self.rows(cluster) for cluster in clusters]
+        for idx, rows in enumerate(row_chunks):
+            counts[idx] = len(rows)
+
+        non_empty = np.flatnonzero(counts)
+        if len(non_empty):
+            all_rows = np.concatenate([row_chunks[i] for i in non_empty])
+            starts = np.concatenate(([0], np.cumsum(counts[non_empty])[:-1]))
+            sums[non_empty] = np.add.reduceat(self.vectors[all_rows], starts, axis=0)
+
+        safe_counts = np.where(counts == 0, 1, counts)
+        return sums / safe_counts[:, None], counts
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; zero rows stay zero (cosine similarity 0)."""
+    if matrix.size == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms = np.where(norms == 0, 1, norms)
+    return matrix / norms
+
+
 class ClusteringService:
     """Server-side node clustering for graph layout and summary generation."""
 
@@ -30,6 +98,7 @@ class ClusteringService:
         semantic_variance_threshold: float | None = None,
         merge_threshold: float | None = None,
         graph: Optional[Dict[str, List[Any]]] = None,
+        incremental: bool | None = None,
     ) -> List[Dict[str, Any]]:
         """
         Cluster project nodes into thematic groups.
@@ -41,6 +110,13 @@ class ClusteringService:
         3. Assign remaining orphans by embedding similarity
         4. Build result dicts with centroid, edge counts, type breakdown
 
+        Incremental mode (default, SUMMARY_SETTINGS['node_clustering']['incremental']):
+        the previous GraphPartition seeds Leiden's initial membership and
+        communities not touched by new/edited nodes or edges since the last
+        run are held fixed and reused verbatim. Cluster ids are carried over
+        by membership overlap, so they stay stable across runs. Falls back
+        to a full (still seeded) run when too much of the graph changed.
+
         Parameters fall back to SUMMARY_SETTINGS['node_clustering'] if not
         explicitly provided. This lets operators tune via env vars without
         code changes.
@@ -53,15 +129,21 @@ class ClusteringService:
                 'centroid_node_id': str,
                 'edge_count': int,
                 'node_types': {claim: N, evidence: N, ...},
+                'cluster_id': int,  # stable across runs
             }]
         """
         from django.conf import settings as django_settings
+        from django.utils import timezone
 
         cfg = getattr(django_settings, 'SUMMARY_SETTINGS', {}).get('node_clustering', {})
         resolution = resolution if resolution is not None else cfg.get('resolution', 1.0)
         similarity_threshold = similarity_threshold if similarity_threshold is not None else cfg.get('similarity_threshold', 0.6)
         merge_threshold = merge_threshold if merge_threshold is not None else cfg.get('merge_threshold', 0.75)
         semantic_variance_threshold = semantic_variance_threshold if semantic_variance_threshold is not None else cfg.get('semantic_variance_threshold', 0.7)
+        incremental = incremental if incremental is not None else cfg.get('incremental', True)
+
+        # Anything mutated after this point is re-optimized on the next run
+        started_at = timezone.now()
 
         if graph is None:
             graph = GraphService.get_project_graph(project_id)
@@ -72,17 +154,35 @@ class ClusteringService:
             return []
 
         nodes_by_id = {n.id: n for n in nodes}
+        embeddings = NodeEmbeddingMatrix(nodes_by_id.values())
 
-        # Step 1: Community detection
+        # Step 1: Community detection (seeded by the previous partition)
+        partition = (
+            ClusteringService._load_partition(project_id, resolution)
+            if incremental else None
+        )
+        seed = ClusteringService._seed_from_partition(
+            partition, nodes, edges,
+            max_touched_fraction=cfg.get('incremental_max_touched_fraction', 0.3),
+        )
+        reused: List[Set[uuid.UUID]] = []
         try:
             components = ClusteringService._build_leiden_communities(
                 nodes, edges, resolution=resolution,
+                initial_membership=seed['initial_membership'],
+                fixed_node_ids=seed['fixed'],
             )
+            if seed['fixed']:
+                # Untouched communities were final last run — skip refinement
+                reused = [c for c in components if c <= seed['fixed']]
+                components = [c for c in components if not c <= seed['fixed']]
             logger.info(
                 "leiden_clustering_complete",
                 extra={
                     'project_id': str(project_id),
-                    'communities': len(components),
+                    'communities': len(components) + len(reused),
+                    'reused_communities': len(reused),
+                    'mode': seed['mode'],
                     'resolution': resolution,
                 },
             )
@@ -90,17 +190,19 @@ class ClusteringService:
             logger.info("leidenalg not available, falling back to Union-Find")
             components = ClusteringService._build_connected_components(nodes, edges)
 
-        # Step 2: Separate real clusters from orphans
-        clusters: List[Set[uuid.UUID]] = []
+        # Step 2: Separate real clusters from orphans. Reused communities
+        # go through the same size filter, so an undersized one is orphaned
+        # exactly as in a full run instead of coming back as a cluster.
         orphan_nodes: List[Node] = []
 
-        for component in components:
-            if len(component) >= min_cluster_size:
-                clusters.append(component)
-            else:
-                for node_id in component:
-                    if node_id in nodes_by_id:
-                        orphan_nodes.append(nodes_by_id[node_id])
+        def _keep(community: Set[uuid.UUID]) -> bool:
+            if len(community) >= min_cluster_size:
+                return True
+            orphan_nodes.extend(nodes_by_id[nid] for nid in community if nid in nodes_by_id)
+            return False
+
+        clusters: List[Set[uuid.UUID]] = [c for c in components if _keep(c)]
+        reused = [c for c in reused if _keep(c)]
 
         # Step 3: Semantic refinement — split high-variance, merge small
         if clusters:
@@ -109,12 +211,16 @@ class ClusteringService:
                 variance_threshold=semantic_variance_threshold,
                 merge_threshold=merge_threshold,
                 min_cluster_size=min_cluster_size,
+                embeddings=embeddings,
             )
 
+        clusters = reused + clusters
+
         # Step 4: Assign orphans by embedding similarity
         if orphan_nodes and clusters:
             clusters = ClusteringService._assign_orphans_by_embedding(
                 orphan_nodes, clusters, nodes_by_id, similarity_threshold,
+                embeddings=embeddings,
             )
         elif orphan_nodes and not clusters:
             for node in orphan_nodes:
@@ -126,11 +232,16 @@ class ClusteringService:
             edge_index[edge.source_node_id].add(edge.target_node_id)
             edge_index[edge.target_node_id].add(edge.source_node_id)
 
+        clusters = [c for c in clusters if c]
+        cluster_ids, next_cluster_id = ClusteringService._assign_stable_cluster_ids(
+            clusters,
+            partition.membership if partition else {},
+            partition.next_cluster_id if partition else 0,
+        )
+
         result = []
-        for cluster_set in clusters:
+        for cluster_set, cluster_id in zip(clusters, cluster_ids):
             node_ids = list(cluster_set) if isinstance(cluster_set, set) else list(cluster_set)
-            if not node_ids:
-                continue
 
             node_types: Dict[str, int] = defaultdict(int)
             for nid in node_ids:
@@ -161,11 +272,178 @@ class ClusteringService:
                 'edge_count': internal_edges,
                 'node_types': dict(node_types),
                 'label': label,
+                'cluster_id': cluster_id,
             })
 
         result.sort(key=lambda c: len(c['node_ids']), reverse=True)
+
+        if incremental:
+            ClusteringService._save_partition(
+                project_id, resolution, result, next_cluster_id, started_at,
+                metadata={
+                    'mode': seed['mode'],
+                    'touched_nodes': seed['touched_count'],
+                    'fixed_nodes': len(seed['fixed']),
+                    'reused_clusters': len(reused),
+                    'node_count': len(nodes),
+                },
+            )
         return result
 
+    # ── Incremental partition state ──────────────────────────────
+
+    @staticmethod
+    def _load_partition(project_id: uuid.UUID, resolution: float):
+        """Previous GraphPartition for (project, resolution), or None."""
+        from .models import GraphPartition
+
+        try:
+            return GraphPartition.objects.filter(
+                project_id=project_id, resolution=resolution,
+            ).first()
+        except Exception:
+            logger.warning("Failed to load graph partition for %s", project_id, exc_info=True)
+            return None
+
+    @staticmethod
+    def _save_partition(
+        project_id: uuid.UUID,
+        resolution: float,
+        clusters: List[Dict[str, Any]],
+        next_cluster_id: int,
+        computed_at,
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Persist this run's membership to seed the next run (non-critical)."""
+        from .models import GraphPartition
+
+        membership = {
+            nid: cluster['cluster_id']
+            for cluster in clusters
+            for nid in cluster['node_ids']
+        }
+        try:
+            GraphPartition.objects.update_or_create(
+                project_id=project_id,
+                resolution=resolution,
+                defaults={
+                    'membership': membership,
+                    'next_cluster_id': next_cluster_id,
+                    'computed_at': computed_at,
+                    'metadata': metadata,
+                },
+            )
+        except Exception:
+            logger.warning("Failed to save graph partition for %s", project_id, exc_info=True)
+
+    @staticmethod
+    def _seed_from_partition(
+        partition,
+        nodes: List[Node],
+        edges: List[Edge],
+        max_touched_fraction: float = 0.3,
+    ) -> Dict[str, Any]:
+        """
+        Work out which part of the graph changed since the previous partition.
+
+        A previous cluster is "touched" if it contains a new or edited node,
+        an endpoint of a clustering edge created/edited since the partition
+        was computed, or a node that has since been deleted. Nodes of
+        untouched clusters are held fixed; everything else is re-optimized.
+
+        Returns:
+            {
+                'mode': 'full' | 'seeded' | 'incremental',
+                'initial_membership': {node_id: seed community} or None,
+                'fixed': set of node ids whose membership is fixed,
+                'touched_count': int,
+            }
+        """
+        seed = {'mode': 'full', 'initial_membership': None, 'fixed': set(), 'touched_count': len(nodes)}
+        if partition is None or not partition.membership:
+            return seed
+
+        current_ids = {n.id for n in nodes}
+        previous: Dict[uuid.UUID, int] = {}
+        removed_clusters: Set[int] = set()
+        for nid_str, cluster_id in partition.membership.items():
+            nid = uuid.UUID(nid_str)
+            if nid in current_ids:
+                previous[nid] = cluster_id
+            else:
+                removed_clusters.add(cluster_id)
+
+        since = partition.computed_at
+
+        def changed(obj) -> bool:
+            updated_at = getattr(obj, 'updated_at', None)
+            return since is None or updated_at is None or updated_at > since
+
+        touched: Set[uuid.UUID] = {
+            n.id for n in nodes if n.id not in previous or changed(n)
+        }
+        clustering_types = {EdgeType.SUPPORTS, EdgeType.DEPENDS_ON}
+        for edge in edges:
+            if edge.edge_type in clustering_types and changed(edge):
+                touched.add(edge.source_node_id)
+                touched.add(edge.target_node_id)
+        touched &= current_ids
+
+        touched_clusters = removed_clusters | {
+            previous[nid] for nid in touched if nid in previous
+        }
+        seed['initial_membership'] = previous
+        seed['touched_count'] = len(touched)
+
+        if not nodes or len(touched) / len(nodes) > max_touched_fraction:
+            seed['mode'] = 'seeded'
+            return seed
+
+        seed['mode'] = 'incremental'
+        seed['fixed'] = {
+            nid for nid, cluster_id in previous.items()
+            if cluster_id not in touched_clusters
+        }
+        return seed
+
+    @staticmethod
+    def _assign_stable_cluster_ids(
+        clusters: List[Set[uuid.UUID]],
+        previous_membership: Dict[str, int],
+        next_cluster_id: int,
+    ) -> Tuple[List[int], int]:
+        """
+        Carry cluster ids over from the previous run by membership overlap.
+
+        Greedy one-to-one matching on overlap size (largest first); clusters
+        with no remaining match get fresh ids, which are never reused.
+
+        Returns (ids aligned with clusters, next unused id).
+        """
+        candidates: List[Tuple[int, int, int]] = []
+        for idx, cluster in enumerate(clusters):
+            overlap: Dict[int, int] = defaultdict(int)
+            for nid in cluster:
+                prev_id = previous_membership.get(str(nid))
+                if prev_id is not None:
+                    overlap[prev_id] += 1
+            candidates.extend((count, idx, prev_id) for prev_id, count in overlap.items())
+
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+        ids: List[Optional[int]] = [None] * len(clusters)
+        taken: Set[int] = set()
+        for _count, idx, prev_id in candidates:
+            if ids[idx] is None and prev_id not in taken:
+                ids[idx] = prev_id
+                taken.add(prev_id)
+
+        next_cluster_id = max([next_cluster_id, *(cid + 1 for cid in taken)])
+        for idx in range(len(ids)):
+            if ids[idx] is None:
+                ids[idx] = next_cluster_id
+                next_cluster_id += 1
+        return ids, next_cluster_id
+
     # ── Leiden community detection ────────────────────────────────
 
     @staticmethod
@@ -173,6 +451,8 @@ class ClusteringService:
         nodes: List[Node],
         edges: List[Edge],
         resolution: float = 1.0,
+        initial_membership: Optional[Dict[uuid.UUID, int]] = None,
+        fixed_node_ids: Optional[Set[uuid.UUID]] = None,
     ) -> List[Set[uuid.UUID]]:
         """
         Leiden community detection via igraph + leidenalg.
@@ -181,6 +461,10 @@ class ClusteringService:
         Only supports/depends_on edges are used for clustering;
         contradicts edges connect opposing nodes and should not cluster together.
 
+        initial_membership seeds the optimiser with a previous partition
+        (nodes missing from it start as singletons); nodes in fixed_node_ids
+        keep their seeded community, though free nodes may still join it.
+
         Raises ImportError if leidenalg is not installed.
         """
         import igraph as ig
@@ -208,12 +492,35 @@ class ClusteringService:
             g.add_edges(edge_list)
             g.es['weight'] = edge_weights
 
-        partition = la.find_partition(
-            g,
-            la.RBConfigurationVertexPartition,
-            weights='weight' if edge_list else None,
-            resolution_parameter=resolution,
-        )
+        if initial_membership:
+            # Remap stable cluster ids to contiguous community indices
+            community_index: Dict[int, int] = {}
+            membership = []
+            next_index = 0
+            for nid in node_ids:
+                key = initial_membership.get(nid)
+                if key is not None and key in community_index:
+                    membership.append(community_index[key])
+                    continue
+                if key is not None:
+                    community_index[key] = next_index
+                membership.append(next_index)
+                next_index += 1
+            partition = la.RBConfigurationVertexPartition(
+                g,
+                initial_membership=membership,
+                weights='weight' if edge_list else None,
+                resolution_parameter=resolution,
+            )
+            fixed = [nid in fixed_node_ids for nid in node_ids] if fixed_node_ids else None
+            la.Optimiser().optimise_partition(partition, n_iterations=2, is_membership_fixed=fixed)
+        else:
+            partition = la.find_partition(
+                g,
+                la.RBConfigurationVertexPartition,
+                weights='weight' if edge_list else None,
+                resolution_parameter=resolution,
+            )
 
         communities: List[Set[uuid.UUID]] = []
         for community_indices in partition:
@@ -273,44 +580,44 @@ class ClusteringService:
         variance_threshold: float = 0.7,
         merge_threshold: float = 0.75,
         min_cluster_size: int = 2,
+        embeddings: Optional[NodeEmbeddingMatrix] = None,
     ) -> List[Set[uuid.UUID]]:
         """
         Post-Leiden semantic refinement:
         1. Split clusters with high embedding variance (semantically diverse)
         2. Merge small clusters whose centroids are semantically close
+
+        Works on a single embedding matrix: variance from the norm of the
+        summed unit vectors, centroids via segment sums, and merge
+        candidates from one centroid similarity matrix.
         """
-        from apps.common.vector_utils import cosine_similarity
+        if embeddings is None:
+            embeddings = NodeEmbeddingMatrix(nodes_by_id.values())
 
         refined: List[Set[uuid.UUID]] = []
 
         # Phase 1: Split high-variance clusters
         for cluster in clusters:
-            embeddings = {}
-            for nid in cluster:
-                node = nodes_by_id.get(nid)
-                if node and node.embedding is not None:
-                    embeddings[nid] = np.array(node.embedding)
-
-            if len(embeddings) < 4:
+            rows = embeddings.rows(cluster)
+            n = len(rows)
+            if n < 4:
                 refined.append(cluster)
                 continue
 
-            # Compute intra-cluster variance (mean pairwise cosine distance)
-            emb_list = list(embeddings.values())
-            emb_matrix = np.stack(emb_list)
-            norms = np.linalg.norm(emb_matrix, axis=1, keepdims=True)
-            norms = np.where(norms == 0, 1, norms)
-            normalized = emb_matrix / norms
-            sim_matrix = normalized @ normalized.T
-            n = len(emb_list)
-            triu_indices = np.triu_indices(n, k=1)
-            mean_sim = float(np.mean(sim_matrix[triu_indices])) if len(triu_indices[0]) > 0 else 1.0
+            # Mean pairwise cosine similarity without the n×n matrix:
+            # sum_{i!=j} u_i·u_j = |sum u|² - sum |u_i|²
+            unit = embeddings.normalized[rows]
+            total = unit.sum(axis=0)
+            pair_sum = float(total @ total) - float(np.einsum('ij,ij->', unit, unit))
+            mean_sim = pair_sum / (n * (n - 1))
             variance = 1.0 - mean_sim
 
             if variance > variance_threshold:
-                nid_list = list(embeddings.keys())
-                sub_a, sub_b = ClusteringService._split_2means(nid_list, embeddings)
-                no_emb = cluster - set(embeddings.keys())
+                nid_list = [nid for nid in cluster if nid in embeddings]
+                sub_a, sub_b = ClusteringService._split_2means(
+                    nid_list, embeddings.vectors[rows],
+                )
+                no_emb = cluster - set(nid_list)
                 if len(sub_a) >= len(sub_b):
                     sub_a |= no_emb
                 else:
@@ -321,44 +628,32 @@ class ClusteringService:
                 refined.append(cluster)
 
         # Phase 2: Merge small clusters with similar centroids
-        cluster_centroids: List[Optional[np.ndarray]] = []
-        for cluster in refined:
-            embs = []
-            for nid in cluster:
-                node = nodes_by_id.get(nid)
-                if node and node.embedding is not None:
-                    embs.append(np.array(node.embedding))
-            if embs:
-                cluster_centroids.append(np.mean(embs, axis=0))
-            else:
-                cluster_centroids.append(None)
+        centroids, counts = embeddings.centroids(refined)
+        has_centroid = counts > 0
+        small = [
+            i for i, cluster in enumerate(refined)
+            if len(cluster) < min_cluster_size and has_centroid[i]
+        ]
 
         merged_into: Dict[int, int] = {}
-        for i in range(len(refined)):
-            if i in merged_into:
-                continue
-            if len(refined[i]) >= min_cluster_size:
-                continue
-            if cluster_centroids[i] is None:
-                continue
-
-            best_sim = -1.0
-            best_j = -1
-            for j in range(len(refined)):
-                if i == j or j in merged_into:
+        if small:
+            unit_centroids = _normalize_rows(centroids)
+            sims = unit_centroids[small] @ unit_centroids.T
+            # Clusters without embeddings never receive merges
+            sims[:, ~has_centroid] = -np.inf
+
+            # Order matters: a cluster merged away is no longer a target
+            for row, i in enumerate(small):
+                if i in merged_into:
                     continue
-                if cluster_centroids[j] is None:
-                    continue
-                sim = cosine_similarity(
-                    cluster_centroids[i].tolist(),
-                    cluster_centroids[j].tolist(),
-                )
-                if sim > best_sim:
-                    best_sim = sim
-                    best_j = j
-
-            if best_sim >= merge_threshold and best_j >= 0:
-                merged_into[i] = best_j
+                candidates = sims[row].copy()
+                candidates[i] = -np.inf
+                if merged_into:
+                    candidates[list(merged_into)] = -np.inf
+                best_j = int(np.argmax(candidates))
+                best_sim = candidates[best_j]
+                if best_sim > -1.0 and best_sim >= merge_threshold:
+                    merged_into[i] = best_j
 
         final: List[Set[uuid.UUID]] = []
         for i, cluster in enumerate(refined):
@@ -373,13 +668,14 @@ class ClusteringService:
     @staticmethod
     def _split_2means(
         node_ids: List[uuid.UUID],
-        embeddings: Dict[uuid.UUID, np.ndarray],
+        emb_matrix: np.ndarray,
         max_iterations: int = 10,
     ) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
         """
         Simple 2-means clustering on embeddings. No sklearn dependency.
+
+        emb_matrix rows are aligned with node_ids.
         """
-        emb_matrix = np.stack([embeddings[nid] for nid in node_ids])
 
         centroid_a = emb_matrix[0].copy()
         distances = np.linalg.norm(emb_matrix - centroid_a, axis=1)
@@ -417,61 +713,58 @@ class ClusteringService:
         clusters: List[Set[uuid.UUID]],
         all_nodes_by_id: Dict[uuid.UUID, Node],
         similarity_threshold: float,
+        embeddings: Optional[NodeEmbeddingMatrix] = None,
     ) -> List[Set[uuid.UUID]]:
         """
         Assign orphaned nodes to the nearest cluster by embedding cosine similarity.
         Nodes below the threshold remain as singletons.
 
-        Centroids are computed once upfront using numpy vectorized ops,
-        then incrementally updated as orphans are assigned.
+        All orphan/centroid similarities come from one matmul. Orphans are
+        still assigned in order: when one joins a cluster, that cluster's
+        centroid is updated incrementally and only its similarity column
+        is recomputed for the orphans that follow.
         """
-        from apps.common.vector_utils import cosine_similarity
-
-        # Pre-compute cluster centroids and embedding counts (vectorized)
-        cluster_centroids: List[Optional[np.ndarray]] = []
-        cluster_emb_counts: List[int] = []
-        for cluster_set in clusters:
-            embs = []
-            for nid in cluster_set:
-                node = all_nodes_by_id.get(nid)
-                if node and node.embedding is not None:
-                    embs.append(np.array(node.embedding))
-            if embs:
-                cluster_centroids.append(np.mean(embs, axis=0))
-                cluster_emb_counts.append(len(embs))
-            else:
-                cluster_centroids.append(None)
-                cluster_emb_counts.append(0)
+        if embeddings is None:
+            embeddings = NodeEmbeddingMatrix(
+                list(all_nodes_by_id.values()) + list(orphan_nodes)
+            )
+
+        centroids, counts = embeddings.centroids(clusters)
+        has_centroid = counts > 0
+
+        embedded = [o for o in orphan_nodes if o.id in embeddings]
+        orphan_rows = embeddings.rows(o.id for o in embedded)
+        orphan_unit = embeddings.normalized[orphan_rows]
+        position = {o.id: pos for pos, o in enumerate(embedded)}
+
+        if len(embedded) and len(clusters):
+            sims = orphan_unit @ _normalize_rows(centroids).T
+            sims[:, ~has_centroid] = -np.inf
+        else:
+            sims = np.full((len(embedded), len(clusters)), -np.inf)
 
         for orphan in orphan_nodes:
-            if orphan.embedding is None:
+            pos = position.get(orphan.id)
+            if pos is None:
                 clusters.append({orphan.id})
-                cluster_centroids.append(None)
-                cluster_emb_counts.append(0)
                 continue
 
-            orphan_emb = np.array(orphan.embedding)
-            best_sim = -1.0
-            best_idx = -1
+            best_idx = int(np.argmax(sims[pos])) if sims.shape[1] else -1
+            best_sim = sims[pos, best_idx] if best_idx >= 0 else -np.inf
 
-            for idx, centroid in enumerate(cluster_centroids):
-                if centroid is None:
-                    continue
-                sim = cosine_similarity(orphan_emb.tolist(), centroid.tolist())
-                if sim > best_sim:
-                    best_sim = sim
-                    best_idx = idx
-
-            if best_sim >= similarity_threshold and best_idx >= 0:
+            if best_idx >= 0 and best_sim > -1.0 and best_sim >= similarity_threshold:
                 clusters[best_idx].add(orphan.id)
                 # Incrementally update centroid: new_mean = (old_mean * n + new) / (n + 1)
-                n = cluster_emb_counts[best_idx]
-                cluster_centroids[best_idx] = (cluster_centroids[best_idx] * n + orphan_emb) / (n + 1)
-                cluster_emb_counts[best_idx] = n + 1
+                n = counts[best_idx]
+                orphan_emb = embeddings.vectors[orphan_rows[pos]]
+                centroids[best_idx] = (centroids[best_idx] * n + orphan_emb) / (n + 1)
+                counts[best_idx] = n + 1
+                if pos + 1 < len(embedded):
+                    updated = _normalize_rows(centroids[best_idx:best_idx + 1])[0]
+                    sims[pos + 1:, best_idx] = orphan_unit[pos + 1:] @ updated
             else:
+                # New singletons have no centroid and never receive orphans
                 clusters.append({orphan.id})
-                cluster_centroids.append(None)
-                cluster_emb_counts.append(0)
 
         return clusters
 
@@ -488,47 +781,51 @@ class ClusteringService:
         Conductance = cut(S) / min(vol(S), vol(V\\S))
         where cut(S) = edges with exactly one endpoint in S,
               vol(S) = sum of degrees of nodes in S.
+
+        Edges are mapped once to integer endpoint arrays; degrees, volumes,
+        internal edge counts and cut sizes are then bincounts over the
+        cluster membership vector (O(E + N) instead of O(clusters × E)).
         """
-        all_node_ids: Set[str] = set()
+        node_index: Dict[str, int] = {}
         for c in clusters:
-            all_node_ids.update(c['node_ids'])
+            for nid in c['node_ids']:
+                if nid not in node_index:
+                    node_index[nid] = len(node_index)
 
-        degree: Dict[str, int] = defaultdict(int)
-        edge_endpoints: List[Tuple[str, str]] = []
+        src_list: List[int] = []
+        tgt_list: List[int] = []
         for e in edges:
-            src = str(e.source_node_id)
-            tgt = str(e.target_node_id)
-            if src in all_node_ids and tgt in all_node_ids:
-                degree[src] += 1
-                degree[tgt] += 1
-                edge_endpoints.append((src, tgt))
+            src = node_index.get(str(e.source_node_id))
+            tgt = node_index.get(str(e.target_node_id))
+            if src is not None and tgt is not None:
+                src_list.append(src)
+                tgt_list.append(tgt)
+
+        n_nodes = len(node_index)
+        src_idx = np.asarray(src_list, dtype=np.int64)
+        tgt_idx = np.asarray(tgt_list, dtype=np.int64)
+        degree = (
+            np.bincount(src_idx, minlength=n_nodes)
+            + np.bincount(tgt_idx, minlength=n_nodes)
+        )
 
-        total_edges = len(edge_endpoints)
-        total_vol = sum(degree.values())
+        total_edges = len(src_list)
+        total_vol = int(degree.sum())
+        internal, cut, vol, sizes = ClusteringService._cluster_edge_counts(
+            clusters, node_index, src_idx, tgt_idx, degree,
+        )
 
         per_cluster = []
-        for idx, cluster in enumerate(clusters):
-            node_set = set(cluster['node_ids'])
-            n = len(node_set)
-
-            vol_s = sum(degree.get(nid, 0) for nid in node_set)
+        for idx in range(len(clusters)):
+            n = sizes[idx]
+            vol_s = vol[idx]
             vol_complement = total_vol - vol_s
 
-            cut = 0
-            internal = 0
-            for src, tgt in edge_endpoints:
-                src_in = src in node_set
-                tgt_in = tgt in node_set
-                if src_in and tgt_in:
-                    internal += 1
-                elif src_in or tgt_in:
-                    cut += 1
-
             min_vol = min(vol_s, vol_complement) if vol_complement > 0 else vol_s
-            conductance = cut / min_vol if min_vol > 0 else 0.0
+            conductance = cut[idx] / min_vol if min_vol > 0 else 0.0
 
             max_possible = n * (n - 1) / 2
-            density = internal / max_possible if max_possible > 0 else 0.0
+            density = internal[idx] / max_possible if max_possible > 0 else 0.0
 
             per_cluster.append({
                 'cluster_index': idx,
@@ -546,12 +843,8 @@ class ClusteringService:
         modularity = 0.0
         if total_edges > 0:
             m2 = 2 * total_edges
-            for cluster in clusters:
-                node_set = set(cluster['node_ids'])
-                e_c = sum(1 for src, tgt in edge_endpoints
-                          if src in node_set and tgt in node_set)
-                a_c = sum(degree.get(nid, 0) for nid in node_set)
-                modularity += e_c / m2 - (a_c / m2) ** 2
+            for idx in range(len(clusters)):
+                modularity += internal[idx] / m2 - (vol[idx] / m2) ** 2
 
         return {
             'modularity': round(modularity, 4),
@@ -559,6 +852,56 @@ class ClusteringService:
             'per_cluster': per_cluster,
         }
 
+    @staticmethod
+    def _cluster_edge_counts(
+        clusters: List[Dict[str, Any]],
+        node_index: Dict[str, int],
+        src_idx: np.ndarray,
+        tgt_idx: np.ndarray,
+        degree: np.ndarray,
+    ) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """
+        Internal edge count, cut size, volume and size per cluster.
+
+        Disjoint clusters use one membership vector; if a node appears in
+        several clusters each cluster is evaluated with its own mask.
+        """
+        member_rows = [
+            np.fromiter({node_index[nid] for nid in c['node_ids']}, dtype=np.int64)
+            for c in clusters
+        ]
+        sizes = [len(rows) for rows in member_rows]
+        k = len(clusters)
+
+        if sum(sizes) == len(node_index):
+            membership = np.empty(len(node_index), dtype=np.int64)
+            for idx, rows in enumerate(member_rows):
+                membership[rows] = idx
+            src_c = membership[src_idx]
+            tgt_c = membership[tgt_idx]
+            same = src_c == tgt_c
+            internal = np.bincount(src_c[same], minlength=k)
+            cut = (
+                np.bincount(src_c[~same], minlength=k)
+                + np.bincount(tgt_c[~same], minlength=k)
+            )
+            vol = np.bincount(membership, weights=degree, minlength=k)
+            return (
+                internal.tolist(), cut.tolist(),
+                [int(v) for v in vol], sizes,
+            )
+
+        internal, cut, vol = [], [], []
+        for rows in member_rows:
+            mask = np.zeros(len(node_index), dtype=bool)
+            mask[rows] = True
+            src_in = mask[src_idx]
+            tgt_in = mask[tgt_idx]
+            internal.append(int(np.count_nonzero(src_in & tgt_in)))
+            cut.append(int(np.count_nonzero(src_in ^ tgt_in)))
+            vol.append(int(degree[rows].sum()))
+        return internal, cut, vol, sizes
+
     # ── Cluster labeling ─────────────────────────────────────────
 
     @staticmethod
@@ -15,6 +15,7 @@ from apps.events.models import EventType, ActorType
 from apps.events.services import EventService
 
 from .models import GraphDelta, DeltaTrigger, Node, Edge
+from .revision import bump_graph_revision
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,8 @@ class GraphDeltaService:
         nodes_added: Optional[List[Node]] = None,
         nodes_updated: Optional[List[Node]] = None,
         edges_added: Optional[List[Edge]] = None,
+        nodes_removed: Optional[List[uuid.UUID]] = None,
+        edges_removed: Optional[List[uuid.UUID]] = None,
         tensions_surfaced: int = 0,
         assumptions_challenged: int = 0,
         narrative: str = '',
@@ -55,6 +58,8 @@ class GraphDeltaService:
             nodes_added: List of newly created nodes
             nodes_updated: List of updated nodes
             edges_added: List of newly created edges
+            nodes_removed: Ids of deleted nodes
+            edges_removed: Ids of deleted edges (including cascaded ones)
             tensions_surfaced: Number of tensions detected
             assumptions_challenged: Number of assumptions challenged
             narrative: Human-readable summary (generated by LLM or template)
@@ -96,6 +101,11 @@ class GraphDeltaService:
                 for e in edges_added
             ],
         }
+        # Removed ids are what delta sync learns deletes from
+        if nodes_removed:
+            patch['nodes_removed'] = [str(nid) for nid in nodes_removed]
+        if edges_removed:
+            patch['edges_removed'] = [str(eid) for eid in edges_removed]
 
         # Generate narrative from template if not provided
         if not narrative:
@@ -122,6 +132,8 @@ class GraphDeltaService:
             assumptions_challenged=assumptions_challenged,
             source_document=source_document,
             source_message=source_message,
+            # Graph health counts deltas, so a new delta is a new revision too
+            revision=bump_graph_revision(project_id),
         )
 
         # Emit event
@@ -80,6 +80,8 @@ class GraphEditHandler:
         nodes_updated: List[Node] = []
         edges_added = []
         nodes_removed = 0
+        removed_node_ids: List[uuid.UUID] = []
+        removed_edge_ids: List[uuid.UUID] = []
 
         for i, edit in enumerate(edits):
             action = edit.get('action', '')
@@ -113,6 +115,8 @@ class GraphEditHandler:
                     )
                     if removed:
                         nodes_removed += 1
+                        removed_node_ids.extend(removed['node_ids'])
+                        removed_edge_ids.extend(removed['edge_ids'])
 
                 else:
                     logger.warning(
@@ -142,6 +146,8 @@ class GraphEditHandler:
                 nodes_added=nodes_added,
                 nodes_updated=nodes_updated,
                 edges_added=edges_added,
+                nodes_removed=removed_node_ids,
+                edges_removed=removed_edge_ids,
                 tensions_surfaced=len(tensions),
                 assumptions_challenged=len(challenged),
             )
@@ -294,16 +300,15 @@ def _handle_update_node(edit, project_id, ref_map) -> Optional[Node]:
     return GraphService.update_node(node.id, **updates)
 
 
-def _handle_remove_node(edit, project_id, ref_map) -> bool:
-    """Handle a remove_node action."""
+def _handle_remove_node(edit, project_id, ref_map) -> Optional[Dict[str, list]]:
+    """Handle a remove_node action. Returns the removed node/edge ids."""
     ref = edit.get('ref', '')
     if not ref:
-        return False
+        return None
 
     node = _resolve_ref(ref, project_id, ref_map, {})
     if not node:
         logger.warning("Could not resolve remove ref: %s", ref)
-        return False
+        return None
 
-    GraphService.remove_node(node.id)
-    return True
+    return GraphService.remove_node(node.id)
@@ -32,6 +32,7 @@ from .models import (
     NodeType, NodeStatus, EdgeType,
     VALID_STATUSES_BY_TYPE, DEFAULT_STATUS_BY_TYPE,
 )
+from .revision import bump_graph_revision
 from .services import GraphService
 
 logger = logging.getLogger(__name__)
@@ -278,6 +279,7 @@ def extract_nodes_from_document(
                 )
 
             Node.objects.bulk_update(created_nodes, ['embedding', 'properties'])
+            bump_graph_revision(project_id)
         except Exception:
             logger.warning(
                 "Batch embedding generation failed for nodes",
@@ -520,8 +522,8 @@ def _extract_long_document(
 
 async def _generate_summary_async(title: str, text: str) -> str:
     """Generate a brief document summary via Haiku for section extraction context."""
-    from apps.common.llm_providers import get_llm_provider
-    provider = get_llm_provider('fast')
+    from apps.common.llm_providers import Priority, get_llm_provider
+    provider = get_llm_provider('fast', priority=Priority.BACKGROUND)
 
     truncated = text[:32000]
 
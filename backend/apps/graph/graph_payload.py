@@ -0,0 +1,190 @@
+"""
+Columnar graph payload — the lean wire format for large project graphs.
+
+The default graph response is NodeSerializer/EdgeSerializer rows: every
+node repeats its field names and every edge repeats both endpoints'
+content. For a 5,000-node graph most of the bytes (and most of the
+serializer time) are that repetition.
+
+The columnar format (``?shape=columnar`` on the graph endpoint) sends one
+array per field instead, with edges referring to nodes by their position
+in the node arrays:
+
+    {
+        "format": "columnar",
+        "nodes": {"id": [...], "node_type": [...], "content": [...], ...},
+        "edges": {"source": [0, 3, ...], "target": [2, 1, ...], "id": [...], ...},
+        "total_node_count": 5000,
+        "truncated": false
+    }
+
+Rows are read with values_list() projections (no embeddings, no model
+instances) and encoded with orjson when it is installed.
+
+The NDJSON export (streaming_views.graph_export_stream) reuses the same
+columns, one JSON object per line, and walks the whole graph in keyset
+pages instead of truncating at GRAPH_MAX_LIMIT.
+"""
+import json
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Same fields, order and meaning as NodeSerializer / EdgeSerializer
+NODE_COLUMNS = (
+    'id',
+    'node_type',
+    'status',
+    'content',
+    'properties',
+    'project',
+    'case',
+    'scope',
+    'source_type',
+    'source_document',
+    'source_document_title',
+    'confidence',
+    'created_at',
+    'updated_at',
+)
+EDGE_COLUMNS = (
+    'id',
+    'edge_type',
+    'strength',
+    'provenance',
+    'source_type',
+    'created_at',
+)
+
+_NODE_FIELDS = tuple(
+    'source_document__title' if column == 'source_document_title' else column
+    for column in NODE_COLUMNS
+)
+
+
+def _columns(names: Sequence[str], rows: Sequence[tuple]) -> Dict[str, list]:
+    if not rows:
+        return {name: [] for name in names}
+    return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+
+def build_columnar_graph(
+    node_rows: Sequence[tuple],
+    edge_rows: Iterable[tuple],
+    *,
+    total_node_count: int,
+) -> Dict[str, Any]:
+    """Columnar payload from node rows (NODE_COLUMNS order) and edge rows.
+
+    Edge rows are (source_node_id, target_node_id, *EDGE_COLUMNS); edges
+    with an endpoint outside ``node_rows`` are dropped.
+    """
+    position = {row[0]: i for i, row in enumerate(node_rows)}
+    edges = []
+    for source_id, target_id, *rest in edge_rows:
+        source = position.get(source_id)
+        target = position.get(target_id)
+        if source is not None and target is not None:
+            edges.append((source, target, *rest))
+    return {
+        'format': 'columnar',
+        'nodes': _columns(NODE_COLUMNS, node_rows),
+        'edges': _columns(('source', 'target') + EDGE_COLUMNS, edges),
+        'total_node_count': total_node_count,
+        'truncated': total_node_count > len(node_rows),
+    }
+
+
+def load_columnar_graph(
+    project_id: uuid.UUID,
+    *,
+    limit: Optional[int] = None,
+    node_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Columnar payload for a project graph — same nodes as GraphService.get_project_graph."""
+    from .models import Edge, Node
+    from .services import GraphService
+
+    if limit is None:
+        limit = GraphService.GRAPH_DEFAULT_LIMIT
+    limit = min(limit, GraphService.GRAPH_MAX_LIMIT)
+
+    qs = Node.objects.filter(project_id=project_id)
+    if node_type:
+        qs = qs.filter(node_type=node_type)
+    total_node_count = qs.count()
+    node_rows = list(qs.values_list(*_NODE_FIELDS)[:limit])
+
+    edges = Edge.objects.filter(source_node__project_id=project_id)
+    if total_node_count > len(node_rows) or node_type:
+        node_ids = [row[0] for row in node_rows]
+        edges = edges.filter(source_node_id__in=node_ids, target_node_id__in=node_ids)
+    edge_rows = edges.values_list('source_node_id', 'target_node_id', *EDGE_COLUMNS)
+
+    return build_columnar_graph(
+        node_rows, edge_rows.iterator(chunk_size=5000), total_node_count=total_node_count,
+    )
+
+
+# Rows per keyset page of the NDJSON export
+EXPORT_PAGE_SIZE = 2000
+
+
+def export_node_page(
+    project_id: uuid.UUID,
+    after: Optional[uuid.UUID],
+    limit: int = EXPORT_PAGE_SIZE,
+) -> List[tuple]:
+    """Next page of the project's node rows (NODE_COLUMNS order) by id, after ``after``."""
+    from .models import Node
+
+    qs = Node.objects.filter(project_id=project_id)
+    if after is not None:
+        qs = qs.filter(id__gt=after)
+    return list(qs.order_by('id').values_list(*_NODE_FIELDS)[:limit])
+
+
+def export_edge_page(
+    project_id: uuid.UUID,
+    after: Optional[uuid.UUID],
+    limit: int = EXPORT_PAGE_SIZE,
+) -> Tuple[Optional[uuid.UUID], List[tuple]]:
+    """Outgoing edges of the next page of node ids after ``after``.
+
+    Every edge has exactly one source node, so paging over source nodes
+    visits each edge once. Returns (last node id of the page or None when
+    done, edge rows as (source_node_id, target_node_id, *EDGE_COLUMNS)).
+    """
+    from .models import Edge, Node
+
+    qs = Node.objects.filter(project_id=project_id)
+    if after is not None:
+        qs = qs.filter(id__gt=after)
+    node_ids = list(qs.order_by('id').values_list('id', flat=True)[:limit])
+    if not node_ids:
+        return None, []
+    rows = list(
+        Edge.objects
+        .filter(source_node_id__in=node_ids)
+        .order_by('source_node_id', 'id')
+        .values_list('source_node_id', 'target_node_id', *EDGE_COLUMNS)
+    )
+    return node_ids[-1], rows
+
+
+def ndjson_lines(kind: str, names: Sequence[str], rows: Iterable[tuple]) -> bytes:
+    """One ``{"type": kind, ...}`` JSON line per row."""
+    return b''.join(
+        encode_json({'type': kind, **dict(zip(names, row))}) + b'\n'
+        for row in rows
+    )
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact JSON bytes — orjson when available, the stdlib otherwise."""
+    try:
+        import orjson
+    except ImportError:
+        from django.core.serializers.json import DjangoJSONEncoder
+
+        return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(payload, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
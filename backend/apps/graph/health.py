@@ -0,0 +1,228 @@
+"""
+Materialized graph health stats — one GraphHealthStats row per project
+graph and per case graph.
+
+Health stats feed graph-mode context assembly, project summaries and
+case pages, and computing them scans nodes, edges, documents and deltas.
+Rows are stamped with the graph revision they were computed at (and, for
+cases, the CaseNodeReference fingerprint, since references don't bump the
+revision):
+
+- a read is one query — the stats row with the current revision joined
+  in; a row that is behind is recomputed and stored on the spot
+- committed graph writes queue refresh_graph_health_task (debounced from
+  bump_graph_revision), so the project row is usually current again
+  before the next read
+- reconcile_graph_health_task periodically recomputes the least recently
+  refreshed rows, fixing drift from writes that skip the revision
+  (direct ORM updates, manual SQL)
+"""
+import logging
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
+
+# Defaults for SUMMARY_SETTINGS['graph_health']
+DEFAULT_REFRESH_DELAY = 10
+DEFAULT_RECONCILE_BATCH = 200
+
+
+def health_settings() -> dict:
+    from django.conf import settings as django_settings
+
+    return getattr(django_settings, 'SUMMARY_SETTINGS', {}).get('graph_health', {})
+
+
+def _current_revision(project_ref):
+    from .models import ProjectGraphRevision
+
+    return Coalesce(
+        Subquery(
+            ProjectGraphRevision.objects
+            .filter(project_id=project_ref)
+            .values('revision')[:1]
+        ),
+        Value(0),
+    )
+
+
+def _store_health(
+    project_id: uuid.UUID,
+    case_id: Optional[uuid.UUID],
+    revision: int,
+    refs_version: str,
+    stats: Dict[str, Any],
+):
+    """Upsert a stats row unless a newer revision was stored meanwhile (best-effort)."""
+    from django.utils import timezone
+    from .models import GraphHealthStats
+
+    try:
+        updated = GraphHealthStats.objects.filter(
+            project_id=project_id, case_id=case_id, graph_revision__lte=revision,
+        ).update(
+            graph_revision=revision,
+            references_version=refs_version,
+            stats=stats,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            GraphHealthStats.objects.bulk_create(
+                [GraphHealthStats(
+                    project_id=project_id,
+                    case_id=case_id,
+                    graph_revision=revision,
+                    references_version=refs_version,
+                    stats=stats,
+                )],
+                ignore_conflicts=True,
+            )
+    except Exception:
+        logger.warning(
+            "graph_health_store_failed",
+            extra={'project_id': str(project_id), 'case_id': str(case_id) if case_id else None},
+            exc_info=True,
+        )
+
+
+def refresh_project_health(project_id: uuid.UUID, revision: Optional[int] = None) -> Dict[str, Any]:
+    """Recompute and store a project's health stats."""
+    from .revision import get_graph_revision
+    from .services import GraphService
+
+    if revision is None:
+        revision = get_graph_revision(project_id)
+    stats = GraphService._scan_graph_health(project_id)
+    _store_health(project_id, None, revision, '', stats)
+    return stats
+
+
+def refresh_case_health(
+    case_id: uuid.UUID,
+    project_id: Optional[uuid.UUID] = None,
+    revision: Optional[int] = None,
+    refs_version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Recompute and store a case's health stats."""
+    from .revision import get_case_references_version, get_graph_revision
+    from .services import GraphService
+
+    if project_id is None:
+        from apps.cases.models import Case
+        project_id = Case.objects.filter(id=case_id).values_list('project_id', flat=True).first()
+    if project_id is None:
+        return GraphService._scan_case_graph_health(case_id)
+    if revision is None:
+        revision = get_graph_revision(project_id)
+    if refs_version is None:
+        refs_version = get_case_references_version(case_id)
+    stats = GraphService._scan_case_graph_health(case_id)
+    _store_health(project_id, case_id, revision, refs_version, stats)
+    return stats
+
+
+def project_graph_health(project_id: uuid.UUID) -> Dict[str, Any]:
+    """Health stats of a project graph — one query when the stored row is current."""
+    from .models import GraphHealthStats
+
+    row = (
+        GraphHealthStats.objects
+        .filter(project_id=project_id, case__isnull=True)
+        .annotate(current=_current_revision(OuterRef('project_id')))
+        .values_list('graph_revision', 'current', 'stats')
+        .first()
+    )
+    if row is not None:
+        stored_revision, current, stats = row
+        if stored_revision == current:
+            return stats
+        return refresh_project_health(project_id, revision=current)
+    return refresh_project_health(project_id)
+
+
+def case_graph_health(case_id: uuid.UUID) -> Dict[str, Any]:
+    """Health stats of a case's composed graph — one query when the stored row is current."""
+    from .models import CaseNodeReference, GraphHealthStats
+    from .revision import references_version
+
+    references = CaseNodeReference.objects.filter(case_id=OuterRef('case_id')).values('case_id')
+    row = (
+        GraphHealthStats.objects
+        .filter(case_id=case_id)
+        .annotate(
+            current=_current_revision(OuterRef('project_id')),
+            ref_count=Coalesce(
+                Subquery(references.annotate(n=Count('id')).values('n'), output_field=IntegerField()),
+                Value(0),
+            ),
+            ref_changed=Subquery(references.annotate(latest=Max('updated_at')).values('latest')),
+        )
+        .values_list('project_id', 'graph_revision', 'references_version', 'current', 'ref_count', 'ref_changed', 'stats')
+        .first()
+    )
+    if row is None:
+        return refresh_case_health(case_id)
+
+    project_id, stored_revision, stored_refs, current, ref_count, ref_changed, stats = row
+    refs_version = references_version(ref_count, ref_changed)
+    if stored_revision == current and stored_refs == refs_version:
+        return stats
+    return refresh_case_health(case_id, project_id, current, refs_version)
+
+
+def request_graph_health_refresh(project_id: Optional[uuid.UUID]):
+    """Queue refresh_graph_health_task for a project (debounced, non-critical).
+
+    The task runs once per refresh_delay window, after the writes that
+    queued it, so bursts of mutations (extraction) cost one recompute.
+    """
+    if project_id is None:
+        return
+    try:
+        from django.core.cache import cache
+
+        delay = health_settings().get('refresh_delay', DEFAULT_REFRESH_DELAY)
+        if cache.add(f'graph_health_dispatch:{project_id}', '1', timeout=delay):
+            from .tasks import refresh_graph_health_task
+            refresh_graph_health_task.apply_async(args=[str(project_id)], countdown=delay)
+    except Exception:
+        logger.debug("Graph health refresh dispatch failed", exc_info=True)
+
+
+def reconcile_graph_health(limit: Optional[int] = None) -> Tuple[int, int]:
+    """Recompute the least recently refreshed stats rows; returns (checked, drifted).
+
+    A row has drifted when its stats differ from a fresh scan even though
+    it was current — a write skipped the revision bump.
+    """
+    from .models import GraphHealthStats
+    from .revision import get_case_references_version, get_graph_revision
+
+    if limit is None:
+        limit = health_settings().get('reconcile_batch', DEFAULT_RECONCILE_BATCH)
+    rows = list(
+        GraphHealthStats.objects
+        .order_by('updated_at')
+        .values_list('project_id', 'case_id', 'graph_revision', 'references_version', 'stats')[:limit]
+    )
+    drifted = 0
+    for project_id, case_id, stored_revision, stored_refs, stored in rows:
+        revision = get_graph_revision(project_id)
+        if case_id is None:
+            fresh = refresh_project_health(project_id, revision=revision)
+            was_current = stored_revision == revision
+        else:
+            refs_version = get_case_references_version(case_id)
+            fresh = refresh_case_health(case_id, project_id, revision, refs_version)
+            was_current = stored_revision == revision and stored_refs == refs_version
+        if was_current and fresh != stored:
+            drifted += 1
+            logger.info(
+                "graph_health_drift",
+                extra={'project_id': str(project_id), 'case_id': str(case_id) if case_id else None},
+            )
+    return len(rows), drifted
@@ -9,9 +9,19 @@ Builds a multi-level cluster tree from document chunk embeddings:
     Level 3 (Root):   Single project overview
 
 The tree is stored as a JSON blob in ClusterHierarchy.tree for fast
-retrieval by the frontend landscape view.
+retrieval by the frontend landscape view. Topic/theme summary embeddings
+are returned separately ('node_vectors') and stored in
+ClusterHierarchyVectors (see hierarchy_vectors).
+
+refresh_hierarchy() updates a previous tree incrementally: new chunks join
+existing topic centroids, only topics whose membership drifted past a
+threshold are re-clustered and re-summarized, and untouched subtrees keep
+their labels, summaries and embeddings. It falls back to a full build when
+churn exceeds the configured limits.
 """
 import asyncio
+import hashlib
+import json
 import logging
 import re
 import time
@@ -39,6 +49,44 @@ MAX_CONCURRENT_LLM = 5  # semaphore cap for parallel LLM calls
 MAX_REPRESENTATIVE_CHUNKS = 5  # chunks sent to LLM per topic cluster
 
 
+def _get_refresh_config() -> dict:
+    """Return hierarchy_refresh config from Django settings with safe fallbacks."""
+    try:
+        from django.conf import settings as django_settings
+        return getattr(django_settings, 'SUMMARY_SETTINGS', {}).get('hierarchy_refresh', {})
+    except Exception:
+        return {}
+
+
+# Default for SUMMARY_SETTINGS['hierarchy_refresh']['memo_max_age_days']
+DEFAULT_MEMO_MAX_AGE_DAYS = 30
+
+
+def prune_summary_memos(current_model: Optional[str] = None) -> int:
+    """
+    Delete ClusterSummaryMemo rows that can no longer be hit: written for an
+    older prompt version or (when ``current_model`` is given) another model,
+    or not used for memo_max_age_days. Returns the number of rows deleted.
+    """
+    from datetime import timedelta
+
+    from django.db.models import Q
+    from django.utils import timezone
+
+    from apps.intelligence.hierarchy_prompts import HIERARCHY_PROMPT_VERSION
+    from .models import ClusterSummaryMemo
+
+    max_age = _get_refresh_config().get('memo_max_age_days', DEFAULT_MEMO_MAX_AGE_DAYS)
+    stale = (
+        ~Q(prompt_version=HIERARCHY_PROMPT_VERSION)
+        | Q(updated_at__lt=timezone.now() - timedelta(days=max_age))
+    )
+    if current_model is not None:
+        stale |= ~Q(model=current_model[:100])
+    deleted, _ = ClusterSummaryMemo.objects.filter(stale).delete()
+    return deleted
+
+
 # ── Data structures ───────────────────────────────────────────────
 
 @dataclass
@@ -53,8 +101,8 @@ class ClusterTreeNode:
     document_ids: List[str] = field(default_factory=list)
     chunk_count: int = 0
     coverage_pct: float = 0.0
-    # Embedding used during building and stored for Level 1-2 nodes in the
-    # serialized tree (as 'embedding') so CaseChunkRetriever can do
+    # Embedding used during building; for Level 1-2 nodes it is returned
+    # alongside the tree ('node_vectors') so CaseChunkRetriever can do
     # hierarchy-aware similarity matching.
     _embedding: Optional[List[float]] = field(default=None, repr=False)
 
@@ -64,22 +112,47 @@ class ClusterTreeNode:
 class HierarchicalClusteringService:
     """Build a hierarchical cluster tree from a project's document chunks."""
 
+    def __init__(self):
+        # LLM calls and summary-memo hits/misses of the current build/refresh
+        # (reported in metadata)
+        self.llm_calls = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._project_id: Optional[uuid.UUID] = None
+        self._memo_model: Optional[str] = None
+
+    def _reset_stats(self, project_id: uuid.UUID):
+        self.llm_calls = self.memo_hits = self.memo_misses = 0
+        self._project_id = project_id
+
     async def build_hierarchy(self, project_id: uuid.UUID) -> dict:
         """
         Main entry point. Loads chunks, clusters recursively, and returns
         the tree as a JSON-serializable dict.
 
         Returns:
-            dict with 'tree' (serialized ClusterTreeNode) and 'metadata'.
-            Level 1-2 nodes include 'embedding' for hierarchy-aware retrieval.
+            dict with 'tree' (serialized ClusterTreeNode), 'metadata' and
+            'node_vectors' — (node_id, level, embedding) for Level 1-2
+            nodes, used for hierarchy-aware retrieval.
         """
         start_time = time.time()
-
-        # 1. Load chunks
-        chunks, total_chunks, total_documents, project_title, project_description = (
-            self._load_chunks(project_id)
+        self._reset_stats(project_id)
+        return await self._build_full(
+            self._load_chunks(project_id), project_id, start_time,
+            refresh={'mode': 'full', 'reason': 'requested'},
         )
 
+    async def _build_full(
+        self,
+        loaded: tuple,
+        project_id: uuid.UUID,
+        start_time: float,
+        refresh: dict,
+    ) -> dict:
+        """Cluster and summarize every chunk from scratch."""
+        # 1. Chunks (loaded by the caller)
+        chunks, total_chunks, total_documents, project_title, project_description, normalized = loaded
+
         # Build document manifest for change detection (Plan 6)
         document_manifest = self._build_document_manifest(chunks)
 
@@ -97,13 +170,10 @@ class HierarchicalClusteringService:
             return self._serialize_tree(
                 root, start_time, total_chunks, 0, 1,
                 document_manifest=document_manifest,
+                refresh=refresh,
             )
 
-        # 2. Build embedding matrix
-        embeddings = np.array([c['embedding'] for c in chunks])
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1, norms)
-        normalized = embeddings / norms
+        # 2. Embedding matrix is loaded normalized, row-aligned with chunks
 
         # 3. Level 0→1: Cluster chunks into topics
         level1_nodes = self._build_level1(chunks, normalized, total_chunks)
@@ -122,6 +192,7 @@ class HierarchicalClusteringService:
             return self._serialize_tree(
                 root, start_time, total_chunks, 0, 1,
                 document_manifest=document_manifest,
+                refresh=refresh,
             )
 
         # 4. Summarize Level 1 topics (parallel LLM calls)
@@ -143,21 +214,7 @@ class HierarchicalClusteringService:
                 self._embed_node_summaries(level2_nodes)
         else:
             # Promote Level 1 nodes to Level 2 (they ARE the themes)
-            level2_nodes = []
-            for node in level1_nodes:
-                theme = ClusterTreeNode(
-                    id=str(uuid.uuid4()),
-                    level=2,
-                    label=node.label,
-                    summary=node.summary,
-                    children=[node],
-                    chunk_ids=node.chunk_ids[:],
-                    document_ids=node.document_ids[:],
-                    chunk_count=node.chunk_count,
-                    coverage_pct=node.coverage_pct,
-                    _embedding=node._embedding,
-                )
-                level2_nodes.append(theme)
+            level2_nodes = [self._promote_topic(node) for node in level1_nodes]
 
         # 7. Build root (Level 3)
         root = await self._build_root(
@@ -181,8 +238,407 @@ class HierarchicalClusteringService:
         return self._serialize_tree(
             root, start_time, total_chunks, total_clusters, levels,
             document_manifest=document_manifest,
+            refresh=refresh,
         )
 
+    # ── Incremental refresh ──────────────────────────────────────
+
+    async def refresh_hierarchy(
+        self,
+        project_id: uuid.UUID,
+        previous_tree: Optional[dict],
+        previous_vectors: Optional[Dict[str, np.ndarray]] = None,
+    ) -> dict:
+        """
+        Update a previous hierarchy for the project's current chunks.
+
+        1. Chunks that were already in a topic stay there; removed chunks
+           drop out. New chunks join the nearest existing topic centroid if
+           within the Level 1 distance threshold.
+        2. Topics whose membership changed by more than
+           ``topic_change_threshold`` (plus new chunks that fit no topic)
+           are pooled and re-clustered, which splits/merges them, and the
+           resulting topics are re-summarized.
+        3. Untouched topics, themes whose children are unchanged (nested
+           themes included), and the root (if no theme changed) are reused
+           verbatim — same id, label, summary and embedding, with membership
+           counts updated. In small projects new topics get their own
+           promoted theme, as in a full build.
+
+        Falls back to a full build when there is no usable previous tree,
+        when chunk churn / touched-topic fraction exceed the configured
+        limits, or when the topic count crosses MAX_CLUSTERS_BEFORE_RECURSE
+        (promoted vs clustered themes). Metadata reports the mode, drift metrics and LLM calls.
+
+        ``previous_vectors`` maps node id → summary embedding of the previous
+        hierarchy (hierarchy_vectors.load_node_vectors); reused nodes keep it.
+        """
+        start_time = time.time()
+        self._reset_stats(project_id)
+        cfg = _get_refresh_config()
+        loaded = self._load_chunks(project_id)
+        chunks, total_chunks, normalized = loaded[0], loaded[1], loaded[5]
+
+        prev_themes = (previous_tree or {}).get('children') or []
+        prev_topics = [
+            topic for theme in prev_themes for topic in self._level1_descendants(theme)
+        ]
+        if not prev_topics or total_chunks < 3:
+            return await self._build_full(
+                loaded, project_id, start_time,
+                refresh={'mode': 'full', 'reason': 'no_previous_topics'},
+            )
+
+        # 1. Carry over membership and place new chunks
+        index_of = {c['id']: i for i, c in enumerate(chunks)}
+        members = [
+            [index_of[cid] for cid in topic.get('chunk_ids', []) if cid in index_of]
+            for topic in prev_topics
+        ]
+        previous_ids = {cid for topic in prev_topics for cid in topic.get('chunk_ids', [])}
+        removed = [
+            len(topic.get('chunk_ids', [])) - len(rows)
+            for topic, rows in zip(prev_topics, members)
+        ]
+        new_rows = [i for i, c in enumerate(chunks) if c['id'] not in previous_ids]
+
+        chunk_churn = (len(new_rows) + sum(removed)) / max(1, len(previous_ids))
+        drift = {'chunk_churn': round(chunk_churn, 3)}
+        if chunk_churn > cfg.get('max_chunk_churn', 0.5):
+            return await self._build_full(
+                loaded, project_id, start_time,
+                refresh={'mode': 'full', 'reason': 'chunk_churn', 'drift': drift},
+            )
+
+        added = [0] * len(prev_topics)
+        unplaced: List[int] = []
+        centroids, live = self._topic_centroids(normalized, members)
+        if new_rows and len(live):
+            sims = normalized[new_rows] @ centroids.T
+            best = np.argmax(sims, axis=1)
+            for row, b, sim in zip(new_rows, best, sims[np.arange(len(new_rows)), best]):
+                if (1 - sim) < LEVEL_THRESHOLDS[1]:
+                    members[live[b]].append(row)
+                    added[live[b]] += 1
+                else:
+                    unplaced.append(row)
+        else:
+            unplaced = list(new_rows)
+
+        # 2. Pool drifted topics (and unplaced chunks) for re-clustering
+        change_threshold = cfg.get('topic_change_threshold', 0.2)
+        touched = []
+        for t, topic in enumerate(prev_topics):
+            change = (added[t] + removed[t]) / max(1, len(topic.get('chunk_ids', [])))
+            touched.append(not members[t] or change > change_threshold)
+        touched_fraction = sum(touched) / len(prev_topics)
+        drift['touched_topic_fraction'] = round(touched_fraction, 3)
+        if touched_fraction > cfg.get('max_touched_topic_fraction', 0.5):
+            return await self._build_full(
+                loaded, project_id, start_time,
+                refresh={'mode': 'full', 'reason': 'topic_drift', 'drift': drift},
+            )
+
+        pool = sorted(set(unplaced).union(
+            row for t in range(len(prev_topics)) if touched[t] for row in members[t]
+        ))
+        new_topics: List[ClusterTreeNode] = []
+        if len(pool) >= 2:
+            new_topics = self._build_level1(
+                [chunks[i] for i in pool], normalized[pool], total_chunks,
+            )
+
+        # Pool leftovers (no multi-member cluster formed) join the nearest kept topic
+        kept = [t for t in range(len(prev_topics)) if not touched[t]]
+        covered = {cid for node in new_topics for cid in node.chunk_ids}
+        leftovers = [i for i in pool if chunks[i]['id'] not in covered]
+        if leftovers:
+            if not kept:
+                return await self._build_full(
+                    loaded, project_id, start_time,
+                    refresh={'mode': 'full', 'reason': 'no_stable_topics', 'drift': drift},
+                )
+            kept_centroids, kept_live = self._topic_centroids(
+                normalized, [members[t] for t in kept],
+            )
+            best = np.argmax(normalized[leftovers] @ kept_centroids.T, axis=1)
+            for row, b in zip(leftovers, best):
+                members[kept[kept_live[b]]].append(row)
+
+        await self._summarize_nodes_batch(new_topics, level=1, chunks=chunks)
+        self._embed_node_summaries(new_topics)
+
+        # Reuse untouched topics verbatim (membership refreshed)
+        topic_nodes: Dict[str, ClusterTreeNode] = {}
+        for t in kept:
+            node = self._node_from_dict(prev_topics[t], children=[], vectors=previous_vectors)
+            self._set_membership(node, [chunks[i] for i in members[t]], total_chunks)
+            topic_nodes[node.id] = node
+
+        # 3. Themes. A full build promotes topics 1:1 to themes up to
+        # MAX_CLUSTERS_BEFORE_RECURSE topics and clusters them above it, so
+        # crossing that line changes the tree's shape — rebuild instead.
+        topic_count = len(topic_nodes) + len(new_topics)
+        promoted = topic_count <= MAX_CLUSTERS_BEFORE_RECURSE
+        if promoted != (len(prev_topics) <= MAX_CLUSTERS_BEFORE_RECURSE):
+            return await self._build_full(
+                loaded, project_id, start_time,
+                refresh={'mode': 'full', 'reason': 'theme_structure', 'drift': drift},
+            )
+
+        # Themes are rebuilt from their direct children, so nested themes
+        # (from a full build's second clustering pass) keep their shape
+        themes: List[ClusterTreeNode] = []
+        changed: Dict[str, ClusterTreeNode] = {}
+        depth_of: Dict[str, int] = {}
+        parent_of: Dict[str, ClusterTreeNode] = {}
+        leaf_themes: List[ClusterTreeNode] = []
+        for theme in prev_themes:
+            node = self._rebuild_theme(
+                theme, topic_nodes, previous_vectors, changed, depth_of, parent_of, leaf_themes,
+            )
+            if node is not None:
+                themes.append(node)
+
+        for topic in new_topics:
+            if promoted:
+                theme = self._promote_topic(topic)
+                themes.append(theme)
+                changed[theme.id] = theme
+                depth_of[theme.id] = 0
+                continue
+            home = self._nearest_theme(topic, leaf_themes)
+            if home is None:
+                home = ClusterTreeNode(
+                    id=str(uuid.uuid4()), level=2, label='', summary='', children=[],
+                )
+                themes.append(home)
+                leaf_themes.append(home)
+                depth_of[home.id] = 0
+            home.children.append(topic)
+            node = home
+            while node is not None:
+                changed[node.id] = node
+                node = parent_of.get(node.id)
+
+        for theme in themes:
+            self._aggregate_theme(theme)
+
+        # Single-child themes mirror their child (as in a full build's
+        # promotion); the rest are re-summarized deepest first
+        to_summarize = []
+        for theme in changed.values():
+            if len(theme.children) == 1:
+                only = theme.children[0]
+                theme.label, theme.summary, theme._embedding = only.label, only.summary, only._embedding
+            else:
+                to_summarize.append(theme)
+        for depth in sorted({depth_of[t.id] for t in to_summarize}, reverse=True):
+            batch = [t for t in to_summarize if depth_of[t.id] == depth]
+            await self._summarize_nodes_batch(batch, level=2)
+            self._embed_node_summaries(batch)
+        changed_themes = [t for t in themes if t.id in changed]
+        themes.sort(key=lambda n: n.chunk_count, reverse=True)
+
+        # Root: re-synthesize only if the theme set changed
+        project_title, project_description = loaded[3], loaded[4]
+        themes_changed = bool(changed_themes) or len(themes) != len(prev_themes)
+        if themes_changed:
+            root = await self._build_root(themes, total_chunks, project_title, project_description)
+        else:
+            root = self._node_from_dict(previous_tree, children=themes)
+            root.chunk_ids = [cid for theme in themes for cid in theme.chunk_ids]
+            root.document_ids = list({d for theme in themes for d in theme.document_ids})
+            root.chunk_count = total_chunks
+            root.coverage_pct = 100.0
+
+        levels = 3 if len(themes) != topic_count else 2
+        refresh = {
+            'mode': 'incremental',
+            'drift': drift,
+            'chunks_added': len(new_rows),
+            'chunks_removed': sum(removed),
+            'topics_reused': len(topic_nodes),
+            'topics_touched': sum(touched),
+            'topics_resummarized': len(new_topics),
+            'themes_reused': len(themes) - len(changed_themes),
+            'themes_resummarized': len(to_summarize),
+            'root_resummarized': themes_changed,
+        }
+
+        logger.info(
+            "hierarchy_refresh_complete",
+            extra={
+                'project_id': str(project_id),
+                'total_chunks': total_chunks,
+                'llm_calls': self.llm_calls,
+                'memo_hits': self.memo_hits,
+                'duration_ms': int((time.time() - start_time) * 1000),
+                **{k: v for k, v in refresh.items() if k != 'drift'},
+            },
+        )
+
+        return self._serialize_tree(
+            root, start_time, total_chunks, topic_count + len(themes) + 1, levels,
+            document_manifest=self._build_document_manifest(chunks),
+            refresh=refresh,
+        )
+
+    @staticmethod
+    def _topic_centroids(normalized: np.ndarray, members: List[List[int]]):
+        """Normalized chunk centroids for non-empty topics → (matrix, topic positions)."""
+        live = [t for t, rows in enumerate(members) if rows]
+        if not live:
+            return np.zeros((0, normalized.shape[1])), live
+        centroids = np.array([normalized[members[t]].mean(axis=0) for t in live])
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        return centroids / np.where(norms == 0, 1, norms), live
+
+    @staticmethod
+    def _nearest_theme(
+        topic: ClusterTreeNode,
+        themes: List[ClusterTreeNode],
+    ) -> Optional[ClusterTreeNode]:
+        """Theme whose summary embedding is closest to the topic's.
+
+        Returns None (open a new theme) when nothing is within the Level 2
+        threshold and there is still room below MAX_CLUSTERS_BEFORE_RECURSE.
+        """
+        room = len(themes) < MAX_CLUSTERS_BEFORE_RECURSE
+        candidates = [t for t in themes if t._embedding]
+        if not candidates or not topic._embedding:
+            return None if room or not themes else themes[0]
+
+        matrix = np.array([t._embedding for t in candidates])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        vec = np.asarray(topic._embedding, dtype=float)
+        sims = matrix @ (vec / (np.linalg.norm(vec) or 1))
+        best = int(np.argmax(sims))
+        if (1 - sims[best]) < LEVEL_THRESHOLDS[2] or not room:
+            return candidates[best]
+        return None
+
+    def _rebuild_theme(
+        self,
+        data: dict,
+        topic_nodes: Dict[str, ClusterTreeNode],
+        vectors: Optional[Dict[str, np.ndarray]],
+        changed: Dict[str, ClusterTreeNode],
+        depth_of: Dict[str, int],
+        parent_of: Dict[str, ClusterTreeNode],
+        leaf_themes: List[ClusterTreeNode],
+        depth: int = 0,
+    ) -> Optional[ClusterTreeNode]:
+        """Rehydrate a serialized theme from its surviving direct children.
+
+        Topic children are taken from ``topic_nodes`` (kept topics); nested
+        themes are rebuilt recursively. Returns None when nothing survives.
+        A theme that lost a child, or holds a changed nested theme, is
+        recorded in ``changed``.
+        """
+        node = self._node_from_dict(data, children=[], vectors=vectors)
+        lost = False
+        for child in data.get('children', []):
+            if child.get('level') == 1:
+                kept = topic_nodes.get(child.get('id'))
+            else:
+                kept = self._rebuild_theme(
+                    child, topic_nodes, vectors, changed, depth_of, parent_of, leaf_themes, depth + 1,
+                )
+                if kept is not None:
+                    parent_of[kept.id] = node
+            if kept is None:
+                lost = True
+            else:
+                node.children.append(kept)
+        if not node.children:
+            return None
+        depth_of[node.id] = depth
+        if any(child.level == 1 for child in node.children):
+            leaf_themes.append(node)
+        if lost or any(child.id in changed for child in node.children):
+            changed[node.id] = node
+        return node
+
+    @staticmethod
+    def _promote_topic(topic: ClusterTreeNode) -> ClusterTreeNode:
+        """Level 2 theme wrapping a single topic (small projects)."""
+        return ClusterTreeNode(
+            id=str(uuid.uuid4()),
+            level=2,
+            label=topic.label,
+            summary=topic.summary,
+            children=[topic],
+            chunk_ids=topic.chunk_ids[:],
+            document_ids=topic.document_ids[:],
+            chunk_count=topic.chunk_count,
+            coverage_pct=topic.coverage_pct,
+            _embedding=topic._embedding,
+        )
+
+    @classmethod
+    def _aggregate_theme(cls, theme: ClusterTreeNode):
+        """Sort children by size and roll membership up, nested themes first."""
+        for child in theme.children:
+            if child.level == 2:
+                cls._aggregate_theme(child)
+        theme.children.sort(key=lambda n: n.chunk_count, reverse=True)
+        cls._aggregate_children(theme)
+
+    @staticmethod
+    def _level1_descendants(node: dict) -> List[dict]:
+        """Topic (Level 1) nodes under a serialized node, depth-first."""
+        topics = []
+        for child in node.get('children', []):
+            if child.get('level') == 1:
+                topics.append(child)
+            else:
+                topics.extend(HierarchicalClusteringService._level1_descendants(child))
+        return topics
+
+    @staticmethod
+    def _node_from_dict(
+        data: dict,
+        children: List[ClusterTreeNode],
+        vectors: Optional[Dict[str, np.ndarray]] = None,
+    ) -> ClusterTreeNode:
+        """Rehydrate a serialized tree node (without its children).
+
+        The summary embedding comes from ``vectors`` by node id, or from an
+        inline 'embedding' key in trees built before the vectors were split out.
+        """
+        embedding = data.get('embedding')
+        if embedding is None and vectors and data.get('id') in vectors:
+            embedding = vectors[data['id']].tolist()
+        return ClusterTreeNode(
+            id=data.get('id') or str(uuid.uuid4()),
+            level=data.get('level', 0),
+            label=data.get('label', ''),
+            summary=data.get('summary', ''),
+            children=children,
+            chunk_ids=list(data.get('chunk_ids', [])),
+            document_ids=list(data.get('document_ids', [])),
+            chunk_count=data.get('chunk_count', 0),
+            coverage_pct=data.get('coverage_pct', 0.0),
+            _embedding=embedding,
+        )
+
+    @staticmethod
+    def _set_membership(node: ClusterTreeNode, member_chunks: List[dict], total_chunks: int):
+        node.chunk_ids = [c['id'] for c in member_chunks]
+        node.document_ids = list(set(c['document_id'] for c in member_chunks))
+        node.chunk_count = len(node.chunk_ids)
+        node.coverage_pct = round(node.chunk_count / total_chunks * 100, 1)
+
+    @staticmethod
+    def _aggregate_children(parent: ClusterTreeNode):
+        """Roll child membership up into the parent (as _cluster_nodes does)."""
+        parent.chunk_ids = [cid for child in parent.children for cid in child.chunk_ids]
+        parent.document_ids = list({d for child in parent.children for d in child.document_ids})
+        parent.chunk_count = sum(child.chunk_count for child in parent.children)
+        parent.coverage_pct = round(sum(child.coverage_pct for child in parent.children), 1)
+
     # ── Document manifest ────────────────────────────────────────
 
     @staticmethod
@@ -214,34 +670,26 @@ class HierarchicalClusteringService:
     # ── Chunk loading ─────────────────────────────────────────────
 
     def _load_chunks(self, project_id: uuid.UUID):
-        """Load all project chunks with embeddings. Returns (chunks_list, total, doc_count, title, desc)."""
-        from apps.projects.models import DocumentChunk, Project
+        """Load all project chunks with embeddings.
+
+        Returns (chunks_list, total, doc_count, title, desc, normalized) where
+        chunks_list holds per-chunk metadata dicts (no embeddings) and
+        normalized is the row-aligned float32 embedding matrix, streamed
+        by load_chunk_matrix without materializing model instances.
+        """
+        from apps.projects.models import Project
+        from .chunk_loader import load_chunk_matrix
 
-        project = Project.objects.filter(id=project_id).first()
+        project = Project.objects.filter(id=project_id).only('title', 'description').first()
         project_title = project.title if project else ''
         project_description = project.description if project else ''
 
-        qs = (
-            DocumentChunk.objects
-            .filter(document__project_id=project_id, embedding__isnull=False)
-            .select_related('document')
-            .order_by('document', 'chunk_index')
-        )
-
-        chunks = []
-        for c in qs:
-            chunks.append({
-                'id': str(c.id),
-                'document_id': str(c.document_id),
-                'document_title': c.document.title,
-                'text': c.chunk_text[:500],
-                'embedding': list(c.embedding),
-            })
-
+        matrix = load_chunk_matrix(project_id, text_limit=500)
+        chunks = matrix.chunk_dicts()
         total_chunks = len(chunks)
-        total_documents = len(set(c['document_id'] for c in chunks))
+        total_documents = matrix.document_count
 
-        return chunks, total_chunks, total_documents, project_title, project_description
+        return chunks, total_chunks, total_documents, project_title, project_description, matrix.normalized()
 
     # ── Level 0→1: Chunk clustering ──────────────────────────────
 
@@ -413,10 +861,27 @@ class HierarchicalClusteringService:
         normalized: np.ndarray,
         distance_threshold: float,
     ) -> np.ndarray:
-        """Run agglomerative clustering on normalized embeddings."""
+        """Run agglomerative clustering on normalized embeddings.
+
+        Above chunk_clustering.max_direct_cluster rows the configured
+        scalable backend is used instead of exact O(n²) agglomeration.
+        """
         if len(normalized) < 2:
             return np.zeros(len(normalized), dtype=int)
 
+        from .chunk_clustering import ChunkClusteringService, get_chunk_clustering_config
+
+        cfg = get_chunk_clustering_config()
+        max_direct = cfg.get('max_direct_cluster', 5000)
+        if len(normalized) > max_direct:
+            if cfg.get('backend', 'minibatch') == 'minibatch':
+                return ChunkClusteringService._cluster_minibatch(
+                    normalized, distance_threshold, cfg,
+                )
+            return ChunkClusteringService._cluster_sampled(
+                normalized, distance_threshold, sample_size=max_direct,
+            )
+
         try:
             from sklearn.cluster import AgglomerativeClustering
 
@@ -440,34 +905,9 @@ class HierarchicalClusteringService:
         distance_threshold: float,
     ) -> np.ndarray:
         """Simple greedy clustering fallback."""
-        n = len(normalized)
-        labels = np.full(n, -1, dtype=int)
-        centroids = []
-        counts = []
-        next_label = 0
-
-        for i in range(n):
-            vec = normalized[i]
-            if centroids:
-                centroid_matrix = np.array(centroids)
-                sims = centroid_matrix @ vec
-                best_idx = int(np.argmax(sims))
-                if (1 - sims[best_idx]) < distance_threshold:
-                    labels[i] = best_idx
-                    count = counts[best_idx]
-                    centroids[best_idx] = (centroids[best_idx] * count + vec) / (count + 1)
-                    norm = np.linalg.norm(centroids[best_idx])
-                    if norm > 0:
-                        centroids[best_idx] /= norm
-                    counts[best_idx] += 1
-                    continue
-
-            labels[i] = next_label
-            centroids.append(vec.copy())
-            counts.append(1)
-            next_label += 1
-
-        return labels
+        from .chunk_clustering import greedy_threshold_cluster
+
+        return greedy_threshold_cluster(normalized, distance_threshold)
 
     # ── LLM summarization ────────────────────────────────────────
 
@@ -477,15 +917,39 @@ class HierarchicalClusteringService:
         level: int,
         chunks: Optional[List[dict]] = None,
     ):
-        """Summarize all nodes at a given level using parallel LLM calls."""
+        """Summarize all nodes at a given level using parallel LLM calls.
+
+        Nodes whose fingerprint is in the summary memo reuse the stored
+        label/summary; only the rest go to the LLM (and are memoized).
+        """
+        if not nodes:
+            return
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM)
+        model = self._summary_model()
+        fingerprints = {node.id: self._node_fingerprint(node, level, model) for node in nodes}
+        memos = await self._load_summary_memos(list(fingerprints.values()))
+
+        pending = []
+        for node in nodes:
+            memo = memos.get(fingerprints[node.id])
+            if memo:
+                node.label, node.summary = memo
+            else:
+                pending.append(node)
+        self.memo_hits += len(nodes) - len(pending)
+        self.memo_misses += len(pending)
+
+        fresh = []
 
         async def _summarize_one(node: ClusterTreeNode):
             async with semaphore:
                 try:
-                    label, summary = await self._summarize_node(node, level, chunks)
+                    label, summary, parsed = await self._summarize_node(node, level, chunks)
                     node.label = label
                     node.summary = summary
+                    # Placeholder labels from unparseable responses aren't memoized
+                    if parsed:
+                        fresh.append((fingerprints[node.id], level, label, summary))
                 except Exception:
                     logger.warning(
                         "hierarchy_summarize_failed",
@@ -495,22 +959,109 @@ class HierarchicalClusteringService:
                     node.label = f'Topic {node.id[:8]}'
                     node.summary = f'Cluster of {node.chunk_count} passages.'
 
-        await asyncio.gather(*[_summarize_one(n) for n in nodes])
+        await asyncio.gather(*[_summarize_one(n) for n in pending])
+        await self._store_summary_memos(fresh, model)
+
+    # ── Summary memo ─────────────────────────────────────────────
+
+    def _summary_model(self) -> str:
+        """Model name of the summarization provider (part of the memo key)."""
+        if self._memo_model is None:
+            try:
+                from apps.common.llm_providers.factory import get_llm_provider
+                self._memo_model = str(getattr(get_llm_provider('fast'), 'model', '') or '')
+            except Exception:
+                self._memo_model = ''
+        return self._memo_model
+
+    @staticmethod
+    def _summary_fingerprint(level: int, parts: list, model: str) -> str:
+        """sha256 over (level, prompt version, model, prompt inputs)."""
+        from apps.intelligence.hierarchy_prompts import HIERARCHY_PROMPT_VERSION
+
+        payload = json.dumps(
+            [level, HIERARCHY_PROMPT_VERSION, model, parts],
+            ensure_ascii=False, separators=(',', ':'),
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _node_fingerprint(self, node: ClusterTreeNode, level: int, model: str) -> str:
+        """Topics are keyed by sorted chunk ids, higher levels by child summaries."""
+        if level == 1:
+            parts = sorted(node.chunk_ids)
+        else:
+            parts = sorted([c.label, c.summary, c.chunk_count] for c in node.children)
+        return self._summary_fingerprint(level, parts, model)
+
+    async def _load_summary_memos(self, fingerprints: List[str]) -> Dict[str, tuple]:
+        """Fingerprint → (label, summary) for memoized clusters of this project."""
+        if not fingerprints or self._project_id is None:
+            return {}
+        from django.utils import timezone
+        from .models import ClusterSummaryMemo
+
+        try:
+            memos = ClusterSummaryMemo.objects.filter(
+                project_id=self._project_id,
+                fingerprint__in=fingerprints,
+            )
+            found = {
+                fp: (label, summary)
+                async for fp, label, summary in memos.values_list('fingerprint', 'label', 'summary')
+            }
+            if found:
+                # Keep memos in use clear of age-based pruning
+                await memos.filter(fingerprint__in=list(found)).aupdate(updated_at=timezone.now())
+            return found
+        except Exception:
+            logger.warning("hierarchy_summary_memo_load_failed", exc_info=True)
+            return {}
+
+    async def _store_summary_memos(self, entries: List[tuple], model: str):
+        """Persist (fingerprint, level, label, summary) entries; conflicts are ignored."""
+        if not entries or self._project_id is None:
+            return
+        from apps.intelligence.hierarchy_prompts import HIERARCHY_PROMPT_VERSION
+        from .models import ClusterSummaryMemo
+
+        try:
+            await ClusterSummaryMemo.objects.abulk_create(
+                [
+                    ClusterSummaryMemo(
+                        project_id=self._project_id,
+                        fingerprint=fp,
+                        level=level,
+                        label=label,
+                        summary=summary,
+                        model=model[:100],
+                        prompt_version=HIERARCHY_PROMPT_VERSION,
+                    )
+                    for fp, level, label, summary in entries
+                ],
+                ignore_conflicts=True,
+            )
+        except Exception:
+            logger.warning("hierarchy_summary_memo_store_failed", exc_info=True)
 
     async def _summarize_node(
         self,
         node: ClusterTreeNode,
         level: int,
         chunks: Optional[List[dict]] = None,
-    ) -> tuple[str, str]:
-        """Single LLM call to summarize a node. Returns (label, summary)."""
+    ) -> tuple[str, str, bool]:
+        """Single LLM call to summarize a node.
+
+        Returns (label, summary, parsed) — parsed is False when the response
+        lacked the expected tags and the fallback label was used.
+        """
         from apps.common.llm_providers.factory import get_llm_provider
+        from apps.common.llm_providers.rate_limiter import Priority
         from apps.intelligence.hierarchy_prompts import (
             build_topic_summary_prompt,
             build_theme_synthesis_prompt,
         )
 
-        provider = get_llm_provider('fast')
+        provider = get_llm_provider('fast', priority=Priority.BACKGROUND)
 
         if level == 1:
             # Use representative chunk texts stored during _build_level1
@@ -529,8 +1080,9 @@ class HierarchicalClusteringService:
             ]
             system_prompt, user_prompt = build_theme_synthesis_prompt(topic_summaries)
         else:
-            return f'Cluster {node.id[:8]}', ''
+            return f'Cluster {node.id[:8]}', '', False
 
+        self.llm_calls += 1
         response = await provider.generate(
             messages=[{"role": "user", "content": user_prompt}],
             system_prompt=system_prompt,
@@ -538,7 +1090,7 @@ class HierarchicalClusteringService:
             temperature=0.3,
         )
 
-        return self._parse_label_summary(response)
+        return (*self._parse_label_summary(response), self._is_well_formed(response))
 
     @staticmethod
     def _parse_label_summary(response: str) -> tuple[str, str]:
@@ -551,6 +1103,14 @@ class HierarchicalClusteringService:
 
         return label, summary
 
+    @staticmethod
+    def _is_well_formed(response: str) -> bool:
+        """Both tags present, i.e. _parse_label_summary used no fallback."""
+        return bool(
+            re.search(r'<label>(.*?)</label>', response, re.DOTALL)
+            and re.search(r'<summary>(.*?)</summary>', response, re.DOTALL)
+        )
+
     # ── Embedding generation ─────────────────────────────────────
 
     def _embed_node_summaries(self, nodes: List[ClusterTreeNode]):
@@ -574,6 +1134,7 @@ class HierarchicalClusteringService:
     ) -> ClusterTreeNode:
         """Build the root node (Level 3) from Level 2 themes."""
         from apps.common.llm_providers.factory import get_llm_provider
+        from apps.common.llm_providers.rate_limiter import Priority
         from apps.intelligence.hierarchy_prompts import build_project_overview_prompt
 
         theme_summaries = [
@@ -589,15 +1150,35 @@ class HierarchicalClusteringService:
             theme_summaries, project_title, project_description,
         )
 
-        provider = get_llm_provider('fast')
+        model = self._summary_model()
+        fingerprint = self._summary_fingerprint(
+            3,
+            [
+                sorted([t['label'], t['summary'], t['coverage_pct']] for t in theme_summaries),
+                project_title,
+                project_description,
+            ],
+            model,
+        )
+        memo = (await self._load_summary_memos([fingerprint])).get(fingerprint)
+
+        provider = get_llm_provider('fast', priority=Priority.BACKGROUND)
         try:
-            response = await provider.generate(
-                messages=[{"role": "user", "content": user_prompt}],
-                system_prompt=system_prompt,
-                max_tokens=512,
-                temperature=0.3,
-            )
-            label, summary = self._parse_label_summary(response)
+            if memo:
+                self.memo_hits += 1
+                label, summary = memo
+            else:
+                self.memo_misses += 1
+                self.llm_calls += 1
+                response = await provider.generate(
+                    messages=[{"role": "user", "content": user_prompt}],
+                    system_prompt=system_prompt,
+                    max_tokens=512,
+                    temperature=0.3,
+                )
+                label, summary = self._parse_label_summary(response)
+                if self._is_well_formed(response):
+                    await self._store_summary_memos([(fingerprint, 3, label, summary)], model)
         except Exception:
             logger.warning("hierarchy_root_synthesis_failed", exc_info=True)
             label = project_title or 'Project Overview'
@@ -631,16 +1212,20 @@ class HierarchicalClusteringService:
         total_clusters: int,
         levels: int,
         document_manifest: Optional[list] = None,
+        refresh: Optional[dict] = None,
     ) -> dict:
         """
         Convert ClusterTreeNode tree to a JSON-serializable dict.
         Strips internal fields (_representative_texts, etc.).
 
-        Preserves embeddings for Level 1 (topic) and Level 2 (theme)
-        nodes so CaseChunkRetriever can do hierarchy-aware similarity
-        matching without recomputing them.
+        Embeddings of Level 1 (topic) and Level 2 (theme) nodes are kept
+        out of the tree and returned as 'node_vectors' (node_id, level,
+        embedding), stored by the caller in ClusterHierarchyVectors so
+        CaseChunkRetriever can match against them without recomputing.
 
-        Includes document_manifest in metadata for change detection (Plan 6).
+        Includes document_manifest in metadata for change detection (Plan 6),
+        plus the refresh mode/drift stats, LLM calls made by this build and
+        summary memo hits/misses.
         """
         def _clean_node(node: ClusterTreeNode) -> dict:
             result = {
@@ -654,16 +1239,17 @@ class HierarchicalClusteringService:
                 'chunk_count': node.chunk_count,
                 'coverage_pct': node.coverage_pct,
             }
-            # Store embeddings for topic/theme nodes (Level 1-2) so the
-            # case chunk retriever can match against them. ~1.5KB per node
-            # (384 floats × 4 bytes), negligible in the JSON blob.
             if node.level in (1, 2) and node._embedding:
-                result['embedding'] = node._embedding
+                node_vectors.append((node.id, node.level, node._embedding))
             return result
 
+        node_vectors = []
+        tree = _clean_node(root)
+
         manifest = document_manifest or []
         return {
-            'tree': _clean_node(root),
+            'tree': tree,
+            'node_vectors': node_vectors,
             'metadata': {
                 'total_chunks': total_chunks,
                 'total_clusters': total_clusters,
@@ -671,5 +1257,8 @@ class HierarchicalClusteringService:
                 'duration_ms': int((time.time() - start_time) * 1000),
                 'document_manifest': manifest,
                 'document_count': len(manifest),
+                'llm_calls': self.llm_calls,
+                'summary_memo': {'hits': self.memo_hits, 'misses': self.memo_misses},
+                'refresh': refresh or {'mode': 'full'},
             },
         }
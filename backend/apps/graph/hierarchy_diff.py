@@ -8,11 +8,17 @@ documents are added.
 """
 import logging
 from dataclasses import dataclass, field, asdict
-from difflib import SequenceMatcher
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# A new/old theme pair is a match (same theme, possibly grown or renamed)
+# when its score reaches MATCH_THRESHOLD; see _theme_match_scores.
+MATCH_THRESHOLD = 0.5
+CENTROID_WEIGHT = 0.5
+
 
 @dataclass
 class HierarchyDiff:
@@ -65,16 +71,25 @@ class HierarchyDiff:
         return "; ".join(parts)
 
 
-def compute_hierarchy_diff(old_hierarchy, new_hierarchy) -> HierarchyDiff:
+def compute_hierarchy_diff(
+    old_hierarchy,
+    new_hierarchy,
+    old_vectors: Optional[Dict[str, np.ndarray]] = None,
+    new_vectors: Optional[Dict[str, np.ndarray]] = None,
+) -> HierarchyDiff:
     """Compare two ClusterHierarchy instances and return a diff.
 
-    Uses theme/topic label similarity (fuzzy matching) to detect
-    renames, merges, and expansions rather than relying on cluster IDs
-    (which change every rebuild).
+    Themes are matched on content rather than labels (which are
+    regenerated) or cluster IDs (which change on full rebuilds): each
+    old/new pair is scored by summary-centroid cosine similarity and
+    chunk-membership Jaccard, and pairs are assigned with a linear
+    assignment that maximizes the total score. See _theme_match_scores.
 
     Args:
         old_hierarchy: Previous ClusterHierarchy instance (or None for first build).
         new_hierarchy: Newly built ClusterHierarchy instance.
+        old_vectors / new_vectors: node_id → summary embedding; loaded
+            with hierarchy_vectors.load_node_vectors when not given.
 
     Returns:
         HierarchyDiff with all detected changes.
@@ -107,29 +122,18 @@ def compute_hierarchy_diff(old_hierarchy, new_hierarchy) -> HierarchyDiff:
     diff.themes_before = len(old_themes)
     diff.themes_after = len(new_themes)
 
-    # Match themes by label similarity using global best-first assignment.
-    # Compute all pairwise scores, then greedily assign the highest-scoring
-    # pair first. This prevents a low-scoring early match from "stealing"
-    # a partner that a later theme would match much better.
+    if old_themes and new_themes:
+        if old_vectors is None:
+            old_vectors = _load_vectors(old_hierarchy)
+        if new_vectors is None:
+            new_vectors = _load_vectors(new_hierarchy)
+    scores, overlap = _theme_match_scores(
+        old_themes, new_themes, old_vectors or {}, new_vectors or {},
+    )
+
     matched_old: Set[int] = set()
     matched_new: Set[int] = set()
-
-    scored_pairs = []
-    for i, new_theme in enumerate(new_themes):
-        for j, old_theme in enumerate(old_themes):
-            score = _label_similarity(
-                new_theme.get('label', ''),
-                old_theme.get('label', ''),
-            )
-            if score >= 0.5:
-                scored_pairs.append((score, i, j))
-
-    # Sort by score descending — assign best matches first
-    scored_pairs.sort(key=lambda x: x[0], reverse=True)
-
-    for score, i, j in scored_pairs:
-        if i in matched_new or j in matched_old:
-            continue
+    for i, j in _assign(scores, MATCH_THRESHOLD):
         matched_old.add(j)
         matched_new.add(i)
 
@@ -156,41 +160,184 @@ def compute_hierarchy_diff(old_hierarchy, new_hierarchy) -> HierarchyDiff:
                 'chunk_count': theme.get('chunk_count', 0),
             })
 
-    # Unmatched old themes — check if they were merged into new themes
+    # Unmatched old themes — merged if ≥50% of their chunks landed in one
+    # new theme (the first such, in tree order), otherwise removed
     for j, old_theme in enumerate(old_themes):
-        if j not in matched_old:
-            # Check if old theme's chunks appear in any new theme (merge detection)
-            old_chunk_set = set(old_theme.get('chunk_ids', []))
-            merged_into = None
-
-            if old_chunk_set:
-                for new_theme in new_themes:
-                    new_chunk_set = set(new_theme.get('chunk_ids', []))
-                    overlap = len(old_chunk_set & new_chunk_set)
-                    if overlap >= len(old_chunk_set) * 0.5:
-                        merged_into = new_theme.get('label', '')
-                        break
-
-            if merged_into:
-                diff.merged_themes.append({
-                    'old_label': old_theme.get('label', ''),
-                    'merged_into': merged_into,
-                })
-            else:
-                diff.removed_themes.append({
-                    'label': old_theme.get('label', ''),
-                    'chunk_count': old_theme.get('chunk_count', 0),
-                })
+        if j in matched_old:
+            continue
+        old_size = len(old_theme.get('chunk_ids', []))
+        merged_into = None
+        if old_size:
+            hits = np.flatnonzero(overlap[:, j] >= old_size * 0.5)
+            if len(hits):
+                merged_into = new_themes[hits[0]].get('label', '')
+
+        if merged_into:
+            diff.merged_themes.append({
+                'old_label': old_theme.get('label', ''),
+                'merged_into': merged_into,
+            })
+        else:
+            diff.removed_themes.append({
+                'label': old_theme.get('label', ''),
+                'chunk_count': old_theme.get('chunk_count', 0),
+            })
 
     return diff
 
 
-def _label_similarity(a: str, b: str) -> float:
-    """Fuzzy label similarity using SequenceMatcher.
+def _load_vectors(hierarchy) -> Dict[str, np.ndarray]:
+    from .hierarchy_vectors import load_node_vectors
+
+    try:
+        return load_node_vectors(hierarchy)
+    except Exception:
+        logger.warning("hierarchy_diff_vectors_unavailable", exc_info=True)
+        return {}
+
+
+def _theme_match_scores(
+    old_themes: List[dict],
+    new_themes: List[dict],
+    old_vectors: Dict[str, np.ndarray],
+    new_vectors: Dict[str, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairwise (new × old) match scores and chunk-overlap counts.
 
-    Returns a ratio between 0.0 and 1.0. A threshold of 0.5 is used
-    in compute_hierarchy_diff to consider two labels as "the same theme".
+    Overlap: chunk ids of both trees are encoded against one sorted
+    vocabulary, and every chunk contributes to the (new theme, old theme)
+    cell it sits in — one bincount instead of a set intersection per pair.
+
+    Score: CENTROID_WEIGHT × centroid cosine + (1 − CENTROID_WEIGHT) ×
+    Jaccard where both themes have a summary vector, Jaccard otherwise.
+    Themes carried over unchanged by an incremental refresh keep their
+    id and always score 1.
+    """
+    n_new, n_old = len(new_themes), len(old_themes)
+    overlap = np.zeros((n_new, n_old), dtype=np.int64)
+    if not n_new or not n_old:
+        return np.zeros((n_new, n_old)), overlap
+
+    old_ids, old_owner = _membership(old_themes)
+    new_ids, new_owner = _membership(new_themes)
+    old_sizes = np.bincount(old_owner, minlength=n_old)
+    new_sizes = np.bincount(new_owner, minlength=n_new)
+
+    # Chunks present in both trees, via sorted-array intersection
+    _, old_pos, new_pos = np.intersect1d(old_ids, new_ids, assume_unique=False, return_indices=True)
+    if len(old_pos):
+        cells = new_owner[new_pos] * n_old + old_owner[old_pos]
+        overlap = np.bincount(cells, minlength=n_new * n_old).reshape(n_new, n_old)
+
+    union = new_sizes[:, None] + old_sizes[None, :] - overlap
+    jaccard = np.divide(overlap, union, out=np.zeros(overlap.shape), where=union > 0)
+
+    old_centroids, old_has = _centroids(old_themes, old_vectors)
+    new_centroids, new_has = _centroids(new_themes, new_vectors)
+    scores = jaccard
+    if old_has.any() and new_has.any() and old_centroids.shape[1] == new_centroids.shape[1]:
+        cosine = np.clip(new_centroids @ old_centroids.T, 0.0, 1.0)
+        both = new_has[:, None] & old_has[None, :]
+        blended = CENTROID_WEIGHT * cosine + (1 - CENTROID_WEIGHT) * jaccard
+        scores = np.where(both, blended, jaccard)
+
+    old_node_ids = np.array([t.get('id') or '' for t in old_themes], dtype=object)
+    new_node_ids = np.array([t.get('id') or '' for t in new_themes], dtype=object)
+    same_id = (new_node_ids[:, None] == old_node_ids[None, :]) & (new_node_ids[:, None] != '')
+    return np.where(same_id, 1.0, scores), overlap
+
+
+def _membership(themes: List[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Chunk ids (as a string array) of all themes and the theme index of each."""
+    ids: List[str] = []
+    owner: List[int] = []
+    for index, theme in enumerate(themes):
+        chunk_ids = theme.get('chunk_ids', [])
+        ids.extend(chunk_ids)
+        owner.extend([index] * len(chunk_ids))
+    return np.array(ids, dtype=str), np.array(owner, dtype=np.int64)
+
+
+def _centroids(themes: List[dict], vectors: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Normalized summary vectors per theme (zero rows where missing)."""
+    dim = next((len(v) for v in vectors.values()), 0)
+    matrix = np.zeros((len(themes), dim), dtype=np.float32)
+    has = np.zeros(len(themes), dtype=bool)
+    for row, theme in enumerate(themes):
+        vec = vectors.get(theme.get('id'))
+        if vec is not None and len(vec) == dim:
+            matrix[row] = vec
+            has[row] = True
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    has &= norms[:, 0] > 0
+    return matrix / np.where(norms == 0, 1, norms), has
+
+
+def _assign(scores: np.ndarray, threshold: float) -> List[Tuple[int, int]]:
+    """(row, col) pairs of a maximum-total-score matching, scores ≥ threshold only.
+
+    Pairs below the threshold are worth nothing to the solver, so it
+    maximizes the summed score of acceptable matches.
+    """
+    if not scores.size:
+        return []
+    gain = np.where(scores >= threshold, scores, 0.0)
+    try:
+        from scipy.optimize import linear_sum_assignment
+        rows, cols = linear_sum_assignment(gain, maximize=True)
+    except ImportError:
+        rows, cols = _hungarian(-gain)
+    return [
+        (int(r), int(c)) for r, c in zip(rows, cols)
+        if scores[r, c] >= threshold
+    ]
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment (shortest augmenting path, O(n²·m)).
+
+    numpy fallback for scipy.optimize.linear_sum_assignment; returns
+    (rows, cols) with one pair per row of the smaller dimension.
     """
-    if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)    # row (1-based) assigned to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(owner[1:])
+    rows = owner[1:][cols] - 1
+    order = np.argsort(rows)
+    rows, cols = rows[order], cols[order]
+    return (cols, rows) if transposed else (rows, cols)
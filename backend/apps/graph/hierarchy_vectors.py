@@ -0,0 +1,101 @@
+"""
+Topic/theme summary embeddings for a ClusterHierarchy.
+
+The hierarchy tree (labels, summaries, chunk ids, counts) lives in
+ClusterHierarchy.tree; the Level 1-2 summary embeddings live in a
+ClusterHierarchyVectors row as a packed float32 matrix. Readers that only
+render or walk the tree never touch the vectors; similarity matching
+(case chunk retrieval, incremental refresh) loads them on demand.
+
+Hierarchies built before the split still carry an 'embedding' key on
+their tree nodes; load_node_vectors() falls back to those.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (node_id, level, embedding) as collected while serializing a tree
+NodeVector = Tuple[str, int, List[float]]
+
+
+def pack_node_vectors(entries: Iterable[NodeVector]) -> Optional[dict]:
+    """Pack node embeddings into ClusterHierarchyVectors field values.
+
+    Entries whose embedding length differs from the first one are dropped.
+    Returns None when there is nothing to store.
+    """
+    node_ids, levels, rows = [], [], []
+    for node_id, level, embedding in entries:
+        if embedding is None or len(embedding) == 0:
+            continue
+        if rows and len(embedding) != len(rows[0]):
+            continue
+        node_ids.append(node_id)
+        levels.append(level)
+        rows.append(embedding)
+    if not rows:
+        return None
+    matrix = np.asarray(rows, dtype=np.float32)
+    return {
+        'node_ids': node_ids,
+        'levels': levels,
+        'dim': matrix.shape[1],
+        'vectors': matrix.tobytes(),
+    }
+
+
+def save_node_vectors(hierarchy, entries: Iterable[NodeVector]):
+    """Store (or replace) the node embeddings of a hierarchy."""
+    from .models import ClusterHierarchyVectors
+
+    packed = pack_node_vectors(entries)
+    if packed is None:
+        ClusterHierarchyVectors.objects.filter(hierarchy=hierarchy).delete()
+        return None
+    obj, _ = ClusterHierarchyVectors.objects.update_or_create(
+        hierarchy=hierarchy, defaults=packed,
+    )
+    return obj
+
+
+def tree_embeddings(tree: Optional[dict]) -> List[NodeVector]:
+    """(node_id, level, embedding) for nodes that carry an inline 'embedding'."""
+    found: List[NodeVector] = []
+    stack = [tree or {}]
+    while stack:
+        node = stack.pop()
+        if node.get('embedding') and node.get('id'):
+            found.append((node['id'], node.get('level', 0), node['embedding']))
+        stack.extend(node.get('children') or [])
+    return found
+
+
+def load_node_vectors(hierarchy) -> Dict[str, np.ndarray]:
+    """node_id → float32 embedding for a hierarchy's topics and themes.
+
+    Reads the ClusterHierarchyVectors row; hierarchies without one (built
+    before embeddings moved out of the tree) fall back to inline tree
+    embeddings. Returns an empty dict when neither is available.
+    """
+    from .models import ClusterHierarchyVectors
+
+    if hierarchy is None:
+        return {}
+    try:
+        stored = ClusterHierarchyVectors.objects.filter(hierarchy_id=hierarchy.pk).first()
+    except Exception:
+        logger.warning(
+            "hierarchy_vectors_load_failed",
+            extra={'hierarchy_id': str(hierarchy.pk)},
+            exc_info=True,
+        )
+        stored = None
+
+    if stored is not None:
+        return dict(zip(stored.node_ids, stored.matrix()))
+
+    legacy = tree_embeddings(getattr(hierarchy, 'tree', None))
+    return {node_id: np.asarray(emb, dtype=np.float32) for node_id, _level, emb in legacy}
@@ -14,7 +14,9 @@ from typing import List
 
 logger = logging.getLogger(__name__)
 
-# Maximum theme pairs to check for tensions (nC2 can grow fast)
+# Maximum new LLM tension checks per run (nC2 can grow fast); pairs are
+# ranked first and memoized verdicts don't count against it.
+# Overridden by SUMMARY_SETTINGS['insight_tensions']['max_llm_pairs'].
 MAX_TENSION_PAIRS = 15
 MAX_CONCURRENT_LLM = 5
 
@@ -62,9 +64,9 @@ class InsightDiscoveryAgent:
         if not themes:
             return []
 
-        # Dismiss stale insights from previous hierarchy versions that reference
+        # Supersede stale insights from previous hierarchy versions that reference
         # cluster IDs no longer present in the current tree
-        self._dismiss_stale_insights(project_id, tree)
+        self._supersede_stale_insights(project_id, tree)
 
         insights = []
 
@@ -80,9 +82,12 @@ class InsightDiscoveryAgent:
             tension_insights = await self._detect_tensions(
                 project_id, themes,
                 filter_labels=changed_labels if changed_labels else None,
+                hierarchy=hierarchy,
             )
         else:
-            tension_insights = await self._detect_tensions(project_id, themes)
+            tension_insights = await self._detect_tensions(
+                project_id, themes, hierarchy=hierarchy,
+            )
 
         insights.extend(tension_insights)
 
@@ -130,7 +135,7 @@ class InsightDiscoveryAgent:
             gap_insights = detect_gap_insights(project_id, tree, themes)
             insights.extend(gap_insights)
 
-        # 4. Deduplicate against existing active insights
+        # 4. Deduplicate against insights the project already has
         new_insights = self._deduplicate(project_id, insights)
 
         # 5. Bulk create
@@ -170,47 +175,63 @@ class InsightDiscoveryAgent:
         project_id: uuid.UUID,
         themes: List[dict],
         filter_labels: set = None,
+        hierarchy=None,
     ) -> list:
         """Detect cross-cluster tensions by comparing theme pairs via LLM (parallel).
 
+        Pairs are ranked by centroid similarity and contradiction edges
+        (see tension_candidates); the top ``max_candidates`` are checked.
+        Memoized verdicts are reused, and at most ``max_llm_pairs`` of the
+        remaining candidates are sent to the LLM, best-ranked first.
+
         Args:
             project_id: Project UUID.
             themes: List of theme dicts from the hierarchy tree.
             filter_labels: If provided, only check pairs where at least one
                 theme's label is in this set. Saves LLM calls on re-builds
                 by skipping stable theme pairs (Plan 6).
+            hierarchy: Current ClusterHierarchy, for theme centroids.
         """
+        from asgiref.sync import sync_to_async
         from apps.common.llm_providers.factory import get_llm_provider
+        from apps.common.llm_providers.rate_limiter import Priority
         from apps.intelligence.insight_prompts import build_tension_detection_prompt
-        from .models import ProjectInsight, InsightType, InsightSource, InsightStatus
+        from .tension_candidates import (
+            DEFAULT_MAX_CANDIDATES, load_verdicts, pair_fingerprint,
+            store_verdicts, tension_settings,
+        )
 
         if len(themes) < 2:
             return []
 
-        # Generate pairs (limit to avoid excessive LLM calls)
-        pairs = []
-        for i in range(len(themes)):
-            for j in range(i + 1, len(themes)):
-                if filter_labels:
-                    label_a = themes[i].get('label', '')
-                    label_b = themes[j].get('label', '')
-                    if label_a not in filter_labels and label_b not in filter_labels:
-                        continue  # Skip — neither theme changed
-                pairs.append((themes[i], themes[j]))
-
-        if len(pairs) > MAX_TENSION_PAIRS:
-            # Prioritize pairs with highest combined coverage
-            pairs.sort(
-                key=lambda p: p[0].get('coverage_pct', 0) + p[1].get('coverage_pct', 0),
-                reverse=True,
-            )
-            pairs = pairs[:MAX_TENSION_PAIRS]
+        cfg = tension_settings()
+        ranked = await sync_to_async(self._rank_tension_pairs)(
+            project_id, themes, filter_labels, hierarchy, cfg,
+        )
+        candidates = ranked[:cfg.get('max_candidates', DEFAULT_MAX_CANDIDATES)]
+
+        provider = get_llm_provider('fast', priority=Priority.BACKGROUND)
+        model = str(getattr(provider, 'model', '') or '')
+        keys = [pair_fingerprint(c.theme_a, c.theme_b, model) for c in candidates]
+        cached = await sync_to_async(load_verdicts)(project_id, keys)
+
+        max_llm_pairs = cfg.get('max_llm_pairs', MAX_TENSION_PAIRS)
+        insights = []
+        to_check = []
+        for key, candidate in zip(keys, candidates):
+            if key in cached:
+                insight = self._tension_insight(
+                    project_id, candidate.theme_a, candidate.theme_b, cached[key],
+                )
+                if insight is not None:
+                    insights.append(insight)
+            elif len(to_check) < max_llm_pairs:
+                to_check.append((key, candidate.theme_a, candidate.theme_b))
 
-        provider = get_llm_provider('fast')
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM)
 
         async def _check_pair(theme_a: dict, theme_b: dict):
-            """Check a single theme pair for tensions."""
+            """Check a single theme pair; returns a verdict tuple or None on failure."""
             async with semaphore:
                 try:
                     system_prompt, user_prompt = build_tension_detection_prompt(theme_a, theme_b)
@@ -220,38 +241,7 @@ class InsightDiscoveryAgent:
                         max_tokens=256,
                         temperature=0.2,
                     )
-
-                    if '<no_tension' in response:
-                        return None
-
-                    # Parse tension
-                    title_match = re.search(r'<title>(.*?)</title>', response, re.DOTALL)
-                    explanation_match = re.search(r'<explanation>(.*?)</explanation>', response, re.DOTALL)
-                    confidence_match = re.search(r'<confidence>(.*?)</confidence>', response, re.DOTALL)
-
-                    if title_match and explanation_match:
-                        confidence = 0.7
-                        if confidence_match:
-                            try:
-                                confidence = float(confidence_match.group(1).strip())
-                            except ValueError:
-                                pass
-
-                        return ProjectInsight(
-                            project_id=project_id,
-                            insight_type=InsightType.TENSION,
-                            title=title_match.group(1).strip()[:200],
-                            content=explanation_match.group(1).strip(),
-                            source_type=InsightSource.AGENT_DISCOVERY,
-                            source_cluster_ids=[
-                                theme_a.get('id', ''),
-                                theme_b.get('id', ''),
-                            ],
-                            status=InsightStatus.ACTIVE,
-                            confidence=min(max(confidence, 0.0), 1.0),
-                            metadata={'model': 'fast'},
-                        )
-
+                    return self._parse_tension_verdict(response)
                 except Exception:
                     logger.warning(
                         "tension_detection_failed",
@@ -263,16 +253,119 @@ class InsightDiscoveryAgent:
                     )
                 return None
 
-        # Run all pairs in parallel with semaphore-bounded concurrency
-        results = await asyncio.gather(*[_check_pair(a, b) for a, b in pairs])
-        return [r for r in results if r is not None]
+        # Run uncached pairs in parallel with semaphore-bounded concurrency
+        verdicts = await asyncio.gather(*[_check_pair(a, b) for _, a, b in to_check])
+
+        fresh = []
+        for (key, theme_a, theme_b), verdict in zip(to_check, verdicts):
+            if verdict is None:
+                continue
+            fresh.append((key, *verdict))
+            insight = self._tension_insight(project_id, theme_a, theme_b, verdict)
+            if insight is not None:
+                insights.append(insight)
+        await sync_to_async(store_verdicts)(project_id, fresh, model)
+
+        logger.info(
+            "tension_candidates_checked",
+            extra={
+                'project_id': str(project_id),
+                'pairs': len(ranked),
+                'candidates': len(candidates),
+                'cached': sum(1 for k in keys if k in cached),
+                'llm_checked': len(to_check),
+                'tensions': len(insights),
+            },
+        )
+        return insights
+
+    @staticmethod
+    def _rank_tension_pairs(project_id, themes, filter_labels, hierarchy, cfg) -> list:
+        """Rank theme pairs; falls back to coverage order if the signals can't be loaded."""
+        import numpy as np
+        from .tension_candidates import (
+            DEFAULT_CONTRADICTION_WEIGHT, load_contradiction_counts,
+            rank_tension_candidates, theme_similarities,
+        )
+
+        n = len(themes)
+        similarities = np.zeros((n, n), dtype=np.float32)
+        contradictions = np.zeros((n, n), dtype=np.int32)
+        if hierarchy is not None:
+            try:
+                from .centroid_index import get_centroid_index
+                similarities = theme_similarities(themes, get_centroid_index(hierarchy))
+            except Exception:
+                logger.warning("tension_similarity_failed", exc_info=True)
+        try:
+            contradictions = load_contradiction_counts(project_id, themes)
+        except Exception:
+            logger.warning("tension_contradiction_counts_failed", exc_info=True)
+
+        return rank_tension_candidates(
+            themes, similarities, contradictions,
+            filter_labels=filter_labels,
+            contradiction_weight=cfg.get('contradiction_weight', DEFAULT_CONTRADICTION_WEIGHT),
+        )
 
-    def _dismiss_stale_insights(
+    @staticmethod
+    def _parse_tension_verdict(response: str):
+        """(has_tension, title, explanation, confidence), or None if unparseable."""
+        if '<no_tension' in response:
+            return (False, '', '', None)
+
+        title_match = re.search(r'<title>(.*?)</title>', response, re.DOTALL)
+        explanation_match = re.search(r'<explanation>(.*?)</explanation>', response, re.DOTALL)
+        confidence_match = re.search(r'<confidence>(.*?)</confidence>', response, re.DOTALL)
+        if not (title_match and explanation_match):
+            return None
+
+        confidence = 0.7
+        if confidence_match:
+            try:
+                confidence = float(confidence_match.group(1).strip())
+            except ValueError:
+                pass
+        return (
+            True,
+            title_match.group(1).strip()[:200],
+            explanation_match.group(1).strip(),
+            min(max(confidence, 0.0), 1.0),
+        )
+
+    @staticmethod
+    def _tension_insight(project_id: uuid.UUID, theme_a: dict, theme_b: dict, verdict):
+        """ProjectInsight for a positive verdict, None otherwise."""
+        from .models import ProjectInsight, InsightType, InsightSource, InsightStatus
+
+        has_tension, title, explanation, confidence = verdict
+        if not has_tension:
+            return None
+        return ProjectInsight(
+            project_id=project_id,
+            insight_type=InsightType.TENSION,
+            title=title,
+            content=explanation,
+            source_type=InsightSource.AGENT_DISCOVERY,
+            source_cluster_ids=[
+                theme_a.get('id', ''),
+                theme_b.get('id', ''),
+            ],
+            status=InsightStatus.ACTIVE,
+            confidence=0.7 if confidence is None else confidence,
+            metadata={'model': 'fast'},
+        )
+
+    def _supersede_stale_insights(
         self,
         project_id: uuid.UUID,
         tree: dict,
     ):
-        """Auto-dismiss insights that reference cluster IDs from previous versions."""
+        """
+        Mark insights that reference cluster IDs from previous versions as
+        superseded. Not dismissed: that status is left to the user, and
+        _deduplicate() keeps dismissed insights from coming back.
+        """
         from .models import ProjectInsight, InsightStatus
 
         # Collect all current cluster IDs from the tree
@@ -294,10 +387,10 @@ class InsightDiscoveryAgent:
 
         if stale_ids:
             count = ProjectInsight.objects.filter(id__in=stale_ids).update(
-                status=InsightStatus.DISMISSED,
+                status=InsightStatus.SUPERSEDED,
             )
             logger.info(
-                "stale_insights_dismissed",
+                "stale_insights_superseded",
                 extra={'project_id': str(project_id), 'count': count},
             )
 
@@ -314,25 +407,53 @@ class InsightDiscoveryAgent:
         project_id: uuid.UUID,
         candidates: list,
     ) -> list:
-        """Remove insights that duplicate existing active ones (by title similarity)."""
-        from .models import ProjectInsight, InsightStatus
+        """
+        Remove insights that duplicate open ones, or discovered ones the
+        user dismissed or resolved, by title or, for tensions, by cluster
+        pair. Without the latter a cached tension verdict would bring back
+        an insight the user already dealt with.
+        """
+        from django.db.models import Q
+        from .models import ProjectInsight, InsightStatus, InsightType, InsightSource
 
+        open_statuses = [InsightStatus.ACTIVE, InsightStatus.ACKNOWLEDGED, InsightStatus.RESEARCHING]
+        closed_by_user = Q(
+            status__in=[InsightStatus.DISMISSED, InsightStatus.RESOLVED],
+            source_type=InsightSource.AGENT_DISCOVERY,
+        )
         existing = list(
             ProjectInsight.objects
-            .filter(project_id=project_id, status=InsightStatus.ACTIVE)
-            .values_list('title', flat=True)
+            .filter(project_id=project_id)
+            .filter(Q(status__in=open_statuses) | closed_by_user)
+            .values_list('title', 'insight_type', 'source_cluster_ids')
         )
 
         if not existing:
             return candidates
 
-        existing_titles = set(t.lower() for t in existing)
+        def tension_pair(insight_type, cluster_ids):
+            if insight_type != InsightType.TENSION or not cluster_ids:
+                return None
+            return frozenset(cluster_ids)
+
+        existing_titles = set(title.lower() for title, _, _ in existing)
+        existing_pairs = {
+            tension_pair(insight_type, cluster_ids)
+            for _, insight_type, cluster_ids in existing
+        }
+        existing_pairs.discard(None)
         unique = []
 
         for candidate in candidates:
             # Simple title-based dedup (exact match after lowercasing)
-            if candidate.title.lower() not in existing_titles:
-                unique.append(candidate)
-                existing_titles.add(candidate.title.lower())
+            if candidate.title.lower() in existing_titles:
+                continue
+            pair = tension_pair(candidate.insight_type, candidate.source_cluster_ids)
+            if pair is not None and pair in existing_pairs:
+                continue
+            unique.append(candidate)
+            existing_titles.add(candidate.title.lower())
+            if pair is not None:
+                existing_pairs.add(pair)
 
         return unique
@@ -0,0 +1,302 @@
+"""
+Server-side 2D layout for the clustered graph view.
+
+The clustered endpoint ships up to GRAPH_MAX_LIMIT nodes; running a force
+simulation over them in the browser stalls the page and is redone on
+every load. Instead compute_graph_layout_task lays the project graph out
+once per graph revision and stores the coordinates in a GraphLayout row,
+and the endpoint returns them with the nodes.
+
+- Full layout: nodes start around an anchor for their cluster (clusters
+  from the project's GraphPartition, anchors on a sunflower spiral, larger
+  clusters closer to the middle), then igraph Fruchterman-Reingold — DrL
+  for large graphs — refines the layout with intra-cluster edges weighted
+  up. Coordinates are scaled into [-LAYOUT_EXTENT, LAYOUT_EXTENT].
+- Incremental: when only a few nodes are new, existing nodes are pinned
+  at their previous coordinates (FR bounds), new nodes start at the mean
+  of their placed neighbours (else their cluster's placed members) and a
+  short, cool FR pass settles them. The rest of the picture doesn't move.
+
+Without igraph the cluster-seeded start positions are used as they are.
+"""
+import logging
+import math
+import time
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Full layouts are scaled to fit [-LAYOUT_EXTENT, LAYOUT_EXTENT]²
+LAYOUT_EXTENT = 1000.0
+# At most one layout dispatch per project per this many seconds
+LAYOUT_DISPATCH_COOLDOWN = 10
+
+_GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+_UNBOUNDED = 1e12
+
+
+class LayoutResult(NamedTuple):
+    positions: np.ndarray   # (n, 2) float32 in stored coordinates
+    mode: str               # 'full' | 'incremental'
+    algorithm: str          # 'fr' | 'drl' | 'seed'
+    scale: float            # stored units per layout unit
+    new_nodes: int
+
+
+def layout_settings() -> dict:
+    from django.conf import settings as django_settings
+
+    return getattr(django_settings, 'SUMMARY_SETTINGS', {}).get('graph_layout', {})
+
+
+def cluster_seed_positions(membership: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Start positions scattered around one anchor per cluster.
+
+    ``membership`` holds a cluster label per node (-1 = unclustered, laid
+    out as a singleton). Anchors follow a sunflower spiral, largest
+    cluster first, with radius growing like the square root of the nodes
+    placed so far; each cluster spreads over a disc sized to its count.
+    """
+    n = len(membership)
+    if not n:
+        return np.zeros((0, 2), dtype=np.float64)
+    labels = np.asarray(membership, dtype=np.int64).copy()
+    missing = labels < 0
+    labels[missing] = labels.max(initial=-1) + 1 + np.arange(int(missing.sum()))
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+
+    order = np.argsort(-counts, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    radius = np.sqrt(np.cumsum(counts[order]) - counts[order] / 2)
+    angle = np.arange(len(order)) * _GOLDEN_ANGLE
+    anchors = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1)[rank]
+
+    spread = 0.5 * np.sqrt(counts)[inverse] * np.sqrt(rng.random(n))
+    theta = rng.random(n) * 2 * math.pi
+    return anchors[inverse] + np.stack([spread * np.cos(theta), spread * np.sin(theta)], axis=1)
+
+
+def _place_new_nodes(
+    raw: np.ndarray,
+    free: np.ndarray,
+    edges: np.ndarray,
+    membership: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Start positions for free nodes, next to what is already placed."""
+    placed = ~free
+    sums = np.zeros((len(raw), 2))
+    counts = np.zeros(len(raw))
+    for a, b in ((0, 1), (1, 0)):
+        mask = free[edges[:, a]] & placed[edges[:, b]] if len(edges) else np.zeros(0, dtype=bool)
+        np.add.at(sums, edges[mask, a], raw[edges[mask, b]])
+        np.add.at(counts, edges[mask, a], 1)
+
+    rim = np.abs(raw[placed]).max() * 1.05 if placed.any() else 1.0
+    for row in np.flatnonzero(free):
+        if counts[row]:
+            raw[row] = sums[row] / counts[row]
+            continue
+        members = placed & (membership == membership[row]) if membership[row] >= 0 else None
+        if members is not None and members.any():
+            raw[row] = raw[members].mean(axis=0)
+        else:
+            theta = rng.random() * 2 * math.pi
+            raw[row] = (rim * math.cos(theta), rim * math.sin(theta))
+    raw[free] += rng.normal(scale=0.5, size=(int(free.sum()), 2))
+    return raw
+
+
+def compute_layout(
+    n: int,
+    edges: np.ndarray,
+    membership: np.ndarray,
+    previous: Optional[np.ndarray] = None,
+    previous_scale: Optional[float] = None,
+    cfg: Optional[dict] = None,
+    seed: int = 0,
+) -> LayoutResult:
+    """Lay out ``n`` nodes with ``edges`` ((m, 2) node rows).
+
+    ``previous`` holds last run's stored coordinates per row (NaN for new
+    nodes) and ``previous_scale`` its scale; when few enough rows are new
+    the layout is incremental.
+    """
+    cfg = cfg if cfg is not None else layout_settings()
+    rng = np.random.default_rng(seed)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    membership = np.asarray(membership, dtype=np.int64)
+    if n == 0:
+        return LayoutResult(np.zeros((0, 2), dtype=np.float32), 'full', 'seed', 1.0, 0)
+
+    if previous is not None and previous_scale:
+        free = np.isnan(previous[:, 0])
+        new_nodes = int(free.sum())
+        max_new = cfg.get('incremental_max_new_fraction', 0.2)
+        if new_nodes < n and new_nodes / n <= max_new:
+            return _incremental_layout(edges, membership, previous, previous_scale, free, cfg, rng)
+
+    start = cluster_seed_positions(membership, rng)
+    same_cluster = (
+        (membership[edges[:, 0]] == membership[edges[:, 1]]) & (membership[edges[:, 0]] >= 0)
+        if len(edges) else np.zeros(0, dtype=bool)
+    )
+    weights = np.where(same_cluster, cfg.get('intra_cluster_weight', 3.0), 1.0)
+    try:
+        import igraph as ig
+
+        graph = ig.Graph(n=n, edges=edges.tolist())
+        if n >= cfg.get('drl_min_nodes', 20000):
+            algorithm = 'drl'
+            coords = graph.layout_drl(weights=weights.tolist() or None, seed=start.tolist())
+        else:
+            algorithm = 'fr'
+            coords = graph.layout_fruchterman_reingold(
+                weights=weights.tolist() or None,
+                seed=start.tolist(),
+                niter=cfg.get('iterations', 500),
+            )
+        raw = np.asarray(coords.coords, dtype=np.float64)
+    except ImportError:
+        logger.info("igraph not available, using cluster-seeded layout")
+        algorithm = 'seed'
+        raw = start
+
+    center = (raw.min(axis=0) + raw.max(axis=0)) / 2
+    half = float(np.abs(raw - center).max())
+    scale = LAYOUT_EXTENT / half if half > 0 else 1.0
+    positions = ((raw - center) * scale).astype(np.float32)
+    return LayoutResult(positions, 'full', algorithm, scale, n)
+
+
+def _incremental_layout(edges, membership, previous, scale, free, cfg, rng) -> LayoutResult:
+    raw = _place_new_nodes(previous.astype(np.float64) / scale, free, edges, membership, rng)
+    algorithm = 'seed'
+    try:
+        import igraph as ig
+
+        graph = ig.Graph(n=len(raw), edges=edges.tolist())
+        x, y = raw[:, 0], raw[:, 1]
+        coords = graph.layout_fruchterman_reingold(
+            seed=raw.tolist(),
+            niter=cfg.get('incremental_iterations', 100),
+            start_temp=min(2.0, math.sqrt(len(raw)) / 10),
+            minx=np.where(free, -_UNBOUNDED, x).tolist(),
+            maxx=np.where(free, _UNBOUNDED, x).tolist(),
+            miny=np.where(free, -_UNBOUNDED, y).tolist(),
+            maxy=np.where(free, _UNBOUNDED, y).tolist(),
+        )
+        raw = np.asarray(coords.coords, dtype=np.float64)
+        algorithm = 'fr'
+    except ImportError:
+        logger.info("igraph not available, placing new nodes without refinement")
+
+    positions = (raw * scale).astype(np.float32)
+    # Pinned nodes keep their exact stored coordinates
+    positions[~free] = previous[~free]
+    return LayoutResult(positions, 'incremental', algorithm, scale, int(free.sum()))
+
+
+def build_graph_layout(project_id: uuid.UUID, *, force: bool = False):
+    """Compute and store the project's layout; None when already current.
+
+    Covers the same nodes as the clustered graph at its maximum limit.
+    Clusters come from the project's GraphPartition at the configured
+    resolution (else its most recent one).
+    """
+    from django.conf import settings as django_settings
+    from .models import Edge, GraphLayout, GraphPartition, Node
+    from .revision import get_graph_revision
+    from .services import GraphService
+
+    revision = get_graph_revision(project_id)
+    existing = GraphLayout.objects.filter(project_id=project_id).first()
+    if existing is not None and existing.graph_revision == revision and not force:
+        return None
+
+    start_time = time.perf_counter()
+    node_ids = list(
+        Node.objects.filter(project_id=project_id)
+        .values_list('id', flat=True)[:GraphService.GRAPH_MAX_LIMIT]
+    )
+    row_of = {nid: row for row, nid in enumerate(node_ids)}
+    edges = [
+        (row_of[source], row_of[target])
+        for source, target in Edge.objects.filter(source_node__project_id=project_id)
+        .values_list('source_node_id', 'target_node_id')
+        if source in row_of and target in row_of
+    ]
+
+    resolution = (
+        getattr(django_settings, 'SUMMARY_SETTINGS', {})
+        .get('node_clustering', {}).get('resolution', 1.0)
+    )
+    partitions = GraphPartition.objects.filter(project_id=project_id)
+    partition = partitions.filter(resolution=resolution).first() or partitions.first()
+    membership_of = partition.membership if partition else {}
+    membership = np.array(
+        [membership_of.get(str(nid), -1) for nid in node_ids], dtype=np.int64,
+    )
+
+    previous = None
+    previous_scale = None
+    if existing is not None and existing.node_ids:
+        previous = np.full((len(node_ids), 2), np.nan, dtype=np.float32)
+        coordinates = existing.coordinates()
+        for old_row, nid in enumerate(existing.node_ids):
+            row = row_of.get(uuid.UUID(nid))
+            if row is not None:
+                previous[row] = coordinates[old_row]
+        previous_scale = (existing.metadata or {}).get('scale')
+
+    result = compute_layout(
+        len(node_ids), np.array(edges, dtype=np.int64).reshape(-1, 2), membership,
+        previous=previous, previous_scale=previous_scale,
+    )
+    layout, _ = GraphLayout.objects.update_or_create(
+        project_id=project_id,
+        defaults={
+            'graph_revision': revision,
+            'node_ids': [str(nid) for nid in node_ids],
+            'positions': result.positions.tobytes(),
+            'metadata': {
+                'mode': result.mode,
+                'algorithm': result.algorithm,
+                'scale': result.scale,
+                'new_nodes': result.new_nodes,
+                'node_count': len(node_ids),
+                'duration_ms': int((time.perf_counter() - start_time) * 1000),
+            },
+        },
+    )
+    return layout
+
+
+def layout_positions(layout, node_ids: Iterable[str]) -> Dict[str, List[float]]:
+    """node id → [x, y] (1 decimal) for the given ids that the layout places."""
+    coordinates = layout.coordinates()
+    row_of = {nid: row for row, nid in enumerate(layout.node_ids)}
+    positions: Dict[str, List[float]] = {}
+    for nid in node_ids:
+        row = row_of.get(nid)
+        if row is not None:
+            x, y = coordinates[row]
+            positions[nid] = [round(float(x), 1), round(float(y), 1)]
+    return positions
+
+
+def request_graph_layout(project_id: uuid.UUID):
+    """Queue compute_graph_layout_task for a project (debounced, non-critical)."""
+    try:
+        from django.core.cache import cache
+
+        if cache.add(f'graph_layout_dispatch:{project_id}', '1', timeout=LAYOUT_DISPATCH_COOLDOWN):
+            from .tasks import compute_graph_layout_task
+            compute_graph_layout_task.apply_async(args=[str(project_id)], countdown=2)
+    except Exception:
+        logger.debug("Graph layout dispatch failed", exc_info=True)
@@ -0,0 +1,551 @@
+"""
+Benchmark graph/clustering hot paths on synthetic data (no DB writes).
+
+Usage:
+    python manage.py benchmark_graph                          # run all benchmarks
+    python manage.py benchmark_graph --bench refinement       # one benchmark
+    python manage.py benchmark_graph --nodes 5000 --repeat 3
+    python manage.py benchmark_graph --bench chunk_clustering --nodes 100000 --repeat 1
+    python manage.py benchmark_graph --bench graph_payload --nodes 5000
+"""
+import json
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+
+def _synthetic_nodes(n: int, dim: int, n_topics: int, seed: int = 0):
+    """Fake Node-like objects clustered around n_topics directions."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+    nodes = []
+    for i in range(n):
+        emb = topics[i % n_topics] + rng.normal(scale=1.5, size=dim)
+        nodes.append(SimpleNamespace(
+            id=uuid.UUID(int=i + 1),
+            embedding=emb.tolist() if i % 13 else None,
+            node_type='claim',
+            content=f'node {i}',
+        ))
+    return nodes
+
+
+def bench_refinement(opts) -> dict:
+    """ClusteringService._semantic_refinement + _assign_orphans_by_embedding."""
+    from apps.graph.clustering import ClusteringService, NodeEmbeddingMatrix
+
+    n = opts['nodes']
+    nodes = _synthetic_nodes(n, opts['dim'], n_topics=max(2, n // 80))
+    nodes_by_id = {node.id: node for node in nodes}
+
+    # 60% in 30-node communities, 15% singletons, 25% orphans
+    grouped = int(n * 0.6)
+    singles = int(n * 0.15)
+    clusters = [
+        {node.id for node in nodes[i:i + 30]} for i in range(0, grouped, 30)
+    ] + [{node.id} for node in nodes[grouped:grouped + singles]]
+    orphans = nodes[grouped + singles:]
+
+    timings = {}
+    start = time.perf_counter()
+    embeddings = NodeEmbeddingMatrix(nodes_by_id.values())
+    timings['matrix_build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    refined = ClusteringService._semantic_refinement(
+        [set(c) for c in clusters], nodes_by_id,
+        merge_threshold=0.3, embeddings=embeddings,
+    )
+    timings['semantic_refinement'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ClusteringService._assign_orphans_by_embedding(
+        orphans, refined, nodes_by_id, 0.2, embeddings=embeddings,
+    )
+    timings['assign_orphans'] = time.perf_counter() - start
+    return timings
+
+
+def bench_cluster_quality(opts) -> dict:
+    """ClusteringService.compute_cluster_quality on a random graph (4 edges/node)."""
+    from apps.graph.clustering import ClusteringService
+
+    rng = np.random.default_rng(0)
+    n = opts['nodes']
+    ids = [uuid.UUID(int=i + 1) for i in range(n)]
+    clusters = [
+        {'node_ids': [str(nid) for nid in ids[i:i + 35]]} for i in range(0, n, 35)
+    ]
+    endpoints = rng.integers(0, n, size=(n * 4, 2))
+    edges = [
+        SimpleNamespace(source_node_id=ids[a], target_node_id=ids[b])
+        for a, b in endpoints
+    ]
+
+    start = time.perf_counter()
+    ClusteringService.compute_cluster_quality(clusters, edges)
+    return {'compute_cluster_quality': time.perf_counter() - start}
+
+
+def _adjusted_rand(labels_a: np.ndarray, labels_b: np.ndarray) -> float:
+    """Adjusted Rand index between two labelings (1.0 = identical partitions)."""
+    _, a = np.unique(labels_a, return_inverse=True)
+    _, b = np.unique(labels_b, return_inverse=True)
+    pairs = np.unique(a * (b.max() + 1) + b, return_counts=True)[1]
+
+    def comb2(counts):
+        counts = counts.astype(float)
+        return float(np.sum(counts * (counts - 1) / 2))
+
+    index = comb2(pairs)
+    sum_a, sum_b = comb2(np.bincount(a)), comb2(np.bincount(b))
+    expected = sum_a * sum_b / comb2(np.array([len(a)]))
+    max_index = (sum_a + sum_b) / 2
+    if max_index == expected:
+        return 1.0
+    return (index - expected) / (max_index - expected)
+
+
+def bench_chunk_clustering(opts) -> dict:
+    """Chunk clustering backends vs. planted topics (and exact, when it fits)."""
+    from apps.graph.chunk_clustering import ChunkClusteringService
+
+    rng = np.random.default_rng(0)
+    n, dim = opts['nodes'], opts['dim']
+    n_topics = max(2, n // 60)
+    # Topics grouped into themes, chunk noise near the 0.65 distance threshold
+    themes = rng.normal(size=(max(1, n_topics // 6), dim))
+    topics = themes[np.arange(n_topics) % len(themes)] * 0.9 + rng.normal(size=(n_topics, dim))
+    truth = rng.integers(0, n_topics, size=n)
+    vecs = topics[truth] + rng.normal(scale=1.6, size=(n, dim))
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    runs = {
+        'sampled': lambda: ChunkClusteringService._cluster_sampled(
+            vecs, 0.65, sample_size=min(5000, max(2, n // 4)),
+        ),
+        'minibatch': lambda: ChunkClusteringService._cluster_minibatch(vecs, 0.65, {}),
+    }
+    if n <= 10000:
+        runs['exact'] = lambda: ChunkClusteringService._cluster_direct(vecs, 0.65)
+
+    timings, labels = {}, {}
+    for name, run in runs.items():
+        start = time.perf_counter()
+        labels[name] = run()
+        timings[name] = time.perf_counter() - start
+
+    scores = {f'{name}_ari_vs_topics': _adjusted_rand(truth, l) for name, l in labels.items()}
+    if 'exact' in labels:
+        for name in ('sampled', 'minibatch'):
+            scores[f'{name}_ari_vs_exact'] = _adjusted_rand(labels['exact'], labels[name])
+    timings['scores'] = scores
+    return timings
+
+
+def bench_chunk_loading(opts) -> dict:
+    """Peak Python heap of the old model-instance chunk load vs. load_chunk_matrix.
+
+    Rows are synthesized the way the DB driver returns them: the old path
+    gets a Document (with its ~40KB content_text) per chunk via
+    select_related and copies each embedding into a list; the new path
+    receives the five selected columns only.
+    """
+    from apps.graph.chunk_loader import fill_chunk_matrix
+
+    n, dim = opts['nodes'], opts['dim']
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(64, dim)).astype(np.float32)
+    content = 'x' * 40_000
+    chunk_text = 'y' * 2_000
+
+    def old_rows():
+        for i in range(n):
+            yield SimpleNamespace(
+                id=uuid.UUID(int=i + 1),
+                document_id=uuid.UUID(int=i // 100 + 1),
+                chunk_text=chunk_text[:-1] + str(i % 10),   # distinct str per row
+                embedding=vectors[i % 64].copy(),
+                document=SimpleNamespace(title=f'Doc {i // 100}', content_text=content[:-1] + str(i % 10)),
+            )
+
+    def new_rows():
+        for i in range(n):
+            yield (
+                uuid.UUID(int=i + 1), uuid.UUID(int=i // 100 + 1), f'Doc {i // 100}',
+                chunk_text[:500], vectors[i % 64].copy(),
+            )
+
+    def old_load():
+        instances = list(old_rows())  # list(qs) materializes every instance
+        chunks = [{
+            'id': str(c.id),
+            'document_id': str(c.document_id),
+            'document_title': c.document.title,
+            'text': c.chunk_text[:500],
+            'embedding': list(c.embedding),
+        } for c in instances]
+        embeddings = np.array([c['embedding'] for c in chunks])
+        return chunks, embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def new_load():
+        matrix = fill_chunk_matrix(new_rows(), n, dim=dim)
+        return matrix.chunk_dicts(), matrix.normalized()
+
+    timings, scores = {}, {}
+    for name, load in (('old_instances', old_load), ('chunk_matrix', new_load)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = load()
+        timings[name] = time.perf_counter() - start
+        scores[f'{name}_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        del result
+    timings['scores'] = scores
+    return timings
+
+
+def bench_hierarchy_payload(opts) -> dict:
+    """Hierarchy tree JSON with inline node embeddings vs. the split storage.
+
+    --nodes is the chunk count (~60 chunks per topic, up to 7 themes).
+    Reading the tree is what every hierarchy endpoint pays; reading the
+    packed vectors is what only similarity matching pays.
+    """
+    from apps.graph.hierarchy_vectors import pack_node_vectors
+
+    n, dim = opts['nodes'], opts['dim']
+    rng = np.random.default_rng(0)
+    chunk_ids = [str(uuid.UUID(int=i + 1)) for i in range(n)]
+    n_topics = max(2, n // 60)
+    topic_chunks = np.array_split(np.arange(n), n_topics)
+
+    def node(level, label, ids, children=()):
+        return {
+            'id': str(uuid.uuid4()), 'level': level, 'label': label,
+            'summary': f'{label} summary ' * 20, 'children': list(children),
+            'chunk_ids': [chunk_ids[i] for i in ids], 'document_ids': [],
+            'chunk_count': len(ids), 'coverage_pct': round(len(ids) / n * 100, 1),
+        }
+
+    topics = [node(1, f'Topic {t}', rows) for t, rows in enumerate(topic_chunks)]
+    themes = [
+        node(2, f'Theme {k}', np.concatenate(topic_chunks[k::7]), children=topics[k::7])
+        for k in range(min(7, n_topics))
+    ]
+    tree = node(3, 'Root', np.arange(n), children=themes)
+    entries = [
+        (item['id'], item['level'], rng.normal(size=dim).astype(np.float32).tolist())
+        for item in themes + topics
+    ]
+
+    split_json = json.dumps(tree)
+    embedding_of = {node_id: emb for node_id, _level, emb in entries}
+    for item in themes + topics:
+        item['embedding'] = embedding_of[item['id']]
+    inline_json = json.dumps(tree)
+    packed = pack_node_vectors(entries)
+
+    timings = {}
+    start = time.perf_counter()
+    json.loads(inline_json)
+    timings['inline_tree_load'] = time.perf_counter() - start
+    start = time.perf_counter()
+    json.loads(split_json)
+    timings['split_tree_load'] = time.perf_counter() - start
+    start = time.perf_counter()
+    matrix = np.frombuffer(packed['vectors'], dtype=np.float32).reshape(-1, packed['dim'])
+    dict(zip(packed['node_ids'], matrix))
+    timings['split_vectors_load'] = time.perf_counter() - start
+
+    timings['scores'] = {
+        'inline_tree_kb': len(inline_json) / 1e3,
+        'split_tree_kb': len(split_json) / 1e3,
+        'split_vectors_kb': len(packed['vectors']) / 1e3,
+    }
+    return timings
+
+
+def bench_centroid_retrieval(opts) -> dict:
+    """Hierarchy-aware chunk retrieval: per-node tree walk vs. centroid index.
+
+    --nodes is the chunk count (~25 chunks per topic, 10 topics per theme).
+    The tree walk is the pre-index CaseChunkRetriever loop (list-based
+    cosine per theme/topic, recursive chunk collection).
+    """
+    from apps.common.vector_utils import cosine_similarity
+    from apps.graph.centroid_index import HierarchyCentroidIndex
+
+    n, dim = opts['nodes'], opts['dim']
+    rng = np.random.default_rng(0)
+    n_topics = max(2, n // 25)
+    n_themes = max(1, n_topics // 10)
+    chunk_ids = [str(uuid.UUID(int=i + 1)) for i in range(n)]
+    topic_rows = np.array_split(np.arange(n), n_topics)
+    theme_vecs = rng.normal(size=(n_themes, dim))
+    vectors = {}
+
+    themes = []
+    for k in range(n_themes):
+        topics = []
+        for t in range(k, n_topics, n_themes):
+            topic_id = str(uuid.uuid4())
+            vectors[topic_id] = theme_vecs[k] + rng.normal(scale=0.7, size=dim)
+            topics.append({'id': topic_id, 'level': 1, 'children': [],
+                           'chunk_ids': [chunk_ids[i] for i in topic_rows[t]]})
+        theme_id = str(uuid.uuid4())
+        vectors[theme_id] = theme_vecs[k]
+        themes.append({'id': theme_id, 'level': 2, 'children': topics,
+                       'chunk_ids': [cid for topic in topics for cid in topic['chunk_ids']]})
+    tree = {'id': 'root', 'level': 3, 'children': themes}
+    lists = {node_id: vec.tolist() for node_id, vec in vectors.items()}
+    query = (theme_vecs[0] + rng.normal(scale=0.7, size=dim)).tolist()
+
+    def collect(node):
+        ids = list(node.get('chunk_ids', []))
+        for child in node.get('children', []):
+            ids.extend(collect(child))
+        return ids
+
+    def tree_walk():
+        found = []
+        for theme in tree['children']:
+            if cosine_similarity(query, lists[theme['id']]) > 0.5:
+                found.extend(collect(theme))
+            else:
+                for topic in theme['children']:
+                    if cosine_similarity(query, lists[topic['id']]) > 0.55:
+                        found.extend(topic['chunk_ids'])
+        return list(set(found))[:50]
+
+    timings = {}
+    start = time.perf_counter()
+    tree_walk()
+    timings['tree_walk'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = HierarchyCentroidIndex.from_tree(tree, vectors)
+    timings['index_build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.chunks_for(index.match(query, 0.5, 0.55), limit=50)
+    timings['index_match'] = time.perf_counter() - start
+    return timings
+
+
+def bench_hierarchy_diff(opts) -> dict:
+    """compute_hierarchy_diff: label matching vs. centroid + Jaccard assignment.
+
+    200 themes x 10 topics over --nodes chunks. The new version regenerates
+    half the labels, merges 10 theme pairs, grows 20 themes by 40% and adds
+    5 new themes. The label baseline is the previous implementation's
+    pairwise SequenceMatcher + greedy best-first loop. Scores are the
+    fraction of surviving themes matched to their true successor.
+    """
+    from difflib import SequenceMatcher
+    from apps.graph.hierarchy_diff import MATCH_THRESHOLD, _assign, _theme_match_scores
+
+    n, dim = opts['nodes'], opts['dim']
+    rng = np.random.default_rng(0)
+    n_themes, topics_per_theme = 200, 10
+    words = [f'w{i}' for i in range(60)]
+
+    def label():
+        return ' '.join(rng.choice(words, size=3, replace=False))
+
+    def theme(chunk_ids, name, vec, vectors):
+        node_id = str(uuid.uuid4())
+        vectors[node_id] = vec
+        topics = np.array_split(np.asarray(chunk_ids), topics_per_theme)
+        return {
+            'id': node_id, 'label': name, 'summary': '', 'chunk_count': len(chunk_ids),
+            'chunk_ids': list(chunk_ids),
+            'children': [{'level': 1, 'chunk_ids': list(t)} for t in topics],
+        }
+
+    chunk_ids = [str(uuid.UUID(int=i + 1)) for i in range(n)]
+    groups = [list(g) for g in np.array_split(np.asarray(chunk_ids), n_themes)]
+    directions = rng.normal(size=(n_themes, dim))
+    old_vectors, new_vectors = {}, {}
+    old_themes = [
+        theme(g, label(), directions[k] + rng.normal(scale=0.3, size=dim), old_vectors)
+        for k, g in enumerate(groups)
+    ]
+
+    next_chunk = n
+    new_themes, truth = [], {}
+    merged = set(range(0, 20, 2))
+    for k, g in enumerate(groups):
+        if k - 1 in merged:
+            continue
+        members = list(g)
+        if k in merged:
+            members += groups[k + 1]
+        if 100 <= k < 120:
+            extra = [str(uuid.UUID(int=next_chunk + i + 1)) for i in range(int(len(g) * 0.4))]
+            next_chunk += len(extra)
+            members += extra
+        name = old_themes[k]['label'] if rng.random() < 0.5 else label()
+        truth[len(new_themes)] = k
+        new_themes.append(theme(members, name, directions[k] + rng.normal(scale=0.3, size=dim), new_vectors))
+    for _ in range(5):
+        extra = [str(uuid.UUID(int=next_chunk + i + 1)) for i in range(len(groups[0]))]
+        next_chunk += len(extra)
+        new_themes.append(theme(extra, label(), rng.normal(size=dim), new_vectors))
+
+    def label_matching():
+        pairs = []
+        for i, new in enumerate(new_themes):
+            for j, old in enumerate(old_themes):
+                score = SequenceMatcher(None, new['label'], old['label']).ratio()
+                if score >= 0.5:
+                    pairs.append((score, i, j))
+        pairs.sort(key=lambda x: x[0], reverse=True)
+        used_new, used_old, matches = set(), set(), []
+        for _score, i, j in pairs:
+            if i in used_new or j in used_old:
+                continue
+            used_new.add(i)
+            used_old.add(j)
+            matches.append((i, j))
+        return matches
+
+    def content_matching():
+        scores, _overlap = _theme_match_scores(old_themes, new_themes, old_vectors, new_vectors)
+        return _assign(scores, MATCH_THRESHOLD)
+
+    timings, scores = {}, {}
+    for name, run in (('label_matching', label_matching), ('centroid_jaccard', content_matching)):
+        start = time.perf_counter()
+        matches = run()
+        timings[name] = time.perf_counter() - start
+        correct = sum(1 for i, j in matches if truth.get(i) == j)
+        scores[f'{name}_recall'] = correct / len(truth)
+        scores[f'{name}_wrong'] = len(matches) - correct
+    timings['scores'] = scores
+    return timings
+
+
+def bench_graph_payload(opts) -> dict:
+    """Graph endpoint body: serializer rows (current) vs. the columnar format.
+
+    --nodes nodes with 3 edges each. The serializer path is what
+    _graph_payload + JSONRenderer do with model instances; the columnar
+    path is build_columnar_graph + encode_json over values_list rows.
+    DB-side savings (no embeddings, no endpoint joins) aren't measured.
+    """
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+    from apps.graph.graph_payload import build_columnar_graph, encode_json
+    from apps.graph.models import Edge, Node
+    from apps.graph.serializers import EdgeSerializer, NodeSerializer
+
+    n = opts['nodes']
+    rng = np.random.default_rng(0)
+    project_id = uuid.uuid4()
+    now = timezone.now()
+    node_rows = [
+        (
+            uuid.UUID(int=i + 1), 'claim', 'supported',
+            f'Claim {i}: ' + 'lorem ipsum dolor sit amet ' * 6,
+            {'specificity': 'high'}, project_id, None, 'project', 'document_extraction',
+            None, None, 0.8, now, now,
+        )
+        for i in range(n)
+    ]
+    endpoints = rng.integers(0, n, size=(n * 3, 2))
+    edge_rows = [
+        (node_rows[a][0], node_rows[b][0], uuid.UUID(int=n + k + 1), 'supports', 0.7,
+         'Both cite the same trial', 'document_extraction', now)
+        for k, (a, b) in enumerate(endpoints)
+    ]
+
+    nodes = [
+        Node(
+            id=row[0], node_type=row[1], status=row[2], content=row[3], properties=row[4],
+            project_id=row[5], scope=row[7], source_type=row[8], confidence=row[11],
+            created_at=row[12], updated_at=row[13],
+        )
+        for row in node_rows
+    ]
+    nodes_by_id = {node.id: node for node in nodes}
+    edges = [
+        Edge(
+            id=row[2], edge_type=row[3], source_node=nodes_by_id[row[0]],
+            target_node=nodes_by_id[row[1]], strength=row[4], provenance=row[5],
+            source_type=row[6], created_at=row[7],
+        )
+        for row in edge_rows
+    ]
+
+    timings = {}
+    start = time.perf_counter()
+    rows_body = JSONRenderer().render({
+        'nodes': NodeSerializer(nodes, many=True).data,
+        'edges': EdgeSerializer(edges, many=True).data,
+        'total_node_count': n,
+        'truncated': False,
+    })
+    timings['serializer_rows'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar_body = encode_json(build_columnar_graph(node_rows, edge_rows, total_node_count=n))
+    timings['columnar'] = time.perf_counter() - start
+
+    timings['scores'] = {
+        'serializer_rows_kb': len(rows_body) / 1e3,
+        'columnar_kb': len(columnar_body) / 1e3,
+    }
+    return timings
+
+
+# Registry of benchmark name → function(opts) -> {stage: seconds}; an
+# optional 'scores' entry carries unitless quality metrics.
+BENCHMARKS = {
+    'refinement': bench_refinement,
+    'cluster_quality': bench_cluster_quality,
+    'chunk_clustering': bench_chunk_clustering,
+    'chunk_loading': bench_chunk_loading,
+    'hierarchy_payload': bench_hierarchy_payload,
+    'centroid_retrieval': bench_centroid_retrieval,
+    'hierarchy_diff': bench_hierarchy_diff,
+    'graph_payload': bench_graph_payload,
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark graph clustering/serialization hot paths on synthetic data"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bench',
+            choices=list(BENCHMARKS.keys()) + ['all'],
+            default='all',
+            help="Which benchmark to run (default: all)",
+        )
+        parser.add_argument('--nodes', type=int, default=5000, help="Synthetic node count")
+        parser.add_argument('--dim', type=int, default=384, help="Embedding dimensions")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark (best is reported)")
+
+    def handle(self, *args, **options):
+        names = list(BENCHMARKS) if options['bench'] == 'all' else [options['bench']]
+
+        for name in names:
+            best: dict = {}
+            scores: dict = {}
+            for _ in range(max(1, options['repeat'])):
+                result = BENCHMARKS[name](options)
+                scores = result.pop('scores', scores)
+                for stage, seconds in result.items():
+                    best[stage] = min(seconds, best.get(stage, float('inf')))
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} (nodes={options['nodes']})"))
+            for stage, seconds in best.items():
+                self.stdout.write(f"  {stage:<28} {seconds * 1000:10.1f} ms")
+            for metric, value in scores.items():
+                self.stdout.write(f"  {metric:<28} {value:10.3f}")
@@ -0,0 +1,36 @@
+"""
+Add GraphPartition — persisted node clustering per (project, resolution),
+used to seed incremental Leiden runs and keep cluster ids stable.
+"""
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0015_node_embedding_hnsw_index'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphPartition',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('resolution', models.FloatField(default=1.0)),
+                ('membership', models.JSONField(default=dict, help_text='Node id → stable cluster id')),
+                ('next_cluster_id', models.IntegerField(default=0, help_text='Next unused cluster id (ids are never reused)')),
+                ('computed_at', models.DateTimeField(blank=True, help_text='Graph state the partition reflects; edges changed after this are re-optimized', null=True)),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Last run: mode (full/incremental), touched/fixed node counts, duration_ms')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='graph_partitions', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'resolution'), name='graph_partition_project_resolution_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+"""
+Add ClusterSummaryMemo — LLM cluster summaries memoized by a fingerprint
+of their inputs so hierarchy rebuilds skip unchanged clusters.
+"""
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0016_graphpartition'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClusterSummaryMemo',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('level', models.IntegerField(help_text='1=topic, 2=theme, 3=root')),
+                ('label', models.TextField(blank=True)),
+                ('summary', models.TextField(blank=True)),
+                ('model', models.CharField(blank=True, max_length=100)),
+                ('prompt_version', models.CharField(blank=True, max_length=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cluster_summary_memos', to='projects.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'fingerprint'), name='cluster_summary_memo_uniq')],
+            },
+        ),
+    ]
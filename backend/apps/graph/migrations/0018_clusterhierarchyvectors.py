@@ -0,0 +1,90 @@
+"""
+Add ClusterHierarchyVectors and move topic/theme embeddings out of
+ClusterHierarchy.tree into it (packed float32 matrix per hierarchy).
+
+Reversing writes the embeddings back onto the tree nodes.
+"""
+import django.db.models.deletion
+import uuid
+
+import numpy as np
+from django.db import migrations, models
+
+
+def _walk(node):
+    stack = [node or {}]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(current.get('children') or [])
+
+
+def split_tree_embeddings(apps, schema_editor):
+    """Strip inline 'embedding' keys from trees into a vectors row."""
+    ClusterHierarchy = apps.get_model('graph', 'ClusterHierarchy')
+    ClusterHierarchyVectors = apps.get_model('graph', 'ClusterHierarchyVectors')
+
+    for hierarchy in ClusterHierarchy.objects.only('id', 'tree').iterator(chunk_size=50):
+        node_ids, levels, rows = [], [], []
+        for node in _walk(hierarchy.tree):
+            embedding = node.pop('embedding', None)
+            if not embedding or not node.get('id'):
+                continue
+            if rows and len(embedding) != len(rows[0]):
+                continue
+            node_ids.append(node['id'])
+            levels.append(node.get('level', 0))
+            rows.append(embedding)
+        if not rows:
+            continue
+
+        matrix = np.asarray(rows, dtype=np.float32)
+        ClusterHierarchyVectors.objects.update_or_create(
+            hierarchy_id=hierarchy.id,
+            defaults={
+                'node_ids': node_ids,
+                'levels': levels,
+                'dim': matrix.shape[1],
+                'vectors': matrix.tobytes(),
+            },
+        )
+        hierarchy.save(update_fields=['tree'])
+
+
+def merge_tree_embeddings(apps, schema_editor):
+    """Write stored vectors back onto their tree nodes."""
+    ClusterHierarchy = apps.get_model('graph', 'ClusterHierarchy')
+    ClusterHierarchyVectors = apps.get_model('graph', 'ClusterHierarchyVectors')
+
+    for stored in ClusterHierarchyVectors.objects.iterator(chunk_size=50):
+        hierarchy = ClusterHierarchy.objects.only('id', 'tree').get(id=stored.hierarchy_id)
+        matrix = np.frombuffer(bytes(stored.vectors), dtype=np.float32).reshape(-1, stored.dim)
+        by_id = dict(zip(stored.node_ids, matrix))
+        for node in _walk(hierarchy.tree):
+            if node.get('id') in by_id:
+                node['embedding'] = by_id[node['id']].tolist()
+        hierarchy.save(update_fields=['tree'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0017_clustersummarymemo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClusterHierarchyVectors',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('node_ids', models.JSONField(default=list, help_text='Tree node ids, one per matrix row')),
+                ('levels', models.JSONField(default=list, help_text='Tree level (1=topic, 2=theme) per matrix row')),
+                ('dim', models.IntegerField(default=384)),
+                ('vectors', models.BinaryField(help_text='Row-major float32 matrix, len(node_ids) x dim')),
+                ('hierarchy', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='node_vectors', to='graph.clusterhierarchy')),
+            ],
+        ),
+        migrations.RunPython(split_tree_embeddings, reverse_code=merge_tree_embeddings),
+    ]
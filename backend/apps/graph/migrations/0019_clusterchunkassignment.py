@@ -0,0 +1,89 @@
+"""
+Add ClusterChunkAssignment — chunk → topic/theme lookup for the current
+hierarchy — and backfill it from each project's current hierarchy tree.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _assignments(tree):
+    """chunk_id → (topic_id, topic_label, theme_id, theme_label) from leaf nodes."""
+    found = {}
+    stack = [(tree or {}, '', '', '', '')]
+    while stack:
+        node, topic_id, topic_label, theme_id, theme_label = stack.pop()
+        level = node.get('level', 0)
+        if level >= 2:
+            theme_id, theme_label = node.get('id', ''), node.get('label', '')
+        elif level == 1:
+            topic_id, topic_label = node.get('id', ''), node.get('label', '')
+        children = node.get('children') or []
+        if not children:
+            for cid in node.get('chunk_ids', []):
+                found[cid] = (topic_id, topic_label, theme_id, theme_label)
+        for child in children:
+            stack.append((child, topic_id, topic_label, theme_id, theme_label))
+    return found
+
+
+def backfill_assignments(apps, schema_editor):
+    ClusterHierarchy = apps.get_model('graph', 'ClusterHierarchy')
+    ClusterChunkAssignment = apps.get_model('graph', 'ClusterChunkAssignment')
+    DocumentChunk = apps.get_model('projects', 'DocumentChunk')
+
+    current = ClusterHierarchy.objects.filter(is_current=True, status='ready')
+    for hierarchy in current.only('id', 'project_id', 'tree').iterator(chunk_size=20):
+        found = _assignments(hierarchy.tree)
+        if not found:
+            continue
+        existing = {
+            str(cid) for cid in DocumentChunk.objects.filter(
+                document__project_id=hierarchy.project_id,
+            ).values_list('id', flat=True)
+        }
+        rows = [
+            ClusterChunkAssignment(
+                project_id=hierarchy.project_id,
+                hierarchy_id=hierarchy.id,
+                chunk_id=chunk_id,
+                topic_id=topic_id,
+                topic_label=topic_label[:255],
+                theme_id=theme_id,
+                theme_label=theme_label[:255],
+            )
+            for chunk_id, (topic_id, topic_label, theme_id, theme_label) in found.items()
+            if chunk_id in existing
+        ]
+        ClusterChunkAssignment.objects.bulk_create(rows, batch_size=2000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0018_clusterhierarchyvectors'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClusterChunkAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic_id', models.CharField(blank=True, max_length=64)),
+                ('topic_label', models.CharField(blank=True, max_length=255)),
+                ('theme_id', models.CharField(blank=True, max_length=64)),
+                ('theme_label', models.CharField(blank=True, max_length=255)),
+                ('chunk', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cluster_assignments', to='projects.documentchunk')),
+                ('hierarchy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunk_assignments', to='graph.clusterhierarchy')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunk_cluster_assignments', to='projects.project')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['project', 'theme_id'], name='cluster_assignment_theme_idx'),
+                    models.Index(fields=['project', 'topic_id'], name='cluster_assignment_topic_idx'),
+                ],
+                'constraints': [models.UniqueConstraint(fields=('hierarchy', 'chunk'), name='cluster_assignment_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_assignments, reverse_code=migrations.RunPython.noop),
+    ]
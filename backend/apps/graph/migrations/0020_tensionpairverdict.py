@@ -0,0 +1,37 @@
+"""
+Add TensionPairVerdict — LLM tension verdicts for theme pairs memoized by
+the fingerprints of both themes so insight discovery skips unchanged pairs.
+"""
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0019_clusterchunkassignment'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TensionPairVerdict',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('pair_fingerprint', models.CharField(max_length=64)),
+                ('has_tension', models.BooleanField(default=False)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('explanation', models.TextField(blank=True)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('model', models.CharField(blank=True, max_length=100)),
+                ('prompt_version', models.CharField(blank=True, max_length=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tension_pair_verdicts', to='projects.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'pair_fingerprint'), name='tension_pair_verdict_uniq')],
+            },
+        ),
+    ]
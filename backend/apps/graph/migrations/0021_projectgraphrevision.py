@@ -0,0 +1,25 @@
+"""
+Add ProjectGraphRevision — a per-project graph revision counter bumped by
+every node/edge mutation and used as the cache key for graph-derived data.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0020_tensionpairverdict'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectGraphRevision',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='graph_revision', serialize=False, to='projects.project')),
+                ('revision', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
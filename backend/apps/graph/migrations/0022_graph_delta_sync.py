@@ -0,0 +1,48 @@
+"""
+Delta sync for graph endpoints: stamp nodes/edges with the project graph
+revision of their last write, record the revision on each GraphDelta, and
+track the revision below which deltas can't be served.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0021_projectgraphrevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='node',
+            name='graph_revision',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='edge',
+            name='graph_revision',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='graphdelta',
+            name='revision',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectgraphrevision',
+            name='resync_revision',
+            field=models.BigIntegerField(default=0, help_text="Deltas can't span this revision (untracked deletes); older clients refetch"),
+        ),
+        migrations.AddIndex(
+            model_name='node',
+            index=models.Index(fields=['project', 'graph_revision'], name='graph_node_project_a7b84e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edge',
+            index=models.Index(fields=['graph_revision'], name='graph_edge_graph_r_e95648_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graphdelta',
+            index=models.Index(fields=['project', 'revision'], name='graph_graph_project_20b4a5_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+"""
+Index nodes on (project, id) for the keyset-paginated graph export.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0022_graph_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='node',
+            index=models.Index(fields=['project', 'id'], name='graph_node_project_5e5004_idx'),
+        ),
+    ]
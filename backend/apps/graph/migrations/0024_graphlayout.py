@@ -0,0 +1,34 @@
+"""
+Add GraphLayout — precomputed 2D node coordinates per project, computed
+per graph revision and returned with the clustered graph.
+"""
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0023_node_project_id_index'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphLayout',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('graph_revision', models.BigIntegerField(default=0)),
+                ('node_ids', models.JSONField(default=list, help_text='Node ids, one per coordinate pair')),
+                ('positions', models.BinaryField(help_text='Row-major float32 (x, y) pairs aligned with node_ids')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Last run: mode (full/incremental), algorithm, scale, new node count, duration_ms')),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='graph_layout', to='projects.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
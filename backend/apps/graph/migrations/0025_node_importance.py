@@ -0,0 +1,65 @@
+"""
+Denormalize properties['importance'] into Node.importance, indexed with
+the LLM context ordering, and backfill it for existing nodes.
+"""
+from django.db import migrations, models
+
+
+# Frozen copy of the importance rules at the time of this migration
+DEFAULT_IMPORTANCE = 2
+
+
+def _importance(properties) -> int:
+    """Importance (1-3) from a node's properties; 2 when missing or invalid."""
+    if not isinstance(properties, dict):
+        return DEFAULT_IMPORTANCE
+    value = properties.get('importance', DEFAULT_IMPORTANCE)
+    try:
+        return max(1, min(3, int(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_IMPORTANCE
+
+
+def backfill_importance(apps, schema_editor):
+    Node = apps.get_model('graph', 'Node')
+    batch_size = 1000
+
+    rows = (
+        Node.objects
+        .filter(properties__has_key='importance')
+        .values_list('id', 'properties')
+        .iterator(chunk_size=batch_size)
+    )
+    batch = []
+    for node_id, properties in rows:
+        importance = _importance(properties)
+        if importance != DEFAULT_IMPORTANCE:
+            batch.append(Node(id=node_id, importance=importance))
+        if len(batch) >= batch_size:
+            Node.objects.bulk_update(batch, ['importance'])
+            batch = []
+    if batch:
+        Node.objects.bulk_update(batch, ['importance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0024_graphlayout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='node',
+            name='importance',
+            field=models.SmallIntegerField(default=2),
+        ),
+        migrations.RunPython(backfill_importance, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='node',
+            index=models.Index(
+                fields=['project', '-importance', 'node_type', '-created_at'],
+                name='graph_node_project_b8fb25_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+"""
+Add GraphHealthStats — materialized health stats per project graph and
+per case graph, stamped with the graph revision they were computed at.
+"""
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0025_node_importance'),
+        ('cases', '0032_resolution_type_to_binary'),
+        ('projects', '0017_add_tsvector_gin_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphHealthStats',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('graph_revision', models.BigIntegerField(default=0)),
+                ('references_version', models.CharField(blank=True, default='', help_text='CaseNodeReference fingerprint the case stats were computed at', max_length=64)),
+                ('stats', models.JSONField(default=dict)),
+                ('case', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='graph_health_stats', to='cases.case')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='graph_health_stats', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='graph_graph_updated_3e4e52_idx')],
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('case__isnull', True)), fields=('project',), name='unique_project_graph_health'),
+                    models.UniqueConstraint(condition=models.Q(('case__isnull', False)), fields=('case',), name='unique_case_graph_health'),
+                ],
+            },
+        ),
+    ]
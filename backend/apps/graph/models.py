@@ -134,6 +134,20 @@ class InclusionType(models.TextChoices):
 # Models
 # ═══════════════════════════════════════════════════════════════════
 
+DEFAULT_NODE_IMPORTANCE = 2
+
+
+def node_importance(properties) -> int:
+    """Importance (1-3) from a node's properties; 2 when missing or invalid."""
+    if not isinstance(properties, dict):
+        return DEFAULT_NODE_IMPORTANCE
+    value = properties.get('importance', DEFAULT_NODE_IMPORTANCE)
+    try:
+        return max(1, min(3, int(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_NODE_IMPORTANCE
+
+
 class Node(UUIDModel, TimestampedModel):
     """
     A node in the knowledge graph.
@@ -236,6 +250,13 @@ class Node(UUIDModel, TimestampedModel):
         blank=True,
     )
 
+    # Project graph revision of the last write (delta sync)
+    graph_revision = models.BigIntegerField(default=0)
+
+    # properties['importance'] (1-3), kept in sync by save() so the LLM
+    # context can take the top-N nodes straight from the index
+    importance = models.SmallIntegerField(default=DEFAULT_NODE_IMPORTANCE)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -244,6 +265,9 @@ class Node(UUIDModel, TimestampedModel):
             models.Index(fields=['case', 'node_type']),
             models.Index(fields=['source_document']),
             models.Index(fields=['project', 'status']),
+            models.Index(fields=['project', 'graph_revision']),
+            models.Index(fields=['project', 'id']),  # keyset export
+            models.Index(fields=['project', '-importance', 'node_type', '-created_at']),  # LLM context
         ]
 
     def __str__(self):
@@ -265,6 +289,10 @@ class Node(UUIDModel, TimestampedModel):
             self.status = DEFAULT_STATUS_BY_TYPE.get(
                 self.node_type, NodeStatus.UNSUBSTANTIATED
             )
+        self.importance = node_importance(self.properties)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'properties' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'importance'}
         super().save(*args, **kwargs)
 
 
@@ -321,12 +349,16 @@ class Edge(UUIDModel, TimestampedModel):
         blank=True,
     )
 
+    # Project graph revision of the last write (delta sync)
+    graph_revision = models.BigIntegerField(default=0)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['source_node', 'edge_type']),
             models.Index(fields=['target_node', 'edge_type']),
             models.Index(fields=['edge_type']),
+            models.Index(fields=['graph_revision']),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -339,6 +371,84 @@ class Edge(UUIDModel, TimestampedModel):
         return f"{self.source_node.content[:30]} --{self.edge_type}--> {self.target_node.content[:30]}"
 
 
+class ProjectGraphRevision(models.Model):
+    """
+    Monotonic revision of a project's graph.
+
+    Bumped inside the transaction of every node/edge mutation (see
+    apps.graph.revision), so it is the cache key component for anything
+    derived from the graph: clustering, serialized LLM context, health
+    stats and graph payloads.
+    """
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='graph_revision',
+    )
+    revision = models.BigIntegerField(default=0)
+    resync_revision = models.BigIntegerField(
+        default=0,
+        help_text="Deltas can't span this revision (untracked deletes); older clients refetch",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Graph r{self.revision} for {self.project_id}"
+
+
+class GraphHealthStats(UUIDModel, TimestampedModel):
+    """
+    Materialized health stats of a project graph (case=None) or of a
+    case's composed graph.
+
+    graph_revision (and references_version for cases) record the graph
+    state the stats were computed at; readers recompute rows that are
+    behind (see apps.graph.health).
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='graph_health_stats',
+    )
+    case = models.ForeignKey(
+        'cases.Case',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='graph_health_stats',
+    )
+    graph_revision = models.BigIntegerField(default=0)
+    references_version = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="CaseNodeReference fingerprint the case stats were computed at",
+    )
+    stats = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at']),  # reconciliation order
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project'],
+                condition=models.Q(case__isnull=True),
+                name='unique_project_graph_health',
+            ),
+            models.UniqueConstraint(
+                fields=['case'],
+                condition=models.Q(case__isnull=False),
+                name='unique_case_graph_health',
+            ),
+        ]
+
+    def __str__(self):
+        scope = f"case {self.case_id}" if self.case_id else f"project {self.project_id}"
+        return f"Graph health r{self.graph_revision} for {scope}"
+
+
 class GraphDelta(UUIDModel, TimestampedModel):
     """
     Record of a graph mutation — what changed, and why it matters.
@@ -378,6 +488,9 @@ class GraphDelta(UUIDModel, TimestampedModel):
     tensions_surfaced = models.IntegerField(default=0)
     assumptions_challenged = models.IntegerField(default=0)
 
+    # Project graph revision after this delta (delta sync)
+    revision = models.BigIntegerField(null=True, blank=True)
+
     # Case (optional — set when mutation is case-scoped)
     case = models.ForeignKey(
         'cases.Case',
@@ -408,6 +521,7 @@ class GraphDelta(UUIDModel, TimestampedModel):
         indexes = [
             models.Index(fields=['project', '-created_at']),
             models.Index(fields=['trigger']),
+            models.Index(fields=['project', 'revision']),
         ]
 
     def __str__(self):
@@ -550,6 +664,96 @@ class ProjectSummary(UUIDModel, TimestampedModel):
         return f"Summary v{self.version} [{self.status}] for {self.project_id}"
 
 
+# ═══════════════════════════════════════════════════════════════════
+# Graph Partition (incremental node clustering)
+# ═══════════════════════════════════════════════════════════════════
+
+class GraphPartition(UUIDModel, TimestampedModel):
+    """
+    Last node clustering computed for a project at a given resolution.
+
+    Seeds the next Leiden run (initial membership) so only communities
+    touched by new nodes/edges are re-optimized, and keeps cluster ids
+    stable across runs. One row per (project, resolution), overwritten
+    on every clustering.
+
+    membership JSON shape: {"<node_uuid>": <cluster_id int>, ...}
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='graph_partitions',
+    )
+    resolution = models.FloatField(default=1.0)
+    membership = models.JSONField(
+        default=dict,
+        help_text="Node id → stable cluster id",
+    )
+    next_cluster_id = models.IntegerField(
+        default=0,
+        help_text="Next unused cluster id (ids are never reused)",
+    )
+    computed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Graph state the partition reflects; edges changed after this are re-optimized",
+    )
+    metadata = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Last run: mode (full/incremental), touched/fixed node counts, duration_ms",
+    )
+
+    class Meta:
+        ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'resolution'],
+                name='graph_partition_project_resolution_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Partition r={self.resolution} ({len(self.membership)} nodes) for {self.project_id}"
+
+
+class GraphLayout(UUIDModel, TimestampedModel):
+    """
+    Precomputed 2D coordinates of a project's graph nodes.
+
+    Computed by compute_graph_layout_task (see apps.graph.layout) and
+    returned with the clustered graph so clients don't run a force layout
+    themselves. graph_revision is the project graph revision the layout
+    reflects; newer revisions are laid out incrementally from this one.
+    """
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='graph_layout',
+    )
+    graph_revision = models.BigIntegerField(default=0)
+    node_ids = models.JSONField(
+        default=list,
+        help_text="Node ids, one per coordinate pair",
+    )
+    positions = models.BinaryField(
+        help_text="Row-major float32 (x, y) pairs aligned with node_ids",
+    )
+    metadata = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Last run: mode (full/incremental), algorithm, scale, new node count, duration_ms",
+    )
+
+    def coordinates(self):
+        """The positions as a read-only (n, 2) float32 array."""
+        import numpy as np
+        return np.frombuffer(bytes(self.positions), dtype=np.float32).reshape(-1, 2)
+
+    def __str__(self):
+        return f"Layout r{self.graph_revision} ({len(self.node_ids)} nodes) for {self.project_id}"
+
+
 # ═══════════════════════════════════════════════════════════════════
 # Cluster Hierarchy
 # ═══════════════════════════════════════════════════════════════════
@@ -610,6 +814,151 @@ class ClusterHierarchy(UUIDModel, TimestampedModel):
         return f"Hierarchy v{self.version} [{self.status}] for {self.project_id}"
 
 
+class ClusterHierarchyVectors(UUIDModel, TimestampedModel):
+    """
+    Summary embeddings of a hierarchy's topic/theme nodes.
+
+    Kept out of ClusterHierarchy.tree so reading the tree (landscape view,
+    chunk search, orientation) doesn't deserialize hundreds of float lists.
+    Stored as one row-major float32 matrix aligned with node_ids; only
+    loaded by code that does similarity matching (see hierarchy_vectors).
+    """
+    hierarchy = models.OneToOneField(
+        ClusterHierarchy,
+        on_delete=models.CASCADE,
+        related_name='node_vectors',
+    )
+    node_ids = models.JSONField(
+        default=list,
+        help_text="Tree node ids, one per matrix row",
+    )
+    levels = models.JSONField(
+        default=list,
+        help_text="Tree level (1=topic, 2=theme) per matrix row",
+    )
+    dim = models.IntegerField(default=384)
+    vectors = models.BinaryField(
+        help_text="Row-major float32 matrix, len(node_ids) x dim",
+    )
+
+    def matrix(self):
+        """The embeddings as a read-only (n, dim) float32 array."""
+        import numpy as np
+        return np.frombuffer(bytes(self.vectors), dtype=np.float32).reshape(-1, self.dim)
+
+    def __str__(self):
+        return f"{len(self.node_ids)} node vectors for hierarchy {self.hierarchy_id}"
+
+
+class ClusterChunkAssignment(models.Model):
+    """
+    Chunk → topic/theme lookup for a project's current hierarchy.
+
+    Written once when a hierarchy becomes current (replacing the previous
+    hierarchy's rows), so chunk search can label results and retrieval can
+    filter by theme with an indexed join instead of walking the tree.
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='chunk_cluster_assignments',
+    )
+    hierarchy = models.ForeignKey(
+        ClusterHierarchy,
+        on_delete=models.CASCADE,
+        related_name='chunk_assignments',
+    )
+    chunk = models.ForeignKey(
+        'projects.DocumentChunk',
+        on_delete=models.CASCADE,
+        related_name='cluster_assignments',
+    )
+    topic_id = models.CharField(max_length=64, blank=True)
+    topic_label = models.CharField(max_length=255, blank=True)
+    theme_id = models.CharField(max_length=64, blank=True)
+    theme_label = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hierarchy', 'chunk'],
+                name='cluster_assignment_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['project', 'theme_id'], name='cluster_assignment_theme_idx'),
+            models.Index(fields=['project', 'topic_id'], name='cluster_assignment_topic_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.chunk_id} → {self.topic_label or self.topic_id}"
+
+
+class ClusterSummaryMemo(UUIDModel, TimestampedModel):
+    """
+    Memoized LLM label/summary for a hierarchy cluster.
+
+    Keyed by a fingerprint of what the summary prompt sees — sorted chunk
+    ids (topics), child labels/summaries (themes, root) — plus the prompt
+    version and model, so a rebuild only pays for clusters that changed.
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='cluster_summary_memos',
+    )
+    fingerprint = models.CharField(max_length=64)
+    level = models.IntegerField(help_text="1=topic, 2=theme, 3=root")
+    label = models.TextField(blank=True)
+    summary = models.TextField(blank=True)
+    model = models.CharField(max_length=100, blank=True)
+    prompt_version = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'fingerprint'],
+                name='cluster_summary_memo_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"L{self.level} memo {self.fingerprint[:12]} for {self.project_id}"
+
+
+class TensionPairVerdict(UUIDModel, TimestampedModel):
+    """
+    Memoized LLM tension verdict for a pair of hierarchy themes.
+
+    Keyed by the fingerprints of both themes (label + summary), the prompt
+    version and model, so insight discovery only re-checks pairs in which
+    a theme changed. Negative verdicts are stored too.
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='tension_pair_verdicts',
+    )
+    pair_fingerprint = models.CharField(max_length=64)
+    has_tension = models.BooleanField(default=False)
+    title = models.CharField(max_length=200, blank=True)
+    explanation = models.TextField(blank=True)
+    confidence = models.FloatField(null=True, blank=True)
+    model = models.CharField(max_length=100, blank=True)
+    prompt_version = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'pair_fingerprint'],
+                name='tension_pair_verdict_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Tension verdict {self.pair_fingerprint[:12]} for {self.project_id}"
+
+
 # ═══════════════════════════════════════════════════════════════════
 # Project Insights
 # ═══════════════════════════════════════════════════════════════════
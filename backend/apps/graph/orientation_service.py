@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Optional, Tuple
 from asgiref.sync import sync_to_async
 from django.db import transaction
 
+from .centroid_index import get_centroid_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,17 +62,20 @@ class OrientationService:
         start_time = time.time()
 
         # ── 1. Load hierarchy and extract themes ─────────────────
+        # Themes come from the hierarchy's cached centroid index; the tree
+        # is only loaded if the index hasn't been built in this process.
         hierarchy = await sync_to_async(
             ClusterHierarchy.objects.filter(
                 id=hierarchy_id,
                 status=HierarchyStatus.READY,
-            ).first
+            ).defer('tree').first
         )()
 
-        if not hierarchy or not hierarchy.tree:
+        if not hierarchy:
             raise ValueError(f"Hierarchy {hierarchy_id} not found or has no tree")
 
-        themes = OrientationService._extract_theme_summaries(hierarchy.tree)
+        index = await sync_to_async(get_centroid_index)(hierarchy)
+        themes = index.theme_summaries()
 
         if not themes:
             raise ValueError(f"No themes found in hierarchy {hierarchy_id}")
@@ -268,17 +273,21 @@ class OrientationService:
         """
         from apps.common.llm_providers.factory import get_llm_provider
         from apps.intelligence.orientation_prompts import build_exploration_angle_prompt
-        from .models import ProjectInsight, ClusterHierarchy, HierarchyStatus
+        from .models import ProjectInsight
 
         insight = await sync_to_async(
-            ProjectInsight.objects.select_related('orientation', 'orientation__hierarchy').get
+            ProjectInsight.objects
+            .select_related('orientation', 'orientation__hierarchy')
+            .defer('orientation__hierarchy__tree')
+            .get
         )(id=insight_id)
 
         if not insight.orientation or not insight.orientation.hierarchy:
             raise ValueError(f"Insight {insight_id} has no linked orientation/hierarchy")
 
         hierarchy = insight.orientation.hierarchy
-        themes = OrientationService._extract_theme_summaries(hierarchy.tree)
+        index = await sync_to_async(get_centroid_index)(hierarchy)
+        themes = index.theme_summaries()
         lens_type = insight.orientation.lens_type
 
         provider = get_llm_provider('fast')
@@ -0,0 +1,129 @@
+"""
+Per-project graph revision — the cache key for graph-derived data.
+
+Every node/edge mutation path calls bump_graph_revision() inside its
+transaction: GraphService writes (which the edit handler, integration and
+extraction go through), bulk embedding updates, document scope changes,
+and deletes cascading from Document/Case (apps.graph.signals). The bump is
+an UPDATE of one row, so it commits or rolls back with the mutation and
+concurrent writers serialize on the row.
+
+Readers take the revision *before* reading the graph and put it in the
+cache key (graph_cache_key). A reader racing a writer can then only cache
+newer data under the old revision, never stale data under the new one, so
+caches can live long without serving stale results.
+
+Delta sync: writes stamp the new revision on the rows they touch
+(Node/Edge.graph_revision) and GraphDelta patches list removed ids.
+Deletes that leave no patch (document cascades) call mark_graph_resync(),
+so clients behind that revision get a full refresh instead of a delta.
+
+Committed bumps also queue a (debounced) refresh of the project's
+materialized health stats (apps.graph.health).
+"""
+import logging
+import uuid
+from typing import Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .health import request_graph_health_refresh
+
+logger = logging.getLogger(__name__)
+
+# Revision-keyed entries never go stale; the timeout only bounds memory.
+GRAPH_CACHE_TIMEOUT = 60 * 60
+
+
+def bump_graph_revision(project_id: Optional[uuid.UUID], *, resync: bool = False) -> int:
+    """Increment the project's graph revision and return the new value.
+
+    The row is created on first use. With ``resync``, deltas can no longer
+    span the new revision (see mark_graph_resync).
+    """
+    from .models import ProjectGraphRevision
+
+    if project_id is None:
+        return 0
+    rows = ProjectGraphRevision.objects.filter(project_id=project_id)
+    updates = {'revision': F('revision') + 1, 'updated_at': timezone.now()}
+    if resync:
+        updates['resync_revision'] = F('revision') + 1
+    revision = None
+    if not rows.update(**updates):
+        _, created = ProjectGraphRevision.objects.get_or_create(
+            project_id=project_id,
+            defaults={'revision': 1, 'resync_revision': 1 if resync else 0},
+        )
+        if created:
+            revision = 1
+        else:
+            rows.update(**updates)
+    if revision is None:
+        # The UPDATE holds the row lock until commit, so this reads our value
+        revision = rows.values_list('revision', flat=True).get()
+    transaction.on_commit(lambda: request_graph_health_refresh(project_id))
+    return revision
+
+
+def mark_graph_resync(project_id: Optional[uuid.UUID]) -> int:
+    """Bump the revision for a change no GraphDelta patch records.
+
+    Clients syncing from an older revision must refetch the full graph.
+    """
+    return bump_graph_revision(project_id, resync=True)
+
+
+def get_graph_revision(project_id: uuid.UUID) -> int:
+    """Current graph revision of a project (0 before its first mutation)."""
+    from .models import ProjectGraphRevision
+
+    revision = (
+        ProjectGraphRevision.objects
+        .filter(project_id=project_id)
+        .values_list('revision', flat=True)
+        .first()
+    )
+    return revision or 0
+
+
+def get_graph_sync_state(project_id: uuid.UUID) -> Tuple[int, int]:
+    """(revision, resync_revision) of a project, (0, 0) before its first mutation."""
+    from .models import ProjectGraphRevision
+
+    state = (
+        ProjectGraphRevision.objects
+        .filter(project_id=project_id)
+        .values_list('revision', 'resync_revision')
+        .first()
+    )
+    return state or (0, 0)
+
+
+def references_version(count: int, changed) -> str:
+    """Fingerprint of a case's CaseNodeReference rows from their count and latest updated_at."""
+    return f"{count}-{changed.timestamp() if changed else 0:.6f}"
+
+
+def get_case_references_version(case_id: uuid.UUID) -> str:
+    """Current CaseNodeReference fingerprint of a case.
+
+    References don't bump the graph revision, so data derived from a
+    case's composed graph is keyed on this as well. Pulls and exclusions
+    save the row (updated_at); removals change the count.
+    """
+    from django.db.models import Count, Max
+    from .models import CaseNodeReference
+
+    state = CaseNodeReference.objects.filter(case_id=case_id).aggregate(
+        count=Count('id'), changed=Max('updated_at'),
+    )
+    return references_version(state['count'], state['changed'])
+
+
+def graph_cache_key(prefix: str, project_id: uuid.UUID, revision: int, *parts) -> str:
+    """Cache key for data derived from a project's graph at ``revision``."""
+    suffix = ''.join(f':{part}' for part in parts)
+    return f"{prefix}:{project_id}:r{revision}{suffix}"
@@ -10,6 +10,8 @@ import uuid
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 
+from django.db.models import Q
+
 from .models import Node, Edge, NodeType
 
 logger = logging.getLogger(__name__)
@@ -44,53 +46,73 @@ class GraphSerializationService:
         (case-scoped nodes + referenced project nodes) instead of the
         full project graph.
 
+        The max_nodes most important nodes are taken straight from the
+        (project, -importance, node_type, -created_at) index. Results are
+        cached per graph revision; case graphs also depend on their
+        CaseNodeReference rows, which don't bump the revision, so their key
+        carries a fingerprint of those rows as well.
+
         Returns:
             (serialized_text, ref_map)
             - serialized_text: compact text with [C1], [E2] etc. references
             - ref_map: dict mapping ref strings to node UUIDs, e.g. {'C1': uuid}
         """
+        from django.core.cache import cache
+        from .revision import (
+            GRAPH_CACHE_TIMEOUT, get_case_references_version, get_graph_revision, graph_cache_key,
+        )
+
+        revision = get_graph_revision(project_id)
+        parts = [max_nodes]
         if case_id:
-            from .services import GraphService
-            case_graph = GraphService.get_case_graph(case_id)
-            candidates = list(case_graph['nodes'])
-            case_edges = list(case_graph['edges'])
-            # Track which nodes are case-local for tagging
-            case_node_ids = {
-                n.id for n in candidates if n.scope == 'case'
-            }
-        else:
-            # Fetch more than max_nodes to allow importance-based filtering
-            candidates = list(
-                Node.objects.filter(project_id=project_id)
-                .select_related('source_document')
-                .order_by('node_type', '-created_at')
+            parts += [f'case-{case_id}', get_case_references_version(case_id)]
+        cache_key = graph_cache_key('graph_llm_context', project_id, revision, *parts)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = GraphSerializationService._serialize_for_llm(project_id, max_nodes, case_id)
+        cache.set(cache_key, result, timeout=GRAPH_CACHE_TIMEOUT)
+        return result
+
+    @staticmethod
+    def _serialize_for_llm(
+        project_id: uuid.UUID,
+        max_nodes: int,
+        case_id: Optional[uuid.UUID],
+    ) -> Tuple[str, Dict[str, uuid.UUID]]:
+        """Uncached serialize_for_llm."""
+        if case_id:
+            from .models import CaseNodeReference
+
+            visible = Node.objects.filter(
+                Q(case_id=case_id, scope='case') |
+                Q(id__in=CaseNodeReference.objects.filter(
+                    case_id=case_id, excluded=False,
+                ).values('node_id'))
             )
-            case_node_ids = set()
-            case_edges = None
-
-        # Sort by importance descending within each type, then trim to max_nodes
-        # This ensures importance=3 nodes are always included
-        candidates.sort(
-            key=lambda n: (
-                -n.properties.get('importance', 2),
-                n.node_type,
-                ),
+        else:
+            visible = Node.objects.filter(project_id=project_id)
+
+        # Most important first (importance=3 nodes are always included)
+        nodes = list(
+            visible
+            .select_related('source_document')
+            .defer('embedding', 'source_document__content_text')
+            .order_by('-importance', 'node_type', '-created_at')[:max_nodes]
         )
-        nodes = candidates[:max_nodes]
+        # Track which nodes are case-local for tagging
+        case_node_ids = {n.id for n in nodes if case_id and n.scope == 'case'}
 
         if not nodes:
             return "No knowledge graph nodes yet.", {}
 
-        # Build edges lookup
+        # Edges where both endpoints made the cut
         node_ids = [n.id for n in nodes]
-        if case_edges is not None:
-            # Use pre-fetched case edges (already filtered for visibility)
-            edges = [e for e in case_edges if e.source_node_id in set(node_ids) and e.target_node_id in set(node_ids)]
-        else:
-            edges = Edge.objects.filter(
-                source_node_id__in=node_ids,
-                target_node_id__in=node_ids,
-            )
+        edges = Edge.objects.filter(
+            source_node_id__in=node_ids,
+            target_node_id__in=node_ids,
+        ).values_list('source_node_id', 'edge_type', 'target_node_id')
 
         # Assign references and build ref_map
         ref_map: Dict[str, uuid.UUID] = {}
@@ -139,11 +161,11 @@ class GraphSerializationService:
 
         # Print edges
         edge_lines: List[str] = []
-        for edge in edges:
-            src_ref = node_ref.get(edge.source_node_id)
-            tgt_ref = node_ref.get(edge.target_node_id)
+        for source_id, edge_type, target_id in edges:
+            src_ref = node_ref.get(source_id)
+            tgt_ref = node_ref.get(target_id)
             if src_ref and tgt_ref:
-                edge_lines.append(f"  [{src_ref}] --{edge.edge_type}--> [{tgt_ref}]")
+                edge_lines.append(f"  [{src_ref}] --{edge_type}--> [{tgt_ref}]")
 
         if edge_lines:
             lines.append(f"\n--- RELATIONSHIPS ({len(edge_lines)}) ---")
@@ -102,33 +102,23 @@ class NodeDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
-    def _get_cached_edges(self, obj):
-        """Fetch edges once and cache on the serializer instance."""
-        if not hasattr(self, '_edges_cache'):
-            from django.db.models import Q
-            self._edges_cache = list(
-                Edge.objects.filter(
-                    Q(source_node=obj) | Q(target_node=obj)
-                ).select_related('source_node', 'target_node')
-            )
-        return self._edges_cache
+    def _get_neighborhood(self, obj):
+        """Edges and neighbors from context['neighborhood'], else one traversal query."""
+        if not hasattr(self, '_neighborhood_cache'):
+            neighborhood = self.context.get('neighborhood')
+            if neighborhood is None:
+                from .services import GraphService
+                neighborhood = GraphService.get_node_neighborhood(obj.id)
+            self._neighborhood_cache = neighborhood
+        return self._neighborhood_cache
 
     def get_edges(self, obj):
         """Get all edges connected to this node."""
-        return EdgeSerializer(self._get_cached_edges(obj), many=True).data
+        return EdgeSerializer(self._get_neighborhood(obj)['edges'], many=True).data
 
     def get_neighbors(self, obj):
-        """Get 1-hop neighbor nodes (reuses cached edges — single query)."""
-        edges = self._get_cached_edges(obj)
-        neighbor_ids = set()
-        for edge in edges:
-            if edge.source_node_id != obj.id:
-                neighbor_ids.add(edge.source_node_id)
-            if edge.target_node_id != obj.id:
-                neighbor_ids.add(edge.target_node_id)
-
-        neighbors = Node.objects.filter(id__in=neighbor_ids).select_related('source_document')
-        return NodeSerializer(neighbors, many=True).data
+        """Get 1-hop neighbor nodes."""
+        return NodeSerializer(self._get_neighborhood(obj)['neighbors'], many=True).data
 
     def get_source_chunks(self, obj):
         """Return source chunk provenance — the document passages backing this node."""
@@ -16,6 +16,7 @@ from apps.events.models import EventType, ActorType
 from apps.events.services import EventService
 
 from .embedding_state import clear_embedding_failure, mark_embedding_failed
+from .revision import bump_graph_revision
 from .models import (
     Node, Edge, GraphDelta,
     NodeType, NodeStatus, EdgeType, NodeSourceType, DeltaTrigger,
@@ -25,15 +26,6 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
-def _sort_by_importance(nodes: list) -> list:
-    """Sort nodes by properties.importance descending (3 first, then 2, then 1)."""
-    return sorted(
-        nodes,
-        key=lambda n: n.properties.get('importance', 2),
-        reverse=True,
-    )
-
-
 def _embedding_failure_reason(error: Optional[Exception] = None) -> str:
     """Normalize embedding failure reason for node properties."""
     if error is None:
@@ -49,7 +41,8 @@ class GraphService:
     1. Validates inputs
     2. Wraps in @transaction.atomic
     3. Generates embedding when content is set/changed
-    4. Emits an event
+    4. Bumps the project's graph revision
+    5. Emits an event
     """
 
     # ───────────────────────────────────────────────────────────
@@ -122,6 +115,7 @@ class GraphService:
                 )
                 logger.warning("Failed to generate embedding for node", exc_info=True)
 
+        node.graph_revision = bump_graph_revision(project.id)
         node.save()
 
         # Emit event
@@ -180,16 +174,31 @@ class GraphService:
                 )
                 logger.warning("Failed to re-embed node %s", node_id, exc_info=True)
 
+        node.graph_revision = bump_graph_revision(node.project_id)
         node.save()
         return node
 
     @staticmethod
     @transaction.atomic
-    def remove_node(node_id: uuid.UUID):
+    def remove_node(node_id: uuid.UUID) -> Dict[str, list]:
         """
         Delete a node and its connected edges (cascade).
+
+        Returns the removed ids ({'node_ids': [...], 'edge_ids': [...]})
+        for the caller's GraphDelta patch — delta sync learns about
+        deletes only from there.
         """
+        project_id = Node.objects.filter(id=node_id).values_list('project_id', flat=True).first()
+        if project_id is None:
+            return {'node_ids': [], 'edge_ids': []}
+        edge_ids = list(
+            Edge.objects.filter(
+                Q(source_node_id=node_id) | Q(target_node_id=node_id)
+            ).values_list('id', flat=True)
+        )
         Node.objects.filter(id=node_id).delete()
+        bump_graph_revision(project_id)
+        return {'node_ids': [node_id], 'edge_ids': edge_ids}
 
     # ───────────────────────────────────────────────────────────
     # Edge CRUD
@@ -213,6 +222,7 @@ class GraphService:
 
         Returns the created Edge (or existing if already present).
         """
+        revision = bump_graph_revision(source_node.project_id)
         edge, created = Edge.objects.get_or_create(
             source_node=source_node,
             target_node=target_node,
@@ -223,6 +233,7 @@ class GraphService:
                 'source_type': source_type,
                 'source_document': source_document,
                 'created_by': created_by,
+                'graph_revision': revision,
             }
         )
 
@@ -245,6 +256,7 @@ class GraphService:
                 edge.strength = strength
             if provenance:
                 edge.provenance = provenance
+            edge.graph_revision = revision
             edge.save()
 
         return edge
@@ -262,6 +274,7 @@ class GraphService:
         *,
         limit: Optional[int] = None,
         node_type: Optional[str] = None,
+        embeddings: bool = True,
     ) -> Dict[str, Any]:
         """
         Graph for a project — nodes and edges with optional limit and filtering.
@@ -270,11 +283,13 @@ class GraphService:
             project_id: Project UUID.
             limit: Max nodes to return. Defaults to GRAPH_DEFAULT_LIMIT.
             node_type: Filter to a specific node type (claim, evidence, etc.).
+            embeddings: Load node embeddings. Serialization doesn't need
+                them; clustering does.
 
         Returns:
             {
                 'nodes': [Node, ...],
-                'edges': [Edge, ...],
+                'edges': [Edge, ...],  # source_node/target_node set from 'nodes'
                 'total_node_count': int,
                 'truncated': bool,
             }
@@ -288,16 +303,24 @@ class GraphService:
             qs = qs.filter(node_type=node_type)
 
         total_node_count = qs.count()
-        nodes = list(
-            qs.select_related('source_document', 'case', 'created_by')[:limit]
-        )
-        node_ids = {n.id for n in nodes}
+        if embeddings:
+            qs = qs.select_related('source_document', 'case', 'created_by')
+        else:
+            qs = qs.select_related('source_document').defer(
+                'embedding', 'source_document__content_text',
+            )
+        nodes = list(qs[:limit])
+        nodes_by_id = {n.id: n for n in nodes}
         edges = list(
             Edge.objects.filter(
-                source_node_id__in=node_ids,
-                target_node_id__in=node_ids,
-            ).select_related('source_node', 'target_node')
+                source_node_id__in=nodes_by_id,
+                target_node_id__in=nodes_by_id,
+            )
         )
+        # Endpoints are already loaded — don't join (and re-fetch embeddings) per edge
+        for edge in edges:
+            edge.source_node = nodes_by_id[edge.source_node_id]
+            edge.target_node = nodes_by_id[edge.target_node_id]
         return {
             'nodes': nodes,
             'edges': edges,
@@ -305,6 +328,93 @@ class GraphService:
             'truncated': total_node_count > len(nodes),
         }
 
+    @staticmethod
+    def get_graph_changes(
+        project_id: uuid.UUID,
+        since: int,
+        *,
+        node_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Graph changes after revision ``since`` (delta sync).
+
+        Created/updated nodes and edges are the rows stamped with a later
+        graph_revision; edges touching a changed node are included too,
+        as they repeat the node's content. Deleted ids come from the
+        GraphDelta patches recorded after ``since``.
+
+        Returns:
+            {
+                'revision': int,
+                'full_refresh': bool,   # window can't be served; refetch the graph
+                'nodes': [Node, ...],
+                'edges': [Edge, ...],
+                'deleted_node_ids': [str, ...],
+                'deleted_edge_ids': [str, ...],
+            }
+        """
+        from .revision import get_graph_sync_state
+
+        # Revision first: rows committed meanwhile are re-sent next time,
+        # never skipped.
+        revision, resync_revision = get_graph_sync_state(project_id)
+        changes = {
+            'revision': revision,
+            'full_refresh': False,
+            'nodes': [],
+            'edges': [],
+            'deleted_node_ids': [],
+            'deleted_edge_ids': [],
+        }
+        if since < resync_revision or since > revision:
+            changes['full_refresh'] = True
+            return changes
+        if since == revision:
+            return changes
+
+        nodes_qs = Node.objects.filter(project_id=project_id, graph_revision__gt=since)
+        if node_type:
+            nodes_qs = nodes_qs.filter(node_type=node_type)
+        nodes = list(
+            nodes_qs.select_related('source_document', 'case', 'created_by')
+            [:GraphService.GRAPH_MAX_LIMIT + 1]
+        )
+        if len(nodes) > GraphService.GRAPH_MAX_LIMIT:
+            changes['full_refresh'] = True
+            return changes
+        node_ids = [n.id for n in nodes]
+
+        edges_qs = Edge.objects.filter(source_node__project_id=project_id).filter(
+            Q(graph_revision__gt=since)
+            | Q(source_node_id__in=node_ids)
+            | Q(target_node_id__in=node_ids)
+        )
+        if node_type:
+            edges_qs = edges_qs.filter(
+                source_node__node_type=node_type,
+                target_node__node_type=node_type,
+            )
+        edges = list(edges_qs.select_related('source_node', 'target_node'))
+
+        removed = (
+            GraphDelta.objects
+            .filter(project_id=project_id, revision__gt=since)
+            .filter(Q(patch__has_key='nodes_removed') | Q(patch__has_key='edges_removed'))
+            .values_list('patch__nodes_removed', 'patch__edges_removed')
+        )
+        deleted_nodes, deleted_edges = set(), set()
+        for removed_nodes, removed_edges in removed:
+            deleted_nodes.update(removed_nodes or [])
+            deleted_edges.update(removed_edges or [])
+
+        changes.update({
+            'nodes': nodes,
+            'edges': edges,
+            'deleted_node_ids': sorted(deleted_nodes),
+            'deleted_edge_ids': sorted(deleted_edges),
+        })
+        return changes
+
     @staticmethod
     def get_document_subgraph(document_id: uuid.UUID) -> Dict[str, Any]:
         """
@@ -316,10 +426,11 @@ class GraphService:
         Returns:
             {'nodes': [Node, ...], 'edges': [Edge, ...]}
         """
-        nodes = _sort_by_importance(list(
+        nodes = list(
             Node.objects.filter(source_document_id=document_id)
             .select_related('source_document', 'case', 'created_by')
-        ))
+            .order_by('-importance', '-created_at')
+        )
         node_ids = {n.id for n in nodes}
         edges = list(
             Edge.objects.filter(
@@ -334,9 +445,6 @@ class GraphService:
         """
         Quick health stats for the knowledge graph.
 
-        Uses conditional aggregation so node totals, type/status breakdowns,
-        and key health indicators come from one node query.
-
         Returns:
             {
                 'total_nodes': int,
@@ -349,9 +457,20 @@ class GraphService:
                 'total_documents': int,
                 'total_deltas': int,
             }
+
+        Read from the materialized GraphHealthStats row, recomputed when it
+        is behind the graph revision (see apps.graph.health).
         """
-        nodes_qs = Node.objects.filter(project_id=project_id)
+        from .health import project_graph_health
+        return project_graph_health(project_id)
 
+    @staticmethod
+    def _node_health(nodes_qs) -> Dict[str, Any]:
+        """
+        Node totals, type/status breakdowns and key health indicators.
+
+        Uses conditional aggregation so they all come from one node query.
+        """
         agg_spec = {
             'total_nodes': Count('id'),
             'untested_assumptions': Count(
@@ -378,17 +497,29 @@ class GraphService:
 
         agg = nodes_qs.aggregate(**agg_spec)
 
-        type_counts = {
-            node_type: agg[f"type__{node_type}"]
-            for node_type, _label in NodeType.choices
-            if agg.get(f"type__{node_type}", 0)
-        }
-        status_counts = {
-            status: agg[f"status__{status}"]
-            for status, _label in NodeStatus.choices
-            if agg.get(f"status__{status}", 0)
+        return {
+            'total_nodes': agg['total_nodes'],
+            'nodes_by_type': {
+                node_type: agg[f"type__{node_type}"]
+                for node_type, _label in NodeType.choices
+                if agg.get(f"type__{node_type}", 0)
+            },
+            'nodes_by_status': {
+                status: agg[f"status__{status}"]
+                for status, _label in NodeStatus.choices
+                if agg.get(f"status__{status}", 0)
+            },
+            'untested_assumptions': agg['untested_assumptions'],
+            'unresolved_tensions': agg['unresolved_tensions'],
+            'unsubstantiated_claims': agg['unsubstantiated_claims'],
         }
 
+    @staticmethod
+    def _scan_graph_health(project_id: uuid.UUID) -> Dict[str, Any]:
+        """compute_graph_health computed from the graph tables (four queries)."""
+        nodes_qs = Node.objects.filter(project_id=project_id)
+        node_health = GraphService._node_health(nodes_qs)
+
         # Edge count using FK join instead of subquery
         total_edges = Edge.objects.filter(
             source_node__project_id=project_id
@@ -401,13 +532,13 @@ class GraphService:
         total_deltas = GraphDelta.objects.filter(project_id=project_id).count()
 
         return {
-            'total_nodes': agg['total_nodes'],
+            'total_nodes': node_health['total_nodes'],
             'total_edges': total_edges,
-            'nodes_by_type': type_counts,
-            'nodes_by_status': status_counts,
-            'untested_assumptions': agg['untested_assumptions'],
-            'unresolved_tensions': agg['unresolved_tensions'],
-            'unsubstantiated_claims': agg['unsubstantiated_claims'],
+            'nodes_by_type': node_health['nodes_by_type'],
+            'nodes_by_status': node_health['nodes_by_status'],
+            'untested_assumptions': node_health['untested_assumptions'],
+            'unresolved_tensions': node_health['unresolved_tensions'],
+            'unsubstantiated_claims': node_health['unsubstantiated_claims'],
             'total_documents': total_docs,
             'total_deltas': total_deltas,
         }
@@ -512,35 +643,18 @@ class GraphService:
 
     @staticmethod
     def compute_case_graph_health(case_id: uuid.UUID) -> Dict[str, Any]:
-        """Health stats scoped to a case's visible graph."""
+        """Health stats scoped to a case's visible graph (materialized like compute_graph_health)."""
+        from .health import case_graph_health
+        return case_graph_health(case_id)
+
+    @staticmethod
+    def _scan_case_graph_health(case_id: uuid.UUID) -> Dict[str, Any]:
+        """compute_case_graph_health computed from the graph tables."""
         visible_ids = GraphService._get_case_visible_nodes(case_id)
 
         nodes_qs = Node.objects.filter(id__in=visible_ids)
+        node_health = GraphService._node_health(nodes_qs)
 
-        type_counts = dict(
-            nodes_qs.values_list('node_type')
-            .annotate(count=Count('id'))
-            .values_list('node_type', 'count')
-        )
-
-        status_counts = dict(
-            nodes_qs.values_list('status')
-            .annotate(count=Count('id'))
-            .values_list('status', 'count')
-        )
-
-        untested = nodes_qs.filter(
-            node_type=NodeType.ASSUMPTION, status=NodeStatus.UNTESTED
-        ).count()
-        unresolved = nodes_qs.filter(
-            node_type=NodeType.TENSION,
-            status__in=[NodeStatus.SURFACED, NodeStatus.ACKNOWLEDGED],
-        ).count()
-        unsubstantiated = nodes_qs.filter(
-            node_type=NodeType.CLAIM, status=NodeStatus.UNSUBSTANTIATED
-        ).count()
-
-        total_nodes = nodes_qs.count()
         total_edges = Edge.objects.filter(
             source_node_id__in=visible_ids,
             target_node_id__in=visible_ids,
@@ -551,13 +665,13 @@ class GraphService:
         ).values('source_document').distinct().count()
 
         return {
-            'total_nodes': total_nodes,
+            'total_nodes': node_health['total_nodes'],
             'total_edges': total_edges,
-            'nodes_by_type': type_counts,
-            'nodes_by_status': status_counts,
-            'untested_assumptions': untested,
-            'unresolved_tensions': unresolved,
-            'unsubstantiated_claims': unsubstantiated,
+            'nodes_by_type': node_health['nodes_by_type'],
+            'nodes_by_status': node_health['nodes_by_status'],
+            'untested_assumptions': node_health['untested_assumptions'],
+            'unresolved_tensions': node_health['unresolved_tensions'],
+            'unsubstantiated_claims': node_health['unsubstantiated_claims'],
             'total_documents': total_docs,
             'total_deltas': 0,  # Deltas are project-level
         }
@@ -676,7 +790,10 @@ class GraphService:
         # Update nodes
         affected_nodes = Node.objects.filter(source_document=document)
         node_ids = list(affected_nodes.values_list('id', flat=True))
-        affected_nodes.update(scope='project', case=None)
+        affected_nodes.update(
+            scope='project', case=None,
+            graph_revision=bump_graph_revision(document.project_id),
+        )
 
         # Remove CaseNodeReferences (these nodes are now project-level)
         CaseNodeReference.objects.filter(node_id__in=node_ids).delete()
@@ -718,7 +835,10 @@ class GraphService:
         # Update nodes
         affected_nodes = Node.objects.filter(source_document=document)
         node_ids = list(affected_nodes.values_list('id', flat=True))
-        affected_nodes.update(scope='case', case=case)
+        affected_nodes.update(
+            scope='case', case=case,
+            graph_revision=bump_graph_revision(document.project_id),
+        )
 
         # Find project-scoped neighbors connected via edges
         connected_edges = Edge.objects.filter(
@@ -770,33 +890,61 @@ class GraphService:
     # ───────────────────────────────────────────────────────────
 
     @staticmethod
-    def get_node_neighborhood(node_id: uuid.UUID) -> Dict[str, Any]:
+    def get_subgraph(
+        seed_ids: List[uuid.UUID],
+        *,
+        max_depth: int = 1,
+        direction: str = 'both',
+        edge_types: Optional[List[str]] = None,
+        max_nodes: Optional[int] = None,
+        project_id: Optional[uuid.UUID] = None,
+    ) -> Dict[str, Any]:
         """
-        A single node with its 1-hop neighborhood (connected edges + neighbors).
+        Nodes within max_depth hops of the seed nodes plus the edges among
+        them, from one recursive CTE (see apps.graph.traversal).
 
         Returns:
-            {'node': Node, 'edges': [Edge, ...], 'neighbors': [Node, ...]}
+            {
+                'nodes': [Node, ...],
+                'edges': [Edge, ...],
+                'depths': {node_id: hops},
+                'truncated': bool,
+            }
         """
-        node = Node.objects.select_related(
-            'source_document', 'case', 'created_by'
-        ).get(id=node_id)
-
-        edges = list(
-            Edge.objects.filter(
-                Q(source_node=node) | Q(target_node=node)
-            ).select_related('source_node', 'target_node')
+        from .traversal import DEFAULT_MAX_NODES, k_hop_subgraph
+
+        if max_nodes is None:
+            max_nodes = DEFAULT_MAX_NODES
+        return k_hop_subgraph(
+            seed_ids,
+            max_depth=max_depth,
+            direction=direction,
+            edge_types=edge_types,
+            max_nodes=min(max_nodes, GraphService.GRAPH_MAX_LIMIT),
+            project_id=project_id,
         )
 
-        neighbor_ids = set()
-        for e in edges:
-            if e.source_node_id != node.id:
-                neighbor_ids.add(e.source_node_id)
-            if e.target_node_id != node.id:
-                neighbor_ids.add(e.target_node_id)
+    @staticmethod
+    def get_node_neighborhood(node_id: uuid.UUID, project_id: Optional[uuid.UUID] = None) -> Dict[str, Any]:
+        """
+        A single node with its 1-hop neighborhood (connected edges + neighbors).
+
+        One query; raises Node.DoesNotExist when the node isn't found.
 
-        neighbors = list(
-            Node.objects.filter(id__in=neighbor_ids)
-            .select_related('source_document')
+        Returns:
+            {'node': Node, 'edges': [Edge, ...], 'neighbors': [Node, ...]}
+        """
+        subgraph = GraphService.get_subgraph(
+            [node_id], max_depth=1,
+            max_nodes=GraphService.GRAPH_MAX_LIMIT, project_id=project_id,
         )
-
-        return {'node': node, 'edges': edges, 'neighbors': neighbors}
+        nodes = {n.id: n for n in subgraph['nodes']}
+        node = nodes.pop(uuid.UUID(str(node_id)), None)
+        if node is None:
+            raise Node.DoesNotExist(f"Node {node_id} not found")
+
+        edges = [
+            e for e in subgraph['edges']
+            if node.id in (e.source_node_id, e.target_node_id)
+        ]
+        return {'node': node, 'edges': edges, 'neighbors': list(nodes.values())}
@@ -0,0 +1,40 @@
+"""
+Signal handlers that keep the project graph revision in step with deletes
+cascading into the graph from outside GraphService.
+
+- Document delete cascades to the nodes/edges extracted from it
+- Case delete nulls Node.case on its case-scoped nodes
+
+pre_delete runs inside the delete's transaction, so the bump commits or
+rolls back with it. Cascaded deletes aren't recorded in any GraphDelta
+patch, so they force clients behind them to resync; case-scoped nodes are
+re-stamped so delta sync picks up their cleared case.
+"""
+import logging
+
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .revision import bump_graph_revision, mark_graph_resync
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_delete, sender='projects.Document')
+def bump_revision_on_document_delete(sender, instance, **kwargs):
+    """Bump the graph revision when a deleted document takes nodes/edges with it."""
+    from .models import Edge, Node
+
+    if (Node.objects.filter(source_document_id=instance.pk).exists()
+            or Edge.objects.filter(source_document_id=instance.pk).exists()):
+        mark_graph_resync(instance.project_id)
+
+
+@receiver(pre_delete, sender='cases.Case')
+def bump_revision_on_case_delete(sender, instance, **kwargs):
+    """Bump the graph revision when a deleted case owned graph nodes."""
+    from .models import Node
+
+    nodes = Node.objects.filter(case_id=instance.pk)
+    if nodes.exists():
+        nodes.update(graph_revision=bump_graph_revision(instance.project_id))
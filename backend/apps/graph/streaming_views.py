@@ -12,6 +12,9 @@ Events:
   event: failed   — terminal: generation errored
 
 The stream terminates on completed/failed or after 3 minutes.
+
+Also home to the NDJSON graph export (graph_export_stream), which streams
+a whole project graph page by page.
 """
 import asyncio
 import json
@@ -267,3 +270,91 @@ async def orientation_generation_stream(request, project_id):
         response['Access-Control-Allow-Credentials'] = 'true'
 
     return response
+
+
+@csrf_exempt
+@require_GET
+async def graph_export_stream(request, project_id):
+    """
+    NDJSON export of a project's full graph.
+
+    GET /api/v2/projects/{project_id}/graph/export/
+
+    One JSON object per line:
+      {"type": "header", "project_id", "revision"}
+      {"type": "node", ...}  — every node, NodeSerializer fields
+      {"type": "edge", "source_node", "target_node", ...}  — after all nodes
+      {"type": "end", "node_count", "edge_count"}
+
+    Nodes and edges are read in keyset pages over (project_id, id), so
+    the export isn't capped at GRAPH_MAX_LIMIT and server memory stays
+    constant however large the graph is. A stream without the "end" line
+    was cut short. Writes during the export are picked up with
+    graph/changes/?since=<header revision>.
+    """
+    user = await authenticate_jwt(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+
+    from apps.projects.models import Project
+
+    project = await sync_to_async(
+        lambda: Project.objects.filter(id=project_id, user=user).first()
+    )()
+    if not project:
+        return JsonResponse({'error': 'Project not found'}, status=404)
+
+    from .graph_payload import (
+        EDGE_COLUMNS, EXPORT_PAGE_SIZE, NODE_COLUMNS,
+        encode_json, export_edge_page, export_node_page, ndjson_lines,
+    )
+    from .revision import get_graph_revision
+
+    # Taken before the first page, so delta sync from it covers every
+    # write the export may have missed
+    revision = await sync_to_async(get_graph_revision)(project_id)
+
+    async def ndjson_stream():
+        yield encode_json({'type': 'header', 'project_id': project_id, 'revision': revision}) + b'\n'
+
+        node_count = 0
+        after = None
+        while True:
+            rows = await sync_to_async(export_node_page)(project_id, after, EXPORT_PAGE_SIZE)
+            if not rows:
+                break
+            yield ndjson_lines('node', NODE_COLUMNS, rows)
+            node_count += len(rows)
+            after = rows[-1][0]
+            if len(rows) < EXPORT_PAGE_SIZE:
+                break
+
+        edge_count = 0
+        after = None
+        while True:
+            after, rows = await sync_to_async(export_edge_page)(project_id, after, EXPORT_PAGE_SIZE)
+            if after is None:
+                break
+            if rows:
+                yield ndjson_lines('edge', ('source_node', 'target_node') + EDGE_COLUMNS, rows)
+                edge_count += len(rows)
+
+        yield encode_json({'type': 'end', 'node_count': node_count, 'edge_count': edge_count}) + b'\n'
+
+    response = StreamingHttpResponse(
+        ndjson_stream(),
+        content_type='application/x-ndjson',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    response['Content-Disposition'] = f'attachment; filename="graph-{project_id}.ndjson"'
+
+    # CORS headers
+    from django.conf import settings
+    origin = request.META.get('HTTP_ORIGIN', '')
+    allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    if origin in allowed_origins:
+        response['Access-Control-Allow-Origin'] = origin
+        response['Access-Control-Allow-Credentials'] = 'true'
+
+    return response
@@ -390,23 +390,31 @@ def regenerate_stale_summaries():
 # ═══════════════════════════════════════════════════════════════════
 
 @shared_task
-def build_cluster_hierarchy_task(project_id: str):
+def build_cluster_hierarchy_task(project_id: str, full: bool = False):
     """
     Build hierarchical cluster tree for a project.
 
     Runs asynchronously after document chunking + embedding completes.
     Creates a ClusterHierarchy record with a multi-level tree.
 
+    When a current hierarchy exists and SUMMARY_SETTINGS['hierarchy_refresh']
+    is incremental, the previous tree is refreshed (new chunks placed into
+    existing topics, only drifted topics re-summarized) instead of rebuilt.
+
     After hierarchy is built, dispatches insight discovery.
 
     Args:
         project_id: UUID string of the Project.
+        full: Force a full rebuild even if an incremental refresh is possible.
     """
     import uuid as _uuid
+    from django.conf import settings
     from django.core.cache import cache
     from asgiref.sync import async_to_sync
     from .models import ClusterHierarchy, HierarchyStatus
     from .hierarchical_clustering import HierarchicalClusteringService
+    from .hierarchy_vectors import load_node_vectors, save_node_vectors
+    from .chunk_assignments import write_chunk_assignments
 
     lock_key = f'hierarchy_build:{project_id}'
 
@@ -441,6 +449,19 @@ def build_cluster_hierarchy_task(project_id: str):
         )
         next_version = (latest or 0) + 1
 
+        refresh_cfg = getattr(settings, 'SUMMARY_SETTINGS', {}).get('hierarchy_refresh', {})
+        previous_current = None
+        previous_vectors = None
+        if not full and refresh_cfg.get('incremental', True):
+            previous_current = (
+                ClusterHierarchy.objects
+                .filter(project_id=pid, is_current=True, status=HierarchyStatus.READY)
+                .only('tree')
+                .first()
+            )
+            if previous_current is not None:
+                previous_vectors = load_node_vectors(previous_current)
+
         # Create building record
         hierarchy = ClusterHierarchy.objects.create(
             project_id=pid,
@@ -452,7 +473,12 @@ def build_cluster_hierarchy_task(project_id: str):
 
         # Build hierarchy
         service = HierarchicalClusteringService()
-        result = async_to_sync(service.build_hierarchy)(pid)
+        if previous_current is not None:
+            result = async_to_sync(service.refresh_hierarchy)(
+                pid, previous_current.tree, previous_vectors,
+            )
+        else:
+            result = async_to_sync(service.build_hierarchy)(pid)
 
         # Atomically swap is_current: unset old, then set new
         from django.db import transaction
@@ -467,6 +493,8 @@ def build_cluster_hierarchy_task(project_id: str):
             hierarchy.status = HierarchyStatus.READY
             hierarchy.is_current = True
             hierarchy.save(update_fields=['tree', 'metadata', 'status', 'is_current'])
+            save_node_vectors(hierarchy, result.get('node_vectors') or [])
+            write_chunk_assignments(hierarchy)
 
         logger.info(
             "hierarchy_build_complete",
@@ -475,6 +503,8 @@ def build_cluster_hierarchy_task(project_id: str):
                 'version': next_version,
                 'duration_ms': result['metadata'].get('duration_ms'),
                 'total_clusters': result['metadata'].get('total_clusters'),
+                'refresh_mode': result['metadata'].get('refresh', {}).get('mode'),
+                'llm_calls': result['metadata'].get('llm_calls'),
             },
         )
 
@@ -546,7 +576,8 @@ def build_cluster_hierarchy_task(project_id: str):
         # ── Staleness check: did new chunks arrive during the build? ──
         # If a user uploaded more documents while this build was running,
         # those chunks were skipped because the lock blocked their builds.
-        # Re-dispatch a follow-up build so the landscape stays current.
+        # Re-dispatch a follow-up build so the landscape stays current; it
+        # refreshes incrementally from the tree just saved.
         chunk_count_after = DocumentChunk.objects.filter(
             document__project_id=pid,
         ).count()
@@ -711,6 +742,115 @@ def generate_orientation_task(project_id: str, hierarchy_id: str):
         }
 
 
+@shared_task
+def compute_graph_layout_task(project_id: str, force: bool = False):
+    """
+    Compute the 2D layout returned with the clustered graph.
+
+    Keyed by graph revision: does nothing when the stored GraphLayout
+    already reflects the project's current revision. Small changes are
+    laid out incrementally from the previous layout (see apps.graph.layout).
+
+    Args:
+        project_id: UUID string of the Project.
+        force: Recompute even if the layout is current.
+    """
+    import uuid as _uuid
+    from django.core.cache import cache
+    from .layout import build_graph_layout
+
+    lock_key = f'graph_layout:{project_id}'
+    if not cache.add(lock_key, '1', timeout=300):
+        return {'status': 'skipped', 'reason': 'lock_held'}
+
+    try:
+        layout = build_graph_layout(_uuid.UUID(project_id), force=force)
+        if layout is None:
+            return {'status': 'skipped', 'reason': 'current'}
+
+        logger.info(
+            "graph_layout_complete",
+            extra={'project_id': project_id, 'revision': layout.graph_revision, **layout.metadata},
+        )
+        return {
+            'status': 'completed',
+            'project_id': project_id,
+            'revision': layout.graph_revision,
+            'mode': layout.metadata.get('mode'),
+        }
+
+    except Exception as e:
+        logger.exception(
+            "graph_layout_failed",
+            extra={'project_id': project_id},
+        )
+        return {
+            'status': 'failed',
+            'project_id': project_id,
+            'error': str(e)[:500],
+        }
+    finally:
+        cache.delete(lock_key)
+
+
+@shared_task
+def refresh_graph_health_task(project_id: str):
+    """
+    Bring a project's materialized health stats up to date after graph
+    writes (queued by request_graph_health_refresh).
+
+    Args:
+        project_id: UUID string of the Project.
+    """
+    import uuid as _uuid
+    from .health import project_graph_health
+
+    try:
+        stats = project_graph_health(_uuid.UUID(project_id))
+        return {'status': 'completed', 'project_id': project_id, 'total_nodes': stats['total_nodes']}
+    except Exception as e:
+        logger.warning(
+            "graph_health_refresh_failed",
+            extra={'project_id': project_id},
+            exc_info=True,
+        )
+        return {'status': 'failed', 'project_id': project_id, 'error': str(e)[:500]}
+
+
+@shared_task
+def reconcile_graph_health_task():
+    """
+    Periodic reconciliation: recompute the least recently refreshed
+    GraphHealthStats rows and fix stats that drifted from the graph.
+
+    Should be scheduled hourly via Celery Beat.
+    """
+    from .health import reconcile_graph_health
+
+    checked, drifted = reconcile_graph_health()
+    logger.info(
+        "reconcile_graph_health",
+        extra={'checked': checked, 'drifted': drifted},
+    )
+    return {'checked': checked, 'drifted': drifted}
+
+
+@shared_task
+def prune_cluster_summary_memos_task():
+    """
+    Periodic cleanup: drop hierarchy summary memos that can no longer be
+    hit (old prompt version or model) or have gone unused for too long.
+
+    Should be scheduled daily via Celery Beat.
+    """
+    from .hierarchical_clustering import HierarchicalClusteringService, prune_summary_memos
+
+    model = HierarchicalClusteringService()._summary_model() or None
+    deleted = prune_summary_memos(current_model=model)
+    logger.info("prune_cluster_summary_memos", extra={'deleted': deleted})
+    return {'deleted': deleted}
+
+
 @shared_task
 def research_insight_gap_task(project_id: str, insight_id: str):
     """
@@ -0,0 +1,228 @@
+"""
+Candidate ranking and verdict memoization for insight tension detection.
+
+Checking every theme pair with the LLM grows quadratically, so pairs are
+ranked cheaply first and only the best candidates reach the LLM:
+
+- centroid similarity — themes about the same subject are the ones that
+  can disagree; unrelated themes rarely contradict each other
+- contradiction edges — CONTRADICTS edges in the node graph whose
+  endpoints were extracted from chunks of the two themes
+
+Verdicts (tension or not) are memoized per project in TensionPairVerdict,
+keyed by the fingerprints of both themes (label + summary, which is what
+the prompt judges), the prompt version and the model. Summaries of
+unchanged themes are themselves memoized, so rebuilds only send new or
+changed pairs to the LLM.
+"""
+import hashlib
+import json
+import logging
+import math
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Defaults for SUMMARY_SETTINGS['insight_tensions']
+DEFAULT_MAX_CANDIDATES = 40
+DEFAULT_CONTRADICTION_WEIGHT = 0.25
+
+
+class TensionCandidate(NamedTuple):
+    theme_a: dict
+    theme_b: dict
+    similarity: float
+    contradictions: int
+    score: float
+
+
+def tension_settings() -> dict:
+    from django.conf import settings as django_settings
+
+    return getattr(django_settings, 'SUMMARY_SETTINGS', {}).get('insight_tensions', {})
+
+
+def theme_fingerprint(theme: dict) -> str:
+    """sha256 over the theme's label and summary."""
+    payload = json.dumps(
+        [theme.get('label') or '', theme.get('summary') or ''],
+        ensure_ascii=False, separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def pair_fingerprint(theme_a: dict, theme_b: dict, model: str) -> str:
+    """Order-independent key of a theme pair for the verdict memo."""
+    from apps.intelligence.insight_prompts import TENSION_PROMPT_VERSION
+
+    payload = json.dumps(
+        [TENSION_PROMPT_VERSION, model, sorted([theme_fingerprint(theme_a), theme_fingerprint(theme_b)])],
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def theme_similarities(themes: List[dict], index) -> np.ndarray:
+    """Pairwise cosine similarity of theme centroids (0 where a vector is missing)."""
+    n = len(themes)
+    sims = np.zeros((n, n), dtype=np.float32)
+    if index is None or not len(index) or not index.centroids.shape[1]:
+        return sims
+    row_of = {node_id: row for row, node_id in enumerate(index.node_ids)}
+    rows = np.array([row_of.get(t.get('id', ''), -1) for t in themes], dtype=np.int64)
+    present = rows >= 0
+    present[present] = index.has_vector[rows[present]]
+    if present.sum() < 2:
+        return sims
+    idx = np.flatnonzero(present)
+    block = index.centroids[rows[idx]]
+    sims[np.ix_(idx, idx)] = block @ block.T
+    return sims
+
+
+def node_theme_rows(
+    pairs: Iterable[Tuple[uuid.UUID, str, str]],
+    theme_rows: Dict[str, int],
+) -> Dict[uuid.UUID, Set[int]]:
+    """node id → theme rows, from (node_id, theme_id, topic_id) assignment rows.
+
+    Themes are usually the chunk's theme; trees too small to have themes
+    promote topics to themes, so the topic id is tried as well.
+    """
+    found: Dict[uuid.UUID, Set[int]] = {}
+    for node_id, theme_id, topic_id in pairs:
+        row = theme_rows.get(theme_id)
+        if row is None:
+            row = theme_rows.get(topic_id)
+        if row is not None:
+            found.setdefault(node_id, set()).add(row)
+    return found
+
+
+def count_contradictions(
+    edges: Iterable[Tuple[uuid.UUID, uuid.UUID]],
+    node_themes: Dict[uuid.UUID, Set[int]],
+    n_themes: int,
+) -> np.ndarray:
+    """Symmetric (n, n) count of contradiction edges spanning two themes."""
+    counts = np.zeros((n_themes, n_themes), dtype=np.int32)
+    for source, target in edges:
+        for a in node_themes.get(source, ()):
+            for b in node_themes.get(target, ()):
+                if a != b:
+                    counts[a, b] += 1
+                    counts[b, a] += 1
+    return counts
+
+
+def load_contradiction_counts(project_id: uuid.UUID, themes: List[dict]) -> np.ndarray:
+    """Contradiction-edge counts between themes of the project's current hierarchy.
+
+    Edge endpoints are mapped to themes through their source chunks'
+    ClusterChunkAssignment rows.
+    """
+    from .models import Edge, EdgeType, Node
+
+    n = len(themes)
+    edges = list(
+        Edge.objects
+        .filter(edge_type=EdgeType.CONTRADICTS, source_node__project_id=project_id)
+        .values_list('source_node_id', 'target_node_id')
+    )
+    if not edges:
+        return np.zeros((n, n), dtype=np.int32)
+
+    node_ids = {nid for edge in edges for nid in edge}
+    assignments = (
+        Node.source_chunks.through.objects
+        .filter(node_id__in=node_ids, documentchunk__cluster_assignments__project_id=project_id)
+        .values_list(
+            'node_id',
+            'documentchunk__cluster_assignments__theme_id',
+            'documentchunk__cluster_assignments__topic_id',
+        )
+        .distinct()
+    )
+    theme_rows = {t.get('id', ''): row for row, t in enumerate(themes)}
+    return count_contradictions(edges, node_theme_rows(assignments, theme_rows), n)
+
+
+def rank_tension_candidates(
+    themes: List[dict],
+    similarities: np.ndarray,
+    contradictions: np.ndarray,
+    filter_labels: Optional[set] = None,
+    contradiction_weight: float = DEFAULT_CONTRADICTION_WEIGHT,
+) -> List[TensionCandidate]:
+    """All theme pairs, best tension candidates first.
+
+    score = centroid similarity + weight * log1p(contradiction edges);
+    ties go to the pair with the higher combined coverage. With
+    ``filter_labels`` only pairs involving one of those themes are kept.
+    """
+    candidates = []
+    for i in range(len(themes)):
+        for j in range(i + 1, len(themes)):
+            a, b = themes[i], themes[j]
+            if filter_labels and a.get('label', '') not in filter_labels \
+                    and b.get('label', '') not in filter_labels:
+                continue
+            similarity = float(similarities[i, j])
+            count = int(contradictions[i, j])
+            candidates.append(TensionCandidate(
+                a, b, similarity, count,
+                similarity + contradiction_weight * math.log1p(count),
+            ))
+    candidates.sort(key=lambda c: (
+        -c.score,
+        -(c.theme_a.get('coverage_pct', 0) + c.theme_b.get('coverage_pct', 0)),
+    ))
+    return candidates
+
+
+def load_verdicts(project_id: uuid.UUID, fingerprints: List[str]) -> Dict[str, tuple]:
+    """Pair fingerprint → (has_tension, title, explanation, confidence)."""
+    from .models import TensionPairVerdict
+
+    if not fingerprints:
+        return {}
+    try:
+        rows = TensionPairVerdict.objects.filter(
+            project_id=project_id,
+            pair_fingerprint__in=fingerprints,
+        ).values_list('pair_fingerprint', 'has_tension', 'title', 'explanation', 'confidence')
+        return {fp: tuple(rest) for fp, *rest in rows}
+    except Exception:
+        logger.warning("tension_verdict_load_failed", exc_info=True)
+        return {}
+
+
+def store_verdicts(project_id: uuid.UUID, entries: List[tuple], model: str):
+    """Persist (fingerprint, has_tension, title, explanation, confidence); conflicts are ignored."""
+    from apps.intelligence.insight_prompts import TENSION_PROMPT_VERSION
+    from .models import TensionPairVerdict
+
+    if not entries:
+        return
+    try:
+        TensionPairVerdict.objects.bulk_create(
+            [
+                TensionPairVerdict(
+                    project_id=project_id,
+                    pair_fingerprint=fp,
+                    has_tension=has_tension,
+                    title=title[:200],
+                    explanation=explanation,
+                    confidence=confidence,
+                    model=model[:100],
+                    prompt_version=TENSION_PROMPT_VERSION,
+                )
+                for fp, has_tension, title, explanation, confidence in entries
+            ],
+            ignore_conflicts=True,
+        )
+    except Exception:
+        logger.warning("tension_verdict_store_failed", exc_info=True)
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for tests that build project graphs.
+
+Used by apps/graph/tests.py and by other apps' tests that need graph
+nodes (case aggregates, scaffolding). Not collected by pytest itself.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+
+from apps.graph.services import GraphService
+from apps.projects.models import Project
+
+# Stand-in for generate_embedding() so creating nodes never calls a model
+TEST_EMBEDDING = [0.1] * 384
+
+
+class GraphTestMixin:
+    """
+    Fresh cache, self.user and self.project, and _node() creating nodes
+    through GraphService (so the graph revision moves) with a fixed
+    embedding.
+
+    Class attributes:
+        node_type      default node type for _node()
+        with_case      also create self.case in the project
+        nodes_in_case  attach nodes made by _node() to self.case
+    """
+    node_type = 'claim'
+    with_case = False
+    nodes_in_case = False
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        super().setUp()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='graph', email='graph@example.com', password='testpass'
+        )
+        self.project = Project.objects.create(title='Graph Project', user=self.user)
+        self.case = self._case() if self.with_case else None
+
+    def _case(self, title='Graph Case'):
+        from apps.cases.models import Case
+        from apps.events.models import Event, ActorType, EventType
+
+        event = Event.objects.create(
+            actor_type=ActorType.SYSTEM, type=EventType.CASE_CREATED, payload={},
+        )
+        return Case.objects.create(
+            title=title, user=self.user, project=self.project,
+            position='Position', created_from_event_id=event.id,
+        )
+
+    def _node(self, content='Claim', node_type=None, **kwargs):
+        kwargs.setdefault('source_type', 'user_edit')
+        if self.nodes_in_case:
+            kwargs.setdefault('case', self.case)
+        with patch('apps.graph.services.generate_embedding', return_value=TEST_EMBEDDING):
+            return GraphService.create_node(
+                project=self.project, node_type=node_type or self.node_type,
+                content=content, **kwargs,
+            )
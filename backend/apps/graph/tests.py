@@ -16,6 +16,7 @@ from apps.graph.services import GraphService
 from apps.graph.serialization import GraphSerializationService
 from apps.graph.delta_service import GraphDeltaService
 from apps.graph.edit_handler import GraphEditHandler
+from apps.graph.testing import GraphTestMixin
 from apps.projects.models import Project, Document
 
 User = get_user_model()
@@ -318,9 +319,13 @@ class GraphServiceTests(TestCase):
 
     def test_compute_graph_health_query_budget(self):
         """Health stats should be computed with a small fixed query budget."""
-        with self.assertNumQueries(4):
+        # Stats row + revision lookups, the four stat queries, then the upsert
+        with self.assertNumQueries(8):
             health = GraphService.compute_graph_health(self.project.id)
         self.assertEqual(health['total_nodes'], 0)
+        # Later reads are one row lookup
+        with self.assertNumQueries(1):
+            GraphService.compute_graph_health(self.project.id)
 
     @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
     def test_update_node(self, mock_embed):
@@ -404,6 +409,295 @@ class GraphServiceTests(TestCase):
         mock_get.assert_not_called()
 
 
+class GraphRevisionTests(GraphTestMixin, TestCase):
+    """Every node/edge mutation bumps the project's graph revision."""
+
+    def _revision(self):
+        from apps.graph.revision import get_graph_revision
+        return get_graph_revision(self.project.id)
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_service_mutations_bump_revision(self, mock_embed):
+        self.assertEqual(self._revision(), 0)
+        a = self._node('A')
+        b = self._node('B')
+        self.assertEqual(self._revision(), 2)
+
+        GraphService.create_edge(a, b, EdgeType.SUPPORTS, 'user_edit')
+        self.assertEqual(self._revision(), 3)
+        GraphService.update_node(a.id, status='contested')
+        self.assertEqual(self._revision(), 4)
+        GraphService.remove_node(b.id)
+        self.assertEqual(self._revision(), 5)
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_rolled_back_mutation_keeps_revision(self, mock_embed):
+        from django.db import transaction
+
+        self._node('A')
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self._node('B')
+                raise RuntimeError('boom')
+        self.assertEqual(self._revision(), 1)
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_document_delete_cascade_bumps_revision(self, mock_embed):
+        document = Document.objects.create(
+            title='Doc', project=self.project, user=self.user,
+        )
+        GraphService.create_node(
+            project=self.project, node_type='claim', content='From doc',
+            source_type='document_extraction', source_document=document,
+        )
+        before = self._revision()
+        document.delete()
+        self.assertEqual(self._revision(), before + 1)
+        self.assertFalse(Node.objects.filter(project=self.project).exists())
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_health_is_cached_per_revision(self, mock_embed):
+        self._node('A')
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 1)
+
+        # Direct ORM writes skip the revision, so the cached stats stay put...
+        Node.objects.create(
+            project=self.project, node_type='claim', status='supported',
+            content='Unbumped', source_type='user_edit',
+        )
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 1)
+
+        # ...until the next real mutation
+        self._node('B')
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 3)
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_revision_endpoint(self, mock_embed):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        self._node('A')
+
+        response = client.get(f'/api/v2/projects/{self.project.id}/graph/revision/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'revision': 1})
+
+        response = client.get(f'/api/v2/projects/{self.project.id}/graph/')
+        self.assertEqual(response.data['revision'], 1)
+        self.assertEqual(len(response.data['nodes']), 1)
+        self._node('B')
+        response = client.get(f'/api/v2/projects/{self.project.id}/graph/')
+        self.assertEqual(response.data['revision'], 2)
+        self.assertEqual(len(response.data['nodes']), 2)
+
+
+class GraphDeltaSyncTests(GraphTestMixin, TestCase):
+    """ETags and delta sync for graph endpoints, keyed on the graph revision."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _changes(self, since):
+        return self.client.get(
+            f'/api/v2/projects/{self.project.id}/graph/changes/?since={since}'
+        )
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_etag_returns_304_until_graph_changes(self, mock_embed):
+        url = f'/api/v2/projects/{self.project.id}/graph/'
+        self._node('A')
+        first = self.client.get(url)
+        etag = first['ETag']
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], etag)
+
+        # Different params, different representation
+        other = self.client.get(f'{url}?node_type=evidence', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, 200)
+
+        self._node('B')
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(len(changed.data['nodes']), 2)
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_changes_since_revision(self, mock_embed):
+        a = self._node('A')
+        b = self._node('B')
+        edge = GraphService.create_edge(a, b, EdgeType.SUPPORTS, 'user_edit')
+        since = self.client.get(f'/api/v2/projects/{self.project.id}/graph/').data['revision']
+
+        GraphService.update_node(a.id, content='A revised')
+        removed = GraphService.remove_node(b.id)
+        GraphDeltaService.create_delta(
+            project_id=self.project.id, trigger='chat_edit',
+            nodes_updated=[Node.objects.get(id=a.id)],
+            nodes_removed=removed['node_ids'], edges_removed=removed['edge_ids'],
+        )
+        c = self._node('C')
+
+        response = self._changes(since)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['full_refresh'])
+        self.assertEqual({n['id'] for n in response.data['nodes']}, {str(a.id), str(c.id)})
+        self.assertEqual(response.data['deleted_node_ids'], [str(b.id)])
+        self.assertEqual(response.data['deleted_edge_ids'], [str(edge.id)])
+
+        # Up to date: nothing to send
+        latest = self._changes(response.data['revision'])
+        self.assertFalse(latest.data['full_refresh'])
+        self.assertEqual(latest.data['nodes'], [])
+        self.assertEqual(latest.data['deleted_node_ids'], [])
+
+    @patch('apps.graph.services.generate_embedding', return_value=[0.1] * 384)
+    def test_untracked_delete_forces_full_refresh(self, mock_embed):
+        document = Document.objects.create(
+            title='Doc', project=self.project, user=self.user,
+        )
+        self._node('From doc', source_document=document)
+        since = self._changes(0).data['revision']
+
+        document.delete()
+        response = self._changes(since)
+        self.assertTrue(response.data['full_refresh'])
+        after = self._changes(response.data['revision'])
+        self.assertFalse(after.data['full_refresh'])
+
+    def test_changes_requires_integer_since(self):
+        response = self._changes('latest')
+        self.assertEqual(response.status_code, 400)
+
+
+class GraphPayloadTests(GraphTestMixin, TestCase):
+    """Lean graph reads and the columnar graph payload."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _graph(self):
+        nodes = [
+            self._node(f'Node {i}', node_type)
+            for i, node_type in enumerate(['claim', 'evidence', 'claim'])
+        ]
+        GraphService.create_edge(nodes[1], nodes[0], EdgeType.SUPPORTS, 'user_edit')
+        GraphService.create_edge(nodes[2], nodes[0], EdgeType.CONTRADICTS, 'user_edit')
+        return nodes
+
+    def test_edges_reuse_loaded_nodes(self):
+        self._graph()
+        graph = GraphService.get_project_graph(self.project.id, embeddings=False)
+        with self.assertNumQueries(0):
+            contents = {(e.source_node.content, e.target_node.content) for e in graph['edges']}
+        self.assertEqual(contents, {('Node 1', 'Node 0'), ('Node 2', 'Node 0')})
+        self.assertIn('embedding', graph['nodes'][0].get_deferred_fields())
+
+    def test_columnar_matches_row_payload(self):
+        self._graph()
+        url = f'/api/v2/projects/{self.project.id}/graph/'
+        rows = self.client.get(url).json()
+        response = self.client.get(f'{url}?shape=columnar')
+        self.assertEqual(response.status_code, 200)
+        columnar = response.json()
+        self.assertEqual(columnar['format'], 'columnar')
+        self.assertEqual(columnar['revision'], rows['revision'])
+        self.assertNotEqual(response['ETag'], self.client.get(url)['ETag'])
+
+        nodes = columnar['nodes']
+        self.assertEqual(nodes['id'], [n['id'] for n in rows['nodes']])
+        for field in ('node_type', 'status', 'content', 'project', 'source_document_title'):
+            self.assertEqual(nodes[field], [n[field] for n in rows['nodes']])
+
+        edges = columnar['edges']
+        rebuilt = {
+            (nodes['id'][s], nodes['id'][t], edge_type)
+            for s, t, edge_type in zip(edges['source'], edges['target'], edges['edge_type'])
+        }
+        self.assertEqual(
+            rebuilt,
+            {(e['source_node'], e['target_node'], e['edge_type']) for e in rows['edges']},
+        )
+
+    def test_columnar_drops_edges_outside_node_filter(self):
+        self._graph()
+        response = self.client.get(
+            f'/api/v2/projects/{self.project.id}/graph/?shape=columnar&node_type=claim'
+        )
+        payload = response.json()
+        self.assertEqual(len(payload['nodes']['id']), 2)
+        # Only the claim → claim edge; the evidence node isn't in the payload
+        self.assertEqual(payload['edges']['edge_type'], [EdgeType.CONTRADICTS])
+        self.assertEqual(len(payload['edges']['id']), 1)
+
+
+class GraphLayoutTests(GraphTestMixin, TestCase):
+    """Stored layouts are keyed by graph revision and updated incrementally."""
+
+    def test_layout_is_incremental_and_revision_keyed(self):
+        from apps.graph.layout import build_graph_layout
+
+        nodes = [self._node(f'Node {i}') for i in range(12)]
+        for a, b in zip(nodes, nodes[1:]):
+            GraphService.create_edge(a, b, EdgeType.SUPPORTS, 'user_edit')
+
+        first = build_graph_layout(self.project.id)
+        self.assertEqual(first.metadata['mode'], 'full')
+        self.assertEqual(len(first.node_ids), 12)
+        self.assertIsNone(build_graph_layout(self.project.id))  # already current
+
+        new = self._node('Node 12')
+        GraphService.create_edge(new, nodes[0], EdgeType.SUPPORTS, 'user_edit')
+        second = build_graph_layout(self.project.id)
+        self.assertEqual(second.metadata['mode'], 'incremental')
+        self.assertEqual(second.metadata['new_nodes'], 1)
+
+        before = dict(zip(first.node_ids, first.coordinates().tolist()))
+        after = dict(zip(second.node_ids, second.coordinates().tolist()))
+        for node_id, position in before.items():
+            self.assertEqual(after[node_id], position)
+
+    @patch('apps.graph.layout.request_graph_layout')
+    @patch('apps.graph.clustering.ClusteringService.cluster_project_nodes', return_value=[])
+    def test_clustered_view_returns_layout(self, mock_cluster, mock_request):
+        from apps.graph.layout import build_graph_layout
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = f'/api/v2/projects/{self.project.id}/graph/clustered/'
+        a = self._node('A')
+
+        response = client.get(url)
+        self.assertIsNone(response.data['layout'])
+        mock_request.assert_called_once_with(self.project.id)
+
+        build_graph_layout(self.project.id)
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)  # layout landed, new ETag
+        self.assertFalse(response.data['layout']['stale'])
+        self.assertEqual(set(response.data['layout']['positions']), {str(a.id)})
+
+        # 304 path: a single layout read, without the coordinate blobs
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        layout_reads = [q['sql'] for q in ctx.captured_queries if 'graph_graphlayout' in q['sql']]
+        self.assertEqual(len(layout_reads), 1)
+        self.assertNotIn('positions', layout_reads[0])
+
+        self._node('B')
+        response = client.get(url)
+        self.assertTrue(response.data['layout']['stale'])
+        self.assertEqual(len(response.data['layout']['positions']), 1)
+
+
 class GraphSerializationTests(TestCase):
     """Test compact serialization for LLM context."""
 
@@ -451,6 +745,372 @@ class GraphSerializationTests(TestCase):
         self.assertEqual(resolved_id, node.id)
 
 
+class GraphHealthStatsTests(GraphTestMixin, TestCase):
+    """Health stats are materialized per revision and reconciled."""
+
+    def test_stats_row_follows_revision(self):
+        from apps.graph.models import GraphHealthStats
+
+        self._node('A', status='supported')
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 1)
+        row = GraphHealthStats.objects.get(project=self.project, case__isnull=True)
+        self.assertEqual(row.graph_revision, 1)
+
+        self._node('B', status='unsubstantiated')
+        health = GraphService.compute_graph_health(self.project.id)
+        self.assertEqual(health['total_nodes'], 2)
+        self.assertEqual(health['unsubstantiated_claims'], 1)
+        row.refresh_from_db()
+        self.assertEqual(row.graph_revision, 2)
+
+    def test_reconcile_fixes_drift(self):
+        from apps.graph.health import reconcile_graph_health
+
+        self._node('A')
+        GraphService.compute_graph_health(self.project.id)
+        # Writes that skip the revision leave the stored stats behind
+        Node.objects.create(
+            project=self.project, node_type='claim', status='supported',
+            content='Unbumped', source_type='user_edit',
+        )
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 1)
+
+        self.assertEqual(reconcile_graph_health(), (1, 1))
+        self.assertEqual(GraphService.compute_graph_health(self.project.id)['total_nodes'], 2)
+        self.assertEqual(reconcile_graph_health(), (1, 0))
+
+    def test_case_stats_track_references(self):
+        from apps.cases.models import Case
+        from apps.events.models import ActorType, Event, EventType
+        from apps.graph.models import CaseNodeReference
+
+        event = Event.objects.create(
+            actor_type=ActorType.SYSTEM, type=EventType.CASE_CREATED, payload={},
+        )
+        case = Case.objects.create(
+            title='Case', user=self.user, project=self.project,
+            position='Position', created_from_event_id=event.id,
+        )
+        self._node('Case note', case=case)
+        shared = self._node('Shared')
+
+        self.assertEqual(GraphService.compute_case_graph_health(case.id)['total_nodes'], 1)
+        with self.assertNumQueries(1):
+            GraphService.compute_case_graph_health(case.id)
+
+        CaseNodeReference.objects.create(case=case, node=shared)
+        self.assertEqual(GraphService.compute_case_graph_health(case.id)['total_nodes'], 2)
+
+    def test_writes_queue_one_debounced_refresh(self):
+        with patch('apps.graph.tasks.refresh_graph_health_task.apply_async') as dispatch:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._node('A')
+                self._node('B')
+        dispatch.assert_called_once()
+        self.assertEqual(dispatch.call_args.kwargs['args'], [str(self.project.id)])
+
+
+class GraphTraversalTests(GraphTestMixin, TestCase):
+    """k-hop subgraphs come from one recursive CTE."""
+
+    def _chain(self):
+        """a → b → c → d (supports), plus d → a (depends_on) closing a cycle."""
+        a, b, c, d = (self._node(name) for name in 'abcd')
+        for source, target in ((a, b), (b, c), (c, d)):
+            GraphService.create_edge(source, target, EdgeType.SUPPORTS, 'user_edit')
+        GraphService.create_edge(d, a, EdgeType.DEPENDS_ON, 'user_edit')
+        return a, b, c, d
+
+    def test_k_hop_subgraph_in_one_query(self):
+        a, b, c, d = self._chain()
+
+        with self.assertNumQueries(1):
+            subgraph = GraphService.get_subgraph(
+                [a.id], max_depth=2, direction='out', edge_types=[EdgeType.SUPPORTS],
+            )
+            # Endpoints are attached, not lazily loaded
+            pairs = {(e.source_node.content, e.target_node.content) for e in subgraph['edges']}
+        self.assertEqual([n.content for n in subgraph['nodes']], ['a', 'b', 'c'])
+        self.assertEqual(subgraph['depths'], {a.id: 0, b.id: 1, c.id: 2})
+        self.assertEqual(pairs, {('a', 'b'), ('b', 'c')})
+        self.assertFalse(subgraph['truncated'])
+
+        # Both directions over all edge types reach d through the cycle
+        subgraph = GraphService.get_subgraph([a.id], max_depth=1)
+        self.assertEqual(subgraph['depths'], {a.id: 0, b.id: 1, d.id: 1})
+
+        capped = GraphService.get_subgraph([a.id], max_depth=3, max_nodes=2)
+        self.assertEqual(len(capped['nodes']), 2)
+        self.assertTrue(capped['truncated'])
+
+    def test_node_neighborhood(self):
+        a, b, c, d = self._chain()
+
+        with self.assertNumQueries(1):
+            data = GraphService.get_node_neighborhood(b.id)
+        self.assertEqual(data['node'].id, b.id)
+        self.assertEqual({n.id for n in data['neighbors']}, {a.id, c.id})
+        self.assertEqual(len(data['edges']), 2)
+        with self.assertRaises(Node.DoesNotExist):
+            GraphService.get_node_neighborhood(uuid.uuid4())
+
+    def test_orphaned_assumptions_follow_dependency_chains(self):
+        from apps.graph.analyzer import GraphAnalyzer
+
+        grounded = self._node('Grounded', 'assumption')
+        middle = self._node('Middle', 'assumption')
+        base = self._node('Base', 'claim')
+        evidence = self._node('Evidence', 'evidence')
+        floating = self._node('Floating', 'assumption')
+        GraphService.create_edge(grounded, middle, EdgeType.DEPENDS_ON, 'user_edit')
+        GraphService.create_edge(middle, base, EdgeType.DEPENDS_ON, 'user_edit')
+        GraphService.create_edge(evidence, base, EdgeType.SUPPORTS, 'user_edit')
+        GraphService.create_edge(floating, grounded, EdgeType.SUPPORTS, 'user_edit')
+
+        from apps.graph.analytics import get_graph_csr
+
+        ungrounded, dependency_counts = GraphAnalyzer._ungrounded_assumptions(
+            get_graph_csr(self.project.id), {grounded.id, middle.id, floating.id},
+        )
+        # grounded has its own support edge from floating; middle reaches
+        # support through base; floating depends on nothing
+        self.assertEqual(ungrounded, {floating.id})
+        self.assertEqual(dependency_counts[middle.id], 1)
+
+    def test_subgraph_endpoint(self):
+        a, b, c, d = self._chain()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = f'/api/v2/projects/{self.project.id}/nodes/{a.id}/subgraph/'
+
+        response = client.get(url, {'depth': 3, 'direction': 'out', 'edge_types': 'supports'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['nodes']), 4)
+        self.assertEqual(len(response.data['edges']), 3)
+        self.assertEqual(response.data['depths'][str(d.id)], 3)
+
+        self.assertEqual(client.get(url, {'direction': 'sideways'}).status_code, 400)
+        self.assertEqual(client.get(url, {'edge_types': 'likes'}).status_code, 400)
+        missing = f'/api/v2/projects/{self.project.id}/nodes/{uuid.uuid4()}/subgraph/'
+        self.assertEqual(client.get(missing).status_code, 404)
+
+
+class GraphAnalyticsTests(GraphTestMixin, TestCase):
+    """GraphAnalyzer checks run over the cached CSR of the project graph."""
+
+    node_type = 'assumption'
+    with_case = True
+    nodes_in_case = True
+
+    def test_circular_reasoning_from_strongly_connected_components(self):
+        from asgiref.sync import async_to_sync
+        from apps.chat.models import ChatThread
+        from apps.graph.analyzer import GraphAnalyzer
+
+        a, b, c, d = (self._node(name) for name in 'abcd')
+        for source, target in ((a, b), (b, c), (c, a), (c, d)):
+            GraphService.create_edge(source, target, EdgeType.DEPENDS_ON, 'user_edit')
+        thread = ChatThread.objects.create(user=self.user, primary_case=self.case)
+
+        # Thread lookup, revision, nodes, edges, cycle root content
+        with self.assertNumQueries(5):
+            chains = async_to_sync(GraphAnalyzer().detect_circular_reasoning)(thread.id)
+        self.assertEqual(len(chains), 1)
+        self.assertEqual(chains[0]['root_signal_id'], str(a.id))
+        self.assertEqual(chains[0]['dependency_count'], 3)
+        self.assertEqual(set(chains[0]['cycle_node_ids']), {str(a.id), str(b.id), str(c.id)})
+
+        # The graph is reused until the revision moves
+        with self.assertNumQueries(3):
+            async_to_sync(GraphAnalyzer().detect_circular_reasoning)(thread.id)
+        GraphService.create_edge(d, a, EdgeType.DEPENDS_ON, 'user_edit')
+        chains = async_to_sync(GraphAnalyzer().detect_circular_reasoning)(thread.id)
+        self.assertEqual(chains[0]['dependency_count'], 4)
+
+    def test_confidence_conflicts_and_strong_claims(self):
+        from asgiref.sync import async_to_sync
+        from apps.graph.analyzer import GraphAnalyzer
+        from apps.inquiries.models import Inquiry
+
+        sure = self._node('Sure', 'claim', confidence=0.9)
+        also_sure = self._node('Also sure', 'claim', confidence=0.8)
+        unsure = self._node('Unsure', 'claim', confidence=0.4)
+        GraphService.create_edge(sure, also_sure, EdgeType.CONTRADICTS, 'user_edit')
+        GraphService.create_edge(sure, unsure, EdgeType.CONTRADICTS, 'user_edit')
+        for name in ('e1', 'e2'):
+            evidence = self._node(name, 'evidence')
+            GraphService.create_edge(evidence, unsure, EdgeType.SUPPORTS, 'user_edit', strength=0.9)
+
+        conflicts = async_to_sync(GraphAnalyzer().find_confidence_conflicts)(self.case.id)
+        self.assertEqual(
+            [(c['signal1_text'], c['signal2_text']) for c in conflicts], [('Sure', 'Also sure')],
+        )
+
+        inquiry = Inquiry.objects.create(case=self.case, title='Why?', sequence_index=1)
+        patterns = GraphAnalyzer().find_patterns_for_inquiry(inquiry.id)
+        self.assertEqual(len(patterns['contradictions']), 2)
+        self.assertEqual(
+            [(c['text'], c['evidence_count']) for c in patterns['strong_claims']], [('Unsure', 2)],
+        )
+        self.assertEqual(patterns['evidence_quality']['total'], 2)
+        self.assertEqual(patterns['evidence_quality']['supporting'], 2)
+        self.assertEqual(async_to_sync(GraphAnalyzer().find_evidence_deserts)(self.case.id), [])
+
+
+class ClusterSummaryMemoPruningTests(GraphTestMixin, TestCase):
+    """Summary memos that can no longer be hit are pruned."""
+
+    def test_prune_stale_memos(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.graph.hierarchical_clustering import prune_summary_memos
+        from apps.graph.models import ClusterSummaryMemo
+        from apps.intelligence.hierarchy_prompts import HIERARCHY_PROMPT_VERSION
+
+        project = self.project
+
+        def memo(fingerprint, model='m', version=HIERARCHY_PROMPT_VERSION):
+            return ClusterSummaryMemo.objects.create(
+                project=project, fingerprint=fingerprint, level=1,
+                label='L', summary='S', model=model, prompt_version=version,
+            )
+
+        memo('fresh')
+        memo('old-prompt', version='0')
+        memo('other-model', model='other')
+        ClusterSummaryMemo.objects.filter(pk=memo('unused').pk).update(
+            updated_at=timezone.now() - timedelta(days=90),
+        )
+
+        self.assertEqual(prune_summary_memos(), 2)
+        self.assertEqual(prune_summary_memos(current_model='m'), 1)
+        self.assertEqual(
+            list(ClusterSummaryMemo.objects.values_list('fingerprint', flat=True)), ['fresh'],
+        )
+
+
+class InsightDeduplicationTests(GraphTestMixin, TestCase):
+    """Re-discovered insights are dropped, including ones the user dismissed, but not stale ones."""
+
+    def test_dismissed_tension_is_not_recreated(self):
+        from apps.graph.insight_agent import InsightDiscoveryAgent
+        from apps.graph.models import ProjectInsight, InsightType, InsightStatus
+
+        project = self.project
+        ProjectInsight.objects.create(
+            project=project, insight_type=InsightType.TENSION,
+            title='Cost vs speed', content='...',
+            source_cluster_ids=['t1', 't2'], status=InsightStatus.DISMISSED,
+        )
+        ProjectInsight.objects.create(
+            project=project, insight_type=InsightType.TENSION,
+            title='Old framing', content='...',
+            source_cluster_ids=['t3', 't4'], status=InsightStatus.SUPERSEDED,
+        )
+
+        agent = InsightDiscoveryAgent()
+        same_title = agent._tension_insight(project.id, {'id': 't5'}, {'id': 't6'}, (True, 'COST VS SPEED', '...', 0.8))
+        same_pair = agent._tension_insight(project.id, {'id': 't2'}, {'id': 't1'}, (True, 'Reworded', '...', 0.8))
+        superseded = agent._tension_insight(project.id, {'id': 't3'}, {'id': 't4'}, (True, 'Old framing', '...', 0.8))
+        fresh = agent._tension_insight(project.id, {'id': 't1'}, {'id': 't3'}, (True, 'New tension', '...', 0.8))
+
+        kept = agent._deduplicate(project.id, [same_title, same_pair, superseded, fresh])
+        self.assertEqual([i.title for i in kept], ['Old framing', 'New tension'])
+
+    def test_stale_sweep_does_not_block_rediscovery(self):
+        from apps.graph.insight_agent import InsightDiscoveryAgent
+        from apps.graph.models import ProjectInsight, InsightType, InsightStatus, InsightSource
+
+        project = self.project
+        gap = ProjectInsight.objects.create(
+            project=project, insight_type=InsightType.BLIND_SPOT,
+            title='Thin coverage: Pricing', content='...', source_cluster_ids=['old-theme'],
+        )
+        ProjectInsight.objects.create(
+            project=project, insight_type=InsightType.PATTERN,
+            title='Orientation finding', content='...',
+            source_type=InsightSource.ORIENTATION, status=InsightStatus.DISMISSED,
+        )
+
+        agent = InsightDiscoveryAgent()
+        agent._supersede_stale_insights(project.id, {'id': 'root', 'children': [{'id': 'new-theme'}]})
+        gap.refresh_from_db()
+        self.assertEqual(gap.status, InsightStatus.SUPERSEDED)
+
+        candidates = [
+            ProjectInsight(project=project, insight_type=InsightType.BLIND_SPOT,
+                           title='Thin coverage: Pricing', content='...', source_cluster_ids=['new-theme']),
+            ProjectInsight(project=project, insight_type=InsightType.PATTERN,
+                           title='Orientation finding', content='...'),
+        ]
+        self.assertEqual(len(agent._deduplicate(project.id, candidates)), 2)
+
+
+class GraphLLMContextTests(GraphTestMixin, TestCase):
+    """LLM context takes the top-N nodes by importance and is cached."""
+
+    def _node(self, content, importance=None, node_type=None, **kwargs):
+        properties = {} if importance is None else {'importance': importance}
+        return super()._node(content, node_type, properties=properties, **kwargs)
+
+    def test_importance_column_follows_properties(self):
+        node = self._node('Thesis', importance=3)
+        self.assertEqual(node.importance, 3)
+        self.assertEqual(self._node('Unscored').importance, 2)
+        self.assertEqual(self._node('Out of range', importance=9).importance, 3)
+
+        GraphService.update_node(node.id, properties={'importance': 1})
+        node.refresh_from_db()
+        self.assertEqual(node.importance, 1)
+
+    def test_top_nodes_by_importance(self):
+        self._node('Detail', importance=1)
+        self._node('Evidence', importance=2, node_type='evidence')
+        self._node('Support', importance=2)
+        self._node('Thesis', importance=3)
+
+        text, ref_map = GraphSerializationService.serialize_for_llm(self.project.id, max_nodes=3)
+        self.assertEqual(len(ref_map), 3)
+        self.assertIn('Thesis', text)
+        self.assertIn('Evidence', text)
+        self.assertNotIn('Detail', text)
+        # Within an importance level, claims come before evidence
+        self.assertEqual(
+            Node.objects.get(id=ref_map['C1']).content, 'Thesis',
+        )
+
+    def test_project_context_is_cached_per_revision(self):
+        self._node('First')
+        GraphSerializationService.serialize_for_llm(self.project.id)
+        with self.assertNumQueries(1):  # revision lookup only
+            GraphSerializationService.serialize_for_llm(self.project.id)
+
+        self._node('Second')
+        _, ref_map = GraphSerializationService.serialize_for_llm(self.project.id)
+        self.assertEqual(len(ref_map), 2)
+
+    def test_case_context_tracks_references(self):
+        from apps.graph.models import CaseNodeReference
+
+        case = self._case()
+        self._node('Case note', case=case)
+        shared = self._node('Shared', importance=3)
+
+        text, _ = GraphSerializationService.serialize_for_llm(self.project.id, case_id=case.id)
+        self.assertIn('[case-local] Case note', text)
+        self.assertNotIn('Shared', text)
+
+        ref = CaseNodeReference.objects.create(case=case, node=shared)
+        text, ref_map = GraphSerializationService.serialize_for_llm(self.project.id, case_id=case.id)
+        self.assertIn('Shared', text)
+        self.assertEqual(ref_map['C1'], shared.id)
+
+        ref.excluded = True
+        ref.save(update_fields=['excluded', 'updated_at'])
+        text, _ = GraphSerializationService.serialize_for_llm(self.project.id, case_id=case.id)
+        self.assertNotIn('Shared', text)
+
+
 class GraphEditHandlerTests(TestCase):
     """Test the chat → graph edit handler."""
 
@@ -0,0 +1,98 @@
+"""
+Tests for the in-memory graph analytics arrays (apps.graph.analytics).
+
+Covers:
+- GraphCSR.from_rows (CSR layout, dropped dangling edges, load order)
+- Tarjan SCC — checked against brute-force mutual reachability
+- grounded() / degree checks
+
+Run locally (no DB required):
+    DJANGO_SETTINGS_MODULE=config.settings.test pytest apps/graph/tests_analytics.py -v --no-cov
+"""
+
+import unittest
+import uuid
+
+import numpy as np
+
+# ── Django setup for imports ──────────────────────────────────────
+import django
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from apps.graph.analytics import GraphCSR, _tarjan_scc  # noqa: E402
+from apps.graph.models import EdgeType, NodeType  # noqa: E402
+
+
+def _graph(node_types, edges, cases=None):
+    ids = [uuid.uuid4() for _ in node_types]
+    cases = cases or [None] * len(ids)
+    node_rows = [(ids[i], t, 0.8, cases[i]) for i, t in enumerate(node_types)]
+    edge_rows = [(ids[s], ids[t], edge_type, strength) for s, t, edge_type, strength in edges]
+    return ids, GraphCSR.from_rows(node_rows, edge_rows)
+
+
+class GraphCSRTests(unittest.TestCase):
+
+    def test_csr_layout(self):
+        ids, csr = _graph(
+            ['claim'] * 3,
+            [(2, 0, 'supports', 0.5), (0, 1, 'supports', None), (0, 2, 'depends_on', 1.0)],
+        )
+        self.assertEqual(csr.indptr.tolist(), [0, 2, 2, 3])
+        self.assertEqual(csr.dst.tolist(), [1, 2, 0])
+        # Load order survives the sort by source
+        order = csr.edges_in_load_order(np.ones(csr.edge_count, dtype=bool))
+        self.assertEqual(csr.src[order].tolist(), [2, 0, 0])
+        self.assertTrue(np.isnan(csr.strength[0]))
+
+        dangling = GraphCSR.from_rows(
+            [(ids[0], 'claim', 0.8, None)], [(ids[0], uuid.uuid4(), 'supports', None)],
+        )
+        self.assertEqual(dangling.edge_count, 0)
+
+    def test_tarjan_matches_mutual_reachability(self):
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            n = int(rng.integers(1, 25))
+            m = int(rng.integers(0, 3 * n))
+            src = rng.integers(0, n, m)
+            dst = rng.integers(0, n, m)
+            order = np.argsort(src, kind='stable')
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+            labels = _tarjan_scc(indptr, dst[order], n)
+
+            reach = np.eye(n, dtype=bool)
+            reach[src, dst] = True
+            for k in range(n):
+                reach |= reach[:, [k]] & reach[[k], :]
+            mutual = reach & reach.T
+            self.assertTrue(np.array_equal(labels[:, None] == labels[None, :], mutual))
+
+    def test_cycles_and_grounding(self):
+        case = uuid.uuid4()
+        ids, csr = _graph(
+            ['assumption', 'assumption', 'assumption', 'claim', 'evidence', 'assumption'],
+            [
+                (0, 1, 'depends_on', None), (1, 2, 'depends_on', None), (2, 0, 'depends_on', None),
+                (2, 3, 'depends_on', None), (4, 3, 'supports', 0.9), (5, 5, 'depends_on', None),
+            ],
+            cases=[case] * 6,
+        )
+        cycles = csr.cycles(EdgeType.DEPENDS_ON, csr.case_mask(case))
+        self.assertEqual(sorted(sorted(c.tolist()) for c in cycles), [[0, 1, 2], [5]])
+        self.assertEqual(csr.cycles(EdgeType.DEPENDS_ON, csr.case_mask(uuid.uuid4())), [])
+
+        # 0 reaches the supported claim in three hops, 5 only depends on itself
+        self.assertEqual(np.flatnonzero(~csr.grounded(3)).tolist(), [4, 5])
+        self.assertEqual(np.flatnonzero(~csr.grounded(2)).tolist(), [0, 4, 5])
+        self.assertEqual(np.flatnonzero(~csr.grounded(1)).tolist(), [0, 1, 4, 5])
+        self.assertEqual(csr.in_degree(EdgeType.SUPPORTS).tolist(), [0, 0, 0, 1, 0, 0])
+        self.assertEqual(csr.out_degree(EdgeType.DEPENDS_ON, exclude_self=True)[[2, 5]].tolist(), [2, 0])
+        self.assertEqual(int(csr.type_mask(NodeType.EVIDENCE).sum()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,562 @@
+"""
+Tests for ClusteringService post-processing on embedding matrices.
+
+Covers:
+- NodeEmbeddingMatrix (row lookup, segment-sum centroids) — no DB required
+- _semantic_refinement / _assign_orphans_by_embedding — no DB required,
+  checked against the per-node reference loops they replaced
+- Incremental Leiden (partition seeding, fixed communities, stable ids) —
+  no DB required (partition load/save patched)
+- compute_cluster_quality (bincount-based metrics) — no DB required
+- compute_layout (cluster-seeded full and incremental layouts) — no DB required
+
+Run locally (no DB required):
+    DJANGO_SETTINGS_MODULE=config.settings.test pytest apps/graph/tests_clustering.py -v --no-cov
+"""
+
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+# ── Django setup for imports ──────────────────────────────────────
+import django
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from apps.common.vector_utils import cosine_similarity
+from apps.graph.clustering import ClusteringService, NodeEmbeddingMatrix
+from apps.graph.layout import LAYOUT_EXTENT, compute_layout
+from apps.graph.models import EdgeType
+
+
+def _make_nodes(n, dim=16, n_topics=6, seed=0, missing_every=0):
+    """Fake nodes drawn around a few topic directions."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+    nodes = []
+    for i in range(n):
+        emb = topics[i % n_topics] + rng.normal(scale=0.6, size=dim)
+        if missing_every and i % missing_every == 0:
+            emb = None
+        nodes.append(SimpleNamespace(
+            id=uuid.UUID(int=i + 1),
+            embedding=None if emb is None else emb.tolist(),
+            node_type='claim',
+            content=f'node {i}',
+        ))
+    return nodes
+
+
+def _reference_assign_orphans(orphan_nodes, clusters, nodes_by_id, threshold):
+    """Per-orphan × per-centroid loop (pre-vectorization behaviour)."""
+    centroids, counts = [], []
+    for cluster in clusters:
+        embs = [np.array(nodes_by_id[nid].embedding) for nid in cluster
+                if nodes_by_id[nid].embedding is not None]
+        centroids.append(np.mean(embs, axis=0) if embs else None)
+        counts.append(len(embs))
+    for orphan in orphan_nodes:
+        if orphan.embedding is None:
+            clusters.append({orphan.id})
+            centroids.append(None)
+            counts.append(0)
+            continue
+        emb = np.array(orphan.embedding)
+        best_sim, best_idx = -1.0, -1
+        for idx, centroid in enumerate(centroids):
+            if centroid is None:
+                continue
+            sim = cosine_similarity(emb.tolist(), centroid.tolist())
+            if sim > best_sim:
+                best_sim, best_idx = sim, idx
+        if best_sim >= threshold and best_idx >= 0:
+            clusters[best_idx].add(orphan.id)
+            n = counts[best_idx]
+            centroids[best_idx] = (centroids[best_idx] * n + emb) / (n + 1)
+            counts[best_idx] = n + 1
+        else:
+            clusters.append({orphan.id})
+            centroids.append(None)
+            counts.append(0)
+    return clusters
+
+
+def _reference_merge_targets(clusters, nodes_by_id, merge_threshold, min_size):
+    """O(k²) centroid loop used by the merge phase before vectorization."""
+    centroids = []
+    for cluster in clusters:
+        embs = [np.array(nodes_by_id[nid].embedding) for nid in cluster
+                if nodes_by_id[nid].embedding is not None]
+        centroids.append(np.mean(embs, axis=0) if embs else None)
+    merged_into = {}
+    for i in range(len(clusters)):
+        if i in merged_into or len(clusters[i]) >= min_size or centroids[i] is None:
+            continue
+        best_sim, best_j = -1.0, -1
+        for j in range(len(clusters)):
+            if i == j or j in merged_into or centroids[j] is None:
+                continue
+            sim = cosine_similarity(centroids[i].tolist(), centroids[j].tolist())
+            if sim > best_sim:
+                best_sim, best_j = sim, j
+        if best_sim >= merge_threshold and best_j >= 0:
+            merged_into[i] = best_j
+    return merged_into
+
+
+class NodeEmbeddingMatrixTests(unittest.TestCase):
+
+    def test_skips_nodes_without_embeddings(self):
+        nodes = _make_nodes(10, missing_every=3)
+        matrix = NodeEmbeddingMatrix(nodes)
+        self.assertEqual(matrix.vectors.shape[0], 6)
+        self.assertNotIn(nodes[0].id, matrix)
+        self.assertIn(nodes[1].id, matrix)
+
+    def test_centroids_match_per_cluster_mean(self):
+        nodes = _make_nodes(40, missing_every=5)
+        matrix = NodeEmbeddingMatrix(nodes)
+        clusters = [
+            {n.id for n in nodes[:15]},
+            {nodes[0].id},  # no embedding
+            {n.id for n in nodes[15:]},
+        ]
+        centroids, counts = matrix.centroids(clusters)
+
+        self.assertEqual(counts.tolist(), [12, 0, 20])
+        expected = np.mean([n.embedding for n in nodes[15:] if n.embedding is not None], axis=0)
+        np.testing.assert_allclose(centroids[2], expected)
+        np.testing.assert_allclose(centroids[1], 0.0)
+
+    def test_empty(self):
+        matrix = NodeEmbeddingMatrix([])
+        centroids, counts = matrix.centroids([set()])
+        self.assertEqual(counts.tolist(), [0])
+        self.assertEqual(len(matrix.rows([uuid.uuid4()])), 0)
+
+
+class SemanticRefinementTests(unittest.TestCase):
+
+    def test_low_variance_cluster_kept(self):
+        nodes = [
+            SimpleNamespace(id=uuid.UUID(int=i + 1), embedding=[1.0, 0.01 * i, 0.0])
+            for i in range(6)
+        ]
+        nodes_by_id = {n.id: n for n in nodes}
+        cluster = {n.id for n in nodes}
+        refined = ClusteringService._semantic_refinement([cluster], nodes_by_id)
+        self.assertEqual(refined, [cluster])
+
+    def test_high_variance_cluster_split(self):
+        vecs = [[1, 0, 0], [1, 0.05, 0], [0, 0, 1], [0, 0.05, 1], [-1, 0, 0], [0, -1, 0]]
+        nodes = [SimpleNamespace(id=uuid.UUID(int=i + 1), embedding=v) for i, v in enumerate(vecs)]
+        nodes_by_id = {n.id: n for n in nodes}
+        cluster = {n.id for n in nodes}
+        refined = ClusteringService._semantic_refinement(
+            [cluster], nodes_by_id, variance_threshold=0.5,
+        )
+        self.assertEqual(len(refined), 2)
+        self.assertEqual(set().union(*refined), cluster)
+
+    def test_merge_targets_match_reference(self):
+        """Small clusters merge into the same targets as the pairwise loop."""
+        nodes = _make_nodes(300, missing_every=7, seed=3)
+        nodes_by_id = {n.id: n for n in nodes}
+        # Many singletons + a few larger groups; variance split disabled
+        clusters = [{n.id} for n in nodes[:120]]
+        for start in range(120, 300, 30):
+            clusters.append({n.id for n in nodes[start:start + 30]})
+
+        expected_targets = _reference_merge_targets(
+            [set(c) for c in clusters], nodes_by_id, merge_threshold=0.6, min_size=2,
+        )
+        refined = ClusteringService._semantic_refinement(
+            [set(c) for c in clusters], nodes_by_id,
+            variance_threshold=2.0, merge_threshold=0.6, min_cluster_size=2,
+        )
+
+        self.assertTrue(expected_targets)
+        self.assertEqual(len(refined), len(clusters) - len(expected_targets))
+
+
+class OrphanAssignmentTests(unittest.TestCase):
+
+    def test_matches_reference_loop(self):
+        nodes = _make_nodes(500, missing_every=11, seed=7)
+        nodes_by_id = {n.id: n for n in nodes}
+        clusters = [{n.id for n in nodes[i:i + 40]} for i in range(0, 200, 40)]
+        clusters.append({nodes[0].id})  # cluster with no embedding
+        orphans = nodes[200:]
+
+        expected = _reference_assign_orphans(
+            orphans, [set(c) for c in clusters], nodes_by_id, 0.3,
+        )
+        actual = ClusteringService._assign_orphans_by_embedding(
+            orphans, [set(c) for c in clusters], nodes_by_id, 0.3,
+        )
+        self.assertEqual(actual, expected)
+
+    def test_below_threshold_stays_singleton(self):
+        a = SimpleNamespace(id=uuid.UUID(int=1), embedding=[1.0, 0.0])
+        b = SimpleNamespace(id=uuid.UUID(int=2), embedding=[1.0, 0.0])
+        orphan = SimpleNamespace(id=uuid.UUID(int=3), embedding=[0.0, 1.0])
+        nodes_by_id = {n.id: n for n in (a, b, orphan)}
+        clusters = ClusteringService._assign_orphans_by_embedding(
+            [orphan], [{a.id, b.id}], nodes_by_id, 0.5,
+        )
+        self.assertEqual(clusters, [{a.id, b.id}, {orphan.id}])
+
+
+# ═══════════════════════════════════════════════════════════════
+# Incremental Leiden
+# ═══════════════════════════════════════════════════════════════
+
+T0 = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _community_graph(n_communities, size, updated_at=T0, offset=0):
+    """Dense 'supports' cliques with no edges between them."""
+    nodes, edges = [], []
+    for c in range(n_communities):
+        members = []
+        for k in range(size):
+            idx = offset + c * size + k
+            node = SimpleNamespace(
+                id=uuid.UUID(int=idx + 1), embedding=None, node_type='claim',
+                content=f'n{idx}', updated_at=updated_at,
+            )
+            nodes.append(node)
+            members.append(node)
+        for i in range(size):
+            for j in range(i + 1, size):
+                edges.append(SimpleNamespace(
+                    source_node_id=members[i].id, target_node_id=members[j].id,
+                    edge_type=EdgeType.SUPPORTS, strength=1.0, updated_at=updated_at,
+                ))
+    return nodes, edges
+
+
+class IncrementalClusteringTests(unittest.TestCase):
+
+    def _run(self, graph, partition):
+        saved = {}
+
+        def fake_save(project_id, resolution, clusters, next_id, computed_at, metadata):
+            saved['partition'] = SimpleNamespace(
+                membership={nid: c['cluster_id'] for c in clusters for nid in c['node_ids']},
+                next_cluster_id=next_id,
+                computed_at=computed_at,
+            )
+            saved['metadata'] = metadata
+
+        with patch.object(ClusteringService, '_load_partition', return_value=partition), \
+                patch.object(ClusteringService, '_save_partition', side_effect=fake_save):
+            clusters = ClusteringService.cluster_project_nodes(
+                uuid.uuid4(), graph=graph, incremental=True,
+            )
+        return clusters, saved
+
+    def test_first_run_is_full_and_persists_partition(self):
+        nodes, edges = _community_graph(4, 5)
+        clusters, saved = self._run({'nodes': nodes, 'edges': edges}, None)
+
+        self.assertEqual(len(clusters), 4)
+        self.assertEqual(saved['metadata']['mode'], 'full')
+        self.assertEqual(sorted(c['cluster_id'] for c in clusters), [0, 1, 2, 3])
+        self.assertEqual(saved['partition'].next_cluster_id, 4)
+
+    def test_new_community_keeps_existing_ids_and_fixes_untouched(self):
+        nodes, edges = _community_graph(10, 5)
+        first, saved = self._run({'nodes': nodes, 'edges': edges}, None)
+        partition = saved['partition']
+        partition.computed_at = T0 + timedelta(minutes=1)
+
+        later = T0 + timedelta(minutes=2)
+        new_nodes, new_edges = _community_graph(1, 5, updated_at=later, offset=50)
+        second, saved = self._run(
+            {'nodes': nodes + new_nodes, 'edges': edges + new_edges}, partition,
+        )
+
+        self.assertEqual(saved['metadata']['mode'], 'incremental')
+        self.assertEqual(saved['metadata']['fixed_nodes'], 50)
+        self.assertEqual(saved['metadata']['reused_clusters'], 10)
+
+        before = {frozenset(c['node_ids']): c['cluster_id'] for c in first}
+        after = {frozenset(c['node_ids']): c['cluster_id'] for c in second}
+        for members, cluster_id in before.items():
+            self.assertEqual(after[members], cluster_id)
+        new_ids = set(after.values()) - set(before.values())
+        self.assertEqual(new_ids, {10})
+
+    def test_large_churn_falls_back_to_seeded_run(self):
+        nodes, edges = _community_graph(2, 5)
+        _, saved = self._run({'nodes': nodes, 'edges': edges}, None)
+        partition = saved['partition']
+        partition.computed_at = T0 + timedelta(minutes=1)
+
+        later = T0 + timedelta(minutes=2)
+        new_nodes, new_edges = _community_graph(3, 5, updated_at=later, offset=50)
+        _, saved = self._run(
+            {'nodes': nodes + new_nodes, 'edges': edges + new_edges}, partition,
+        )
+        self.assertEqual(saved['metadata']['mode'], 'seeded')
+        self.assertEqual(saved['metadata']['fixed_nodes'], 0)
+
+    def test_edge_added_between_communities_touches_both(self):
+        nodes, edges = _community_graph(10, 5)
+        partition = SimpleNamespace(
+            membership={str(n.id): i // 5 for i, n in enumerate(nodes)},
+            next_cluster_id=10,
+            computed_at=T0 + timedelta(minutes=1),
+        )
+        bridge = SimpleNamespace(
+            source_node_id=nodes[0].id, target_node_id=nodes[5].id,
+            edge_type=EdgeType.SUPPORTS, strength=1.0,
+            updated_at=T0 + timedelta(minutes=2),
+        )
+        seed = ClusteringService._seed_from_partition(partition, nodes, edges + [bridge])
+
+        self.assertEqual(seed['mode'], 'incremental')
+        self.assertEqual(seed['touched_count'], 2)
+        self.assertEqual(len(seed['fixed']), 40)
+        self.assertNotIn(nodes[1].id, seed['fixed'])
+        self.assertNotIn(nodes[6].id, seed['fixed'])
+
+    def test_deleted_node_touches_its_cluster(self):
+        nodes, edges = _community_graph(10, 5)
+        partition = SimpleNamespace(
+            membership={str(n.id): i // 5 for i, n in enumerate(nodes)},
+            next_cluster_id=10,
+            computed_at=T0 + timedelta(minutes=1),
+        )
+        remaining = nodes[1:]
+        remaining_edges = [e for e in edges if nodes[0].id not in (e.source_node_id, e.target_node_id)]
+        seed = ClusteringService._seed_from_partition(partition, remaining, remaining_edges)
+        self.assertEqual(len(seed['fixed']), 45)
+
+    def test_undersized_reused_community_matches_full_run(self):
+        nodes, edges = _community_graph(10, 5)
+        direction = np.eye(16)[0]
+        loner = SimpleNamespace(
+            id=uuid.UUID(int=900), embedding=direction.tolist(), node_type='claim',
+            content='loner', updated_at=T0,
+        )
+        _, saved = self._run({'nodes': nodes + [loner], 'edges': edges}, None)
+        partition = saved['partition']
+        partition.computed_at = T0 + timedelta(minutes=1)
+
+        # A similar isolated node arrives; the loner's singleton community
+        # is untouched and fixed, but must not absorb it as a cluster would
+        newcomer = SimpleNamespace(
+            id=uuid.UUID(int=901), embedding=(direction + 0.01).tolist(), node_type='claim',
+            content='newcomer', updated_at=T0 + timedelta(minutes=2),
+        )
+        graph = {'nodes': nodes + [loner, newcomer], 'edges': edges}
+        incremental, saved = self._run(graph, partition)
+        self.assertEqual(saved['metadata']['mode'], 'incremental')
+        full, _ = self._run(graph, None)
+
+        def members(clusters):
+            return sorted(sorted(c['node_ids']) for c in clusters)
+
+        self.assertEqual(members(incremental), members(full))
+        self.assertIn([str(loner.id)], members(incremental))
+
+
+class StableClusterIdTests(unittest.TestCase):
+
+    def test_ids_follow_largest_overlap(self):
+        a, b, c, d = (uuid.UUID(int=i) for i in range(1, 5))
+        previous = {str(a): 7, str(b): 7, str(c): 3, str(d): 3}
+        # {a,b,c} overlaps 7 twice, 3 once; {d} overlaps 3
+        ids, next_id = ClusteringService._assign_stable_cluster_ids(
+            [{a, b, c}, {d}], previous, 8,
+        )
+        self.assertEqual(ids, [7, 3])
+        self.assertEqual(next_id, 8)
+
+    def test_split_cluster_gets_fresh_id(self):
+        a, b, c, d = (uuid.UUID(int=i) for i in range(1, 5))
+        previous = {str(a): 0, str(b): 0, str(c): 0, str(d): 0}
+        ids, next_id = ClusteringService._assign_stable_cluster_ids(
+            [{a, b, c}, {d}], previous, 1,
+        )
+        self.assertEqual(ids, [0, 1])
+        self.assertEqual(next_id, 2)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Cluster quality metrics
+# ═══════════════════════════════════════════════════════════════
+
+
+def _reference_cluster_quality(clusters, edges):
+    """Per-cluster × per-edge loops the bincount version replaced."""
+    all_ids = set()
+    for c in clusters:
+        all_ids.update(c['node_ids'])
+    degree, endpoints = {}, []
+    for e in edges:
+        src, tgt = str(e.source_node_id), str(e.target_node_id)
+        if src in all_ids and tgt in all_ids:
+            degree[src] = degree.get(src, 0) + 1
+            degree[tgt] = degree.get(tgt, 0) + 1
+            endpoints.append((src, tgt))
+    total_vol = sum(degree.values())
+    per_cluster = []
+    for idx, cluster in enumerate(clusters):
+        node_set = set(cluster['node_ids'])
+        n = len(node_set)
+        vol_s = sum(degree.get(nid, 0) for nid in node_set)
+        internal = sum(1 for s, t in endpoints if s in node_set and t in node_set)
+        cut = sum(1 for s, t in endpoints if (s in node_set) != (t in node_set))
+        comp = total_vol - vol_s
+        min_vol = min(vol_s, comp) if comp > 0 else vol_s
+        per_cluster.append({
+            'cluster_index': idx,
+            'conductance': round(cut / min_vol if min_vol > 0 else 0.0, 4),
+            'density': round(internal / (n * (n - 1) / 2) if n > 1 else 0.0, 4),
+            'node_count': n,
+        })
+    modularity = 0.0
+    if endpoints:
+        m2 = 2 * len(endpoints)
+        for cluster in clusters:
+            node_set = set(cluster['node_ids'])
+            e_c = sum(1 for s, t in endpoints if s in node_set and t in node_set)
+            a_c = sum(degree.get(nid, 0) for nid in node_set)
+            modularity += e_c / m2 - (a_c / m2) ** 2
+    mean = sum(c['conductance'] for c in per_cluster) / len(per_cluster) if per_cluster else 0.0
+    return {
+        'modularity': round(modularity, 4),
+        'mean_conductance': round(mean, 4),
+        'per_cluster': per_cluster,
+    }
+
+
+class ClusterQualityTests(unittest.TestCase):
+
+    def _edge(self, a, b):
+        return SimpleNamespace(source_node_id=uuid.UUID(int=a), target_node_id=uuid.UUID(int=b))
+
+    def _cluster(self, *ints):
+        return {'node_ids': [str(uuid.UUID(int=i)) for i in ints]}
+
+    def test_two_triangles_with_bridge(self):
+        clusters = [self._cluster(1, 2, 3), self._cluster(4, 5, 6)]
+        edges = [
+            self._edge(1, 2), self._edge(2, 3), self._edge(1, 3),
+            self._edge(4, 5), self._edge(5, 6), self._edge(4, 6),
+            self._edge(3, 4),
+        ]
+        quality = ClusteringService.compute_cluster_quality(clusters, edges)
+
+        # vol = 7 per side, cut = 1 → conductance 1/7; e_c = 3, m2 = 14
+        self.assertEqual(quality['per_cluster'][0]['conductance'], round(1 / 7, 4))
+        self.assertEqual(quality['per_cluster'][0]['density'], 1.0)
+        self.assertEqual(quality['modularity'], round(2 * (3 / 14 - 0.25), 4))
+
+    def test_matches_reference_on_random_graph(self):
+        rng = np.random.default_rng(5)
+        clusters = [self._cluster(*range(i, i + 20)) for i in range(1, 400, 20)]
+        # Include self loops and edges to nodes outside any cluster
+        edges = [self._edge(int(a), int(b)) for a, b in rng.integers(1, 420, size=(1500, 2))]
+        self.assertEqual(
+            ClusteringService.compute_cluster_quality(clusters, edges),
+            _reference_cluster_quality(clusters, edges),
+        )
+
+    def test_overlapping_clusters_match_reference(self):
+        clusters = [self._cluster(1, 2, 3), self._cluster(3, 4), self._cluster(5)]
+        edges = [self._edge(1, 2), self._edge(2, 3), self._edge(3, 4), self._edge(4, 5)]
+        self.assertEqual(
+            ClusteringService.compute_cluster_quality(clusters, edges),
+            _reference_cluster_quality(clusters, edges),
+        )
+
+    def test_no_edges(self):
+        quality = ClusteringService.compute_cluster_quality([self._cluster(1, 2)], [])
+        self.assertEqual(quality['modularity'], 0.0)
+        self.assertEqual(quality['per_cluster'][0]['conductance'], 0.0)
+
+
+class GraphLayoutTests(unittest.TestCase):
+    """compute_layout: cluster-seeded full layouts and incremental placement."""
+
+    CFG = {
+        'drl_min_nodes': 10_000, 'iterations': 200,
+        'incremental_max_new_fraction': 0.2, 'incremental_iterations': 50,
+        'intra_cluster_weight': 3.0,
+    }
+
+    def _clustered_graph(self, n_clusters=4, size=15, seed=0):
+        """Dense clusters joined by a single bridge edge each."""
+        rng = np.random.default_rng(seed)
+        membership = np.repeat(np.arange(n_clusters), size)
+        edges = []
+        for c in range(n_clusters):
+            rows = np.arange(c * size, (c + 1) * size)
+            for _ in range(size * 3):
+                a, b = rng.choice(rows, size=2, replace=False)
+                edges.append((a, b))
+            if c:
+                edges.append((rows[0], rows[0] - size))
+        return len(membership), np.array(edges), membership
+
+    def test_full_layout_fits_extent_and_separates_clusters(self):
+        n, edges, membership = self._clustered_graph()
+        result = compute_layout(n, edges, membership, cfg=self.CFG)
+
+        self.assertEqual(result.mode, 'full')
+        self.assertEqual(result.positions.shape, (n, 2))
+        self.assertLessEqual(float(np.abs(result.positions).max()), LAYOUT_EXTENT + 1e-3)
+
+        centers = np.array([result.positions[membership == c].mean(axis=0) for c in range(4)])
+        spread = np.mean([
+            np.linalg.norm(result.positions[membership == c] - centers[c], axis=1).mean()
+            for c in range(4)
+        ])
+        gaps = [np.linalg.norm(centers[a] - centers[b]) for a in range(4) for b in range(a + 1, 4)]
+        self.assertGreater(min(gaps), spread)
+
+    def test_incremental_pins_existing_nodes(self):
+        n, edges, membership = self._clustered_graph()
+        full = compute_layout(n, edges, membership, cfg=self.CFG)
+
+        # One new node attached to node 3
+        previous = np.vstack([full.positions, [[np.nan, np.nan]]]).astype(np.float32)
+        grown_edges = np.vstack([edges, [[n, 3]]])
+        grown_membership = np.append(membership, membership[3])
+        result = compute_layout(
+            n + 1, grown_edges, grown_membership,
+            previous=previous, previous_scale=full.scale, cfg=self.CFG,
+        )
+
+        self.assertEqual(result.mode, 'incremental')
+        self.assertEqual(result.new_nodes, 1)
+        np.testing.assert_array_equal(result.positions[:n], full.positions)
+        distance_to_neighbour = np.linalg.norm(result.positions[n] - result.positions[3])
+        self.assertLess(distance_to_neighbour, LAYOUT_EXTENT / 2)
+
+    def test_large_churn_relays_out_from_scratch(self):
+        n, edges, membership = self._clustered_graph()
+        full = compute_layout(n, edges, membership, cfg=self.CFG)
+        previous = full.positions.copy()
+        previous[: n // 2] = np.nan
+
+        result = compute_layout(
+            n, edges, membership, previous=previous, previous_scale=full.scale, cfg=self.CFG,
+        )
+        self.assertEqual(result.mode, 'full')
+        self.assertEqual(result.new_nodes, n)
+
+    def test_empty_and_edgeless_graphs(self):
+        self.assertEqual(compute_layout(0, np.zeros((0, 2)), np.zeros(0), cfg=self.CFG).positions.shape, (0, 2))
+        result = compute_layout(5, np.zeros((0, 2)), np.full(5, -1), cfg=self.CFG)
+        self.assertEqual(result.positions.shape, (5, 2))
+        self.assertTrue(np.isfinite(result.positions).all())
@@ -0,0 +1,667 @@
+"""
+Tests for HierarchicalClusteringService incremental refresh.
+
+Covers:
+- refresh_hierarchy reusing untouched topics/themes/root verbatim — no DB
+  required (chunk loading, LLM provider and embeddings patched)
+- re-clustering and re-summarizing only drifted topics / new content
+- full-rebuild fallbacks on drift, and llm_calls/refresh metadata
+- summary memo (fingerprint reuse across builds) — memo store patched
+- topic/theme embeddings kept out of the tree (hierarchy_vectors packing)
+- chunk → topic/theme assignments derived from the tree
+- centroid index matching/theme extraction vs. walking the tree
+- hierarchy diff theme matching (centroid + Jaccard assignment)
+- tension candidate ranking and verdict memoization — memo store patched
+
+Run locally (no DB required):
+    DJANGO_SETTINGS_MODULE=config.settings.test pytest apps/graph/tests_hierarchy.py -v --no-cov
+"""
+
+import asyncio
+import re
+import unittest
+import uuid
+from unittest.mock import patch
+
+import numpy as np
+
+# ── Django setup for imports ──────────────────────────────────────
+import django
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from apps.graph.hierarchical_clustering import HierarchicalClusteringService
+from apps.graph import centroid_index
+from apps.graph.centroid_index import HierarchyCentroidIndex
+from apps.graph.chunk_assignments import tree_chunk_assignments
+from apps.graph.hierarchy_vectors import pack_node_vectors, tree_embeddings
+
+DIM = 32
+
+
+def _chunks_for(groups, rng, start=0):
+    """Fake chunk dicts: `groups` is [(direction_index, count), ...]."""
+    chunks = []
+    i = start
+    for direction, count in groups:
+        for _ in range(count):
+            vec = np.zeros(DIM)
+            vec[direction] = 1.0
+            vec += rng.normal(scale=0.05, size=DIM)
+            chunks.append({
+                'id': str(uuid.UUID(int=i + 1)),
+                'document_id': f'doc-{direction}',
+                'document_title': f'Doc {direction}',
+                'text': f'chunk {i} about {direction}',
+                'embedding': vec.tolist(),
+            })
+            i += 1
+    return chunks
+
+
+class _FakeProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, messages, system_prompt=None, **kwargs):
+        self.calls += 1
+        return f'<label>Label {self.calls}</label><summary>Summary {self.calls}</summary>'
+
+
+def _fake_embed(self, nodes):
+    """Summary embedding = centroid of the node's chunk embeddings."""
+    for node in nodes:
+        vecs = np.array([self._test_embeddings[cid] for cid in node.chunk_ids])
+        node._embedding = vecs.mean(axis=0).tolist()
+
+
+class _HierarchyServiceHarness:
+    """Runs the service with chunk loading, LLM, embeddings and memo store patched."""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.provider = _FakeProvider()
+        self.project_id = uuid.uuid4()
+        self.memo = {}
+
+    async def _load_memos(self, service, fingerprints):
+        return {fp: self.memo[fp] for fp in fingerprints if fp in self.memo}
+
+    async def _store_memos(self, service, entries, model):
+        for fp, _level, label, summary in entries:
+            self.memo.setdefault(fp, (label, summary))
+
+    @staticmethod
+    def _vectors(result):
+        """Node vectors as refresh receives them after a storage round-trip."""
+        packed = pack_node_vectors(result['node_vectors'])
+        matrix = np.frombuffer(packed['vectors'], dtype=np.float32).reshape(-1, packed['dim'])
+        return dict(zip(packed['node_ids'], matrix))
+
+    def _run(self, chunks, previous_tree=None, refresh_cfg=None, previous_vectors=None):
+        service = HierarchicalClusteringService()
+        service._test_embeddings = {c['id']: c['embedding'] for c in chunks}
+        matrix = np.array([c['embedding'] for c in chunks], dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        loaded = (chunks, len(chunks), len({c['document_id'] for c in chunks}), 'P', '', matrix)
+        test = self
+        with patch.object(HierarchicalClusteringService, '_load_chunks', return_value=loaded), \
+                patch.object(HierarchicalClusteringService, '_load_summary_memos',
+                             lambda svc, fps: test._load_memos(svc, fps)), \
+                patch.object(HierarchicalClusteringService, '_store_summary_memos',
+                             lambda svc, entries, model: test._store_memos(svc, entries, model)), \
+                patch.object(HierarchicalClusteringService, '_embed_node_summaries', _fake_embed), \
+                patch('apps.common.llm_providers.factory.get_llm_provider', return_value=self.provider), \
+                patch('apps.graph.hierarchical_clustering._get_refresh_config', return_value=refresh_cfg or {}):
+            if previous_tree is None:
+                return asyncio.run(service.build_hierarchy(self.project_id))
+            return asyncio.run(service.refresh_hierarchy(
+                self.project_id, previous_tree, previous_vectors,
+            ))
+
+
+class HierarchyRefreshTests(_HierarchyServiceHarness, unittest.TestCase):
+
+    @staticmethod
+    def _topics(tree):
+        return [t for theme in tree['children'] for t in theme['children'] if t['level'] == 1]
+
+    def _base(self):
+        chunks = _chunks_for([(0, 30), (1, 30), (2, 30), (3, 30)], self.rng)
+        result = self._run(chunks)
+        self.memo.clear()  # refresh tests measure reuse, not memo hits
+        self.assertEqual(result['metadata']['refresh']['mode'], 'full')
+        # 4 topics (promoted to themes, no theme LLM calls) + root
+        self.assertEqual(result['metadata']['llm_calls'], 5)
+        return chunks, result
+
+    def test_small_addition_reuses_everything(self):
+        chunks, base = self._base()
+        added = _chunks_for([(0, 3)], self.rng, start=1000)
+        result = self._run(chunks + added, base['tree'], previous_vectors=self._vectors(base))
+
+        meta = result['metadata']
+        self.assertEqual(meta['refresh']['mode'], 'incremental')
+        self.assertEqual(meta['llm_calls'], 0)
+        self.assertEqual(meta['refresh']['topics_reused'], 4)
+        self.assertFalse(meta['refresh']['root_resummarized'])
+        self.assertEqual(meta['total_chunks'], 123)
+
+        old = {t['id']: t for t in self._topics(base['tree'])}
+        new = {t['id']: t for t in self._topics(result['tree'])}
+        self.assertEqual(set(old), set(new))
+        grown = [tid for tid in new if new[tid]['chunk_count'] == 33]
+        self.assertEqual(len(grown), 1)
+        self.assertEqual(new[grown[0]]['summary'], old[grown[0]]['summary'])
+        self.assertTrue(set(c['id'] for c in added) <= set(new[grown[0]]['chunk_ids']))
+        self.assertEqual(result['tree']['summary'], base['tree']['summary'])
+
+    def test_new_topic_only_summarizes_new_content(self):
+        chunks, base = self._base()
+        added = _chunks_for([(5, 20)], self.rng, start=1000)
+        result = self._run(chunks + added, base['tree'], previous_vectors=self._vectors(base))
+
+        meta = result['metadata']
+        self.assertEqual(meta['refresh']['mode'], 'incremental')
+        self.assertEqual(meta['refresh']['topics_resummarized'], 1)
+        self.assertEqual(meta['refresh']['topics_reused'], 4)
+        # One new topic + root re-synthesis; the new theme mirrors its topic
+        self.assertEqual(meta['llm_calls'], 2)
+        self.assertTrue(meta['refresh']['root_resummarized'])
+        self.assertEqual(len(result['tree']['children']), 5)
+
+    def test_drifted_topic_is_reclustered(self):
+        chunks, base = self._base()
+        # Remove half of direction 2's chunks → that topic drifts past 20%
+        kept = [c for c in chunks if not (c['document_id'] == 'doc-2' and int(uuid.UUID(c['id'])) % 2)]
+        result = self._run(kept, base['tree'], previous_vectors=self._vectors(base))
+
+        meta = result['metadata']['refresh']
+        self.assertEqual(meta['mode'], 'incremental')
+        self.assertEqual(meta['topics_touched'], 1)
+        self.assertEqual(meta['topics_resummarized'], 1)
+        self.assertEqual(meta['chunks_removed'], 15)
+        covered = {cid for t in self._topics(result['tree']) for cid in t['chunk_ids']}
+        self.assertEqual(covered, {c['id'] for c in kept})
+
+    def test_high_churn_falls_back_to_full_build(self):
+        chunks, base = self._base()
+        added = _chunks_for([(6, 40), (7, 40)], self.rng, start=1000)
+        result = self._run(chunks + added, base['tree'])
+
+        meta = result['metadata']
+        self.assertEqual(meta['refresh']['mode'], 'full')
+        self.assertEqual(meta['refresh']['reason'], 'chunk_churn')
+        self.assertGreater(meta['llm_calls'], 0)
+
+    def test_no_previous_tree_builds_full(self):
+        chunks = _chunks_for([(0, 10), (1, 10)], self.rng)
+        result = self._run(chunks, previous_tree={})
+        self.assertEqual(result['metadata']['refresh']['reason'], 'no_previous_topics')
+
+
+    def test_reused_nodes_keep_their_vectors(self):
+        chunks, base = self._base()
+        previous = self._vectors(base)
+        added = _chunks_for([(0, 3)], self.rng, start=1000)
+        result = self._run(chunks + added, base['tree'], previous_vectors=previous)
+
+        refreshed = {node_id: emb for node_id, _level, emb in result['node_vectors']}
+        self.assertEqual(set(refreshed), set(previous))
+        for node_id, emb in refreshed.items():
+            np.testing.assert_allclose(emb, previous[node_id], rtol=1e-6)
+
+    def test_nested_themes_keep_their_shape(self):
+        # Ten orthogonal topics: the full build clusters them twice, so each
+        # top-level theme holds a nested theme holding the topic
+        chunks = _chunks_for([(d, 15) for d in range(10)], self.rng)
+        base = self._run(chunks)
+        self.memo.clear()
+        nested = [c for theme in base['tree']['children'] for c in theme['children']]
+        self.assertTrue(nested and all(c['level'] == 2 for c in nested))
+
+        def shape(node):
+            return (node['id'], tuple(sorted(shape(c) for c in node['children'])))
+
+        added = _chunks_for([(0, 2)], self.rng, start=1000)
+        result = self._run(chunks + added, base['tree'], previous_vectors=self._vectors(base))
+        meta = result['metadata']
+        self.assertEqual(meta['refresh']['mode'], 'incremental')
+        self.assertEqual(meta['llm_calls'], 0)
+        self.assertEqual(shape(result['tree']), shape(base['tree']))
+
+        # Dropping a topic's chunks drops its whole nested branch; the other
+        # branches are reused as they were
+        gone = [c for c in chunks if c['document_id'] == 'doc-9']
+        result = self._run(
+            [c for c in chunks if c['document_id'] != 'doc-9'] + gone[:1],
+            base['tree'], refresh_cfg={'max_touched_topic_fraction': 1.0},
+            previous_vectors=self._vectors(base),
+        )
+        meta = result['metadata']['refresh']
+        self.assertEqual(meta['mode'], 'incremental')
+        self.assertEqual(meta['themes_resummarized'], 0)
+        kept = {shape(t) for t in result['tree']['children']}
+        self.assertEqual(len(kept & {shape(t) for t in base['tree']['children']}), 9)
+
+    def test_crossing_promotion_limit_rebuilds(self):
+        chunks, base = self._base()
+        added = _chunks_for([(d, 6) for d in range(5, 9)], self.rng, start=1000)
+        result = self._run(
+            chunks + added, base['tree'], refresh_cfg={'max_chunk_churn': 1.0},
+            previous_vectors=self._vectors(base),
+        )
+        self.assertEqual(result['metadata']['refresh']['reason'], 'theme_structure')
+
+
+class SummaryMemoTests(_HierarchyServiceHarness, unittest.TestCase):
+    """Full rebuilds reuse memoized summaries for unchanged clusters."""
+
+    def test_identical_rebuild_makes_no_llm_calls(self):
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20)], self.rng)
+        first = self._run(chunks)
+        self.assertEqual(first['metadata']['summary_memo'], {'hits': 0, 'misses': 4})
+
+        second = self._run(chunks)
+        self.assertEqual(second['metadata']['llm_calls'], 0)
+        self.assertEqual(second['metadata']['summary_memo'], {'hits': 4, 'misses': 0})
+        self.assertEqual(second['tree']['summary'], first['tree']['summary'])
+
+    def test_changed_topic_misses_and_root_resynthesized(self):
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20)], self.rng)
+        self._run(chunks)
+        more = chunks + _chunks_for([(2, 2)], self.rng, start=1000)
+        result = self._run(more)
+        # Topic 2 changed membership → miss; its new summary changes the root
+        self.assertEqual(result['metadata']['summary_memo'], {'hits': 2, 'misses': 2})
+        self.assertEqual(result['metadata']['llm_calls'], 2)
+
+    def test_unparseable_summaries_are_not_memoized(self):
+        async def garbled(messages, system_prompt=None, **kwargs):
+            self.provider.calls += 1
+            return 'no tags here'
+
+        self.provider.generate = garbled
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20)], self.rng)
+        result = self._run(chunks)
+        self.assertEqual(result['metadata']['summary_memo'], {'hits': 0, 'misses': 4})
+        self.assertEqual(self.memo, {})
+
+    def test_prompt_version_is_part_of_fingerprint(self):
+        with patch('apps.intelligence.hierarchy_prompts.HIERARCHY_PROMPT_VERSION', '1'):
+            a = HierarchicalClusteringService._summary_fingerprint(1, ['x'], 'm')
+        with patch('apps.intelligence.hierarchy_prompts.HIERARCHY_PROMPT_VERSION', '2'):
+            b = HierarchicalClusteringService._summary_fingerprint(1, ['x'], 'm')
+        self.assertNotEqual(a, b)
+        self.assertNotEqual(a, HierarchicalClusteringService._summary_fingerprint(1, ['x'], 'other'))
+
+
+class HierarchyVectorsTests(_HierarchyServiceHarness, unittest.TestCase):
+    """Topic/theme embeddings travel beside the tree, not inside it."""
+
+    def test_tree_has_no_inline_embeddings(self):
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20)], self.rng)
+        result = self._run(chunks)
+
+        self.assertEqual(tree_embeddings(result['tree']), [])
+        levels = {}
+        stack = [result['tree']]
+        while stack:
+            node = stack.pop()
+            levels[node['id']] = node['level']
+            stack.extend(node['children'])
+        stored = {node_id: level for node_id, level, _emb in result['node_vectors']}
+        expected = {node_id for node_id, level in levels.items() if level in (1, 2)}
+        self.assertEqual(set(stored), expected)
+        self.assertTrue(all(levels[node_id] == level for node_id, level in stored.items()))
+
+    def test_pack_round_trip(self):
+        entries = [('a', 1, [1.0, 2.0, 3.0]), ('b', 2, [0.5, 0.0, -1.0]), ('c', 1, [])]
+        packed = pack_node_vectors(entries)
+        self.assertEqual(packed['node_ids'], ['a', 'b'])
+        self.assertEqual(packed['levels'], [1, 2])
+        self.assertEqual(len(packed['vectors']), 2 * 3 * 4)
+        matrix = np.frombuffer(packed['vectors'], dtype=np.float32).reshape(-1, packed['dim'])
+        np.testing.assert_array_equal(matrix[1], [0.5, 0.0, -1.0])
+        self.assertIsNone(pack_node_vectors([]))
+
+    def test_legacy_inline_embeddings_still_rehydrate(self):
+        legacy = {'id': 't1', 'level': 1, 'label': 'L', 'summary': 'S', 'embedding': [1.0, 0.0]}
+        self.assertEqual(tree_embeddings({'id': 'r', 'level': 3, 'children': [legacy]}),
+                         [('t1', 1, [1.0, 0.0])])
+        node = HierarchicalClusteringService._node_from_dict(legacy, children=[])
+        self.assertEqual(node._embedding, [1.0, 0.0])
+
+        split = dict(legacy)
+        del split['embedding']
+        node = HierarchicalClusteringService._node_from_dict(
+            split, children=[], vectors={'t1': np.array([0.0, 1.0], dtype=np.float32)},
+        )
+        self.assertEqual(node._embedding, [0.0, 1.0])
+
+
+class ChunkAssignmentTests(_HierarchyServiceHarness, unittest.TestCase):
+
+    def test_every_chunk_maps_to_its_topic_and_theme(self):
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20)], self.rng)
+        tree = self._run(chunks)['tree']
+        assignments = tree_chunk_assignments(tree)
+
+        self.assertEqual(set(assignments), {c['id'] for c in chunks})
+        for theme in tree['children']:
+            for topic in theme['children']:
+                for cid in topic['chunk_ids']:
+                    cluster = assignments[cid]
+                    self.assertEqual((cluster.topic_id, cluster.topic_label), (topic['id'], topic['label']))
+                    self.assertEqual((cluster.theme_id, cluster.theme_label), (theme['id'], theme['label']))
+
+    def test_unclustered_tree_maps_chunks_to_root(self):
+        root = {'id': 'r', 'level': 3, 'label': 'Project', 'children': [], 'chunk_ids': ['c1', 'c2']}
+        assignments = tree_chunk_assignments(root)
+        self.assertEqual(assignments['c1'].theme_label, 'Project')
+        self.assertEqual(assignments['c1'].topic_id, '')
+        self.assertEqual(tree_chunk_assignments({}), {})
+
+
+def _walk_match(tree, vectors, query, theme_threshold, topic_threshold):
+    """Chunk ids the pre-index retriever collected by walking the tree."""
+    def sim(node):
+        vec = vectors.get(node.get('id'))
+        if vec is None:
+            return None
+        return float(np.dot(query, vec) / (np.linalg.norm(query) * np.linalg.norm(vec)))
+
+    def collect(node):
+        ids = list(node.get('chunk_ids', []))
+        for child in node.get('children', []):
+            ids.extend(collect(child))
+        return ids
+
+    found = []
+    for theme in tree.get('children', []):
+        theme_sim = sim(theme)
+        if theme_sim is None:
+            continue
+        if theme_sim > theme_threshold:
+            found.extend(collect(theme))
+        else:
+            for topic in theme.get('children', []):
+                topic_sim = sim(topic)
+                if topic_sim is not None and topic_sim > topic_threshold:
+                    found.extend(topic.get('chunk_ids', []))
+    return set(found)
+
+
+class CentroidIndexTests(_HierarchyServiceHarness, unittest.TestCase):
+
+    def _built(self):
+        chunks = _chunks_for([(0, 20), (1, 20), (2, 20), (3, 20)], self.rng)
+        result = self._run(chunks)
+        return result['tree'], self._vectors(result)
+
+    def test_match_selects_same_chunks_as_tree_walk(self):
+        tree, vectors = self._built()
+        index = HierarchyCentroidIndex.from_tree(tree, vectors)
+        for direction in range(4):
+            query = np.zeros(DIM)
+            query[direction] = 1.0
+            query += self.rng.normal(scale=0.3, size=DIM)
+            for thresholds in ((0.5, 0.55), (0.9, 0.3), (0.99, 0.99)):
+                rows = index.match(query, *thresholds)
+                self.assertEqual(
+                    set(index.chunks_for(rows)),
+                    _walk_match(tree, vectors, query, *thresholds),
+                )
+
+    def test_topics_of_themes_without_vector_are_skipped(self):
+        tree, vectors = self._built()
+        theme = tree['children'][0]
+        topic = theme['children'][0]
+        partial = {k: v for k, v in vectors.items() if k != theme['id']}
+        index = HierarchyCentroidIndex.from_tree(tree, partial)
+        query = np.asarray(partial[topic['id']], dtype=float)
+        rows = index.match(query, 0.99, 0.5)
+        self.assertNotIn(index.node_ids.index(topic['id']), rows)
+        self.assertEqual(
+            set(index.chunks_for(rows)), _walk_match(tree, partial, query, 0.99, 0.5),
+        )
+
+    def test_best_cluster_chunks_come_first(self):
+        tree, vectors = self._built()
+        index = HierarchyCentroidIndex.from_tree(tree, vectors)
+        query = np.zeros(DIM)
+        query[2] = 1.0
+        chunk_ids = index.chunks_for(index.match(query, 0.0, 0.0), limit=10)
+        self.assertEqual(len(chunk_ids), 10)
+        topic = next(
+            t for theme in tree['children'] for t in theme['children']
+            if chunk_ids[0] in t['chunk_ids']
+        )
+        self.assertTrue(set(chunk_ids) <= set(topic['chunk_ids']))
+        self.assertEqual(topic['document_ids'], ['doc-2'])
+
+    def test_theme_summaries_match_orientation_extraction(self):
+        from apps.graph.orientation_service import OrientationService
+
+        tree, vectors = self._built()
+        flat = {'id': 'r', 'level': 3, 'children': [
+            {'id': 't1', 'level': 1, 'label': 'A', 'children': [], 'chunk_ids': ['c1']},
+            {'id': 't2', 'level': 1, 'children': [], 'chunk_ids': ['c2']},
+        ]}
+        for candidate in (tree, flat, {}):
+            index = HierarchyCentroidIndex.from_tree(candidate, vectors)
+            self.assertEqual(
+                index.theme_summaries(),
+                OrientationService._extract_theme_summaries(candidate),
+            )
+        self.assertEqual(
+            HierarchyCentroidIndex.from_tree(tree, {}).theme_labels(),
+            [theme['label'] for theme in tree['children'] if theme['level'] == 2],
+        )
+
+    def test_ready_hierarchy_index_is_cached(self):
+        from types import SimpleNamespace
+
+        tree, vectors = self._built()
+        index = HierarchyCentroidIndex.from_tree(tree, vectors)
+        ready = SimpleNamespace(pk=uuid.uuid4(), status='ready')
+        building = SimpleNamespace(pk=uuid.uuid4(), status='building')
+        with patch.object(centroid_index, 'build_centroid_index', return_value=index) as build:
+            self.assertIs(centroid_index.get_centroid_index(ready), index)
+            self.assertIs(centroid_index.get_centroid_index(ready), index)
+            centroid_index.get_centroid_index(building)
+            centroid_index.get_centroid_index(building)
+        self.assertEqual(build.call_count, 3)
+
+
+class HierarchyDiffTests(unittest.TestCase):
+    """compute_hierarchy_diff matches themes by content, not labels."""
+
+    @staticmethod
+    def _hierarchy(themes):
+        from types import SimpleNamespace
+        return SimpleNamespace(
+            tree={'id': 'root', 'level': 3, 'children': themes},
+            metadata={'total_chunks': sum(len(t['chunk_ids']) for t in themes)},
+        )
+
+    @staticmethod
+    def _theme(node_id, label, chunk_ids):
+        return {'id': node_id, 'level': 2, 'label': label, 'summary': '',
+                'chunk_ids': chunk_ids, 'chunk_count': len(chunk_ids), 'children': []}
+
+    def test_relabeled_grown_merged_and_new_themes(self):
+        from apps.graph.hierarchy_diff import compute_hierarchy_diff
+
+        ids = [f'c{i}' for i in range(100)]
+        axes = np.eye(8)
+        old = self._hierarchy([
+            self._theme('a', 'Supply chain risk', ids[0:30]),
+            self._theme('b', 'Pricing pressure', ids[30:60]),
+            self._theme('c', 'Hiring plans', ids[60:80]),
+            self._theme('d', 'Office moves', ids[80:100]),
+        ])
+        old_vectors = {'a': axes[0], 'b': axes[1], 'c': axes[2], 'd': axes[3]}
+        grown = ids[30:60] + [f'n{i}' for i in range(15)]
+        new = self._hierarchy([
+            self._theme('a2', 'Vendor dependencies', ids[0:30]),          # relabeled
+            self._theme('b2', 'Pricing pressure', grown),                  # +50%
+            self._theme('c2', 'People and places', ids[60:100]),          # c + d merged
+            self._theme('e2', 'Regulation', [f'r{i}' for i in range(10)]),  # new
+        ])
+        new_vectors = {'a2': axes[0], 'b2': axes[1], 'c2': (axes[2] + axes[3]) / 2, 'e2': axes[5]}
+
+        diff = compute_hierarchy_diff(old, new, old_vectors, new_vectors)
+
+        self.assertEqual([t['label'] for t in diff.new_themes], ['Regulation'])
+        # c continues as c2 (doubled); d's chunks were absorbed into it
+        self.assertEqual(
+            [t['label'] for t in diff.expanded_themes], ['Pricing pressure', 'People and places'],
+        )
+        self.assertEqual(
+            diff.merged_themes, [{'old_label': 'Office moves', 'merged_into': 'People and places'}],
+        )
+        self.assertEqual(diff.removed_themes, [])
+
+    def test_missing_vectors_fall_back_to_membership(self):
+        from apps.graph.hierarchy_diff import compute_hierarchy_diff
+
+        ids = [f'c{i}' for i in range(40)]
+        old = self._hierarchy([self._theme('a', 'One', ids[:20]), self._theme('b', 'Two', ids[20:])])
+        new = self._hierarchy([self._theme('x', 'Uno', ids[:20]), self._theme('y', 'Dos', ids[20:])])
+        diff = compute_hierarchy_diff(old, new, {}, {})
+        self.assertFalse(diff.has_changes)
+
+    def test_hungarian_fallback_is_optimal(self):
+        import itertools
+        from apps.graph.hierarchy_diff import _hungarian
+
+        rng = np.random.default_rng(3)
+        for n, m in ((3, 3), (2, 5), (5, 2), (4, 4)):
+            cost = rng.random((n, m))
+            rows, cols = _hungarian(cost)
+            self.assertEqual(len(set(rows)), min(n, m))
+            self.assertEqual(len(set(cols)), min(n, m))
+            if n <= m:
+                best = min(sum(cost[i, p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+            else:
+                best = min(sum(cost[p[j], j] for j in range(m)) for p in itertools.permutations(range(n), m))
+            self.assertAlmostEqual(cost[rows, cols].sum(), best)
+
+
+class _TensionProvider:
+    model = 'fake-fast'
+
+    def __init__(self):
+        self.pairs = []
+
+    async def generate(self, messages, system_prompt=None, **kwargs):
+        labels = re.findall(r'## Theme [AB]: (.*?) \(', messages[0]['content'])
+        self.pairs.append(tuple(labels))
+        if 'Pricing' in labels:
+            return ('<tension><title>Prices vs costs</title>'
+                    '<explanation>They disagree.</explanation><confidence>0.9</confidence></tension>')
+        return '<no_tension />'
+
+
+class TensionCandidateTests(unittest.TestCase):
+    """Theme pairs are ranked cheaply; only uncached top candidates hit the LLM."""
+
+    @staticmethod
+    def _themes(n):
+        labels = ['Pricing', 'Costs', 'Hiring', 'Offices', 'Legal', 'Brand']
+        return [
+            {'id': f't{i}', 'level': 2, 'label': labels[i], 'summary': f'About {labels[i]}',
+             'coverage_pct': 10 * (n - i)}
+            for i in range(n)
+        ]
+
+    def test_rank_by_similarity_and_contradictions(self):
+        from apps.graph.tension_candidates import rank_tension_candidates
+
+        themes = self._themes(4)
+        sims = np.zeros((4, 4), dtype=np.float32)
+        sims[2, 3] = sims[3, 2] = 0.8
+        counts = np.zeros((4, 4), dtype=np.int32)
+        counts[1, 3] = counts[3, 1] = 50
+
+        ranked = rank_tension_candidates(themes, sims, counts)
+        self.assertEqual(len(ranked), 6)
+        self.assertEqual(
+            [(c.theme_a['id'], c.theme_b['id']) for c in ranked[:3]],
+            [('t1', 't3'), ('t2', 't3'), ('t0', 't1')],  # then coverage breaks ties
+        )
+        filtered = rank_tension_candidates(themes, sims, counts, filter_labels={'Hiring'})
+        self.assertEqual(len(filtered), 3)
+        self.assertTrue(all('Hiring' in (c.theme_a['label'], c.theme_b['label']) for c in filtered))
+
+    def test_contradiction_counts_map_nodes_through_chunk_themes(self):
+        from apps.graph.tension_candidates import count_contradictions, node_theme_rows
+
+        rows = {'t0': 0, 't1': 1, 'topic-x': 2}
+        node_themes = node_theme_rows(
+            [('n1', 't0', 'p'), ('n1', 't1', 'q'), ('n2', 't1', 'q'),
+             ('n3', 'root', 'topic-x'), ('n4', 'gone', 'gone')],
+            rows,
+        )
+        self.assertEqual(node_themes, {'n1': {0, 1}, 'n2': {1}, 'n3': {2}})
+        counts = count_contradictions([('n1', 'n2'), ('n3', 'n2'), ('n4', 'n1')], node_themes, 3)
+        self.assertEqual(counts[0, 1], 1)   # n1(t0) → n2(t1); n1(t1) → n2(t1) is intra-theme
+        self.assertEqual(counts[1, 2], 1)
+        self.assertEqual(counts.sum(), 4)
+
+    def test_pair_fingerprint_is_order_independent(self):
+        from apps.graph.tension_candidates import pair_fingerprint
+
+        a, b, c = self._themes(3)
+        self.assertEqual(pair_fingerprint(a, b, 'm'), pair_fingerprint(b, a, 'm'))
+        self.assertNotEqual(pair_fingerprint(a, b, 'm'), pair_fingerprint(a, c, 'm'))
+        self.assertNotEqual(pair_fingerprint(a, b, 'm'), pair_fingerprint(a, b, 'other'))
+        self.assertNotEqual(pair_fingerprint(a, b, 'm'), pair_fingerprint(a, dict(b, summary='Changed'), 'm'))
+
+    def _detect(self, themes, memo, cfg):
+        from apps.graph.insight_agent import InsightDiscoveryAgent
+
+        provider = _TensionProvider()
+
+        def load(project_id, keys):
+            return {k: memo[k] for k in keys if k in memo}
+
+        def store(project_id, entries, model):
+            for fp, *verdict in entries:
+                memo[fp] = tuple(verdict)
+
+        n = len(themes)
+        with patch('apps.common.llm_providers.factory.get_llm_provider', return_value=provider), \
+                patch('apps.graph.tension_candidates.tension_settings', return_value=cfg), \
+                patch('apps.graph.tension_candidates.load_contradiction_counts',
+                      return_value=np.zeros((n, n), dtype=np.int32)), \
+                patch('apps.graph.tension_candidates.load_verdicts', side_effect=load), \
+                patch('apps.graph.tension_candidates.store_verdicts', side_effect=store):
+            insights = asyncio.run(InsightDiscoveryAgent()._detect_tensions(uuid.uuid4(), themes))
+        return insights, provider
+
+    def test_verdicts_are_memoized_across_runs(self):
+        themes = self._themes(6)
+        memo = {}
+        cfg = {'max_candidates': 10, 'max_llm_pairs': 4}
+
+        insights, provider = self._detect(themes, memo, cfg)
+        self.assertEqual(len(provider.pairs), 4)
+        self.assertEqual(len(memo), 4)
+        first_tensions = {tuple(i.source_cluster_ids) for i in insights}
+        self.assertTrue(all('t0' in ids for ids in first_tensions))
+
+        # Second run: the 4 checked pairs come from the memo, the budget
+        # goes to the next 4 candidates.
+        insights, provider = self._detect(themes, memo, cfg)
+        self.assertEqual(len(provider.pairs), 4)
+        self.assertEqual(len(memo), 8)
+        self.assertTrue(first_tensions <= {tuple(i.source_cluster_ids) for i in insights})
+
+        # A changed summary invalidates only that theme's pairs.
+        themes[5] = dict(themes[5], summary='Rewritten')
+        _, provider = self._detect(themes, memo, {'max_candidates': 8, 'max_llm_pairs': 10})
+        self.assertEqual(provider.pairs, [('Pricing', 'Brand')])
+
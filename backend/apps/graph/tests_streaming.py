@@ -769,3 +769,85 @@ class StreamingResponseHeaderTests(TestCase):
 
         response = _run_async(_test())
         self.assertEqual(response['X-Accel-Buffering'], 'no')
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Graph Export Tests
+# ═══════════════════════════════════════════════════════════════════
+
+
+@patch('apps.graph.streaming_views.sync_to_async', _fake_sync_to_async)
+class GraphExportStreamTests(TestCase):
+    """Test the NDJSON graph export (graph_export_stream)."""
+
+    def setUp(self):
+        from apps.graph.models import Edge, Node
+
+        self.user = User.objects.create_user(
+            username='graph_export', email='graph_export@example.com', password='testpass'
+        )
+        self.project = Project.objects.create(
+            title='Graph Export Project', user=self.user
+        )
+        self.nodes = [
+            Node.objects.create(
+                project=self.project, node_type='claim', status='supported',
+                content=f'Claim {i}', source_type='user_edit',
+            )
+            for i in range(5)
+        ]
+        for i in range(4):
+            Edge.objects.create(
+                source_node=self.nodes[i], target_node=self.nodes[i + 1],
+                edge_type='supports', source_type='user_edit',
+            )
+
+    def _export(self):
+        from apps.graph.streaming_views import graph_export_stream
+
+        request = _make_request()
+
+        async def _test():
+            response = await graph_export_stream(request, self.project.id)
+            chunks = [chunk async for chunk in response.streaming_content]
+            return response, b''.join(chunks)
+
+        return _run_async(_test())
+
+    @patch('apps.graph.streaming_views.authenticate_jwt')
+    def test_unauthenticated_returns_401(self, mock_auth):
+        from apps.graph.streaming_views import graph_export_stream
+
+        async def _test():
+            mock_auth.return_value = None
+            return await graph_export_stream(_make_request(), self.project.id)
+
+        response = _run_async(_test())
+        self.assertEqual(response.status_code, 401)
+
+    @patch('apps.graph.graph_payload.EXPORT_PAGE_SIZE', 2)
+    @patch('apps.graph.streaming_views.authenticate_jwt')
+    def test_export_pages_through_whole_graph(self, mock_auth):
+        mock_auth.return_value = self.user
+        response, body = self._export()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(lines[0]['type'], 'header')
+        self.assertEqual(lines[-1], {'type': 'end', 'node_count': 5, 'edge_count': 4})
+
+        nodes = [line for line in lines if line['type'] == 'node']
+        edges = [line for line in lines if line['type'] == 'edge']
+        self.assertEqual(sorted(n['id'] for n in nodes), sorted(str(n.id) for n in self.nodes))
+        self.assertEqual(len({e['id'] for e in edges}), 4)
+        # All nodes come before the first edge
+        kinds = [line['type'] for line in lines[1:-1]]
+        self.assertEqual(kinds, ['node'] * 5 + ['edge'] * 4)
+
+    @patch('apps.graph.streaming_views.authenticate_jwt')
+    def test_empty_graph_exports_header_and_end(self, mock_auth):
+        mock_auth.return_value = self.user
+        self.project.graph_nodes.all().delete()
+        _, body = self._export()
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([line['type'] for line in lines], ['header', 'end'])
@@ -2,7 +2,8 @@
 Tests for the progressive two-tier thematic summary system.
 
 Covers:
-- ChunkClusteringService (direct + fallback + sampled) — no DB required
+- ChunkClusteringService (direct + fallback + sampled + minibatch) — no DB required
+- chunk_loader.fill_chunk_matrix / cluster_project_chunks on a ChunkMatrix — no DB required
 - Thematic XML parsing (_parse_thematic_summary_xml) — no DB required
 - should_generate logic (thematic_upgrade, thematic_insufficient_nodes) — requires DB
 - cleanup_stuck_generating_summaries task — requires DB
@@ -28,7 +29,12 @@ import os
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
 django.setup()
 
-from apps.graph.chunk_clustering import ChunkClusteringService
+from apps.graph.chunk_clustering import (
+    ChunkClusteringService,
+    _average_linkage_merge,
+    minibatch_agglomerative_cluster,
+)
+from apps.graph.chunk_loader import fill_chunk_matrix
 from apps.graph.summary_service import ProjectSummaryService
 
 
@@ -196,6 +202,117 @@ class ChunkClusteringSampledTests(unittest.TestCase):
         self.assertEqual(len(labels), n)
 
 
+class ChunkClusteringMinibatchTests(unittest.TestCase):
+    """Test the scalable mini-batch k-means + average-linkage backend."""
+
+    def _blobs(self, n_per=200, n_groups=4, dim=16, scale=0.1, seed=0):
+        rng = np.random.default_rng(seed)
+        centers = np.eye(dim)[:n_groups]
+        vecs = np.vstack([
+            rng.normal(loc=c, scale=scale, size=(n_per, dim)) for c in centers
+        ])
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    def test_labels_every_vector_and_recovers_groups(self):
+        vecs = self._blobs()
+        labels = minibatch_agglomerative_cluster(vecs, 0.65, micro_cluster_size=10)
+        self.assertEqual(len(labels), len(vecs))
+        for g in range(4):
+            self.assertEqual(len(set(labels[g * 200:(g + 1) * 200].tolist())), 1)
+        self.assertEqual(len(set(labels.tolist())), 4)
+
+    def test_deterministic(self):
+        vecs = self._blobs(seed=3)
+        np.testing.assert_array_equal(
+            minibatch_agglomerative_cluster(vecs, 0.65, batch_size=128),
+            minibatch_agglomerative_cluster(vecs, 0.65, batch_size=128),
+        )
+
+    def test_merge_uses_average_linkage(self):
+        """Group distance is the mean pairwise distance, weighted by size."""
+        # a·b = 0.5 (distance 0.5); c is orthogonal to both (distance 1)
+        means = np.array([[1.0, 0, 0], [0.5, np.sqrt(0.75), 0], [0, 0, 1.0]])
+        counts = np.array([3, 1, 2])
+        np.testing.assert_array_equal(
+            _average_linkage_merge(means, counts, 0.6), [0, 0, 1],
+        )
+        np.testing.assert_array_equal(
+            _average_linkage_merge(means, counts, 0.4), [0, 1, 2],
+        )
+        # After a+b merge, distance to c stays 1 → still separate at 0.99
+        self.assertEqual(len(set(_average_linkage_merge(means, counts, 0.99))), 2)
+
+    def test_hierarchy_dispatch_above_max_direct(self):
+        """Above max_direct the configured backend is used."""
+        vecs = self._blobs(n_per=20)
+        with patch(
+            'apps.graph.chunk_clustering.get_chunk_clustering_config',
+            return_value={'max_direct_cluster': 10, 'backend': 'minibatch'},
+        ), patch.object(
+            ChunkClusteringService, '_cluster_sampled',
+        ) as sampled:
+            from apps.graph.hierarchical_clustering import HierarchicalClusteringService
+            labels = HierarchicalClusteringService._agglomerative_cluster(vecs, 0.65)
+        sampled.assert_not_called()
+        self.assertEqual(len(set(labels.tolist())), 4)
+
+
+class ChunkLoaderTests(unittest.TestCase):
+    """Test fill_chunk_matrix and its use by cluster_project_chunks."""
+
+    def _rows(self, n, dim=4, docs=2):
+        rng = np.random.default_rng(0)
+        return [
+            (uuid.UUID(int=i + 1), f'doc-{i % docs}', f'Title {i % docs}', f'text {i}',
+             rng.normal(size=dim).astype(np.float32))
+            for i in range(n)
+        ]
+
+    def test_fills_matrix_and_dedupes_documents(self):
+        rows = self._rows(5)
+        matrix = fill_chunk_matrix(iter(rows), expected=5, dim=4)
+        self.assertEqual(matrix.embeddings.dtype, np.float32)
+        np.testing.assert_array_equal(matrix.embeddings[3], rows[3][4])
+        self.assertEqual(matrix.ids[0], str(uuid.UUID(int=1)))
+        self.assertEqual(matrix.document_count, 2)
+        self.assertEqual(matrix.document_title(3), 'Title 1')
+        self.assertEqual(matrix.chunk_dicts()[2]['document_id'], 'doc-0')
+
+    def test_grows_and_trims_when_row_count_changes(self):
+        self.assertEqual(len(fill_chunk_matrix(iter(self._rows(7)), expected=3, dim=4).embeddings), 7)
+        self.assertEqual(len(fill_chunk_matrix(iter(self._rows(2)), expected=5, dim=4).embeddings), 2)
+
+    def test_normalized_in_place(self):
+        matrix = fill_chunk_matrix(iter(self._rows(4) + [
+            (uuid.uuid4(), 'doc-0', 'Title 0', 'zero', np.zeros(4, dtype=np.float32)),
+        ]), expected=5, dim=4)
+        normalized = matrix.normalized()
+        self.assertIs(normalized, matrix.embeddings)
+        np.testing.assert_allclose(np.linalg.norm(normalized[:4], axis=1), 1.0, rtol=1e-6)
+        self.assertEqual(np.linalg.norm(normalized[4]), 0.0)
+
+    def test_cluster_project_chunks_uses_matrix(self):
+        rng = np.random.default_rng(1)
+        rows = []
+        for i in range(12):
+            vec = np.zeros(8, dtype=np.float32)
+            vec[i % 2] = 1.0
+            rows.append((uuid.UUID(int=i + 1), f'doc-{i % 3}', f'Doc {i % 3}', f'passage {i}',
+                         vec + rng.normal(scale=0.01, size=8).astype(np.float32)))
+        matrix = fill_chunk_matrix(iter(rows), expected=len(rows), dim=8)
+
+        with patch('apps.graph.chunk_loader.load_chunk_matrix', return_value=matrix):
+            result = ChunkClusteringService.cluster_project_chunks(uuid.uuid4())
+
+        self.assertEqual(result['total_chunks'], 12)
+        self.assertEqual(result['total_documents'], 3)
+        self.assertEqual(len(result['clusters']), 2)
+        cluster = result['clusters'][0]
+        self.assertEqual(cluster['chunk_count'], 6)
+        self.assertEqual(sum(cluster['document_distribution'].values()), 6)
+        self.assertTrue(cluster['representative_chunks'][0]['text'].startswith('passage'))
+
+
 # ═══════════════════════════════════════════════════════════════
 # Thematic XML Parsing Tests (no DB — plain unittest)
 # ═══════════════════════════════════════════════════════════════
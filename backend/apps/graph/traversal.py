@@ -0,0 +1,223 @@
+"""
+Multi-hop graph traversal — one recursive CTE over Edge.
+
+k_hop_subgraph() returns the nodes within ``max_depth`` hops of a set of
+seed nodes, and the edges between them, in a single statement:
+
+    walk     (node, depth) pairs reached from the seeds, following edges
+             of the requested types in the requested direction. UNION
+             drops duplicate (node, depth) pairs, so diamonds collapse
+             to one row per depth instead of one per path. It does not
+             detect cycles: a node on a cycle is revisited at each
+             later depth, and the walk ends only at ``max_depth``.
+    reached  every node at its shortest distance
+    capped   the max_nodes nearest nodes; within a distance the most
+             important first
+
+Each returned node row carries its outgoing edges inside the capped set
+as a JSON array (turned back into Edge instances here) and the title of
+its source document, so callers can serialize the result without more
+queries.
+
+reachable_from() runs the same walk per seed and only returns ids, for
+analyzers asking "which of these nodes can reach X".
+"""
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connection
+
+from .models import Edge, Node
+
+DIRECTIONS = ('out', 'in', 'both')
+MAX_TRAVERSAL_DEPTH = 5
+DEFAULT_MAX_NODES = 200
+
+_NODE_FIELDS = [f for f in Node._meta.concrete_fields if f.name != 'embedding']
+_EDGE_FIELDS = list(Edge._meta.concrete_fields)
+
+
+def _partial_instance(model, db: str, values: Dict[str, Any]):
+    """Model instance with only ``values`` loaded (the rest deferred)."""
+    names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(db, names, [values[name] for name in names])
+
+
+def _step_sql(direction: str, typed: bool) -> str:
+    """Lateral subquery: node ids one hop from ``w.node_id``."""
+    edge_table = Edge._meta.db_table
+    type_filter = ' AND e.edge_type = ANY(%(edge_types)s)' if typed else ''
+    steps = []
+    if direction in ('out', 'both'):
+        steps.append(
+            f"SELECT e.target_node_id AS node_id FROM {edge_table} e "
+            f"WHERE e.source_node_id = w.node_id{type_filter}"
+        )
+    if direction in ('in', 'both'):
+        steps.append(
+            f"SELECT e.source_node_id AS node_id FROM {edge_table} e "
+            f"WHERE e.target_node_id = w.node_id{type_filter}"
+        )
+    return ' UNION ALL '.join(steps)
+
+
+def _walk_params(
+    seed_ids: Iterable[uuid.UUID],
+    max_depth: int,
+    direction: str,
+    edge_types: Optional[Iterable[str]],
+) -> Dict[str, Any]:
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+    return {
+        'seeds': [uuid.UUID(str(seed)) for seed in seed_ids],
+        'max_depth': max(0, min(int(max_depth), MAX_TRAVERSAL_DEPTH)),
+        'edge_types': list(edge_types) if edge_types else None,
+    }
+
+
+def k_hop_subgraph(
+    seed_ids: Iterable[uuid.UUID],
+    *,
+    max_depth: int = 1,
+    direction: str = 'both',
+    edge_types: Optional[Iterable[str]] = None,
+    max_nodes: int = DEFAULT_MAX_NODES,
+    project_id: Optional[uuid.UUID] = None,
+) -> Dict[str, Any]:
+    """
+    Nodes within ``max_depth`` hops of the seeds and the edges among them.
+
+    Args:
+        seed_ids: Start nodes (depth 0, always kept first).
+        max_depth: Hops to follow (clamped to MAX_TRAVERSAL_DEPTH).
+        direction: 'out' follows source → target, 'in' the reverse,
+            'both' either way.
+        edge_types: Only traverse (and return) edges of these types.
+        max_nodes: Cap on returned nodes, nearest first.
+        project_id: Only start from seeds in this project.
+
+    Returns:
+        {
+            'nodes': [Node, ...],       # by distance; embeddings deferred
+            'edges': [Edge, ...],       # both endpoints in 'nodes'
+            'depths': {node_id: hops},
+            'truncated': bool,          # more nodes were reachable
+        }
+    """
+    from apps.projects.models import Document
+
+    params = _walk_params(seed_ids, max_depth, direction, edge_types)
+    params['max_nodes'] = max(1, int(max_nodes))
+    empty = {'nodes': [], 'edges': [], 'depths': {}, 'truncated': False}
+    if not params['seeds']:
+        return empty
+
+    typed = params['edge_types'] is not None
+    node_table = Node._meta.db_table
+    seed_filter = ''
+    if project_id is not None:
+        seed_filter = ' AND project_id = %(project_id)s'
+        params['project_id'] = project_id
+    node_columns = ', '.join(f'n.{f.column}' for f in _NODE_FIELDS)
+    edge_columns = ', '.join(f'e.{f.column}' for f in _EDGE_FIELDS)
+    edge_type_filter = ' AND e.edge_type = ANY(%(edge_types)s)' if typed else ''
+
+    sql = f"""
+        WITH RECURSIVE walk(node_id, depth) AS (
+            SELECT id, 0 FROM {node_table}
+            WHERE id = ANY(%(seeds)s){seed_filter}
+          UNION
+            SELECT step.node_id, w.depth + 1
+            FROM walk w
+            CROSS JOIN LATERAL ({_step_sql(direction, typed)}) step
+            WHERE w.depth < %(max_depth)s
+        ),
+        reached AS (
+            SELECT node_id, MIN(depth) AS depth FROM walk GROUP BY node_id
+        ),
+        capped AS (
+            SELECT r.node_id, r.depth, n.importance, n.created_at
+            FROM reached r JOIN {node_table} n ON n.id = r.node_id
+            ORDER BY r.depth, n.importance DESC, n.created_at DESC, n.id
+            LIMIT %(max_nodes)s
+        )
+        SELECT {node_columns},
+            c.depth AS hop_depth,
+            d.title AS hop_document_title,
+            (SELECT COUNT(*) FROM reached) AS hop_reached,
+            (
+                SELECT json_agg(json_build_array({edge_columns}) ORDER BY e.created_at DESC)
+                FROM {Edge._meta.db_table} e
+                WHERE e.source_node_id = n.id
+                  AND e.target_node_id IN (SELECT node_id FROM capped){edge_type_filter}
+            ) AS hop_edges
+        FROM capped c
+        JOIN {node_table} n ON n.id = c.node_id
+        LEFT JOIN {Document._meta.db_table} d ON d.id = n.source_document_id
+        ORDER BY c.depth, c.importance DESC, c.created_at DESC, n.id
+    """
+    nodes = list(Node.objects.raw(sql, params))
+    if not nodes:
+        return empty
+
+    db = nodes[0]._state.db
+    by_id = {node.id: node for node in nodes}
+    edge_names = [f.attname for f in _EDGE_FIELDS]
+    edges: List[Edge] = []
+    for node in nodes:
+        if node.source_document_id is not None:
+            node.source_document = _partial_instance(Document, db, {
+                'id': node.source_document_id, 'title': node.hop_document_title,
+            })
+        for values in node.hop_edges or ():
+            edge = Edge.from_db(
+                db, edge_names,
+                [f.to_python(v) for f, v in zip(_EDGE_FIELDS, values)],
+            )
+            edge.source_node = node
+            edge.target_node = by_id[edge.target_node_id]
+            edges.append(edge)
+
+    return {
+        'nodes': nodes,
+        'edges': edges,
+        'depths': {node.id: node.hop_depth for node in nodes},
+        'truncated': nodes[0].hop_reached > len(nodes),
+    }
+
+
+def reachable_from(
+    seed_ids: Iterable[uuid.UUID],
+    *,
+    max_depth: int = MAX_TRAVERSAL_DEPTH,
+    direction: str = 'out',
+    edge_types: Optional[Iterable[str]] = None,
+) -> Dict[uuid.UUID, Dict[uuid.UUID, int]]:
+    """seed id → {node id: hops} of every node each seed reaches (seeds excluded)."""
+    params = _walk_params(seed_ids, max_depth, direction, edge_types)
+    if not params['seeds']:
+        return {}
+
+    sql = f"""
+        WITH RECURSIVE walk(origin, node_id, depth) AS (
+            SELECT id, id, 0 FROM {Node._meta.db_table}
+            WHERE id = ANY(%(seeds)s)
+          UNION
+            SELECT w.origin, step.node_id, w.depth + 1
+            FROM walk w
+            CROSS JOIN LATERAL ({_step_sql(direction, params['edge_types'] is not None)}) step
+            WHERE w.depth < %(max_depth)s
+        )
+        SELECT origin, node_id, MIN(depth)
+        FROM walk
+        WHERE node_id <> origin
+        GROUP BY origin, node_id
+    """
+    found: Dict[uuid.UUID, Dict[uuid.UUID, int]] = defaultdict(dict)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for origin, node_id, depth in cursor.fetchall():
+            found[origin][node_id] = depth
+    return dict(found)
@@ -23,6 +23,27 @@ urlpatterns = [
         name='project-graph-clustered',
     ),
 
+    # Graph revision (cache/poll token)
+    path(
+        'projects/<uuid:project_id>/graph/revision/',
+        views.project_graph_revision_view,
+        name='project-graph-revision',
+    ),
+
+    # Delta sync (changes since a graph revision)
+    path(
+        'projects/<uuid:project_id>/graph/changes/',
+        views.project_graph_delta_sync_view,
+        name='project-graph-changes',
+    ),
+
+    # Full graph as streamed NDJSON (no node limit)
+    path(
+        'projects/<uuid:project_id>/graph/export/',
+        streaming_views.graph_export_stream,
+        name='project-graph-export',
+    ),
+
     # Graph deltas (mutation history)
     path(
         'projects/<uuid:project_id>/graph/deltas/',
@@ -44,6 +65,13 @@ urlpatterns = [
         name='node-detail',
     ),
 
+    # Multi-hop subgraph around a node
+    path(
+        'projects/<uuid:project_id>/nodes/<uuid:node_id>/subgraph/',
+        views.node_subgraph_view,
+        name='node-subgraph',
+    ),
+
     # Node update
     path(
         'projects/<uuid:project_id>/nodes/<uuid:node_id>/update/',
@@ -8,6 +8,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -53,15 +54,90 @@ def _parse_graph_params(request):
     return {'limit': limit, 'node_type': node_type}
 
 
+def _graph_etag(revision, *parts) -> str:
+    """Strong ETag for a graph response at ``revision`` with the given params."""
+    source = ':'.join(str(part) for part in parts)
+    return f'"g{revision}-{hashlib.md5(source.encode()).hexdigest()[:12]}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists ``etag`` (or is '*')."""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    resp = Response(status=status.HTTP_304_NOT_MODIFIED)
+    resp['ETag'] = etag
+    return resp
+
+
+def _graph_payload(project_id, revision, params):
+    """
+    Serialized nodes/edges for a project graph, cached per graph revision.
+
+    Returns (payload, graph); graph is the GraphService result on a cache
+    miss and None when the payload came from the cache.
+    """
+    from django.core.cache import cache
+    from .revision import GRAPH_CACHE_TIMEOUT, graph_cache_key
+
+    cache_key = graph_cache_key(
+        'graph_payload', project_id, revision, params['limit'], params['node_type'],
+    )
+    payload = cache.get(cache_key)
+    if payload is not None:
+        return payload, None
+
+    graph = GraphService.get_project_graph(project_id, embeddings=False, **params)
+    payload = {
+        'nodes': NodeSerializer(graph['nodes'], many=True).data,
+        'edges': EdgeSerializer(graph['edges'], many=True).data,
+        'total_node_count': graph['total_node_count'],
+        'truncated': graph['truncated'],
+    }
+    cache.set(cache_key, payload, timeout=GRAPH_CACHE_TIMEOUT)
+    return payload, graph
+
+
+def _columnar_graph_body(project_id, revision, params) -> bytes:
+    """Encoded columnar graph payload (see graph_payload), cached per graph revision."""
+    from django.core.cache import cache
+    from .graph_payload import encode_json, load_columnar_graph
+    from .revision import GRAPH_CACHE_TIMEOUT, graph_cache_key
+
+    cache_key = graph_cache_key(
+        'graph_columnar', project_id, revision, params['limit'], params['node_type'],
+    )
+    body = cache.get(cache_key)
+    if body is None:
+        payload = load_columnar_graph(project_id, **params)
+        body = encode_json({**payload, 'revision': revision})
+        cache.set(cache_key, body, timeout=GRAPH_CACHE_TIMEOUT)
+    return body
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def project_graph_view(request, project_id):
     """
-    GET /api/v2/projects/{project_id}/graph/?limit=2000&node_type=claim
+    GET /api/v2/projects/{project_id}/graph/?limit=2000&node_type=claim&shape=columnar
 
     Returns the graph (nodes + edges) for a project.
     Supports optional limit (default 2000, max 5000) and node_type filter.
+    The response carries the graph revision it was built from.
+
+    ``shape=columnar`` returns one array per field with edges referencing
+    nodes by index (see graph_payload) — much smaller for large graphs.
+
+    Supports ETag / If-None-Match: the ETag is derived from the graph
+    revision, so an unchanged graph answers 304 without being loaded.
     """
+    from .revision import get_graph_revision
+
     project = _get_user_project(request, project_id)
     if not project:
         return Response(
@@ -70,13 +146,25 @@ def project_graph_view(request, project_id):
         )
 
     params = _parse_graph_params(request)
-    graph = GraphService.get_project_graph(project_id, **params)
-    return Response({
-        'nodes': NodeSerializer(graph['nodes'], many=True).data,
-        'edges': EdgeSerializer(graph['edges'], many=True).data,
-        'total_node_count': graph['total_node_count'],
-        'truncated': graph['truncated'],
-    })
+    shape = request.query_params.get('shape', 'rows')
+    revision = get_graph_revision(project_id)
+    etag = _graph_etag(revision, 'graph', shape, params['limit'], params['node_type'])
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    if shape == 'columnar':
+        # Pre-encoded bytes; bypasses DRF serializers and renderers
+        resp = HttpResponse(
+            _columnar_graph_body(project_id, revision, params),
+            content_type='application/json',
+        )
+        resp['ETag'] = etag
+        return resp
+
+    payload, _ = _graph_payload(project_id, revision, params)
+    resp = Response({**payload, 'revision': revision})
+    resp['ETag'] = etag
+    return resp
 
 
 @api_view(['GET'])
@@ -86,10 +174,20 @@ def project_graph_clustered_view(request, project_id):
     GET /api/v2/projects/{project_id}/graph/clustered/?resolution=1.0&limit=2000&node_type=claim
 
     Returns the graph (nodes + edges) plus backend-computed clusters
-    and cluster quality metrics. Clustering results are cached for 60s.
+    and cluster quality metrics. Payload and clustering results are
+    cached per graph revision and summary version.
     Supports optional limit (default 2000, max 5000) and node_type filter.
+    Supports ETag / If-None-Match (graph revision + summary version + layout).
+
+    ``layout`` carries precomputed node coordinates ({node_id: [x, y]}) from
+    the last GraphLayout, or null before the first one. When it is behind
+    the graph revision (``stale``) a layout run is queued; nodes added
+    since have no coordinates yet.
     """
     from django.core.cache import cache
+    from .layout import layout_positions, request_graph_layout
+    from .models import GraphLayout
+    from .revision import GRAPH_CACHE_TIMEOUT, get_graph_revision, graph_cache_key
 
     project = _get_user_project(request, project_id)
     if not project:
@@ -101,21 +199,41 @@ def project_graph_clustered_view(request, project_id):
     resolution = float(request.query_params.get('resolution', '1.0'))
     params = _parse_graph_params(request)
 
-    graph = GraphService.get_project_graph(project_id, **params)
-    nodes_data = NodeSerializer(graph['nodes'], many=True).data
-    edges_data = EdgeSerializer(graph['edges'], many=True).data
+    revision = get_graph_revision(project_id)
+    latest_summary = ProjectSummaryService.get_current_summary(project_id)
+    summary_version = latest_summary.version if latest_summary else 0
+    # One read serves the ETag and the payload; the coordinate blobs are
+    # only loaded past the 304 check.
+    layout_row = (
+        GraphLayout.objects.filter(project_id=project_id)
+        .defer('node_ids', 'positions')
+        .first()
+    )
+    if layout_row is None or layout_row.graph_revision != revision:
+        request_graph_layout(project_id)
+    etag = _graph_etag(
+        revision, 'clustered', resolution, params['limit'], params['node_type'],
+        summary_version, latest_summary.updated_at.isoformat() if latest_summary else '',
+        layout_row.updated_at.isoformat() if layout_row else '',
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    payload, graph = _graph_payload(project_id, revision, params)
 
     # Cache clustering + enrichment together so the summary DB query
     # only runs once per cache miss (not on every request).
-    node_count = len(graph['nodes'])
-    latest_summary = ProjectSummaryService.get_current_summary(project_id)
-    summary_version = latest_summary.version if latest_summary else 0
-    cache_key = f"graph_clusters:{project_id}:{resolution}:{node_count}:{summary_version}"
+    cache_key = graph_cache_key(
+        'graph_clusters', project_id, revision,
+        resolution, params['limit'], params['node_type'], summary_version,
+    )
     cached = cache.get(cache_key)
 
     if cached:
         clusters, cluster_quality = cached
     else:
+        if graph is None:
+            graph = GraphService.get_project_graph(project_id, embeddings=False, **params)
         clusters = ClusteringService.cluster_project_nodes(
             project_id, resolution=resolution,
         )
@@ -143,18 +261,91 @@ def project_graph_clustered_view(request, project_id):
                     if stored.get('summary'):
                         cluster['summary'] = stored['summary']
 
-        cache.set(cache_key, (clusters, cluster_quality), timeout=60)
+        cache.set(cache_key, (clusters, cluster_quality), timeout=GRAPH_CACHE_TIMEOUT)
 
-    return Response({
-        'nodes': nodes_data,
-        'edges': edges_data,
+    layout = None
+    if layout_row is not None:
+        layout_row.refresh_from_db(fields=['node_ids', 'positions'])
+        layout = {
+            'revision': layout_row.graph_revision,
+            'stale': layout_row.graph_revision != revision,
+            'positions': layout_positions(layout_row, (n['id'] for n in payload['nodes'])),
+        }
+
+    resp = Response({
+        **payload,
         'clusters': clusters,
         'cluster_quality': cluster_quality,
-        'total_node_count': graph['total_node_count'],
-        'truncated': graph['truncated'],
+        'layout': layout,
+        'revision': revision,
+    })
+    resp['ETag'] = etag
+    return resp
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_graph_delta_sync_view(request, project_id):
+    """
+    GET /api/v2/projects/{project_id}/graph/changes/?since=42&node_type=claim
+
+    Delta sync: nodes/edges created or updated and ids deleted after graph
+    revision ``since`` (the ``revision`` of the client's last graph
+    response). Apply the changes and keep the returned ``revision``.
+
+    ``full_refresh: true`` means the window can't be served as a delta
+    (deletes not recorded in GraphDelta patches, or too many changes) —
+    refetch the full graph instead.
+    """
+    project = _get_user_project(request, project_id)
+    if not project:
+        return Response(
+            {'error': 'Project not found'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    try:
+        since = int(request.query_params.get('since', ''))
+    except (ValueError, TypeError):
+        return Response(
+            {'error': 'since must be a graph revision (integer)'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    params = _parse_graph_params(request)
+    changes = GraphService.get_graph_changes(project_id, since, node_type=params['node_type'])
+    return Response({
+        'revision': changes['revision'],
+        'since': since,
+        'full_refresh': changes['full_refresh'],
+        'nodes': NodeSerializer(changes['nodes'], many=True).data,
+        'edges': EdgeSerializer(changes['edges'], many=True).data,
+        'deleted_node_ids': changes['deleted_node_ids'],
+        'deleted_edge_ids': changes['deleted_edge_ids'],
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_graph_revision_view(request, project_id):
+    """
+    GET /api/v2/projects/{project_id}/graph/revision/
+
+    Current graph revision — bumped by every node/edge mutation, so
+    clients can poll it cheaply and refetch the graph only when it moved.
+    """
+    from .revision import get_graph_revision
+
+    project = _get_user_project(request, project_id)
+    if not project:
+        return Response(
+            {'error': 'Project not found'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    return Response({'revision': get_graph_revision(project_id)})
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def node_search_view(request, project_id):
@@ -267,6 +458,74 @@ def node_detail_view(request, project_id, node_id):
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def node_subgraph_view(request, project_id, node_id):
+    """
+    GET /api/v2/projects/{project_id}/nodes/{node_id}/subgraph/
+
+    Nodes within ``depth`` hops of a node and the edges among them.
+
+    Query params:
+        depth: hops to follow (default 2, max 5)
+        direction: out | in | both (default both)
+        edge_types: comma-separated edge types to follow (default all)
+        limit: max nodes, nearest first (default 200)
+    """
+    from .models import EdgeType
+    from .traversal import DEFAULT_MAX_NODES, DIRECTIONS, MAX_TRAVERSAL_DEPTH
+
+    project = _get_user_project(request, project_id)
+    if not project:
+        return Response(
+            {'error': 'Project not found'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    try:
+        depth = int(request.query_params.get('depth', 2))
+        limit = int(request.query_params.get('limit', DEFAULT_MAX_NODES))
+    except (ValueError, TypeError):
+        return Response(
+            {'error': 'depth and limit must be integers'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    direction = request.query_params.get('direction', 'both')
+    if direction not in DIRECTIONS:
+        return Response(
+            {'error': f"direction must be one of: {', '.join(DIRECTIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    edge_types = [t for t in request.query_params.get('edge_types', '').split(',') if t]
+    unknown = set(edge_types) - set(EdgeType.values)
+    if unknown:
+        return Response(
+            {'error': f"Unknown edge types: {', '.join(sorted(unknown))}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    subgraph = GraphService.get_subgraph(
+        [node_id],
+        max_depth=min(max(depth, 0), MAX_TRAVERSAL_DEPTH),
+        direction=direction,
+        edge_types=edge_types or None,
+        max_nodes=max(limit, 1),
+        project_id=project_id,
+    )
+    if not subgraph['nodes']:
+        return Response(
+            {'error': 'Node not found'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    return Response({
+        'nodes': NodeSerializer(subgraph['nodes'], many=True).data,
+        'edges': EdgeSerializer(subgraph['edges'], many=True).data,
+        'depths': {str(node_id): hops for node_id, hops in subgraph['depths'].items()},
+        'truncated': subgraph['truncated'],
+    })
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
 def node_update_view(request, project_id, node_id):
@@ -748,6 +1007,9 @@ def project_hierarchy_rebuild_view(request, project_id):
     POST /api/v2/projects/{project_id}/hierarchy/rebuild/
 
     Trigger a hierarchy rebuild. Returns 202 Accepted immediately.
+
+    Refreshes incrementally from the current hierarchy when possible;
+    pass {"full": true} to force re-clustering and re-summarizing everything.
     """
     project = _get_user_project(request, project_id)
     if not project:
@@ -770,7 +1032,9 @@ def project_hierarchy_rebuild_view(request, project_id):
         )
 
     from .tasks import build_cluster_hierarchy_task
-    build_cluster_hierarchy_task.delay(str(project_id))
+    build_cluster_hierarchy_task.delay(
+        str(project_id), full=bool(request.data.get('full', False)),
+    )
 
     return Response(
         {'status': 'building'},
@@ -886,16 +1150,17 @@ def project_insight_update_view(request, project_id, insight_id):
 @permission_classes([IsAuthenticated])
 def hierarchy_chunk_search_view(request, project_id):
     """
-    GET /api/v2/projects/{project_id}/hierarchy/search/?q=...&top_k=20
+    GET /api/v2/projects/{project_id}/hierarchy/search/?q=...&top_k=20[&cluster=<id>]
 
     Search chunks by query embedding within the project's hierarchy.
-    Returns chunks with their parent cluster context (topic/theme labels).
+    Returns chunks with their parent cluster context (topic/theme labels),
+    joined from the current hierarchy's ClusterChunkAssignment rows.
+    Optional `cluster` (repeatable) restricts results to chunks under the
+    given theme/topic ids.
 
     This endpoint supports Plan 3 (Case Extraction) by providing
     relevant chunks from the hierarchy for case-level extraction.
     """
-    from .models import ClusterHierarchy
-
     project = _get_user_project(request, project_id)
     if not project:
         return Response(
@@ -913,8 +1178,10 @@ def hierarchy_chunk_search_view(request, project_id):
     top_k = min(int(request.query_params.get('top_k', 20)), 50)
 
     # Semantic search over chunks
+    from django.db.models import F
     from apps.common.vector_utils import generate_embedding, similarity_search
     from apps.projects.models import DocumentChunk
+    from .chunk_assignments import chunks_in_clusters
 
     query_vector = generate_embedding(query)
     chunk_qs = (
@@ -922,6 +1189,14 @@ def hierarchy_chunk_search_view(request, project_id):
         .filter(document__project_id=project_id, embedding__isnull=False)
         .select_related('document')
     )
+    cluster_ids = request.query_params.getlist('cluster')
+    if cluster_ids:
+        chunk_qs = chunks_in_clusters(chunk_qs, cluster_ids)
+    # Filter before annotating so both use the same assignment join
+    chunk_qs = chunk_qs.annotate(
+        topic_label=F('cluster_assignments__topic_label'),
+        theme_label=F('cluster_assignments__theme_label'),
+    )
 
     results = list(similarity_search(
         queryset=chunk_qs,
@@ -931,55 +1206,21 @@ def hierarchy_chunk_search_view(request, project_id):
         top_k=top_k,
     ))
 
-    # Build chunk ID -> cluster context lookup from hierarchy
-    from .models import HierarchyStatus
-    hierarchy = (
-        ClusterHierarchy.objects
-        .filter(project_id=project_id, is_current=True, status=HierarchyStatus.READY)
-        .first()
-    )
-
-    chunk_context = {}
-    if hierarchy and hierarchy.tree:
-        _build_chunk_context(hierarchy.tree, chunk_context, theme_label='', topic_label='')
-
     response_data = []
     for chunk in results:
-        ctx = chunk_context.get(str(chunk.id), {})
         response_data.append({
             'chunk_id': str(chunk.id),
             'chunk_text': chunk.chunk_text[:500],
             'document_id': str(chunk.document_id),
             'document_title': chunk.document.title,
             'similarity': round(1.0 - chunk.distance, 3),
-            'topic_label': ctx.get('topic_label', ''),
-            'theme_label': ctx.get('theme_label', ''),
+            'topic_label': chunk.topic_label or '',
+            'theme_label': chunk.theme_label or '',
         })
 
     return Response({'results': response_data})
 
 
-def _build_chunk_context(node: dict, context: dict, theme_label: str, topic_label: str):
-    """Recursively build chunk_id -> {theme_label, topic_label} mapping."""
-    level = node.get('level', 0)
-
-    if level >= 2:
-        theme_label = node.get('label', theme_label)
-    if level == 1:
-        topic_label = node.get('label', topic_label)
-
-    # If this is a leaf-like node with chunk_ids, map them
-    if not node.get('children'):
-        for cid in node.get('chunk_ids', []):
-            context[cid] = {
-                'theme_label': theme_label,
-                'topic_label': topic_label,
-            }
-    else:
-        for child in node['children']:
-            _build_chunk_context(child, context, theme_label, topic_label)
-
-
 # ── Project Orientation endpoints ─────────────────────────────────
 
 
@@ -10,6 +10,10 @@ Output format uses XML tags for easy parsing:
 """
 from typing import Any, Dict, List
 
+# Bump when any prompt below changes — part of the ClusterSummaryMemo
+# fingerprint, so memoized cluster summaries are invalidated.
+HIERARCHY_PROMPT_VERSION = '1'
+
 
 def build_topic_summary_prompt(
     chunk_texts: List[str],
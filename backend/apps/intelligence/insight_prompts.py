@@ -6,6 +6,10 @@ Follows the pattern of thematic_summary_prompts.py: stateless, no I/O, returns s
 """
 from typing import Any, Dict
 
+# Bump when the tension prompt changes — part of the TensionPairVerdict
+# key, so memoized verdicts are invalidated.
+TENSION_PROMPT_VERSION = '1'
+
 
 def build_tension_detection_prompt(
     theme_a: Dict[str, Any],
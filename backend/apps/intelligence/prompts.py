@@ -292,6 +292,7 @@ def build_case_aware_system_prompt(
     constraints: Optional[List] = None,
     success_criteria: Optional[List] = None,
     available_tools: Optional[List] = None,
+    workspace_aggregates: Optional[Dict] = None,
 ) -> str:
     """
     Build a system prompt for case-scoped chat that includes the full plan
@@ -312,6 +313,7 @@ def build_case_aware_system_prompt(
         position_statement: Current position statement from the plan
         constraints: Case constraints list
         success_criteria: Case success criteria list
+        workspace_aggregates: CaseAggregatesService.get_case_aggregates() counts
     """
     sections: List[str] = []
 
@@ -331,6 +333,11 @@ def build_case_aware_system_prompt(
     # --- Section: Plan state ---
     sections.append(_build_plan_state_section(plan_content))
 
+    # --- Section: Workspace state (evidence / assumption / inquiry counts) ---
+    workspace_section = _build_workspace_state_section(workspace_aggregates)
+    if workspace_section:
+        sections.append(workspace_section)
+
     # --- Section: Plan edits instructions ---
     sections.append(_build_plan_edits_section())
 
@@ -458,6 +465,26 @@ def _build_plan_state_section(plan_content: Optional[Dict]) -> str:
     )
 
 
+def _build_workspace_state_section(aggregates: Optional[Dict]) -> str:
+    """Workspace state section — evidence, assumption and inquiry counts."""
+    if not aggregates:
+        return ''
+    evidence = aggregates.get('evidence', {})
+    assumptions = aggregates.get('assumptions', {})
+    inquiries = aggregates.get('inquiries', {})
+    return (
+        "## Workspace State\n"
+        f"- Evidence: {evidence.get('total', 0)} items "
+        f"({evidence.get('supporting', 0)} supporting, "
+        f"{evidence.get('contradicting', 0)} contradicting)\n"
+        f"- Assumptions: {assumptions.get('untested', 0)} untested "
+        f"of {assumptions.get('total', 0)}\n"
+        f"- Inquiries: {inquiries.get('open', 0)} open, "
+        f"{inquiries.get('investigating', 0)} investigating, "
+        f"{inquiries.get('resolved', 0)} resolved"
+    )
+
+
 def _build_plan_edits_section() -> str:
     """Plan edits instructions — diff-only format (no proposed_content)."""
     return """## Plan Edits
@@ -171,6 +171,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.graph.tasks.cleanup_stuck_generating_summaries',
         'schedule': crontab(minute='*/10'),  # every 10 minutes
     },
+    'reconcile-graph-health': {
+        'task': 'apps.graph.tasks.reconcile_graph_health_task',
+        'schedule': crontab(minute=15),  # hourly
+    },
+    'prune-cluster-summary-memos': {
+        'task': 'apps.graph.tasks.prune_cluster_summary_memos_task',
+        'schedule': crontab(hour=4, minute=0),
+    },
 }
 
 # Chat response behavior
@@ -241,6 +249,30 @@ AI_MODELS = {
     'extraction': env('AI_MODEL_EXTRACTION', default='anthropic:claude-haiku-4-5'),
 }
 
+# ── Shared LLM rate limiter ──
+# Budgets per provider:model shared by every web/Celery process via Redis
+# (falls back to an in-process limiter when Redis is unreachable).
+# Background work leaves headroom so interactive chat is served first.
+LLM_RATE_LIMITS = {
+    # Off by default: the defaults below are conservative placeholders, so
+    # set per-model limits from your provider tier before enabling
+    'enabled': env.bool('LLM_RATE_LIMIT_ENABLED', default=False),
+    'backend': env('LLM_RATE_LIMIT_BACKEND', default='redis'),  # 'redis' or 'local'
+    'redis_url': env('LLM_RATE_LIMIT_REDIS_URL', default='redis://localhost:6379/2'),
+    'max_wait_seconds': env.int('LLM_RATE_LIMIT_MAX_WAIT', default=120),
+    # Output tokens charged up front per call (instead of the full
+    # max_tokens); usage beyond it is debited when the call finishes
+    'reserve_output_tokens': env.int('LLM_RATE_LIMIT_RESERVE_OUTPUT_TOKENS', default=1024),
+    'default': {
+        'requests_per_minute': env.int('LLM_RATE_LIMIT_RPM', default=50),
+        'tokens_per_minute': env.int('LLM_RATE_LIMIT_TPM', default=40000),
+        'max_in_flight': env.int('LLM_RATE_LIMIT_MAX_IN_FLIGHT', default=8),
+    },
+    # Per-model overrides keyed "provider:model", e.g.
+    # 'anthropic:claude-haiku-4-5': {'requests_per_minute': 4000, 'tokens_per_minute': 400000},
+    'models': {},
+}
+
 # Embedding Backend
 EMBEDDING_BACKEND = env('EMBEDDING_BACKEND', default='postgresql')
 # sentence-transformers model for embeddings (384-dim, same dims for L6/L12)
@@ -268,11 +300,62 @@ SUMMARY_SETTINGS = {
         'similarity_threshold': env.float('CLUSTERING_SIMILARITY_THRESHOLD', default=0.6),
         'merge_threshold': env.float('CLUSTERING_MERGE_THRESHOLD', default=0.75),
         'semantic_variance_threshold': env.float('CLUSTERING_SEMANTIC_VARIANCE_THRESHOLD', default=0.7),
+        # Seed Leiden with the previous GraphPartition and only re-optimize
+        # communities touched since; full (seeded) run above this churn.
+        'incremental': env.bool('CLUSTERING_INCREMENTAL', default=True),
+        'incremental_max_touched_fraction': env.float('CLUSTERING_INCREMENTAL_MAX_TOUCHED', default=0.3),
+    },
+    # Server-side graph layout (apps.graph.layout) for the clustered graph view
+    'graph_layout': {
+        # DrL instead of Fruchterman-Reingold for full layouts at this size
+        # (grid FR lays out 5,000 nodes in under a second; DrL takes ~10s)
+        'drl_min_nodes': env.int('GRAPH_LAYOUT_DRL_MIN_NODES', default=20000),
+        'iterations': env.int('GRAPH_LAYOUT_ITERATIONS', default=500),
+        # Pin existing nodes and only settle new ones below this churn
+        'incremental_max_new_fraction': env.float('GRAPH_LAYOUT_INCREMENTAL_MAX_NEW', default=0.2),
+        'incremental_iterations': env.int('GRAPH_LAYOUT_INCREMENTAL_ITERATIONS', default=100),
+        'intra_cluster_weight': env.float('GRAPH_LAYOUT_INTRA_CLUSTER_WEIGHT', default=3.0),
+    },
+    # Materialized graph health stats (apps.graph.health)
+    'graph_health': {
+        # Seconds between a graph write and the background recompute it queues
+        'refresh_delay': env.int('GRAPH_HEALTH_REFRESH_DELAY', default=10),
+        # Stats rows re-checked per reconciliation run (oldest first)
+        'reconcile_batch': env.int('GRAPH_HEALTH_RECONCILE_BATCH', default=200),
     },
     # Chunk clustering (agglomerative) — used in thematic summary generation
+    # and hierarchy Level 0→1
     'chunk_clustering': {
         'distance_threshold': env.float('CHUNK_CLUSTERING_DISTANCE_THRESHOLD', default=0.65),
         'max_direct_cluster': env.int('CHUNK_CLUSTERING_MAX_DIRECT', default=5000),
+        # Above max_direct_cluster: 'minibatch' (k-means micro-clusters over all
+        # chunks + average-linkage merge) or 'sampled' (cluster a sample, assign rest)
+        'backend': env('CHUNK_CLUSTERING_BACKEND', default='minibatch'),
+        'micro_cluster_size': env.int('CHUNK_CLUSTERING_MICRO_CLUSTER_SIZE', default=20),
+        'max_micro_clusters': env.int('CHUNK_CLUSTERING_MAX_MICRO_CLUSTERS', default=5000),
+    },
+    # Incremental cluster hierarchy refresh — reuse untouched topics/themes
+    # and only re-summarize what drifted; full rebuild past these limits.
+    'hierarchy_refresh': {
+        'incremental': env.bool('HIERARCHY_INCREMENTAL', default=True),
+        'topic_change_threshold': env.float('HIERARCHY_TOPIC_CHANGE_THRESHOLD', default=0.2),
+        'max_chunk_churn': env.float('HIERARCHY_MAX_CHUNK_CHURN', default=0.5),
+        'max_touched_topic_fraction': env.float('HIERARCHY_MAX_TOUCHED_TOPICS', default=0.5),
+        # Summary memos unused for this long are pruned by the daily beat task
+        'memo_max_age_days': env.int('HIERARCHY_MEMO_MAX_AGE_DAYS', default=30),
+    },
+    # Insight tension detection — theme pairs are ranked by centroid
+    # similarity + contradiction edges; the top candidates are checked,
+    # reusing memoized verdicts, with at most max_llm_pairs new LLM calls.
+    'insight_tensions': {
+        'max_candidates': env.int('INSIGHT_TENSION_MAX_CANDIDATES', default=40),
+        'max_llm_pairs': env.int('INSIGHT_TENSION_MAX_LLM_PAIRS', default=15),
+        'contradiction_weight': env.float('INSIGHT_TENSION_CONTRADICTION_WEIGHT', default=0.25),
+    },
+    # Working document versions — every snapshot_interval-th version keeps
+    # full content, the rest store line diffs against their predecessor.
+    'document_versions': {
+        'snapshot_interval': env.int('DOCUMENT_VERSION_SNAPSHOT_INTERVAL', default=20),
     },
 }
 
@@ -37,3 +37,6 @@ MIDDLEWARE = [
 # Use synchronous responses in tests (no Celery)
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+
+# In-process LLM rate limiter (no Redis dependency in tests)
+LLM_RATE_LIMITS = {**LLM_RATE_LIMITS, 'backend': 'local'}